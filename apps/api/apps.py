@@ -7,9 +7,13 @@ class ApiConfig(AppConfig):
     verbose_name = 'API'
 
     def ready(self):
-        """Import signal handlers to register cache invalidation."""
+        """Import signal handlers for cache invalidation and page payloads."""
         # Import cache invalidation signals
         from apps.api.cache import invalidation
 
         # This ensures all @receiver decorators are executed
         invalidation.setup_cache_invalidation()
+
+        # Precompute page StreamField payloads when pages are saved
+        from apps.api.content_serializers.payloads import setup_payload_signals
+        setup_payload_signals()
@@ -7,6 +7,8 @@ from django.http import HttpRequest
 
 import bleach
 
+from apps.api.services.html_sanitizer import SanitizationPolicy
+
 try:
     from wagtail.images.models import Image
 except Exception:  # pragma: no cover - allow imports to resolve in docs/static checks
@@ -34,25 +36,32 @@ ALLOWED_ATTRIBUTES = {
 
 ALLOWED_PROTOCOLS = list(bleach.sanitizer.ALLOWED_PROTOCOLS) + ['data']
 
+RICH_TEXT_POLICY = SanitizationPolicy(
+    name='rich_text',
+    tags=ALLOWED_TAGS,
+    attributes=ALLOWED_ATTRIBUTES,
+    protocols=ALLOWED_PROTOCOLS,
+    strip=False,
+)
+
 
 def sanitize_rich_text(html: Optional[str]) -> str:
     """Sanitize RichText/HTML using a safe allowlist. Keeps code/pre tags.
+    Results are cached by content hash, so unchanged content is sanitized once.
     Do NOT use this for code-bearing fields or templates.
     """
     if not html:
         return ''
-    return bleach.clean(
-        html,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        protocols=ALLOWED_PROTOCOLS,
-        strip=False,
-    )
+    from apps.api.services.container import container
+    return container.get_html_sanitizer().sanitize(html, RICH_TEXT_POLICY)
 
 
-def absolute_media_url(request: HttpRequest, url: Optional[str]) -> Optional[str]:
+def absolute_media_url(request: Optional[HttpRequest], url: Optional[str]) -> Optional[str]:
     if not url:
         return None
+    if request is None:
+        # Precomputed payloads keep relative URLs until they are served
+        return url
     # Build absolute URL for frontend clients and CDNs
     try:
         return request.build_absolute_uri(url)
@@ -60,9 +69,9 @@ def absolute_media_url(request: HttpRequest, url: Optional[str]) -> Optional[str
         return url
 
 
-def serialize_image(image: Any, request: HttpRequest) -> Optional[Dict[str, Any]]:
+def serialize_image(image: Any, request: Optional[HttpRequest]) -> Optional[Dict[str, Any]]:
     """Return image info with standard renditions and absolute URLs.
-    Safe to call with None.
+    Safe to call with None. Without a request, URLs are left relative.
     """
     if not image:
         return None
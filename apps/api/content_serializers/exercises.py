@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+from django.http import HttpRequest
+
+
+def serialize_exercise_content(stream_value: Any, request: Optional[HttpRequest] = None) -> List[Dict[str, Any]]:
+    """Serialize ExercisePage.exercise_content (instructions, examples, hints)."""
+    result: List[Dict[str, Any]] = []
+    for block in stream_value or []:
+        if block.block_type == 'instruction':
+            result.append({
+                'type': 'instruction',
+                'value': str(block.value)
+            })
+        elif block.block_type == 'code_example':
+            result.append({
+                'type': 'code_example',
+                'title': block.value.get('title', ''),
+                'language': block.value.get('language', 'python'),
+                'code': block.value.get('code', ''),
+                'explanation': str(block.value.get('explanation', ''))
+            })
+        elif block.block_type == 'hint_block':
+            result.append({
+                'type': 'hint_block',
+                'hint_type': block.value.get('hint_type', 'general'),
+                'content': str(block.value.get('content', ''))
+            })
+    return result
+
+
+def serialize_test_cases(stream_value: Any, request: Optional[HttpRequest] = None) -> List[Dict[str, Any]]:
+    """Serialize ExercisePage.test_cases."""
+    return [
+        {
+            'input': block.value.get('input', ''),
+            'expected_output': block.value.get('expected_output', ''),
+            'description': block.value.get('description', ''),
+            'is_hidden': block.value.get('is_hidden', False)
+        }
+        for block in stream_value or []
+        if block.block_type == 'test_case'
+    ]
+
+
+def serialize_hints(stream_value: Any, request: Optional[HttpRequest] = None) -> List[Dict[str, Any]]:
+    """Serialize hint blocks (ExercisePage.hints, StepBasedExercisePage.general_hints)."""
+    return [
+        {
+            'hint_text': str(block.value.get('hint_text', '')),
+            'reveal_after_attempts': block.value.get('reveal_after_attempts', 3)
+        }
+        for block in stream_value or []
+        if block.block_type == 'hint'
+    ]
+
+
+def serialize_exercise_steps(stream_value: Any, request: Optional[HttpRequest] = None) -> List[Dict[str, Any]]:
+    """Serialize StepBasedExercisePage.exercise_steps, ordered by step number."""
+    steps: List[Dict[str, Any]] = []
+    for block in stream_value or []:
+        if block.block_type != 'exercise_step':
+            continue
+        step_data = {
+            'step_number': block.value.get('step_number', 1),
+            'title': block.value.get('title', ''),
+            'description': str(block.value.get('description', '')),
+            'exercise_type': block.value.get('exercise_type', 'code'),
+            'template': block.value.get('template', ''),
+            'points': block.value.get('points', 10),
+            'success_message': block.value.get('success_message', ''),
+            'hint': block.value.get('hint', ''),
+        }
+
+        # Parse solutions JSON for this step
+        solutions_text = block.value.get('solutions', '')
+        if solutions_text:
+            try:
+                step_data['solutions'] = json.loads(solutions_text)
+            except (ValueError, json.JSONDecodeError):
+                step_data['solutions'] = {}
+        else:
+            step_data['solutions'] = {}
+
+        steps.append(step_data)
+
+    steps.sort(key=lambda x: x['step_number'])
+    return steps
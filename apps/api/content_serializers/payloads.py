@@ -0,0 +1,108 @@
+"""Precomputed API payloads for Wagtail pages.
+
+Serializing a page's StreamFields walks every block, renders rich text and
+sanitizes it. Pages with ApiPayloadMixin store that serialization in
+``api_payload`` whenever they are saved with changed content (publishing
+saves the page), and API views read it back with ``page_payload()``, adding
+only per-request data such as absolute media URLs.
+
+Bump PAYLOAD_VERSION when a serializer's output changes: pages with an
+older payload are serialized on read until ``rebuild_page_payloads`` runs.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+from django.apps import apps
+from django.db.models.signals import post_save, pre_save
+from django.http import HttpRequest
+
+from .exercises import (
+    serialize_exercise_content,
+    serialize_exercise_steps,
+    serialize_hints,
+    serialize_test_cases,
+)
+from .streamfield import absolutize_media_urls, serialize_streamfield
+
+PAYLOAD_VERSION = 1
+
+# Model label -> {StreamField name: serializer(stream_value, request)}
+PAYLOAD_SERIALIZERS: Dict[str, Dict[str, Callable]] = {
+    'blog.BlogPage': {'body': serialize_streamfield},
+    'blog.LessonPage': {'content': serialize_streamfield},
+    'blog.ExercisePage': {
+        'exercise_content': serialize_exercise_content,
+        'test_cases': serialize_test_cases,
+        'hints': serialize_hints,
+    },
+    'blog.StepBasedExercisePage': {
+        'exercise_steps': serialize_exercise_steps,
+        'general_hints': serialize_hints,
+    },
+}
+
+
+def payload_serializers(model: Any) -> Dict[str, Callable]:
+    """Field serializers of a page model (or instance), including inherited ones."""
+    for klass in (model if isinstance(model, type) else type(model)).__mro__:
+        meta = getattr(klass, '_meta', None)
+        if meta is not None and meta.label in PAYLOAD_SERIALIZERS:
+            return PAYLOAD_SERIALIZERS[meta.label]
+    return {}
+
+
+def build_payload(page: Any) -> Dict[str, Any]:
+    """Serialize a page's StreamFields without request-specific data."""
+    return {
+        'version': PAYLOAD_VERSION,
+        'fields': {
+            name: serializer(getattr(page, name, None), None)
+            for name, serializer in payload_serializers(page).items()
+        },
+    }
+
+
+def is_current(page: Any) -> bool:
+    payload = getattr(page, 'api_payload', None) or {}
+    return (
+        payload.get('version') == PAYLOAD_VERSION
+        and set(payload_serializers(page)) <= set(payload.get('fields') or {})
+    )
+
+
+def page_payload(page: Any, request: Optional[HttpRequest]) -> Dict[str, Any]:
+    """Serialized StreamFields of a page for an API response.
+    Uses the stored payload when it is current, else serializes on the fly.
+    """
+    fields = page.api_payload['fields'] if is_current(page) else build_payload(page)['fields']
+    return {name: absolutize_media_urls(value, request) for name, value in fields.items()}
+
+
+def refresh_page_payload(sender, instance, raw=False, update_fields=None, **kwargs):
+    """pre_save: store the payload with a full save of the page."""
+    if raw or update_fields is not None:
+        return
+    instance.api_payload = build_payload(instance)
+
+
+def refresh_partial_page_payload(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """post_save: refresh the payload after a save limited to some fields.
+    Saves that don't touch StreamFields (e.g. saving a draft revision) are skipped.
+    """
+    if raw or update_fields is None or 'api_payload' in update_fields:
+        return
+    if not set(update_fields) & set(payload_serializers(sender)):
+        return
+    instance.api_payload = build_payload(instance)
+    sender.objects.filter(pk=instance.pk).update(api_payload=instance.api_payload)
+
+
+def setup_payload_signals():
+    """Connect payload refreshes for page models with precomputed payloads."""
+    for model in apps.get_models():
+        if payload_serializers(model):
+            pre_save.connect(refresh_page_payload, sender=model, dispatch_uid=f'page_payload_{model._meta.label}')
+            post_save.connect(
+                refresh_partial_page_payload, sender=model, dispatch_uid=f'partial_page_payload_{model._meta.label}'
+            )
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from django.http import HttpRequest
 
-from .common import sanitize_rich_text, serialize_image
+from .common import absolute_media_url, sanitize_rich_text, serialize_image
 import json
 
 
@@ -17,11 +17,11 @@ def _parse_json_maybe(value: Any, default: Any):
     return value if value is not None else default
 
 
-def serialize_streamfield(stream_value: Any, request: HttpRequest) -> List[Dict[str, Any]]:
+def serialize_streamfield(stream_value: Any, request: Optional[HttpRequest]) -> List[Dict[str, Any]]:
     """Serialize a Wagtail StreamField into a JSON-friendly list.
     - Rich text fields are sanitized (editor-safe).
     - Code/plain text fields are passed through verbatim.
-    - Images include rendition metadata with absolute URLs.
+    - Images include rendition metadata with absolute URLs (relative without a request).
     """
     result: List[Dict[str, Any]] = []
     if not stream_value:
@@ -134,3 +134,29 @@ def serialize_streamfield(stream_value: Any, request: HttpRequest) -> List[Dict[
         result.append(entry)
 
     return result
+
+
+def absolutize_media_urls(blocks: Any, request: Optional[HttpRequest]) -> Any:
+    """Return serialized blocks with image URLs made absolute for this request.
+    Other values are returned unchanged.
+    """
+    if request is None or not isinstance(blocks, list):
+        return blocks
+
+    result = []
+    for entry in blocks:
+        value = entry.get('value') if isinstance(entry, dict) else None
+        if isinstance(value, dict) and entry.get('type') == 'image':
+            entry = {
+                **entry,
+                'value': {
+                    **value,
+                    'original': absolute_media_url(request, value.get('original')),
+                    'renditions': {
+                        key: {**rendition, 'url': absolute_media_url(request, rendition.get('url'))}
+                        for key, rendition in (value.get('renditions') or {}).items()
+                    },
+                },
+            }
+        result.append(entry)
+    return result
@@ -1,8 +1,12 @@
 """
 Pagination classes for forum API endpoints.
+
+Page-number totals come from apps.api.pagination.count_rows(): exact for
+small lists, estimated or cached for large ones (see total_is_exact).
 """
 from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.response import Response
+from apps.api.pagination import CountStrategyPaginator
 
 
 class ForumStandardPagination(PageNumberPagination):
@@ -12,6 +16,7 @@ class ForumStandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    django_paginator_class = CountStrategyPaginator
 
     def get_paginated_response(self, data):
         """Return paginated response with metadata."""
@@ -21,6 +26,7 @@ class ForumStandardPagination(PageNumberPagination):
                 'current_page': self.page.number,
                 'page_size': self.page.paginator.per_page,
                 'total_count': self.page.paginator.count,
+                'total_is_exact': self.page.paginator.count_is_exact,
                 'total_pages': self.page.paginator.num_pages,
                 'has_next': self.page.has_next(),
                 'has_previous': self.page.has_previous(),
@@ -35,6 +41,7 @@ class TopicPagination(PageNumberPagination):
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
+    django_paginator_class = CountStrategyPaginator
 
     def get_paginated_response(self, data):
         """Return paginated response with metadata."""
@@ -44,6 +51,7 @@ class TopicPagination(PageNumberPagination):
                 'current_page': self.page.number,
                 'page_size': self.page.paginator.per_page,
                 'total_count': self.page.paginator.count,
+                'total_is_exact': self.page.paginator.count_is_exact,
                 'total_pages': self.page.paginator.num_pages,
                 'has_next': self.page.has_next(),
                 'has_previous': self.page.has_previous(),
@@ -59,6 +67,7 @@ class PostPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 50  # Limit to 50 posts per page
+    django_paginator_class = CountStrategyPaginator
 
     def get_paginated_response(self, data):
         """Return paginated response with metadata."""
@@ -68,6 +77,7 @@ class PostPagination(PageNumberPagination):
                 'current_page': self.page.number,
                 'page_size': self.page.paginator.per_page,
                 'total_count': self.page.paginator.count,
+                'total_is_exact': self.page.paginator.count_is_exact,
                 'total_pages': self.page.paginator.num_pages,
                 'has_next': self.page.has_next(),
                 'has_previous': self.page.has_previous(),
@@ -82,6 +92,7 @@ class ModerationQueuePagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    django_paginator_class = CountStrategyPaginator
 
     def get_paginated_response(self, data):
         """Return paginated response with metadata."""
@@ -91,6 +102,7 @@ class ModerationQueuePagination(PageNumberPagination):
                 'current_page': self.page.number,
                 'page_size': self.page.paginator.per_page,
                 'total_count': self.page.paginator.count,
+                'total_is_exact': self.page.paginator.count_is_exact,
                 'total_pages': self.page.paginator.num_pages,
                 'has_next': self.page.has_next(),
                 'has_previous': self.page.has_previous(),
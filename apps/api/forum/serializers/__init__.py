@@ -1,7 +1,7 @@
 """
 Forum API Serializers
 """
-from .user import UserSerializer, UserProfileSerializer
+from .user import UserSerializer, UserProfileSerializer, AuthorSerializer, AuthorListSerializer
 from .forum import ForumSerializer, ForumListSerializer, ForumDetailSerializer
 from .topic import TopicSerializer, TopicListSerializer, TopicDetailSerializer, TopicCreateSerializer
 from .post import PostSerializer, PostListSerializer, PostDetailSerializer, PostCreateSerializer, PostUpdateSerializer
@@ -9,6 +9,8 @@ from .post import PostSerializer, PostListSerializer, PostDetailSerializer, Post
 __all__ = [
     'UserSerializer',
     'UserProfileSerializer',
+    'AuthorSerializer',
+    'AuthorListSerializer',
     'ForumSerializer',
     'ForumListSerializer',
     'ForumDetailSerializer',
@@ -3,7 +3,23 @@ Post serializers for post list, detail, and create operations.
 """
 from rest_framework import serializers
 from machina.apps.forum_conversation.models import Post
-from .user import UserSerializer
+from .user import AuthorListSerializer, AuthorSerializer, UserSerializer
+
+
+def _rendered(serializer, post):
+    """
+    Rendered HTML and excerpt of a post; those of all posts in a list are
+    fetched with one cache read.
+    """
+    from apps.api.services.container import container
+
+    rendered = serializer.context.get('rendered_posts')
+    if rendered is None or post.pk not in rendered:
+        parent = serializer.parent
+        posts = parent.instance if isinstance(parent, serializers.ListSerializer) and parent.instance else [post]
+        rendered = container.get_post_render_cache().get_many(posts)
+        serializer.context['rendered_posts'] = rendered
+    return rendered[post.pk]
 
 
 class PostSerializer(serializers.ModelSerializer):
@@ -24,8 +40,10 @@ class PostSerializer(serializers.ModelSerializer):
 
 
 class PostListSerializer(serializers.ModelSerializer):
-    """Serializer for post lists with user info."""
-    poster = UserSerializer(read_only=True)
+    """Serializer for post lists with author cards (batch-loaded per page)."""
+    poster = AuthorSerializer(read_only=True)
+    content_html = serializers.SerializerMethodField()
+    excerpt = serializers.SerializerMethodField()
     is_topic_head = serializers.SerializerMethodField()
     permissions = serializers.SerializerMethodField()
 
@@ -35,6 +53,8 @@ class PostListSerializer(serializers.ModelSerializer):
             'id',
             'poster',
             'content',
+            'content_html',
+            'excerpt',
             'created',
             'updated',
             'approved',
@@ -43,6 +63,15 @@ class PostListSerializer(serializers.ModelSerializer):
             'permissions',
         ]
         read_only_fields = ['id', 'created', 'updated', 'approved', 'position', 'is_topic_head']
+        list_serializer_class = AuthorListSerializer
+
+    def get_content_html(self, obj):
+        """Get the post's rendered, sanitized HTML."""
+        return _rendered(self, obj)['html']
+
+    def get_excerpt(self, obj):
+        """Get a plain-text excerpt of the post."""
+        return _rendered(self, obj)['excerpt']
 
     def get_is_topic_head(self, obj):
         """Check if this is the first post in the topic."""
@@ -73,7 +102,7 @@ class PostListSerializer(serializers.ModelSerializer):
 
 class PostDetailSerializer(serializers.ModelSerializer):
     """Detailed post serializer with all information."""
-    poster = UserSerializer(read_only=True)
+    poster = AuthorSerializer(read_only=True)
     topic_info = serializers.SerializerMethodField()
     permissions = serializers.SerializerMethodField()
     edit_history = serializers.SerializerMethodField()
@@ -208,14 +237,6 @@ class PostCreateSerializer(serializers.ModelSerializer):
         # Create post
         post = Post.objects.create(**validated_data)
 
-        # Update topic and forum trackers
-        topic.update_trackers()
-        topic.save(update_fields=['last_post', 'last_post_on'])
-
-        if topic.forum:
-            topic.forum.update_trackers()
-            topic.forum.save()
-
         # Add to review queue if needs approval
         if needs_approval:
             from apps.api.services.container import container
@@ -7,6 +7,22 @@ from .user import UserSerializer
 from .forum import ForumSerializer
 
 
+def _views_count(serializer, topic):
+    """
+    Stored plus pending views of a topic; pending views of all topics in a
+    list are fetched with one cache lookup.
+    """
+    from apps.api.services.container import container
+
+    pending = serializer.context.get('pending_views')
+    if pending is None or topic.pk not in pending:
+        parent = serializer.parent
+        topics = parent.instance if isinstance(parent, serializers.ListSerializer) and parent.instance else [topic]
+        pending = container.get_topic_view_counter().pending_many(t.pk for t in topics)
+        serializer.context['pending_views'] = pending
+    return topic.views_count + pending.get(topic.pk, 0)
+
+
 class TopicSerializer(serializers.ModelSerializer):
     """Basic topic serializer."""
     poster = UserSerializer(read_only=True)
@@ -39,6 +55,7 @@ class TopicListSerializer(serializers.ModelSerializer):
     """Serializer for topic lists with statistics."""
     poster = UserSerializer(read_only=True)
     last_post_info = serializers.SerializerMethodField()
+    views_count = serializers.SerializerMethodField()
     stats = serializers.SerializerMethodField()
     is_pinned = serializers.SerializerMethodField()
     is_locked = serializers.SerializerMethodField()
@@ -74,10 +91,14 @@ class TopicListSerializer(serializers.ModelSerializer):
             }
         return None
 
+    def get_views_count(self, obj):
+        """Get views including those not yet flushed."""
+        return _views_count(self, obj)
+
     def get_stats(self, obj):
         """Get topic statistics."""
         return {
-            'views': obj.views_count,
+            'views': _views_count(self, obj),
             'posts': obj.posts_count,
             'participants': self._get_participants_count(obj),
         }
@@ -102,6 +123,7 @@ class TopicDetailSerializer(serializers.ModelSerializer):
     """Detailed topic serializer with all fields and relationships."""
     poster = UserSerializer(read_only=True)
     forum = ForumSerializer(read_only=True)
+    views_count = serializers.SerializerMethodField()
     subscribers = serializers.SerializerMethodField()
     is_subscribed = serializers.SerializerMethodField()
     permissions = serializers.SerializerMethodField()
@@ -130,6 +152,10 @@ class TopicDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    def get_views_count(self, obj):
+        """Get views including those not yet flushed."""
+        return _views_count(self, obj)
+
     def get_subscribers(self, obj):
         """Get count of users subscribed to this topic."""
         return obj.subscribers.count()
@@ -299,8 +325,4 @@ class TopicCreateSerializer(serializers.ModelSerializer):
             approved=approved,
         )
 
-        # Update forum trackers
-        forum.update_trackers()
-        forum.save()
-
         return topic
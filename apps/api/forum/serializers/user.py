@@ -3,10 +3,20 @@ User serializers for forum API responses.
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import models
+from apps.api.utils.author_loader import AuthorLoader
 
 User = get_user_model()
 
 
+def _author_loader(serializer):
+    """The request's AuthorLoader (one per serializer context without a request)."""
+    request = serializer.context.get('request')
+    if request is None:
+        return serializer.context.setdefault('author_loader', AuthorLoader())
+    return AuthorLoader.for_request(request)
+
+
 class TrustLevelSerializer(serializers.Serializer):
     """Serializer for user trust level information."""
     level = serializers.IntegerField()
@@ -29,6 +39,9 @@ class UserSerializer(serializers.ModelSerializer):
 
     def get_trust_level(self, obj):
         """Get user's trust level information."""
+        loader = _author_loader(self)
+        if loader.is_known(obj.pk):
+            return loader.load(obj.pk)['trust_level']
         if hasattr(obj, 'trust_level'):
             return TrustLevelSerializer(obj.trust_level).data
         return {'level': 0, 'name': 'New User', 'can_moderate': False}
@@ -43,6 +56,57 @@ class UserSerializer(serializers.ModelSerializer):
         return None
 
 
+class AuthorSerializer(UserSerializer):
+    """
+    Author card for posts: the user plus points, top badges and post count.
+
+    Metadata comes from the request's AuthorLoader; serialize posts with
+    AuthorListSerializer so a whole page of authors is loaded at once.
+    """
+    trust_level = serializers.SerializerMethodField()
+    points = serializers.SerializerMethodField()
+    badges = serializers.SerializerMethodField()
+    posts_count = serializers.SerializerMethodField()
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['points', 'badges', 'posts_count']
+        read_only_fields = fields
+
+    def _card(self, obj):
+        return _author_loader(self).load(obj.pk)
+
+    def get_trust_level(self, obj):
+        """Get user's trust level information."""
+        return self._card(obj)['trust_level']
+
+    def get_points(self, obj):
+        """Get user's total points."""
+        return self._card(obj)['points']
+
+    def get_badges(self, obj):
+        """Get user's top badges, rarest first."""
+        return self._card(obj)['badges']
+
+    def get_posts_count(self, obj):
+        """Get user's approved post count."""
+        return self._card(obj)['posts_count']
+
+
+class AuthorListSerializer(serializers.ListSerializer):
+    """
+    List serializer that queues the posters of all items in the request's
+    AuthorLoader before serializing them, so their metadata is fetched in
+    one batch.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        _author_loader(self).prime(
+            getattr(item, 'poster_id', None) for item in items
+        )
+        return super().to_representation(items)
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """Detailed user profile serializer for profile pages."""
     trust_level = serializers.SerializerMethodField()
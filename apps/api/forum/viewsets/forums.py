@@ -7,6 +7,7 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework.response import Response
 from django.db.models import Count, Q, Case, When, IntegerField
 from machina.apps.forum.models import Forum
+from apps.api.pagination import InvalidCursor, keyset_requested, paginate_keyset
 from ..serializers import ForumListSerializer, ForumDetailSerializer
 
 
@@ -43,29 +44,26 @@ class ForumViewSet(viewsets.ReadOnlyModelViewSet):
 
         Returns forums grouped by their parent categories with statistics.
         """
-        # Get all categories
-        categories = Forum.objects.filter(type=Forum.FORUM_CAT).order_by('tree_id', 'lft')
+        from apps.api.services.container import container
+
+        # Categories, forums, latest posts and forum stats come from one cached snapshot
+        snapshot = container.get_forum_index().get()
 
         forums_data = []
-        for category in categories:
-            # Get child forums for this category
-            child_forums = category.get_children().filter(
-                type=Forum.FORUM_POST
-            ).select_related('customization')
-
-            if child_forums.exists():
-                category_data = {
-                    'id': category.id,
-                    'name': category.name,
-                    'slug': category.slug,
-                    'description': str(category.description) if category.description else '',
-                    'type': 'category',
-                    'forums': ForumListSerializer(child_forums, many=True, context={'request': request}).data
-                }
-                forums_data.append(category_data)
+        for category in snapshot['categories']:
+            forums = []
+            for forum in category['forums']:
+                last_post = forum['last_post']
+                if last_post and last_post['author'] and last_post['author']['avatar']:
+                    author = last_post['author']
+                    last_post = {
+                        **last_post,
+                        'author': {**author, 'avatar': request.build_absolute_uri(author['avatar'])},
+                    }
+                forums.append({**forum, 'last_post': last_post})
+            forums_data.append({**category, 'forums': forums})
 
         # Get overall forum statistics using DI container
-        from apps.api.services.container import container
         stats_service = container.get_statistics_service()
         overall_stats = stats_service.get_forum_statistics()
 
@@ -89,6 +87,9 @@ class ForumViewSet(viewsets.ReadOnlyModelViewSet):
         - page_size: Items per page (default: 20, max: 100)
         - sort: Sort by (activity, created, title, views)
         - pinned: Show only pinned topics (true/false)
+        - pagination: 'cursor' for keyset pagination, then
+          cursor (from next_cursor/previous_cursor) replaces page and
+          total=true adds a total_count
         """
         forum = self.get_object()
         from machina.apps.forum_conversation.models import Topic
@@ -126,15 +127,25 @@ class ForumViewSet(viewsets.ReadOnlyModelViewSet):
             )
         )
 
-        # Apply sorting (pinned topics always first)
+        # Apply sorting (pinned topics always first, ID breaks ties)
         if sort_by == 'created':
-            queryset = queryset.order_by('-pin_priority', '-created')
+            ordering = ('-pin_priority', '-created', '-id')
         elif sort_by == 'title':
-            queryset = queryset.order_by('-pin_priority', 'subject')
+            ordering = ('-pin_priority', 'subject', 'id')
         elif sort_by == 'views':
-            queryset = queryset.order_by('-pin_priority', '-views_count')
+            ordering = ('-pin_priority', '-views_count', '-id')
         else:  # activity (default)
-            queryset = queryset.order_by('-pin_priority', '-last_post_on')
+            ordering = ('-pin_priority', '-last_post_on', '-id')
+
+        if keyset_requested(request):
+            try:
+                page_topics, pagination = paginate_keyset(request, queryset, ordering)
+            except InvalidCursor as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = TopicListSerializer(page_topics, many=True, context={'request': request})
+            return Response({'results': serializer.data, 'pagination': pagination})
+
+        queryset = queryset.order_by(*ordering)
 
         # ✅ Get total count (single COUNT query, no data loaded)
         total_count = queryset.count()
@@ -264,23 +264,10 @@ class ModerationQueueViewSet(viewsets.ViewSet):
         review_trend = ((total_reviews - previous_total) / previous_total * 100) if previous_total > 0 else 0
         approval_trend = ((approved_count - previous_approved) / previous_approved * 100) if previous_approved > 0 else 0
 
-        # Calculate average response time (time from creation to review)
-        from django.db.models import Avg, F, ExpressionWrapper, fields
+        # Average response time (time from creation to review), from the daily rollups
+        from apps.forum_integration.moderation_rollups import ModerationRollups
 
-        avg_response_time_data = ReviewQueue.objects.filter(
-            status__in=['approved', 'rejected'],
-            resolved_at__isnull=False,
-            created_at__isnull=False
-        ).annotate(
-            response_duration=ExpressionWrapper(
-                F('resolved_at') - F('created_at'),
-                output_field=fields.DurationField()
-            )
-        ).aggregate(avg_time=Avg('response_duration'))
-
-        avg_response_seconds = None
-        if avg_response_time_data['avg_time']:
-            avg_response_seconds = avg_response_time_data['avg_time'].total_seconds()
+        avg_response_seconds = ModerationRollups.summary()['avg_resolution_seconds']
 
         # Get top moderators (users with most moderation actions in the period)
         top_moderators_data = ModerationLog.objects.filter(
@@ -5,6 +5,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from apps.api.throttle import PostVelocityThrottle
 from machina.apps.forum_conversation.models import Post
 from ..serializers import (
     PostListSerializer,
@@ -27,6 +28,12 @@ class PostViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'pk'
 
+    def get_throttles(self):
+        """Apply posting-velocity limits to creation only."""
+        if self.action == 'create':
+            return [PostVelocityThrottle()]
+        return super().get_throttles()
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'create':
@@ -107,18 +114,9 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        topic = post.topic
-        forum = topic.forum
+        # Topic and forum trackers are updated by Post.delete()
         post.delete()
 
-        # Update topic and forum trackers
-        topic.update_trackers()
-        topic.save()
-
-        if forum:
-            forum.update_trackers()
-            forum.save()
-
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=['post'])
@@ -5,6 +5,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from apps.api.throttle import TopicVelocityThrottle
+from apps.api.services.container import container
 from rest_framework.pagination import CursorPagination
 from django.shortcuts import get_object_or_404
 from machina.apps.forum_conversation.models import Topic, Post
@@ -46,6 +48,12 @@ class TopicViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'pk'
 
+    def get_throttles(self):
+        """Apply posting-velocity limits to creation only."""
+        if self.action == 'create':
+            return [TopicVelocityThrottle()]
+        return super().get_throttles()
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'create':
@@ -118,14 +126,9 @@ class TopicViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        forum = topic.forum
+        # Forum trackers are updated by Topic.delete()
         topic.delete()
 
-        # Update forum trackers
-        if forum:
-            forum.update_trackers()
-            forum.save()
-
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=['get'])
@@ -142,9 +145,9 @@ class TopicViewSet(viewsets.ModelViewSet):
         """
         topic = self.get_object()
 
-        # Increment view count
-        topic.views_count += 1
-        topic.save(update_fields=['views_count'])
+        # Count the view (buffered, once per viewer per window)
+        view_counter = container.get_topic_view_counter()
+        view_counter.record_view(topic.pk, view_counter.viewer_key(request))
 
         # Get posts with optimized query
         posts_queryset = Post.objects.filter(
@@ -7,9 +7,12 @@ from django.conf import settings
 from django.utils import timezone
 from django_ratelimit.decorators import ratelimit
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from .pagination import InvalidCursor, keyset_requested, paginate_keyset
+from .utils.author_loader import AuthorLoader
+from .throttle import PostVelocityThrottle, TopicVelocityThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -20,72 +23,30 @@ logger = logging.getLogger(__name__)
 def forum_list(request):
     """Get forum data for React frontend."""
     try:
-        from machina.apps.forum.models import Forum
-        from machina.apps.forum_conversation.models import Topic
-        from django.contrib.auth import get_user_model
         from apps.api.services.container import container
 
-        User = get_user_model()
         stats_service = container.get_statistics_service()
 
-        # Get forum categories and their children
-        forum_categories = Forum.objects.filter(type=Forum.FORUM_CAT)
+        # Categories, forums, latest posts and forum stats come from one cached snapshot
+        snapshot = container.get_forum_index().get()
 
         forums_data = []
-        for category in forum_categories:
-            category_data = {
-                'id': category.id,
-                'name': category.name,
-                'slug': category.slug,
-                'description': str(category.description) if category.description else '',
-                'type': 'category',
-                'forums': []
-            }
-
-            # Get child forums
-            for forum in category.get_children():
-                if forum.type == Forum.FORUM_POST:
-                    # Get latest topic for this forum
-                    latest_topic = Topic.objects.filter(
-                        forum=forum, approved=True
-                    ).select_related('poster', 'last_post', 'last_post__poster').order_by('-last_post_on').first()
-
-                    last_post_data = None
-                    if latest_topic and latest_topic.last_post:
-                        last_post_data = {
-                            'id': latest_topic.last_post.id,
-                            'title': latest_topic.subject,
-                            'author': {
-                                'username': latest_topic.last_post.poster.username,
-                                'avatar': None,
-                                'trust_level': 1
-                            },
-                            'created_at': latest_topic.last_post_on.isoformat() if latest_topic.last_post_on else None
+        for category in snapshot['categories']:
+            forums = []
+            for forum in category['forums']:
+                last_post = forum['last_post']
+                if last_post and last_post['author']:
+                    author = last_post['author']
+                    last_post = {
+                        **last_post,
+                        'author': {
+                            'username': author['username'],
+                            'avatar': request.build_absolute_uri(author['avatar']) if author['avatar'] else None,
+                            'trust_level': author['trust_level']['level']
                         }
-
-                    # Get real statistics for this forum
-                    forum_stats = stats_service.get_forum_specific_stats(forum.id)
-
-                    forum_data = {
-                        'id': forum.id,
-                        'name': forum.name,
-                        'slug': forum.slug,
-                        'description': str(forum.description) if forum.description else '',
-                        'icon': '💬',
-                        'topics_count': forum.direct_topics_count,
-                        'posts_count': forum.direct_posts_count,
-                        'last_post': last_post_data,
-                        'stats': {
-                            'online_users': forum_stats['online_users'],
-                            'weekly_posts': forum_stats['weekly_posts'],
-                            'trending': forum_stats['trending']
-                        },
-                        'color': 'bg-blue-500'
                     }
-                    category_data['forums'].append(forum_data)
-
-            if category_data['forums']:  # Only include categories that have forums
-                forums_data.append(category_data)
+                forums.append({**forum, 'last_post': last_post})
+            forums_data.append({**category, 'forums': forums})
 
         # Get overall stats using the statistics service
         overall_stats = stats_service.get_forum_statistics()
@@ -112,6 +73,7 @@ def forum_topic_detail(request, forum_slug, forum_id, topic_slug, topic_id):
     """Get topic detail with posts for React frontend (paginated)."""
     try:
         from machina.apps.forum_conversation.models import Topic, Post
+        from apps.api.services.container import container
 
         # Get the topic
         topic = Topic.objects.select_related('poster', 'forum').get(
@@ -144,14 +106,19 @@ def forum_topic_detail(request, forum_slug, forum_id, topic_slug, topic_id):
             page = (total_count - 1) // page_size + 1
             start = (page - 1) * page_size
         end = start + page_size
-        posts = posts_qs[start:end]
+        posts = list(posts_qs[start:end])
+        rendered = container.get_post_render_cache().get_many(posts)
+        authors = AuthorLoader.for_request(request).load_many({post.poster_id for post in posts})
 
         # Serialize posts
         posts_data = []
         for idx, post in enumerate(posts):
+            author = authors[post.poster_id]
             posts_data.append({
                 'id': post.id,
                 'content': str(post.content),
+                'content_html': rendered[post.id]['html'],
+                'excerpt': rendered[post.id]['excerpt'],
                 'created': post.created.isoformat(),
                 'updated': post.updated.isoformat() if post.updated else None,
                 'poster': {
@@ -159,7 +126,11 @@ def forum_topic_detail(request, forum_slug, forum_id, topic_slug, topic_id):
                     'username': post.poster.username,
                     'first_name': post.poster.first_name,
                     'last_name': post.poster.last_name,
-                    'avatar': None,
+                    'avatar': request.build_absolute_uri(post.poster.avatar.url) if post.poster.avatar else None,
+                    'trust_level': author['trust_level'],
+                    'points': author['points'],
+                    'badges': author['badges'],
+                    'posts_count': author['posts_count'],
                 },
                 'position': start + idx + 1,
             })
@@ -182,7 +153,7 @@ def forum_topic_detail(request, forum_slug, forum_id, topic_slug, topic_id):
             'created': topic.created.isoformat(),
             'updated': topic.updated.isoformat(),
             'posts_count': topic.posts_count,
-            'views_count': topic.views_count,
+            'views_count': container.get_topic_view_counter().views(topic),
             'poster': {
                 'id': topic.poster.id,
                 'username': topic.poster.username,
@@ -243,7 +214,10 @@ def forum_detail(request, forum_slug, forum_id):
             page = (total_count - 1) // page_size + 1
             start = (page - 1) * page_size
         end = start + page_size
-        topics = topics_qs[start:end]
+        topics = list(topics_qs[start:end])
+
+        from apps.api.services.container import container
+        views = container.get_topic_view_counter().views_many(topics)
 
         # Format topics data
         topics_data = []
@@ -265,7 +239,7 @@ def forum_detail(request, forum_slug, forum_id):
                 'slug': topic.slug,
                 'created': topic.created.isoformat(),
                 'posts_count': topic.posts_count,
-                'views_count': topic.views_count,
+                'views_count': views[topic.id],
                 'last_post_on': topic.last_post_on.isoformat() if topic.last_post_on else None,
                 'poster': {
                     'id': topic.poster.id,
@@ -308,6 +282,7 @@ def forum_detail(request, forum_slug, forum_id):
 # Forum Topic CRUD API Views
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([TopicVelocityThrottle])
 def topic_create(request):
     """Create a new forum topic."""
     try:
@@ -376,13 +351,14 @@ def topic_create(request):
         forum.refresh_from_db()
 
         # Return successful response
+        from apps.api.services.container import container
         topic_data = {
             'id': topic.id,
             'subject': topic.subject,
             'slug': topic.slug,
             'created': topic.created.isoformat(),
             'posts_count': topic.posts_count,
-            'views_count': getattr(topic, 'views_count', 0),
+            'views_count': container.get_topic_view_counter().views(topic),
             'forum': {
                 'id': forum.id,
                 'name': forum.name,
@@ -460,13 +436,14 @@ def topic_edit(request, topic_id):
             post = form.save()
             updated_topic = post.topic
 
+            from apps.api.services.container import container
             topic_data = {
                 'id': updated_topic.id,
                 'subject': updated_topic.subject,
                 'slug': updated_topic.slug,
                 'updated': updated_topic.updated.isoformat(),
                 'posts_count': updated_topic.posts_count,
-                'views_count': updated_topic.views_count,
+                'views_count': container.get_topic_view_counter().views(updated_topic),
                 'forum': {
                     'id': updated_topic.forum.id,
                     'name': updated_topic.forum.name,
@@ -526,6 +503,7 @@ def topic_delete(request, topic_id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 @ratelimit(key='user', rate=settings.RATE_LIMIT_SETTINGS['FORUM_POSTS'], method='POST', block=True)
+@throttle_classes([PostVelocityThrottle])
 def post_create(request):
     """Create a new forum post (reply to a topic)."""
     try:
@@ -605,6 +583,7 @@ def post_create(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([PostVelocityThrottle])
 def post_reply(request, topic_id):
     """Create a reply post to a topic."""
     try:
@@ -874,6 +853,7 @@ def dashboard_forum_stats(request):
             })
 
         recent_topics_data = []
+        views = container.get_topic_view_counter().views_many(user_recent_topics)
         for topic in user_recent_topics:
             recent_topics_data.append({
                 'id': topic.id,
@@ -881,7 +861,7 @@ def dashboard_forum_stats(request):
                 'slug': topic.slug,
                 'created': topic.created.isoformat(),
                 'posts_count': topic.posts_count,
-                'views_count': topic.views_count,
+                'views_count': views[topic.id],
                 'forum': {
                     'id': topic.forum.id,
                     'name': topic.forum.name,
@@ -1005,6 +985,7 @@ def user_forum_profile(request, user_id):
 
         # Serialize recent topics
         recent_topics_data = []
+        views = container.get_topic_view_counter().views_many(recent_topics)
         for topic in recent_topics:
             recent_topics_data.append({
                 'id': topic.id,
@@ -1012,7 +993,7 @@ def user_forum_profile(request, user_id):
                 'slug': topic.slug,
                 'created': topic.created.isoformat(),
                 'posts_count': topic.posts_count,
-                'views_count': topic.views_count,
+                'views_count': views[topic.id],
                 'forum': {
                     'id': topic.forum.id,
                     'name': topic.forum.name,
@@ -1110,14 +1091,26 @@ def user_forum_posts(request, user_id):
             approved=True
         ).select_related('topic', 'topic__forum').order_by('-created')
 
-        # Pagination
-        total_count = posts_qs.count()
-        start = (page - 1) * page_size
-        if total_count and start >= total_count:
-            page = (total_count - 1) // page_size + 1
+        # Pagination (?pagination=cursor opts in to keyset pagination)
+        if keyset_requested(request):
+            posts, pagination = paginate_keyset(request, posts_qs, ('-created', '-id'))
+        else:
+            total_count = posts_qs.count()
             start = (page - 1) * page_size
-        end = start + page_size
-        posts = posts_qs[start:end]
+            if total_count and start >= total_count:
+                page = (total_count - 1) // page_size + 1
+                start = (page - 1) * page_size
+            end = start + page_size
+            posts = posts_qs[start:end]
+            total_pages = (total_count + page_size - 1) // page_size if page_size else 1
+            pagination = {
+                'current_page': page,
+                'page_size': page_size,
+                'total_count': total_count,
+                'total_pages': total_pages,
+                'has_next': page < total_pages,
+                'has_previous': page > 1
+            }
 
         # Serialize posts
         posts_data = []
@@ -1139,9 +1132,6 @@ def user_forum_posts(request, user_id):
                 }
             })
 
-        # Pagination info
-        total_pages = (total_count + page_size - 1) // page_size if page_size else 1
-
         return Response({
             'user': {
                 'id': user.id,
@@ -1149,16 +1139,11 @@ def user_forum_posts(request, user_id):
                 'full_name': user.get_full_name() or user.username
             },
             'posts': posts_data,
-            'pagination': {
-                'current_page': page,
-                'page_size': page_size,
-                'total_count': total_count,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_previous': page > 1
-            }
+            'pagination': pagination
         })
 
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.error(f"Error fetching user posts: {str(e)}")
         return Response({
@@ -1200,17 +1185,31 @@ def user_forum_topics(request, user_id):
             approved=True
         ).select_related('forum', 'last_post', 'last_post__poster').order_by('-created')
 
-        # Pagination
-        total_count = topics_qs.count()
-        start = (page - 1) * page_size
-        if total_count and start >= total_count:
-            page = (total_count - 1) // page_size + 1
+        # Pagination (?pagination=cursor opts in to keyset pagination)
+        if keyset_requested(request):
+            topics, pagination = paginate_keyset(request, topics_qs, ('-created', '-id'))
+        else:
+            total_count = topics_qs.count()
             start = (page - 1) * page_size
-        end = start + page_size
-        topics = topics_qs[start:end]
+            if total_count and start >= total_count:
+                page = (total_count - 1) // page_size + 1
+                start = (page - 1) * page_size
+            end = start + page_size
+            topics = topics_qs[start:end]
+            total_pages = (total_count + page_size - 1) // page_size if page_size else 1
+            pagination = {
+                'current_page': page,
+                'page_size': page_size,
+                'total_count': total_count,
+                'total_pages': total_pages,
+                'has_next': page < total_pages,
+                'has_previous': page > 1
+            }
 
         # Serialize topics
+        from apps.api.services.container import container
         topics_data = []
+        views = container.get_topic_view_counter().views_many(topics)
         for topic in topics:
             last_post_data = None
             if topic.last_post and topic.last_post.poster:
@@ -1229,7 +1228,7 @@ def user_forum_topics(request, user_id):
                 'created': topic.created.isoformat(),
                 'updated': topic.updated.isoformat(),
                 'posts_count': topic.posts_count,
-                'views_count': topic.views_count,
+                'views_count': views[topic.id],
                 'forum': {
                     'id': topic.forum.id,
                     'name': topic.forum.name,
@@ -1238,9 +1237,6 @@ def user_forum_topics(request, user_id):
                 'last_post': last_post_data
             })
 
-        # Pagination info
-        total_pages = (total_count + page_size - 1) // page_size if page_size else 1
-
         return Response({
             'user': {
                 'id': user.id,
@@ -1248,16 +1244,11 @@ def user_forum_topics(request, user_id):
                 'full_name': user.get_full_name() or user.username
             },
             'topics': topics_data,
-            'pagination': {
-                'current_page': page,
-                'page_size': page_size,
-                'total_count': total_count,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_previous': page > 1
-            }
+            'pagination': pagination
         })
 
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.error(f"Error fetching user topics: {str(e)}")
         return Response({
@@ -1292,7 +1283,9 @@ def user_topic_subscriptions(request, user_id):
         ).select_related('forum').order_by('-created')
 
         # Serialize subscriptions
+        from apps.api.services.container import container
         subscriptions_data = []
+        views = container.get_topic_view_counter().views_many(subscribed_topics)
         for topic in subscribed_topics:
             subscriptions_data.append({
                 'topic': {
@@ -1300,7 +1293,7 @@ def user_topic_subscriptions(request, user_id):
                     'subject': topic.subject,
                     'slug': topic.slug,
                     'posts_count': topic.posts_count,
-                    'views_count': topic.views_count
+                    'views_count': views[topic.id]
                 },
                 'forum': {
                     'id': topic.forum.id,
@@ -1407,6 +1400,40 @@ def topic_unsubscribe(request, topic_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@ratelimit(key='user', rate=settings.RATE_LIMIT_SETTINGS['API_CALLS'], method='POST', block=True)
+def reading_batch(request):
+    """
+    Ingest a batch of read receipts.
+
+    Body: {"events": [[topic_id, first_post_id, last_post_id, dwell_ms, scroll_depth], ...]}
+
+    Replaces one request per post read with a single request per flush from
+    the client; posts already credited to the user are ignored.
+    """
+    try:
+        from apps.forum_integration.middleware import ForumActivityTracker
+
+        try:
+            summary = ForumActivityTracker.track_reading_batch(
+                request.user, request.data.get('events', [])
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            **summary,
+        })
+
+    except Exception as e:
+        logger.error(f"Error ingesting reading batch: {str(e)}")
+        return Response({
+            'error': f'Failed to record reading progress: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 # Forum Search API
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -1442,6 +1469,9 @@ def forum_search(request):
             page_size = 20
         page = max(page, 1)
         page_size = max(1, min(page_size, 100))
+        # ?pagination=cursor pages topics and posts separately with
+        # topics_cursor and posts_cursor
+        keyset = keyset_requested(request)
 
         results = {
             'query': query,
@@ -1461,12 +1491,20 @@ def forum_search(request):
                 topics_qs = topics_qs.filter(forum_id=forum_id)
 
             # Pagination for topics
-            total_topics = topics_qs.count()
-            start = (page - 1) * page_size
-            end = start + page_size
-            topics = topics_qs[start:end]
-
+            if keyset:
+                topics, results['pagination']['topics'] = paginate_keyset(
+                    request, topics_qs, ('-created', '-id'), cursor_param='topics_cursor'
+                )
+                total_topics = results['pagination']['topics'].get('total_count')
+            else:
+                total_topics = topics_qs.count()
+                start = (page - 1) * page_size
+                end = start + page_size
+                topics = topics_qs[start:end]
+
+            from apps.api.services.container import container
             topics_data = []
+            views = container.get_topic_view_counter().views_many(topics)
             for topic in topics:
                 topics_data.append({
                     'id': topic.id,
@@ -1474,7 +1512,7 @@ def forum_search(request):
                     'slug': topic.slug,
                     'created': topic.created.isoformat(),
                     'posts_count': topic.posts_count,
-                    'views_count': topic.views_count,
+                    'views_count': views[topic.id],
                     'poster': {
                         'username': topic.poster.username
                     },
@@ -1486,7 +1524,8 @@ def forum_search(request):
                 })
 
             results['topics'] = topics_data
-            results['topics_count'] = total_topics
+            if total_topics is not None:
+                results['topics_count'] = total_topics
 
         # Search posts
         if search_type in ['all', 'posts']:
@@ -1499,10 +1538,16 @@ def forum_search(request):
                 posts_qs = posts_qs.filter(topic__forum_id=forum_id)
 
             # Pagination for posts
-            total_posts = posts_qs.count()
-            start = (page - 1) * page_size
-            end = start + page_size
-            posts = posts_qs[start:end]
+            if keyset:
+                posts, results['pagination']['posts'] = paginate_keyset(
+                    request, posts_qs, ('-created', '-id'), cursor_param='posts_cursor'
+                )
+                total_posts = results['pagination']['posts'].get('total_count')
+            else:
+                total_posts = posts_qs.count()
+                start = (page - 1) * page_size
+                end = start + page_size
+                posts = posts_qs[start:end]
 
             posts_data = []
             for post in posts:
@@ -1542,7 +1587,11 @@ def forum_search(request):
                 })
 
             results['posts'] = posts_data
-            results['posts_count'] = total_posts
+            if total_posts is not None:
+                results['posts_count'] = total_posts
+
+        if keyset:
+            return Response(results)
 
         # Overall pagination
         total_results = results.get('topics_count', 0) + results.get('posts_count', 0)
@@ -1559,6 +1608,8 @@ def forum_search(request):
 
         return Response(results)
 
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.error(f"Error searching forums: {str(e)}")
         return Response({
@@ -2007,7 +2058,7 @@ def moderation_queue(request):
         queue_items = ReviewQueue.objects.select_related(
             'post__topic__forum', 'topic__forum', 'topic__poster',
             'reported_user', 'reporter', 'assigned_moderator'
-        ).order_by('-priority', '-created_at')
+        ).by_urgency()
 
         # Apply filters
         if status_filter == 'pending':
@@ -2196,6 +2247,60 @@ def moderation_review(request, item_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def moderation_bulk_review(request):
+    """
+    Approve, reject or escalate many moderation queue items at once.
+
+    Body: {"item_ids": [...], "action": "approve" | "reject" | "escalate", "notes": "..."}
+    Applied in one transaction; the response lists the result of every item.
+    """
+    try:
+        if not _check_moderation_permission(request.user):
+            return Response({
+                'error': 'You do not have permission to review moderation items'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        item_ids = request.data.get('item_ids')
+        action = request.data.get('action')
+        notes = request.data.get('notes', '')
+
+        if not isinstance(item_ids, list) or not item_ids:
+            return Response({'error': 'item_ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            item_ids = [int(item_id) for item_id in item_ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'item_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        from apps.api.services.container import container
+
+        review_service = container.get_review_queue_service()
+        try:
+            result = review_service.bulk_review(
+                item_ids=item_ids,
+                reviewer=request.user,
+                action=action,
+                notes=notes,
+                ip_address=request.META.get('REMOTE_ADDR'),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(
+            f"{result['updated']} queue items {review_service.BULK_REVIEW_ACTIONS[action]} "
+            f"in bulk by {request.user.username}"
+        )
+
+        return Response({'success': True, **result})
+
+    except Exception as e:
+        logger.error(f"Error bulk reviewing queue items: {str(e)}")
+        return Response({
+            'error': f'Failed to review items: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def moderation_stats(request):
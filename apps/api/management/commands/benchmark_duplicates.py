@@ -0,0 +1,105 @@
+"""
+Benchmark duplicate detection: pairwise scan of recent posts vs. MinHash/LSH index.
+
+Recall is measured against exact shingle Jaccard similarity computed over
+the whole corpus, so it also shows what the scoped pairwise scan misses.
+"""
+
+import random
+import time
+from django.core.management.base import BaseCommand
+from machina.apps.forum_conversation.models import Post
+from apps.api.services.container import container
+from apps.forum_integration.utils import minhash
+
+
+class Command(BaseCommand):
+    help = 'Compare recall and latency of pairwise and LSH duplicate detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sample',
+            type=int,
+            default=200,
+            help='Number of posts to check (default: 200)',
+        )
+        parser.add_argument(
+            '--corpus',
+            type=int,
+            default=5000,
+            help='Most recent posts used to compute ground truth (default: 5000)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for the sample',
+        )
+
+    def handle(self, *args, **options):
+        review_service = container.get_review_queue_service()
+        index = container.get_near_duplicate_index()
+        threshold = index.SIMILARITY_THRESHOLD
+
+        corpus = [
+            post for post in Post.objects.order_by('-pk').only(
+                'id', 'content', 'poster_id', 'topic_id', 'created'
+            )[:options['corpus']]
+            if len(index.post_text(post)) >= index.MIN_CONTENT_LENGTH
+        ]
+        if not corpus:
+            self.stdout.write(self.style.WARNING('No posts long enough to check'))
+            return
+
+        shingled = {post.pk: minhash.shingles(index.post_text(post)) for post in corpus}
+        sample = random.Random(options['seed']).sample(corpus, min(options['sample'], len(corpus)))
+
+        results = {'scan': [0, 0, []], 'lsh': [0, 0, []]}  # hits, flagged, times
+        truth_count = 0
+
+        for post in sample:
+            text = index.post_text(post)
+            own = shingled[post.pk]
+            truth = any(
+                len(own & other) / len(own | other) >= threshold
+                for post_id, other in shingled.items()
+                if post_id != post.pk
+            )
+            truth_count += truth
+
+            start = time.perf_counter()
+            found = review_service.scan_recent_duplicates(post, text)
+            results['scan'][2].append(time.perf_counter() - start)
+            results['scan'][0] += truth and found
+            results['scan'][1] += found
+
+            start = time.perf_counter()
+            scores = index.candidates(minhash.signature(text), exclude_post_id=post.pk)
+            found = any(score >= threshold for score in scores.values())
+            results['lsh'][2].append(time.perf_counter() - start)
+            results['lsh'][0] += truth and found
+            results['lsh'][1] += found
+
+        self.stdout.write(
+            f'Checked {len(sample)} posts against {len(corpus)} '
+            f'({truth_count} true duplicates at Jaccard >= {threshold})\n'
+        )
+        header = (
+            f"{'Method':<8} "
+            f"{'Recall':>8} "
+            f"{'Flagged':>8} "
+            f"{'Avg (ms)':>10} "
+            f"{'P95 (ms)':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for method, (hits, flagged, times) in results.items():
+            times.sort()
+            recall = hits / truth_count if truth_count else 1.0
+            self.stdout.write(
+                f'{method:<8} '
+                f'{recall:>8.1%} '
+                f'{flagged:>8} '
+                f'{sum(times) / len(times) * 1000:>10.2f} '
+                f'{times[int(len(times) * 0.95)] * 1000:>10.2f}'
+            )
@@ -0,0 +1,163 @@
+"""
+Micro-benchmark of HTML sanitization over lesson and forum content.
+
+Compares the sanitizers used before HtmlSanitizer (bleach.clean for rich
+text; a BeautifulSoup pre-pass, bleach.clean and a BeautifulSoup iframe pass
+for embed code) with the single-pass sanitizer, uncached and with a warm
+result cache, and checks that rich text is sanitized identically.
+"""
+
+import time
+from urllib.parse import urlparse
+import bleach
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+from machina.apps.forum_conversation.models import Post
+from wagtail.fields import StreamField
+from wagtail.models import Page
+from apps.api.content_serializers import common
+from apps.api.services.html_sanitizer import HtmlSanitizer
+from apps.forum_integration.utils import sanitization
+
+# Block types and struct keys serialize_streamfield sanitizes as rich text
+RICH_TEXT_BLOCKS = {'paragraph', 'text', 'embed'}
+RICH_TEXT_KEYS = {'explanation', 'instructions', 'description', 'text'}
+
+
+def legacy_rich_text(html):
+    """Reference implementation: bleach.clean per call."""
+    return bleach.clean(
+        html,
+        tags=common.ALLOWED_TAGS,
+        attributes=common.ALLOWED_ATTRIBUTES,
+        protocols=common.ALLOWED_PROTOCOLS,
+        strip=False,
+    )
+
+
+def legacy_embed(html):
+    """Reference implementation: three parses per call."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup.find_all(['script', 'style', 'noscript']):
+        tag.decompose()
+    clean_html = bleach.clean(
+        str(soup),
+        tags=sanitization.ALLOWED_TAGS,
+        attributes=sanitization.ALLOWED_ATTRIBUTES,
+        protocols=sanitization.ALLOWED_PROTOCOLS,
+        strip=True,
+        css_sanitizer=sanitization.css_sanitizer,
+    )
+    soup = BeautifulSoup(clean_html, 'html.parser')
+    for iframe in soup.find_all('iframe'):
+        domain = urlparse(iframe.get('src', '')).netloc.lower()
+        if not any(domain == allowed or domain.endswith('.' + allowed)
+                   for allowed in sanitization.ALLOWED_IFRAME_DOMAINS):
+            iframe.decompose()
+    return str(soup)
+
+
+def rich_text_values(raw_data):
+    """Rich-text strings of a StreamField's raw block data."""
+    for block in raw_data or []:
+        value = block.get('value')
+        if block.get('type') in RICH_TEXT_BLOCKS and isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key in RICH_TEXT_KEYS and isinstance(item, str):
+                    yield item
+
+
+class Command(BaseCommand):
+    help = 'Benchmark legacy and single-pass HTML sanitization over lesson and forum content'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help='Number of pages and of recent posts in the corpus (default: 500)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Passes over the corpus per sanitizer (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        lesson_texts = []
+        for page in Page.objects.live().specific()[:limit]:
+            for field in page._meta.get_fields():
+                if isinstance(field, StreamField):
+                    stream = getattr(page, field.name, None)
+                    lesson_texts.extend(rich_text_values(getattr(stream, 'raw_data', None)))
+        forum_texts = [
+            str(content)
+            for content in Post.objects.order_by('-pk').values_list('content', flat=True)[:limit]
+            if content
+        ]
+        if not lesson_texts and not forum_texts:
+            self.stdout.write(self.style.WARNING('No content to sanitize'))
+            return
+
+        iterations = options['iterations']
+        corpora = (
+            ('lessons', lesson_texts, legacy_rich_text, common.RICH_TEXT_POLICY),
+            ('forum', forum_texts, legacy_embed, sanitization.EMBED_POLICY),
+        )
+
+        header = (
+            f"{'Corpus':<8} "
+            f"{'Sanitizer':<12} "
+            f"{'Best (ms)':>10} "
+            f"{'Avg (ms)':>10} "
+            f"{'Per item (us)':>14}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        mismatches = 0
+        for corpus, texts, legacy, policy in corpora:
+            if not texts:
+                continue
+            uncached = HtmlSanitizer()
+            cached = HtmlSanitizer(local_cache_size=len(texts))
+            cached.sanitize_many(texts, policy)
+
+            sanitizers = (
+                ('legacy', lambda: [legacy(text) for text in texts]),
+                ('single-pass', lambda: [uncached.clean(text, policy) for text in texts]),
+                ('cached', lambda: cached.sanitize_many(texts, policy)),
+            )
+            outputs = {}
+            for name, run in sanitizers:
+                times = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    outputs[name] = run()
+                    times.append(time.perf_counter() - start)
+                best = min(times)
+                self.stdout.write(
+                    f'{corpus:<8} '
+                    f'{name:<12} '
+                    f'{best * 1000:>10.2f} '
+                    f'{sum(times) / len(times) * 1000:>10.2f} '
+                    f'{best / len(texts) * 1e6:>14.2f}'
+                )
+
+            # Embed output differs from the BeautifulSoup serialization in
+            # attribute order and void-tag syntax, so only rich text is compared
+            if corpus == 'lessons':
+                mismatches += sum(
+                    1 for old, new in zip(outputs['legacy'], outputs['single-pass']) if old != new
+                )
+
+        self.stdout.write(f'\nSanitized {len(lesson_texts)} lesson fields and {len(forum_texts)} posts '
+                          f'x {iterations} iterations')
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'{mismatches} rich-text fields sanitized differently'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Rich text output matches'))
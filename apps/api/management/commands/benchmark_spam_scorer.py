@@ -0,0 +1,114 @@
+"""
+Micro-benchmark of spam scoring over a corpus of real posts.
+
+Compares the per-pattern ``re.search`` scoring the review queue used before
+the compiled SpamScorer with the compiled single-pass scorer, and checks that
+both give the same scores.
+"""
+
+import re
+import time
+from django.core.management.base import BaseCommand
+from machina.apps.forum_conversation.models import Post
+from apps.api.services.container import container
+
+
+def legacy_content_score(content, spam_patterns, link_patterns):
+    """Reference implementation: one re.search per pattern, two character passes."""
+    score = 0.0
+
+    pattern_matches = sum(1 for pattern in spam_patterns if re.search(pattern, content))
+    if pattern_matches > 0:
+        score += min(0.3 + (pattern_matches * 0.2), 0.8)
+
+    link_matches = sum(1 for pattern in link_patterns if re.search(pattern, content))
+    if link_matches > 0:
+        score += min(0.2 + (link_matches * 0.15), 0.5)
+
+    if content:
+        caps_ratio = sum(1 for c in content if c.isupper()) / len(content)
+        if caps_ratio > 0.5 and len(content) > 20:
+            score += 0.3
+
+        punct_ratio = sum(1 for c in content if c in '!?') / max(len(content), 1)
+        if punct_ratio > 0.1:
+            score += 0.2
+
+    if content and len(content.strip()) < 50 and re.search(r'http', content):
+        score += 0.4
+
+    return min(score, 1.0)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark legacy and compiled spam scoring over recent posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=2000,
+            help='Number of recent posts in the corpus (default: 2000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Passes over the corpus per scorer (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        service = container.get_review_queue_service()
+        texts = [
+            str(content) if content else ''
+            for content in Post.objects.order_by('-pk').values_list('content', flat=True)[:options['limit']]
+        ]
+        if not texts:
+            self.stdout.write(self.style.WARNING('No posts to score'))
+            return
+
+        iterations = options['iterations']
+        spam_patterns = service.SPAM_PATTERNS
+        link_patterns = service.SUSPICIOUS_LINK_PATTERNS
+
+        def run_legacy():
+            return [legacy_content_score(text, spam_patterns, link_patterns) for text in texts]
+
+        def run_compiled():
+            return service.score_many(texts)
+
+        results = []
+        scores = {}
+        for name, scorer in (('legacy', run_legacy), ('compiled', run_compiled)):
+            times = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                scores[name] = scorer()
+                times.append(time.perf_counter() - start)
+            results.append((name, min(times), sum(times) / len(times)))
+
+        self.stdout.write(f'Scored {len(texts)} posts x {iterations} iterations\n')
+        header = (
+            f"{'Scorer':<10} "
+            f"{'Best (ms)':>10} "
+            f"{'Avg (ms)':>10} "
+            f"{'Per post (us)':>14}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, best, avg in results:
+            self.stdout.write(
+                f'{name:<10} '
+                f'{best * 1000:>10.2f} '
+                f'{avg * 1000:>10.2f} '
+                f'{best / len(texts) * 1e6:>14.2f}'
+            )
+
+        mismatches = sum(
+            1 for legacy, compiled in zip(scores['legacy'], scores['compiled'])
+            if abs(legacy - compiled) > 1e-9
+        )
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'{mismatches} posts scored differently'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Scores match'))
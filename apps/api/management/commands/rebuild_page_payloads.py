@@ -0,0 +1,46 @@
+"""
+Management command to rebuild precomputed page API payloads.
+
+Run after deploying pages with ApiPayloadMixin to backfill existing pages,
+or after bumping PAYLOAD_VERSION. Pages are updated directly, without
+saving them, so no revisions are created and page save hooks don't run.
+"""
+
+import time
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from apps.api.content_serializers.payloads import PAYLOAD_SERIALIZERS, build_payload, is_current
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored StreamField API payloads of Wagtail pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild payloads that are already current',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Pages loaded per query',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rebuilt = 0
+        for label in PAYLOAD_SERIALIZERS:
+            model = apps.get_model(label)
+            for page in model.objects.order_by('pk').iterator(chunk_size=options['chunk_size']):
+                if not options['force'] and is_current(page):
+                    continue
+                model.objects.filter(pk=page.pk).update(api_payload=build_payload(page))
+                rebuilt += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rebuilt {rebuilt} page payloads in {time.monotonic() - started:.1f}s'
+            )
+        )
@@ -1,5 +1,25 @@
+import hashlib
+import logging
+from collections import namedtuple
+from datetime import date, datetime
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import F, Q, QuerySet
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+logger = logging.getLogger(__name__)
+
+COUNT_DEFAULTS = {
+    'EXACT_THRESHOLD': 1000,  # rows counted exactly
+    'CACHE_TTL': 60,  # seconds a count of a larger filtered list is reused
+}
+COUNT_CACHE_PREFIX = 'v1:paginator_count'
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     """Standard pagination for all API lists.
@@ -9,3 +29,321 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+def _planner_estimate(queryset):
+    """Row estimate of an unfiltered queryset's table from pg_class.reltuples, or None."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+    except DatabaseError as e:
+        logger.warning(f"Planner estimate failed for {queryset.model._meta.db_table}: {e}")
+        return None
+    # -1 until the table is first analyzed
+    return row[0] if row and row[0] >= 0 else None
+
+
+def count_rows(queryset):
+    """
+    Count rows for a paginator without COUNT(*) over large tables.
+
+    - Up to EXACT_THRESHOLD rows: counted exactly (the count stops there)
+    - Larger and unfiltered: the planner's estimate, on PostgreSQL
+    - Larger and filtered: counted once and cached for CACHE_TTL seconds,
+      keyed by a hash of the query
+
+    Settings come from settings.FORUM_PAGINATION_COUNTS (see COUNT_DEFAULTS).
+
+    Returns:
+        (count, exact) - exact is False for estimates and cached counts
+    """
+    if not isinstance(queryset, QuerySet):
+        return len(queryset), True
+    options = {**COUNT_DEFAULTS, **getattr(settings, 'FORUM_PAGINATION_COUNTS', {})}
+    threshold = options['EXACT_THRESHOLD']
+
+    counted = queryset.order_by()[:threshold + 1].count()
+    if counted <= threshold:
+        return counted, True
+
+    query = queryset.query
+    if not query.where and not query.distinct and not query.combinator:
+        estimate = _planner_estimate(queryset)
+        if estimate is not None:
+            return max(estimate, counted), False
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = f"{COUNT_CACHE_PREFIX}:{hashlib.sha1(repr((queryset.db, sql, params)).encode()).hexdigest()}"
+    count = cache.get(key)
+    if count is not None:
+        return count, False
+    count = queryset.count()
+    cache.set(key, count, options['CACHE_TTL'])
+    return count, True
+
+
+class ProbedPage(Page):
+    """Page whose has_next() comes from fetching one row past it."""
+
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Django paginator whose total comes from count_rows().
+
+    count_is_exact says whether `count` is exact or an estimate/cached count.
+    Inexact totals are only displayed: pages are then validated by fetching
+    page_size + 1 rows, which also decides has_next(), and `count` is raised
+    to at least the rows seen.
+    """
+
+    @cached_property
+    def _counted(self):
+        return count_rows(self.object_list)
+
+    @cached_property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def count_is_exact(self):
+        return self._counted[1]
+
+    def validate_number(self, number):
+        if self.count_is_exact:
+            return super().validate_number(number)
+        # Same checks without the upper bound from the inexact total
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if self.count_is_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage(self.error_messages['no_results'])
+        self.count = max(self.count, bottom + len(rows))
+        self.__dict__.pop('num_pages', None)
+        return ProbedPage(rows[:self.per_page], number, self, more=len(rows) > self.per_page)
+
+
+class InvalidCursor(ValueError):
+    """A cursor was tampered with or was issued for another ordering."""
+
+
+SortKey = namedtuple('SortKey', 'name attname descending nullable field')
+
+
+class KeysetPaginator:
+    """
+    Keyset (seek) pagination over a composite sort key.
+
+    Pages are fetched with a WHERE on the sort key of the last row seen
+    instead of OFFSET, so every page costs the same however deep it is.
+    The ordering must end in a unique column (the primary key is appended
+    if it does not), e.g. ('-last_post_on', '-id') or ('created', 'id').
+    Nullable keys sort last. Cursors are opaque, signed, and only valid
+    for the ordering that issued them.
+
+    Totals are optional and come from count_rows(); total_is_exact says
+    whether total_count is exact.
+
+    Usage:
+        paginator = KeysetPaginator(Topic.objects.filter(...), ('-last_post_on', '-id'))
+        page = paginator.paginate(cursor=request.GET.get('cursor'))
+        page['results'], page['next_cursor'], page['previous_cursor']
+    """
+
+    def __init__(self, queryset, ordering, page_size=20):
+        """
+        Args:
+            queryset: QuerySet to paginate (its own ordering is replaced)
+            ordering: Field or annotation names, '-' prefix for descending
+            page_size: Rows per page
+        """
+        self.queryset = queryset
+        self.model = queryset.model
+        self.page_size = page_size
+        self.keys = [self._sort_key(name) for name in ordering]
+        if not self.keys or self.keys[-1].attname != self.model._meta.pk.attname:
+            descending = self.keys[-1].descending if self.keys else False
+            self.keys.append(self._sort_key(('-' if descending else '') + self.model._meta.pk.name))
+        self.salt = f"apps.api.pagination.keyset:{self.model._meta.label}:{','.join(self.ordering)}"
+
+    @property
+    def ordering(self):
+        return [('-' if key.descending else '') + key.name for key in self.keys]
+
+    def _sort_key(self, name):
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        try:
+            field = self.model._meta.pk if name == 'pk' else self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # An annotation of the queryset
+            return SortKey(name, name, descending, False, None)
+        return SortKey(field.attname, field.attname, descending, field.null, field)
+
+    def encode_cursor(self, obj, direction):
+        """
+        Build a signed cursor pointing at obj.
+
+        Args:
+            obj: Row the cursor points at
+            direction: 'n' for rows after obj, 'p' for rows before it
+        """
+        values = []
+        for key in self.keys:
+            value = getattr(obj, key.attname)
+            values.append(value.isoformat() if isinstance(value, (date, datetime)) else value)
+        return signing.dumps([direction, values], salt=self.salt, compress=True)
+
+    def decode_cursor(self, cursor):
+        """
+        Returns:
+            (direction, sort key values)
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or not ours
+        """
+        try:
+            direction, values = signing.loads(cursor, salt=self.salt)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor('Invalid cursor')
+        if direction not in ('n', 'p') or len(values) != len(self.keys):
+            raise InvalidCursor('Invalid cursor')
+        return direction, [
+            key.field.to_python(value) if key.field is not None and value is not None else value
+            for key, value in zip(self.keys, values)
+        ]
+
+    def _order_by(self, backward):
+        # Walking backward reverses every key, so nulls come first
+        order = []
+        for key in self.keys:
+            nulls = {} if not key.nullable else {'nulls_first': True} if backward else {'nulls_last': True}
+            if key.descending != backward:
+                order.append(F(key.name).desc(**nulls))
+            else:
+                order.append(F(key.name).asc(**nulls))
+        return order
+
+    def _beyond(self, key, value, backward):
+        """Rows strictly past value on one key, in the walking direction."""
+        if not backward:
+            if value is None:
+                # Nulls sort last; nothing comes after them
+                return Q(pk__in=[])
+            condition = Q(**{f"{key.name}__{'lt' if key.descending else 'gt'}": value})
+            return condition | Q(**{f'{key.name}__isnull': True}) if key.nullable else condition
+        if value is None:
+            return Q(**{f'{key.name}__isnull': False})
+        return Q(**{f"{key.name}__{'gt' if key.descending else 'lt'}": value})
+
+    def _seek(self, values, backward):
+        condition = None
+        for key, value in reversed(list(zip(self.keys, values))):
+            beyond = self._beyond(key, value, backward)
+            if condition is None:
+                condition = beyond
+            else:
+                equal = Q(**{f'{key.name}__isnull': True}) if value is None else Q(**{key.name: value})
+                condition = beyond | (equal & condition)
+        return condition
+
+    def paginate(self, cursor=None, include_total=False):
+        """
+        Fetch one page.
+
+        Args:
+            cursor: Cursor from a previous page (None for the first page)
+            include_total: Also count the rows (see count_rows())
+
+        Returns:
+            Dict with 'results', 'page_size', 'next_cursor', 'previous_cursor',
+            'has_next', 'has_previous' and, with include_total, 'total_count'
+            and 'total_is_exact'
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or not ours
+        """
+        queryset = self.queryset
+        backward = False
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+            backward = direction == 'p'
+            queryset = queryset.filter(self._seek(values, backward))
+
+        results = list(queryset.order_by(*self._order_by(backward))[:self.page_size + 1])
+        more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if backward:
+            results.reverse()
+            has_next, has_previous = True, more
+        else:
+            has_next, has_previous = more, bool(cursor)
+
+        page = {
+            'results': results,
+            'page_size': self.page_size,
+            'next_cursor': self.encode_cursor(results[-1], 'n') if results and has_next else None,
+            'previous_cursor': self.encode_cursor(results[0], 'p') if results and has_previous else None,
+            'has_next': has_next,
+            'has_previous': has_previous,
+        }
+        if include_total:
+            page['total_count'], page['total_is_exact'] = count_rows(self.queryset)
+        return page
+
+
+def keyset_requested(request):
+    """Whether the client opted in to cursor pagination (?pagination=cursor)."""
+    return request.GET.get('pagination') == 'cursor'
+
+
+def paginate_keyset(request, queryset, ordering, cursor_param='cursor', default_page_size=20, max_page_size=100):
+    """
+    Paginate a queryset with KeysetPaginator from request parameters.
+
+    Reads the cursor from `cursor_param`, `page_size` (capped at
+    max_page_size) and `total` (`?total=true` to count rows).
+
+    Returns:
+        (page of objects, pagination metadata dict)
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or not ours
+    """
+    try:
+        page_size = int(request.GET.get('page_size', default_page_size) or default_page_size)
+    except ValueError:
+        page_size = default_page_size
+    page_size = max(1, min(page_size, max_page_size))
+
+    page = KeysetPaginator(queryset, ordering, page_size=page_size).paginate(
+        cursor=request.GET.get(cursor_param) or None,
+        include_total=request.GET.get('total', '').lower() in ('1', 'true'),
+    )
+    return page.pop('results'), page
@@ -10,6 +10,7 @@ This module provides the foundation for the repository pattern, which:
 
 from typing import List, Optional, Dict, Any
 from django.db.models import QuerySet, Model, Q, Prefetch
+from apps.api.pagination import KeysetPaginator
 
 
 class BaseRepository:
@@ -20,6 +21,9 @@ class BaseRepository:
     methods to add model-specific optimizations.
     """
 
+    # Sort key of paginate(keyset=True)
+    keyset_ordering = ('-pk',)
+
     def __init__(self, model: type[Model]):
         """
         Initialize repository with a Django model.
@@ -228,19 +232,31 @@ class BaseRepository:
         """
         return self.model.objects.order_by(*fields)
 
-    def paginate(self, page: int = 1, page_size: int = 20, **kwargs) -> Dict[str, Any]:
+    def paginate(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
         """
         Get paginated results.
 
         Args:
             page: Page number (1-indexed)
             page_size: Number of items per page
+            cursor: Keyset cursor from a previous page (keyset only)
+            keyset: Page by keyset_ordering instead of OFFSET
             **kwargs: Filter criteria
 
         Returns:
-            Dict with 'results', 'total', 'page', 'pages' keys
+            Dict with 'results', 'total', 'page', 'pages' keys, or the
+            keyset_paginate() keys with keyset=True
         """
         queryset = self.model.objects.filter(**kwargs) if kwargs else self.model.objects.all()
+        if keyset:
+            return self.keyset_paginate(queryset, self.keyset_ordering, cursor, page_size)
         total = queryset.count()
 
         start = (page - 1) * page_size
@@ -257,6 +273,33 @@ class BaseRepository:
             'has_prev': page > 1,
         }
 
+    def keyset_paginate(
+        self,
+        queryset: QuerySet,
+        ordering: tuple,
+        cursor: Optional[str] = None,
+        page_size: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Get one page by keyset (no OFFSET, no COUNT).
+
+        Args:
+            queryset: QuerySet to paginate
+            ordering: Sort key ending in a unique field, e.g. ('-created', '-id')
+            cursor: Cursor from a previous page (None for the first page)
+            page_size: Number of items per page
+
+        Returns:
+            Dict with 'results', 'page_size', 'next_cursor', 'previous_cursor',
+            'has_next', 'has_prev' keys
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or not for this ordering
+        """
+        page = KeysetPaginator(queryset, ordering, page_size=page_size).paginate(cursor=cursor)
+        page['has_prev'] = page.pop('has_previous')
+        return page
+
     def get_or_create(self, defaults: Optional[Dict[str, Any]] = None, **kwargs) -> tuple[Model, bool]:
         """
         Get existing object or create if doesn't exist.
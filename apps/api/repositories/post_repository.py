@@ -21,6 +21,8 @@ class PostRepository(OptimizedRepository):
     Handles post retrieval, moderation, and statistics.
     """
 
+    keyset_ordering = ('-created', '-id')
+
     def __init__(self):
         """Initialize with Post model."""
         super().__init__(Post)
@@ -39,7 +41,9 @@ class PostRepository(OptimizedRepository):
         topic_id: int,
         page: int = 1,
         page_size: int = 20,
-        approved_only: bool = True
+        approved_only: bool = True,
+        cursor: Optional[str] = None,
+        keyset: bool = False
     ) -> dict:
         """
         Get paginated posts for a topic.
@@ -49,6 +53,8 @@ class PostRepository(OptimizedRepository):
             page: Page number
             page_size: Items per page
             approved_only: Only return approved posts
+            cursor: Keyset cursor from a previous page (keyset only)
+            keyset: Page by (created, id) instead of OFFSET
 
         Returns:
             Dict with results and pagination info
@@ -62,6 +68,8 @@ class PostRepository(OptimizedRepository):
         if approved_only:
             queryset = queryset.filter(approved=True)
 
+        if keyset:
+            return self._paginate_queryset(queryset, page, page_size, cursor=cursor, ordering=('created', 'id'))
         return self._paginate_queryset(queryset, page, page_size)
 
     def count_approved(self) -> int:
@@ -308,7 +316,14 @@ class PostRepository(OptimizedRepository):
             created__gte=threshold
         )
 
-    def _paginate_queryset(self, queryset, page: int, page_size: int) -> dict:
+    def _paginate_queryset(
+        self,
+        queryset,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        ordering: Optional[tuple] = None
+    ) -> dict:
         """
         Helper to paginate a queryset.
 
@@ -316,10 +331,14 @@ class PostRepository(OptimizedRepository):
             queryset: QuerySet to paginate
             page: Page number
             page_size: Items per page
+            cursor: Keyset cursor from a previous page
+            ordering: Sort key to page by keyset instead of OFFSET
 
         Returns:
             Dict with pagination info
         """
+        if ordering:
+            return self.keyset_paginate(queryset, ordering, cursor, page_size)
         total = queryset.count()
         start = (page - 1) * page_size
         end = start + page_size
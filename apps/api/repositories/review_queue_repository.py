@@ -6,8 +6,8 @@ including queue management, analytics, and review workflows.
 """
 
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
-from django.db.models import Count, Q, Avg, F
+from datetime import timedelta
+from django.db.models import Q
 from django.utils import timezone
 
 from .base import OptimizedRepository
@@ -68,7 +68,7 @@ class ReviewQueueRepository(OptimizedRepository):
         queryset = (
             self.get_optimized_queryset()
             .filter(status='pending')
-            .order_by('-priority', '-score', '-created_at')
+            .by_urgency()
         )
 
         if review_type:
@@ -80,113 +80,63 @@ class ReviewQueueRepository(OptimizedRepository):
         """
         Get moderation queue statistics.
 
+        Read from the daily rollups, so the cost doesn't grow with the queue.
+
         Returns:
             Dict with queue statistics
         """
-        from apps.forum_integration.models import ReviewQueue
+        from apps.forum_integration.moderation_rollups import ModerationRollups
 
-        total = self.count()
-        pending = self.count(status='pending')
-        approved = self.count(status='approved')
-        rejected = self.count(status='rejected')
-
-        # Get counts by review type
-        type_counts = dict(
-            ReviewQueue.objects
-            .filter(status='pending')
-            .values('review_type')
-            .annotate(count=Count('id'))
-            .values_list('review_type', 'count')
-        )
-
-        # Get average resolution time for resolved items
-        resolved_items = ReviewQueue.objects.filter(
-            status__in=['approved', 'rejected'],
-            resolved_at__isnull=False
-        )
-
-        avg_resolution_time = None
-        if resolved_items.exists():
-            # Calculate average time difference
-            from django.db.models import Avg, ExpressionWrapper, F, DurationField
-            avg_resolution_time = resolved_items.aggregate(
-                avg_time=Avg(
-                    ExpressionWrapper(
-                        F('resolved_at') - F('created_at'),
-                        output_field=DurationField()
-                    )
-                )
-            )['avg_time']
+        summary = ModerationRollups.summary()
+        by_status = summary['by_status']
 
         return {
-            'total': total,
-            'pending': pending,
-            'approved': approved,
-            'rejected': rejected,
-            'by_type': type_counts,
-            'avg_resolution_time_seconds': (
-                avg_resolution_time.total_seconds() if avg_resolution_time else None
-            ),
+            'total': summary['total'],
+            'pending': by_status.get('pending', 0),
+            'approved': by_status.get('approved', 0),
+            'rejected': by_status.get('rejected', 0),
+            'by_type': summary['pending_by_type'],
+            'avg_resolution_time_seconds': summary['avg_resolution_seconds'],
+            'p50_resolution_time_seconds': summary['p50_resolution_seconds'],
+            'p90_resolution_time_seconds': summary['p90_resolution_seconds'],
         }
 
     def get_analytics(self, days: int = 7) -> Dict[str, Any]:
         """
         Get moderation analytics for specified period.
 
+        Read from the daily rollups; the period covers whole days.
+
         Args:
             days: Number of days to analyze
 
         Returns:
             Dict with analytics data
         """
-        from apps.forum_integration.models import ReviewQueue
-        from django.db.models.functions import TruncDate
+        from apps.forum_integration.moderation_rollups import ModerationRollups
 
-        threshold = timezone.now() - timedelta(days=days)
-
-        queryset = ReviewQueue.objects.filter(created_at__gte=threshold)
+        since = timezone.localdate() - timedelta(days=days)
+        summary = ModerationRollups.summary(since=since)
+        by_status = summary['by_status']
 
-        total_reviewed = queryset.filter(status__in=['approved', 'rejected']).count()
-        approved = queryset.filter(status='approved').count()
-        rejected = queryset.filter(status='rejected').count()
-        pending = queryset.filter(status='pending').count()
-
-        # Group by date (using safe TruncDate instead of .extra())
-        by_date = dict(
-            queryset
-            .annotate(date=TruncDate('created_at'))
-            .values('date')
-            .annotate(count=Count('id'))
-            .values_list('date', 'count')
-        )
-
-        # Group by review type
-        by_type = dict(
-            queryset
-            .values('review_type')
-            .annotate(count=Count('id'))
-            .values_list('review_type', 'count')
-        )
-
-        # Group by status
-        by_status = dict(
-            queryset
-            .values('status')
-            .annotate(count=Count('id'))
-            .values_list('status', 'count')
-        )
+        approved = by_status.get('approved', 0)
+        rejected = by_status.get('rejected', 0)
+        total_reviewed = approved + rejected
 
         return {
             'period_days': days,
-            'total_items': queryset.count(),
+            'total_items': summary['total'],
             'total_reviewed': total_reviewed,
             'approved': approved,
             'rejected': rejected,
-            'pending': pending,
+            'pending': by_status.get('pending', 0),
             'approval_rate': (approved / total_reviewed * 100) if total_reviewed > 0 else 0,
-            'by_date': by_date,
-            'by_type': by_type,
+            'by_date': summary['by_date'],
+            'by_type': summary['by_type'],
             'by_status': by_status,
+            'avg_resolution_time_seconds': summary['avg_resolution_seconds'],
+            'p50_resolution_time_seconds': summary['p50_resolution_seconds'],
+            'p90_resolution_time_seconds': summary['p90_resolution_seconds'],
         }
 
     def get_items_by_user(
@@ -231,7 +181,7 @@ class ReviewQueueRepository(OptimizedRepository):
         return list(
             self.get_optimized_queryset()
             .filter(status='pending')
-            .order_by('-priority', '-score', '-created_at')
+            .by_urgency()
             [:limit]
         )
 
@@ -252,13 +202,12 @@ class ReviewQueueRepository(OptimizedRepository):
         Returns:
             True if approved
         """
-        return self.update(
-            item_id,
-            status='approved',
+        return self.model.objects.filter(pk=item_id).transition(
+            'approved',
             assigned_moderator_id=moderator_id,
             resolved_at=timezone.now(),
             moderator_notes=reason or ''
-        )
+        ) > 0
 
     def reject_item(
         self,
@@ -277,17 +226,16 @@ class ReviewQueueRepository(OptimizedRepository):
         Returns:
             True if rejected
         """
-        return self.update(
-            item_id,
-            status='rejected',
+        return self.model.objects.filter(pk=item_id).transition(
+            'rejected',
             assigned_moderator_id=moderator_id,
             resolved_at=timezone.now(),
             moderator_notes=reason or ''
-        )
+        ) > 0
 
     def escalate_item(self, item_id: int, new_priority: int = 1) -> bool:
         """
-        Escalate item priority.
+        Escalate item priority, recomputing its score and decay_rank.
 
         Args:
             item_id: ReviewQueue ID
@@ -296,7 +244,7 @@ class ReviewQueueRepository(OptimizedRepository):
         Returns:
             True if escalated
         """
-        return self.update(item_id, priority=new_priority)
+        return self.model.objects.filter(pk=item_id).set_priority(new_priority) > 0
 
     def add_note(self, item_id: int, note: str) -> bool:
         """
@@ -328,11 +276,14 @@ class ReviewQueueRepository(OptimizedRepository):
         Returns:
             Number of items deleted
         """
+        from apps.forum_integration.moderation_rollups import ModerationRollups
+
         threshold = timezone.now() - timedelta(days=days)
-        return self.delete_many(
-            status__in=['approved', 'rejected'],
-            resolved_at__lt=threshold
-        )
+        with ModerationRollups.batched_removals():
+            return self.delete_many(
+                status__in=['approved', 'rejected'],
+                resolved_at__lt=threshold
+            )
 
     def _paginate_queryset(self, queryset, page: int, page_size: int) -> Dict[str, Any]:
         """
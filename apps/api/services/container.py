@@ -205,6 +205,69 @@ class ServiceContainer:
         """
         return self.get('review_queue_service')
 
+    def get_near_duplicate_index(self):
+        """
+        Get NearDuplicateIndex for MinHash/LSH duplicate detection.
+
+        Returns:
+            NearDuplicateIndex instance
+        """
+        return self.get('near_duplicate_index')
+
+    def get_posting_velocity_tracker(self):
+        """
+        Get PostingVelocityTracker for per-user posting rates.
+
+        Returns:
+            PostingVelocityTracker instance
+        """
+        return self.get('posting_velocity_tracker')
+
+    def get_topic_view_counter(self):
+        """
+        Get TopicViewCounter for buffered topic views.
+
+        Returns:
+            TopicViewCounter instance
+        """
+        return self.get('topic_view_counter')
+
+    def get_html_sanitizer(self):
+        """
+        Get HtmlSanitizer with injected dependencies.
+
+        Returns:
+            HtmlSanitizer instance
+        """
+        return self.get('html_sanitizer')
+
+    def get_post_render_cache(self):
+        """
+        Get PostRenderCache for rendered post HTML.
+
+        Returns:
+            PostRenderCache instance
+        """
+        return self.get('post_render_cache')
+
+    def get_forum_index(self):
+        """
+        Get ForumIndexSnapshot for the cached forum index tree.
+
+        Returns:
+            ForumIndexSnapshot instance
+        """
+        return self.get('forum_index')
+
+    def get_spam_rescoring_service(self):
+        """
+        Get SpamRescoringService with injected dependencies.
+
+        Returns:
+            SpamRescoringService instance
+        """
+        return self.get('spam_rescoring_service')
+
     def get_code_execution_service(self):
         """
         Get CodeExecutionService with injected dependencies.
@@ -254,6 +317,13 @@ def _initialize_container():
     from apps.api.services.statistics_service import ForumStatisticsService
     from apps.api.services.review_queue_service import ReviewQueueService
     from apps.api.services.forum_content_service import ForumContentService
+    from apps.api.services.near_duplicate_service import NearDuplicateIndex
+    from apps.api.services.spam_rescoring_service import SpamRescoringService
+    from apps.api.services.posting_velocity import PostingVelocityTracker
+    from apps.api.services.topic_views import TopicViewCounter
+    from apps.api.services.html_sanitizer import HtmlSanitizer
+    from apps.api.services.post_rendering import PostRenderCache
+    from apps.api.services.forum_index import ForumIndexSnapshot
 
     c.register('statistics_service', lambda: ForumStatisticsService(
         user_repo=c.get_user_repository(),
@@ -263,19 +333,70 @@ def _initialize_container():
         cache=c.get_cache()
     ))
 
+    c.register('near_duplicate_index', NearDuplicateIndex)
+
+    c.register('posting_velocity_tracker', lambda: PostingVelocityTracker(
+        cache=_get_counter_cache(c.get_cache(), 'posting-velocity')
+    ))
+
+    from django.conf import settings
+
+    # Under the test runner the test database is gone by the time atexit runs
+    c.register('topic_view_counter', lambda: TopicViewCounter(
+        cache=_get_counter_cache(c.get_cache(), 'topic-views'),
+        register_exit_flush=not getattr(settings, 'TESTING', False),
+    ))
+
     c.register('review_queue_service', lambda: ReviewQueueService(
         review_queue_repo=c.get_review_queue_repository(),
         post_repo=c.get_post_repository(),
         topic_repo=c.get_topic_repository(),
         user_repo=c.get_user_repository(),
+        cache=c.get_cache(),
+        duplicate_index=c.get_near_duplicate_index(),
+        velocity_tracker=c.get_posting_velocity_tracker(),
+        forum_index=c.get_forum_index()
+    ))
+
+    c.register('spam_rescoring_service', lambda: SpamRescoringService(
+        review_queue_service=c.get_review_queue_service(),
         cache=c.get_cache()
     ))
 
     c.register('forum_content_service', ForumContentService)
 
+    c.register('html_sanitizer', lambda: HtmlSanitizer(
+        cache=c.get_cache()
+    ))
+
+    c.register('post_render_cache', lambda: PostRenderCache(
+        cache=_get_counter_cache(c.get_cache(), 'post-html'),
+        sanitizer=c.get_html_sanitizer()
+    ))
+
+    c.register('forum_index', lambda: ForumIndexSnapshot(cache=c.get_cache()))
+
     logger.info("Service container initialized with repositories and services")
 
 
+def _get_counter_cache(cache, name):
+    """
+    Get the cache for counters (posting-velocity buckets, pending topic views)
+    and other entries that must survive cache invalidation (rendered posts).
+
+    Uses the shared cache when it is Redis; otherwise a local memory cache of
+    its own, since pattern invalidation clears a local default cache wholesale.
+
+    Returns:
+        Django cache backend
+    """
+    if hasattr(cache, 'delete_pattern'):
+        return cache
+
+    from django.core.cache.backends.locmem import LocMemCache
+    return LocMemCache(name, {'TIMEOUT': None, 'OPTIONS': {'MAX_ENTRIES': 100000}})
+
+
 def _get_cache():
     """
     Get cache backend with fallback support.
@@ -10,8 +10,6 @@ from django.utils import timezone
 from django.db import transaction
 from rest_framework import status
 
-from apps.api.content_serializers.streamfield import serialize_streamfield
-
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
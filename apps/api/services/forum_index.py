@@ -0,0 +1,200 @@
+"""
+Forum index snapshot.
+
+The forum index (categories, their forums, each forum's latest post and
+activity stats) used to be assembled per request: one query for the
+children of every category, one for the latest topic of every forum and
+two more for its stats. The snapshot builds the whole tree from four
+grouped queries, forums (with their latest topic ID), latest topics with
+their authors, weekly post counts and recent posters, and caches it as
+one entry. Post, topic and forum signals drop it; the short timeout bounds
+how stale the time-windowed stats can get.
+
+The forum list API, ForumViewSet.list and the forum_stats context
+processor all read the snapshot.
+
+Usage:
+    from apps.api.services.container import container
+
+    snapshot = container.get_forum_index().get()
+    for category in snapshot['categories']:
+        category['forums'][0]['last_post'], category['forums'][0]['stats']
+"""
+
+from __future__ import annotations
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from django.db.models import Count, F, OuterRef, Subquery
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from django.core.cache import BaseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ForumIndexSnapshot:
+    """
+    Cached category → forum → latest post → stats tree of the forum index.
+    """
+
+    CACHE_KEY = 'v1:forum:index'
+    CACHE_TIMEOUT = 60
+
+    DEFAULT_ICON = '💬'
+    DEFAULT_COLOR = 'bg-blue-500'
+
+    # Same windows as ForumStatisticsService.get_forum_specific_stats
+    WEEKLY_DAYS = 7
+    ONLINE_THRESHOLD_MINUTES = 15
+    TRENDING_WEEKLY_POSTS = 5
+
+    def __init__(self, cache: BaseCache):
+        """
+        Args:
+            cache: Cache the snapshot is stored in
+        """
+        self.cache = cache
+
+    def get(self) -> Dict[str, Any]:
+        """
+        Get the snapshot, building and caching it on a miss.
+
+        Returns:
+            Dict with 'categories' (each with its 'forums') and 'built_at'
+        """
+        snapshot = self.cache.get(self.CACHE_KEY)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = self.build()
+        self.cache.set(self.CACHE_KEY, snapshot, self.CACHE_TIMEOUT)
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot; the next read rebuilds it."""
+        self.cache.delete(self.CACHE_KEY)
+        logger.debug(f"Invalidated cache: {self.CACHE_KEY}")
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Build the snapshot from the database (four queries).
+
+        Returns:
+            Dict with 'categories' (each with its 'forums') and 'built_at'
+        """
+        from machina.apps.forum.models import Forum
+        from machina.apps.forum_conversation.models import Post, Topic
+
+        latest_topics = Topic.objects.filter(
+            forum=OuterRef('pk'), approved=True
+        ).order_by(F('last_post_on').desc(nulls_last=True)).values('pk')[:1]
+        forums = list(
+            Forum.objects.filter(type__in=[Forum.FORUM_CAT, Forum.FORUM_POST])
+            .select_related('customization')
+            .annotate(latest_topic_id=Subquery(latest_topics))
+            .order_by('tree_id', 'lft')
+        )
+        post_forum_ids = [forum.pk for forum in forums if forum.type == Forum.FORUM_POST]
+
+        topics = Topic.objects.filter(
+            pk__in=[forum.latest_topic_id for forum in forums if forum.latest_topic_id]
+        ).select_related('last_post', 'last_post__poster', 'last_post__poster__trust_level')
+        last_posts = {topic.forum_id: self._last_post(topic) for topic in topics}
+
+        now = timezone.now()
+        weekly_posts = self._posts_by_forum(
+            Post.objects.filter(created__gte=now - timedelta(days=self.WEEKLY_DAYS)),
+            post_forum_ids, Count('id'),
+        )
+        online_users = self._posts_by_forum(
+            Post.objects.filter(created__gte=now - timedelta(minutes=self.ONLINE_THRESHOLD_MINUTES)),
+            post_forum_ids, Count('poster_id', distinct=True),
+        )
+
+        children: Dict[int, List[Dict[str, Any]]] = {}
+        for forum in forums:
+            if forum.type != Forum.FORUM_POST or forum.parent_id is None:
+                continue
+            weekly = weekly_posts.get(forum.pk, 0)
+            children.setdefault(forum.parent_id, []).append({
+                'id': forum.pk,
+                'name': forum.name,
+                'slug': forum.slug,
+                'description': str(forum.description) if forum.description else '',
+                'icon': self._customization(forum, 'icon', self.DEFAULT_ICON),
+                'topics_count': forum.direct_topics_count,
+                'posts_count': forum.direct_posts_count,
+                'last_post': last_posts.get(forum.pk),
+                'stats': {
+                    'online_users': online_users.get(forum.pk, 0),
+                    'weekly_posts': weekly,
+                    'trending': weekly > self.TRENDING_WEEKLY_POSTS,
+                },
+                'color': self._customization(forum, 'color', self.DEFAULT_COLOR),
+            })
+
+        categories = [
+            {
+                'id': forum.pk,
+                'name': forum.name,
+                'slug': forum.slug,
+                'description': str(forum.description) if forum.description else '',
+                'type': 'category',
+                'forums': children[forum.pk],
+            }
+            for forum in forums
+            if forum.type == Forum.FORUM_CAT and children.get(forum.pk)
+        ]
+
+        return {
+            'categories': categories,
+            'built_at': now.isoformat(),
+        }
+
+    @staticmethod
+    def _posts_by_forum(posts, forum_ids: List[int], aggregate) -> Dict[int, int]:
+        """Aggregate approved posts of the given forums, grouped by forum."""
+        return dict(
+            posts.filter(topic__forum_id__in=forum_ids, approved=True)
+            .values('topic__forum_id')
+            .annotate(value=aggregate)
+            .order_by()
+            .values_list('topic__forum_id', 'value')
+        )
+
+    @staticmethod
+    def _customization(forum, field: str, default: str) -> str:
+        customization = getattr(forum, 'customization', None)
+        return getattr(customization, field, default) if customization else default
+
+    @staticmethod
+    def _last_post(topic) -> Optional[Dict[str, Any]]:
+        """Serialize the last post of a forum's latest topic (None if it has none)."""
+        post = topic.last_post
+        if post is None:
+            return None
+
+        poster = post.poster
+        author = None
+        if poster is not None:
+            trust_level = getattr(poster, 'trust_level', None)
+            author = {
+                'id': poster.pk,
+                'username': poster.username,
+                'avatar': poster.avatar.url if poster.avatar else None,
+                'trust_level': {
+                    'level': trust_level.level,
+                    'name': trust_level.level_name,
+                    'can_moderate': trust_level.can_moderate_basic,
+                } if trust_level else {'level': 0, 'name': 'New User', 'can_moderate': False},
+                'is_staff': poster.is_staff,
+            }
+
+        return {
+            'id': post.pk,
+            'title': topic.subject,
+            'author': author,
+            'created_at': topic.last_post_on.isoformat() if topic.last_post_on else None,
+        }
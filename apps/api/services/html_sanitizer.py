@@ -0,0 +1,340 @@
+"""
+Single-pass HTML sanitizer with a content-hash keyed result cache.
+
+Each SanitizationPolicy is applied in one html5lib parse: the token stream
+drops dangerous elements together with their content, runs bleach's
+allowlist sanitizer, and removes iframes from untrusted domains before
+serializing. Results are cached by policy fingerprint and a hash of the
+input, first in a per-process LRU and then in the shared cache, so
+unchanged content is sanitized once. Changing a policy's allowlists
+changes its fingerprint, so stale results are never served.
+
+Usage:
+    from apps.api.services.container import container
+
+    sanitizer = container.get_html_sanitizer()
+    clean = sanitizer.sanitize(html, EMBED_POLICY)
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+from bleach import html5lib_shim
+from bleach.sanitizer import BleachSanitizerFilter
+
+if TYPE_CHECKING:
+    from bleach.css_sanitizer import CSSSanitizer
+    from django.core.cache import BaseCache
+
+logger = logging.getLogger(__name__)
+
+
+class SanitizationPolicy:
+    """
+    Allowlists and checks applied by HtmlSanitizer.
+
+    Args:
+        name: Short policy name used in cache keys and logs
+        tags: Allowed tags
+        attributes: Allowed attributes per tag (bleach format)
+        protocols: Allowed URL protocols
+        strip: Remove disallowed tags (True) or escape them (False)
+        css_sanitizer: bleach CSSSanitizer for style attributes
+        drop_content_tags: Tags removed together with their content
+        iframe_domains: Trusted iframe domains (subdomains match);
+            None allows iframes from any domain
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tags: Iterable[str],
+        attributes: Dict[str, List[str]],
+        protocols: Iterable[str],
+        strip: bool = False,
+        css_sanitizer: Optional[CSSSanitizer] = None,
+        drop_content_tags: Iterable[str] = (),
+        iframe_domains: Optional[Iterable[str]] = None,
+    ):
+        self.name = name
+        self.tags = frozenset(tags)
+        self.attributes = {tag: list(attrs) for tag, attrs in attributes.items()}
+        self.protocols = frozenset(protocols)
+        self.strip = strip
+        self.css_sanitizer = css_sanitizer
+        self.drop_content_tags = frozenset(drop_content_tags)
+        self.iframe_domains = None if iframe_domains is None else tuple(domain.lower() for domain in iframe_domains)
+        self.fingerprint = self._fingerprint()
+
+    def _fingerprint(self) -> str:
+        css_properties = sorted(getattr(self.css_sanitizer, 'allowed_css_properties', ()) or ())
+        config = repr((
+            HtmlSanitizer.VERSION,
+            sorted(self.tags),
+            sorted((tag, sorted(attrs)) for tag, attrs in self.attributes.items()),
+            sorted(self.protocols),
+            self.strip,
+            css_properties,
+            sorted(self.drop_content_tags),
+            self.iframe_domains,
+        ))
+        return hashlib.blake2b(config.encode(), digest_size=6).hexdigest()
+
+    def iframe_allowed(self, src: str) -> bool:
+        """
+        Whether an iframe src points at a trusted domain.
+        """
+        if self.iframe_domains is None:
+            return True
+        if not src:
+            return False
+        try:
+            domain = urlparse(src).netloc.lower()
+        except (ValueError, TypeError) as e:
+            logger.warning(
+                f"EMBED_SANITIZATION: Invalid URL in iframe src, removing iframe. "
+                f"Error: {e}, URL: {src[:100]}"
+            )
+            return False
+        return any(domain == allowed or domain.endswith('.' + allowed) for allowed in self.iframe_domains)
+
+
+# ========================================
+# Token stream filters
+# ========================================
+
+class DropContentFilter(html5lib_shim.Filter):
+    """
+    Remove elements such as <script> together with everything inside them.
+    """
+
+    def __init__(self, source, tags):
+        super().__init__(source)
+        self.tags = tags
+
+    def __iter__(self):
+        depth = 0
+        for token in super().__iter__():
+            token_type = token['type']
+            if token_type in ('StartTag', 'EmptyTag') and token['name'] in self.tags:
+                if token_type == 'StartTag':
+                    depth += 1
+                continue
+            if token_type == 'EndTag' and token['name'] in self.tags:
+                depth = max(depth - 1, 0)
+                continue
+            if not depth:
+                yield token
+
+
+class IframeDomainFilter(html5lib_shim.Filter):
+    """
+    Remove iframes whose src isn't on a policy's trusted domains.
+    """
+
+    def __init__(self, source, policy):
+        super().__init__(source)
+        self.policy = policy
+
+    def __iter__(self):
+        dropping = 0
+        for token in super().__iter__():
+            if token.get('name') == 'iframe':
+                if token['type'] == 'StartTag':
+                    if dropping:
+                        dropping += 1
+                        continue
+                    src = token['data'].get((None, 'src'), '')
+                    if not self.policy.iframe_allowed(src):
+                        if src:
+                            logger.warning(
+                                f"EMBED_BLOCKED: Untrusted iframe domain blocked: {src[:100]}"
+                            )
+                        dropping = 1
+                        continue
+                elif token['type'] == 'EndTag' and dropping:
+                    dropping -= 1
+                    continue
+            if not dropping:
+                yield token
+
+
+# ========================================
+# Sanitizer
+# ========================================
+
+class HtmlSanitizer:
+    """
+    Service applying SanitizationPolicies with result caching.
+    """
+
+    VERSION = 1  # bump when the sanitizing code changes its output
+    CACHE_PREFIX = 'v1:sanitized'
+    CACHE_TIMEOUT = 7 * 24 * 3600  # keys are content hashes, so entries never go stale
+    LOCAL_CACHE_SIZE = 2048
+    # Below this length a parse is cheaper than a shared-cache round trip
+    SHARED_CACHE_MIN_LENGTH = 512
+
+    def __init__(self, cache: Optional[BaseCache] = None, local_cache_size: Optional[int] = None):
+        """
+        Initialize with injected dependencies.
+
+        Args:
+            cache: Shared cache for results (None to keep them process-local)
+            local_cache_size: Entries in the per-process LRU
+        """
+        self.cache = cache
+        self.local_cache_size = self.LOCAL_CACHE_SIZE if local_cache_size is None else local_cache_size
+        self._local: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # html5lib parsers and serializers keep state, so one set per thread
+        self._pipelines = threading.local()
+
+    def sanitize(self, html: Optional[str], policy: SanitizationPolicy) -> str:
+        """
+        Sanitize HTML with a policy, reusing earlier results.
+
+        Args:
+            html: Untrusted HTML
+            policy: Policy to apply
+
+        Returns:
+            Sanitized HTML
+        """
+        if not html:
+            return ''
+        return self.sanitize_many([html], policy)[0]
+
+    def sanitize_many(self, texts: List[str], policy: SanitizationPolicy) -> List[str]:
+        """
+        Sanitize several HTML fragments with one shared-cache round trip.
+
+        Args:
+            texts: Untrusted HTML fragments
+            policy: Policy to apply
+
+        Returns:
+            Sanitized HTML, in the order of texts
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        keys: Dict[str, List[int]] = {}
+        shared: Dict[str, str] = {}
+
+        with self._lock:
+            for i, text in enumerate(texts):
+                if not text:
+                    results[i] = ''
+                    continue
+                key = self.cache_key(text, policy)
+                cached = self._local.get(key)
+                if cached is not None:
+                    self._local.move_to_end(key)
+                    results[i] = cached
+                    continue
+                keys.setdefault(key, []).append(i)
+
+        if not keys:
+            return results
+
+        if self.cache is not None:
+            wanted = [key for key, positions in keys.items() if len(texts[positions[0]]) >= self.SHARED_CACHE_MIN_LENGTH]
+            if wanted:
+                shared = self.cache.get_many(wanted)
+
+        computed = {}
+        for key, positions in keys.items():
+            text = texts[positions[0]]
+            clean = shared.get(key)
+            if clean is None:
+                clean = self.clean(text, policy)
+                if len(text) >= self.SHARED_CACHE_MIN_LENGTH:
+                    computed[key] = clean
+            for i in positions:
+                results[i] = clean
+            self._remember(key, clean)
+
+        if computed and self.cache is not None:
+            self.cache.set_many(computed, self.CACHE_TIMEOUT)
+
+        return results
+
+    def clean(self, html: str, policy: SanitizationPolicy) -> str:
+        """
+        Sanitize HTML in one parse, without caching.
+
+        Args:
+            html: Untrusted HTML
+            policy: Policy to apply
+
+        Returns:
+            Sanitized HTML
+        """
+        if not html:
+            return ''
+
+        parser, walker, serializer = self._pipeline(policy)
+        stream = walker(parser.parseFragment(html))
+        if policy.drop_content_tags:
+            stream = DropContentFilter(stream, policy.drop_content_tags)
+        stream = BleachSanitizerFilter(
+            source=stream,
+            allowed_tags=policy.tags,
+            attributes=policy.attributes,
+            strip_disallowed_tags=policy.strip,
+            strip_html_comments=True,
+            css_sanitizer=policy.css_sanitizer,
+            allowed_protocols=policy.protocols,
+        )
+        if policy.iframe_domains is not None:
+            stream = IframeDomainFilter(stream, policy)
+        return serializer.render(stream)
+
+    def cache_key(self, html: str, policy: SanitizationPolicy) -> str:
+        digest = hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        return f'{self.CACHE_PREFIX}:{policy.name}:{policy.fingerprint}:{digest}'
+
+    def clear_local_cache(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    # ========================================
+    # Internals
+    # ========================================
+
+    def _remember(self, key: str, clean: str) -> None:
+        if self.local_cache_size <= 0:
+            return
+        with self._lock:
+            self._local[key] = clean
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_cache_size:
+                self._local.popitem(last=False)
+
+    def _pipeline(self, policy: SanitizationPolicy):
+        pipelines = getattr(self._pipelines, 'by_policy', None)
+        if pipelines is None:
+            pipelines = self._pipelines.by_policy = {}
+
+        pipeline = pipelines.get(policy.fingerprint)
+        if pipeline is None:
+            # Dropped tags must reach the tree so their content can be removed
+            parser = html5lib_shim.BleachHTMLParser(
+                tags=policy.tags | policy.drop_content_tags,
+                strip=policy.strip,
+                consume_entities=False,
+                namespaceHTMLElements=False,
+            )
+            serializer = html5lib_shim.BleachHTMLSerializer(
+                quote_attr_values='always',
+                omit_optional_tags=False,
+                escape_lt_in_attrs=True,
+                resolve_entities=False,
+                sanitize=False,
+                alphabetical_attributes=False,
+            )
+            pipeline = pipelines[policy.fingerprint] = (parser, html5lib_shim.getTreeWalker('etree'), serializer)
+        return pipeline
@@ -0,0 +1,198 @@
+"""
+Near-duplicate post index backed by MinHash signatures and LSH bands.
+
+Each post's MinHash signature is stored in PostSignature and its band
+buckets in PostSignatureBand. Looking up a post's near-duplicates is one
+indexed query over its BANDS buckets, independent of how many posts exist.
+
+Usage:
+    from apps.api.services.container import container
+
+    index = container.get_near_duplicate_index()
+    index.index_post(post)
+    duplicate_ids = index.find_duplicates(post)
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from apps.forum_integration.models import PostSignature, PostSignatureBand
+from apps.forum_integration.utils import minhash
+
+if TYPE_CHECKING:
+    from machina.apps.forum_conversation.models import Post
+
+
+class NearDuplicateIndex:
+    """
+    Service for indexing post content and finding near-duplicate posts.
+    """
+
+    SIMILARITY_THRESHOLD = 0.9
+    MIN_CONTENT_LENGTH = 50
+    MAX_CANDIDATES = 200
+
+    @staticmethod
+    def post_text(post: Post) -> str:
+        """
+        Plain content of a post used for signatures.
+
+        Args:
+            post: Post instance
+
+        Returns:
+            Stripped content text
+        """
+        if not post.content:
+            return ''
+        return str(post.content).strip()
+
+    def index_post(self, post: Post) -> Optional[Tuple[int, ...]]:
+        """
+        Store or refresh the signature and band buckets of a post.
+
+        Posts shorter than MIN_CONTENT_LENGTH are removed from the index. The
+        signature is only computed when the post was saved after it was last
+        indexed.
+
+        Args:
+            post: Post instance to index
+
+        Returns:
+            The post's signature, or None if it isn't indexed
+        """
+        text = self.post_text(post)
+        if len(text) < self.MIN_CONTENT_LENGTH:
+            PostSignature.objects.filter(post_id=post.pk).delete()
+            return None
+
+        stored = PostSignature.objects.filter(post_id=post.pk).values_list('signature', 'updated_at').first()
+        if stored is not None and post.updated and stored[1] >= post.updated:
+            # Indexed since the post was last saved: reuse the signature
+            return minhash.unpack(stored[0])
+
+        signature = minhash.signature(text)
+        packed = minhash.pack(signature)
+
+        with transaction.atomic():
+            if stored is not None and bytes(stored[0]) == packed:
+                PostSignature.objects.filter(post_id=post.pk).update(updated_at=timezone.now())
+                return signature
+
+            PostSignature.objects.update_or_create(post_id=post.pk, defaults={'signature': packed})
+            PostSignatureBand.objects.filter(signature_id=post.pk).delete()
+            PostSignatureBand.objects.bulk_create(self._bands(post.pk, signature))
+
+        return signature
+
+    def index_posts(self, posts: Iterable[Post]) -> int:
+        """
+        Index a batch of posts with bulk writes (used by the backfill).
+
+        Args:
+            posts: Post instances
+
+        Returns:
+            Number of posts indexed
+        """
+        signatures = {}
+        skipped = []
+        for post in posts:
+            text = self.post_text(post)
+            if len(text) < self.MIN_CONTENT_LENGTH:
+                skipped.append(post.pk)
+            else:
+                signatures[post.pk] = minhash.signature(text)
+
+        with transaction.atomic():
+            PostSignature.objects.filter(post_id__in=skipped + list(signatures)).delete()
+            PostSignature.objects.bulk_create([
+                PostSignature(post_id=post_id, signature=minhash.pack(signature))
+                for post_id, signature in signatures.items()
+            ])
+            PostSignatureBand.objects.bulk_create([
+                band
+                for post_id, signature in signatures.items()
+                for band in self._bands(post_id, signature)
+            ])
+
+        return len(signatures)
+
+    def find_duplicates(
+        self,
+        post: Post,
+        threshold: Optional[float] = None
+    ) -> List[int]:
+        """
+        Find indexed posts whose content is near-identical to a post.
+
+        The post is indexed first if needed, and the signature returned by
+        index_post is reused for the lookup. Candidates sharing an LSH bucket
+        are confirmed by their estimated similarity.
+
+        Args:
+            post: Post instance to check
+            threshold: Minimum estimated Jaccard similarity (default SIMILARITY_THRESHOLD)
+
+        Returns:
+            IDs of duplicate posts, most similar first
+        """
+        signature = self.index_post(post)
+        if signature is None:
+            return []
+
+        threshold = self.SIMILARITY_THRESHOLD if threshold is None else threshold
+        scores = self.candidates(signature, exclude_post_id=post.pk)
+        return [
+            post_id
+            for post_id, score in sorted(scores.items(), key=lambda item: -item[1])
+            if score >= threshold
+        ]
+
+    def candidates(
+        self,
+        signature: Tuple[int, ...],
+        exclude_post_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Dict[int, float]:
+        """
+        Posts sharing at least one LSH bucket with a signature.
+
+        Args:
+            signature: MinHash signature
+            exclude_post_id: Post ID to leave out (usually the post itself)
+            limit: Maximum candidates, those sharing the most buckets first
+                (default MAX_CANDIDATES)
+
+        Returns:
+            Dict mapping post ID to estimated similarity
+        """
+        bucket_filter = Q()
+        for band, bucket in enumerate(minhash.band_buckets(signature)):
+            bucket_filter |= Q(band=band, bucket=bucket)
+
+        rows = PostSignatureBand.objects.filter(bucket_filter)
+        if exclude_post_id is not None:
+            rows = rows.exclude(signature_id=exclude_post_id)
+
+        limit = self.MAX_CANDIDATES if limit is None else limit
+        rows = (
+            rows.values('signature_id')
+            .annotate(shared_bands=Count('id'))
+            .order_by('-shared_bands', '-signature_id')
+            .values_list('signature_id', 'signature__signature')[:limit]
+        )
+
+        return {
+            post_id: minhash.similarity(signature, minhash.unpack(packed))
+            for post_id, packed in rows
+        }
+
+    @staticmethod
+    def _bands(post_id: int, signature: Tuple[int, ...]) -> List[PostSignatureBand]:
+        return [
+            PostSignatureBand(signature_id=post_id, band=band, bucket=bucket)
+            for band, bucket in enumerate(minhash.band_buckets(signature))
+        ]
@@ -0,0 +1,167 @@
+"""
+Rendered forum post HTML, stored per post revision.
+
+Post content is Markdown. Rendering it (and sanitizing the result) on every
+topic page read made page time grow with Markdown complexity, so the
+sanitized HTML and a plain-text excerpt of each post are stored in the cache
+under (post ID, ``updated`` timestamp). Posts are rendered when they are
+saved, the previous revision's entry is evicted on edit, and a page of posts
+is read with one ``get_many``; posts missing from the cache (evicted, or
+saved before this store existed) are rendered on read and stored.
+
+Usage:
+    from apps.api.services.container import container
+
+    rendered = container.get_post_render_cache().get_many(posts)
+    rendered[post.pk]['html'], rendered[post.pk]['excerpt']
+"""
+
+from __future__ import annotations
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+from django.utils.html import escape, linebreaks, strip_tags
+from django.utils.text import Truncator
+from apps.api.services.html_sanitizer import SanitizationPolicy
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from django.core.cache import BaseCache
+    from apps.api.services.html_sanitizer import HtmlSanitizer
+    from apps.learning.content_renderer import ContentBlockRenderer
+
+logger = logging.getLogger(__name__)
+
+
+FORUM_POST_POLICY = SanitizationPolicy(
+    name='forum_post',
+    tags=[
+        'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'div', 'em', 'h1', 'h2', 'h3',
+        'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 'span', 'strong',
+        'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+    ],
+    attributes={
+        'a': ['href', 'title', 'rel'],
+        'abbr': ['title'],
+        'img': ['src', 'alt', 'title'],
+        # Pygments highlighting classes
+        'code': ['class'],
+        'div': ['class'],
+        'pre': ['class'],
+        'span': ['class'],
+        'th': ['align'],
+        'td': ['align'],
+    },
+    protocols=['http', 'https', 'mailto'],
+    strip=False,
+    drop_content_tags=['script', 'style'],
+)
+
+
+class PostRenderCache:
+    """
+    Store of rendered, sanitized post HTML and excerpts keyed by post revision.
+    """
+
+    CACHE_PREFIX = 'v1:post_html'
+    CACHE_TIMEOUT = 7 * 24 * 3600
+    EXCERPT_LENGTH = 200
+    MARKDOWN_CONFIG = 'forum_post'
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        sanitizer: HtmlSanitizer,
+        renderer: Optional[ContentBlockRenderer] = None,
+    ):
+        """
+        Args:
+            cache: Cache the rendered posts are stored in
+            sanitizer: HtmlSanitizer applying FORUM_POST_POLICY
+            renderer: Markdown renderer (the shared content renderer by default)
+        """
+        if renderer is None:
+            from apps.learning.content_renderer import content_renderer as renderer
+        self.cache = cache
+        self.sanitizer = sanitizer
+        self.renderer = renderer
+
+    def cache_key(self, post_id: int, updated: Optional[datetime]) -> str:
+        revision = int(updated.timestamp() * 1_000_000) if updated else 0
+        return (
+            f'{self.CACHE_PREFIX}:{self.renderer.RENDER_VERSION}:{FORUM_POST_POLICY.fingerprint}:'
+            f'{post_id}:{revision}'
+        )
+
+    def render(self, content: Optional[str]) -> Dict[str, str]:
+        """
+        Render post Markdown to sanitized HTML and a plain-text excerpt.
+
+        Returns:
+            Dict with 'html' and 'excerpt'
+        """
+        content = content or ''
+        if self.renderer.markdown_available:
+            html = self.renderer.render_markdown(content, self.MARKDOWN_CONFIG)
+        else:
+            html = linebreaks(escape(content))
+        html = self.sanitizer.clean(html, FORUM_POST_POLICY)
+        text = ' '.join(strip_tags(html).split())
+        return {
+            'html': html,
+            'excerpt': Truncator(text).chars(self.EXCERPT_LENGTH),
+        }
+
+    @staticmethod
+    def _raw(post) -> str:
+        return getattr(post.content, 'raw', None) or str(post.content or '')
+
+    def store(self, post, previous_updated: Optional[datetime] = None) -> Dict[str, str]:
+        """
+        Render a saved post and store it, evicting its previous revision.
+
+        Args:
+            post: Post that was just saved
+            previous_updated: The post's `updated` before this save (None if new)
+
+        Returns:
+            Dict with 'html' and 'excerpt'
+        """
+        rendered = self.render(self._raw(post))
+        self.cache.set(self.cache_key(post.pk, post.updated), rendered, self.CACHE_TIMEOUT)
+        if previous_updated is not None and previous_updated != post.updated:
+            self.cache.delete(self.cache_key(post.pk, previous_updated))
+        return rendered
+
+    def evict(self, post_id: int, updated: Optional[datetime]) -> None:
+        """Drop the stored render of one post revision."""
+        self.cache.delete(self.cache_key(post_id, updated))
+
+    def get(self, post) -> Dict[str, str]:
+        """Get the rendered HTML and excerpt of one post."""
+        return self.get_many([post])[post.pk]
+
+    def get_many(self, posts: Iterable) -> Dict[int, Dict[str, str]]:
+        """
+        Get rendered HTML and excerpts of several posts with one cache read.
+
+        Posts missing from the cache are rendered and stored.
+
+        Returns:
+            {post ID: {'html': ..., 'excerpt': ...}}
+        """
+        keys = {self.cache_key(post.pk, post.updated): post for post in posts}
+        if not keys:
+            return {}
+        cached = self.cache.get_many(list(keys))
+
+        rendered = {}
+        missing = {}
+        for key, post in keys.items():
+            if key in cached:
+                rendered[post.pk] = cached[key]
+            else:
+                rendered[post.pk] = missing[key] = self.render(self._raw(post))
+        if missing:
+            self.cache.set_many(missing, self.CACHE_TIMEOUT)
+            logger.debug(f"Rendered {len(missing)} of {len(keys)} posts missing from the render cache")
+        return rendered
@@ -0,0 +1,251 @@
+"""
+Sliding-window posting-velocity tracker.
+
+Counts each user's posts, topics and posted links in time buckets kept in
+the cache (Redis in production, local memory when Redis isn't configured):
+minute buckets for windows up to an hour and hour buckets for windows up to
+a day. Recording an event is two cache increments, and any window is read
+with one get_many over at most 60 keys, however much the user has posted.
+Windows longer than an hour are hour-granular, so they may include up to an
+hour more than asked for.
+
+Limits per trust level come from settings.FORUM_POSTING_VELOCITY, falling
+back to DEFAULT_LIMITS for kinds it leaves out:
+    THROTTLE: checked before a post or topic is created (PostingVelocityThrottle)
+    REVIEW: checked by ReviewQueueService.check_user_behavior
+
+Usage:
+    from apps.api.services.container import container
+
+    tracker = container.get_posting_velocity_tracker()
+    tracker.record(user.id, 'post')
+    tracker.count(user.id, 'post', minutes=10)
+"""
+
+from __future__ import annotations
+import math
+import re
+import time
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from django.core.cache import BaseCache
+
+
+VelocityLimit = namedtuple('VelocityLimit', 'event count limit minutes retry_after')
+
+
+DEFAULT_LIMITS = {
+    # trust level: {event: (max events, window in minutes)}; levels not listed are unlimited
+    'THROTTLE': {
+        0: {'post': (10, 10), 'topic': (3, 60)},
+        1: {'post': (20, 10), 'topic': (10, 60)},
+        2: {'post': (60, 10), 'topic': (30, 60)},
+    },
+    'REVIEW': {
+        0: {'post': (20, 1440), 'link': (10, 1440)},
+        1: {'post': (20, 1440), 'link': (30, 1440)},
+    },
+}
+
+
+class PostingVelocityTracker:
+    """
+    Per-user event rates over sliding windows, backed by cache buckets.
+    """
+
+    CACHE_PREFIX = 'v1:velocity'
+    EVENTS = ('post', 'topic', 'link')
+
+    MINUTE = 60
+    HOUR = 3600
+    MAX_MINUTE_WINDOW = 60
+    MAX_WINDOW = 24 * 60
+
+    LINK_PATTERN = re.compile(r'https?://|www\.', re.IGNORECASE)
+
+    def __init__(self, cache: BaseCache):
+        """
+        Initialize with injected dependencies.
+
+        Args:
+            cache: Cache backend holding the buckets
+        """
+        self.cache = cache
+
+    # ========================================
+    # Recording
+    # ========================================
+
+    def record(self, user_id: int, event: str, count: int = 1, now: Optional[float] = None) -> None:
+        """
+        Count events for a user at the current time.
+
+        Args:
+            user_id: User ID
+            event: One of EVENTS
+            count: Number of events (e.g. links in a post)
+            now: Unix timestamp (for tests and backfills)
+        """
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown velocity event '{event}'")
+        if count <= 0:
+            return
+
+        now = time.time() if now is None else now
+        for size, buckets in ((self.MINUTE, self.MAX_MINUTE_WINDOW), (self.HOUR, self.MAX_WINDOW // 60)):
+            key = self._key(user_id, event, size, int(now // size))
+            # Keep a bucket until it can no longer fall inside a window
+            timeout = size * (buckets + 1)
+            if not self.cache.add(key, count, timeout):
+                try:
+                    self.cache.incr(key, count)
+                except ValueError:
+                    # Expired between add() and incr()
+                    self.cache.set(key, count, timeout)
+
+    def record_post(self, user_id: int, content: str, now: Optional[float] = None) -> None:
+        """
+        Count a new post and the links in it.
+
+        Args:
+            user_id: Poster ID
+            content: Post content
+            now: Unix timestamp
+        """
+        self.record(user_id, 'post', now=now)
+        self.record(user_id, 'link', count=self.count_links(content), now=now)
+
+    @classmethod
+    def count_links(cls, content: str) -> int:
+        return len(cls.LINK_PATTERN.findall(str(content or '')))
+
+    # ========================================
+    # Queries
+    # ========================================
+
+    def count(self, user_id: int, event: str, minutes: int, now: Optional[float] = None) -> int:
+        """
+        Events of a user in the last `minutes` minutes.
+
+        Args:
+            user_id: User ID
+            event: One of EVENTS
+            minutes: Window length, at most MAX_WINDOW
+
+        Returns:
+            Number of events in the window
+        """
+        return self.counts(user_id, {event: minutes}, now=now)[event]
+
+    def counts(self, user_id: int, windows: Dict[str, int], now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Events of a user in several windows with one cache round trip.
+
+        Args:
+            user_id: User ID
+            windows: Event -> window length in minutes
+
+        Returns:
+            Event -> number of events in its window
+        """
+        buckets = self._window_buckets(user_id, windows, now)
+        return {event: sum(count for _, count in event_buckets) for event, event_buckets in buckets.items()}
+
+    def exceeded(
+        self,
+        user_id: int,
+        trust_level: int,
+        kind: str = 'THROTTLE',
+        events: Optional[Tuple[str, ...]] = None,
+        now: Optional[float] = None
+    ) -> List[VelocityLimit]:
+        """
+        Limits of a trust level the user has reached.
+
+        Args:
+            user_id: User ID
+            trust_level: The user's trust level
+            kind: 'THROTTLE' (at or over the limit) or 'REVIEW' (over it)
+            events: Only check these events (default: all configured)
+
+        Returns:
+            VelocityLimit per limit reached; retry_after is the number of
+            seconds until enough events leave the window
+        """
+        limits = self.limits(trust_level, kind)
+        if events is not None:
+            limits = {event: limit for event, limit in limits.items() if event in events}
+        if not limits:
+            return []
+
+        now = time.time() if now is None else now
+        buckets = self._window_buckets(user_id, {event: minutes for event, (_, minutes) in limits.items()}, now)
+
+        reached = []
+        for event, (limit, minutes) in limits.items():
+            event_buckets = buckets[event]
+            total = sum(count for _, count in event_buckets)
+            # Throttles block the request that would go over the limit
+            allowed = limit - 1 if kind == 'THROTTLE' else limit
+            if total <= allowed:
+                continue
+
+            # Oldest bucket whose expiry brings the window back under the limit
+            excess = total - allowed
+            retry_after = 0
+            for expires_at, count in event_buckets:
+                excess -= count
+                if excess <= 0:
+                    retry_after = max(0, math.ceil(expires_at - now))
+                    break
+            reached.append(VelocityLimit(event, total, limit, minutes, retry_after))
+        return reached
+
+    @staticmethod
+    def limits(trust_level: int, kind: str = 'THROTTLE') -> Dict[str, Tuple[int, int]]:
+        """
+        Configured {event: (max events, window minutes)} of a trust level.
+        """
+        configured = getattr(settings, 'FORUM_POSTING_VELOCITY', {}).get(kind)
+        if configured is None:
+            configured = DEFAULT_LIMITS[kind]
+        return configured.get(trust_level, {})
+
+    # ========================================
+    # Buckets
+    # ========================================
+
+    def _key(self, user_id: int, event: str, size: int, index: int) -> str:
+        unit = 'm' if size == self.MINUTE else 'h'
+        return f'{self.CACHE_PREFIX}:{user_id}:{event}:{unit}:{index}'
+
+    def _window_buckets(
+        self,
+        user_id: int,
+        windows: Dict[str, int],
+        now: Optional[float]
+    ) -> Dict[str, List[Tuple[float, int]]]:
+        """
+        (time the bucket leaves the window, count) per event, oldest first.
+        """
+        now = time.time() if now is None else now
+        layout = {}
+        for event, minutes in windows.items():
+            if not 0 < minutes <= self.MAX_WINDOW:
+                raise ValueError(f'Velocity windows must be 1-{self.MAX_WINDOW} minutes')
+            size = self.MINUTE if minutes <= self.MAX_MINUTE_WINDOW else self.HOUR
+            span = minutes if size == self.MINUTE else math.ceil(minutes / 60)
+            current = int(now // size)
+            layout[event] = [
+                (self._key(user_id, event, size, index), (index + span) * size)
+                for index in range(current - span + 1, current + 1)
+            ]
+
+        values = self.cache.get_many([key for keys in layout.values() for key, _ in keys])
+        return {
+            event: [(expires_at, values.get(key, 0)) for key, expires_at in keys]
+            for event, keys in layout.items()
+        }
@@ -6,17 +6,20 @@ to use repository pattern, dependency injection, and Redis caching.
 """
 
 from __future__ import annotations
-import re
-from typing import TYPE_CHECKING, Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Sequence, Set
 from datetime import timedelta
 from django.utils import timezone
 from django.core.cache import cache as django_cache
+from apps.api.services.spam_scorer import SpamScorer
 
 if TYPE_CHECKING:
     from apps.api.repositories.review_queue_repository import ReviewQueueRepository
     from apps.api.repositories.post_repository import PostRepository
     from apps.api.repositories.topic_repository import TopicRepository
     from apps.api.repositories.user_repository import UserRepository
+    from apps.api.services.forum_index import ForumIndexSnapshot
+    from apps.api.services.near_duplicate_service import NearDuplicateIndex
+    from apps.api.services.posting_velocity import PostingVelocityTracker
     from django.core.cache import BaseCache
     from machina.apps.forum_conversation.models import Post, Topic
     from django.contrib.auth import get_user_model
@@ -36,6 +39,14 @@ class ReviewQueueService:
     CACHE_TIMEOUT_SHORT = 300  # 5 minutes - spam scores (content can be edited)
     CACHE_TIMEOUT_MEDIUM = 900  # 15 minutes - duplicate checks
 
+    # Bulk review actions and the status they set
+    BULK_REVIEW_ACTIONS = {
+        'approve': 'approved',
+        'reject': 'rejected',
+        'escalate': 'escalated',
+    }
+    MAX_BULK_REVIEW_ITEMS = 500
+
     # Spam detection patterns (could be moved to Django settings)
     SPAM_PATTERNS = [
         r'(?i)\b(buy|sell|cheap|discount|offer|deal)\s+(viagra|cialis|pills|medication)',
@@ -59,7 +70,10 @@ class ReviewQueueService:
         post_repo: PostRepository,
         topic_repo: TopicRepository,
         user_repo: UserRepository,
-        cache: BaseCache
+        cache: BaseCache,
+        duplicate_index: Optional[NearDuplicateIndex] = None,
+        velocity_tracker: Optional[PostingVelocityTracker] = None,
+        forum_index: Optional[ForumIndexSnapshot] = None
     ):
         """
         Initialize with injected dependencies.
@@ -70,12 +84,22 @@ class ReviewQueueService:
             topic_repo: Topic repository
             user_repo: User repository
             cache: Cache backend
+            duplicate_index: MinHash/LSH index used for duplicate detection;
+                without one, recent posts are compared pairwise
+            velocity_tracker: Posting rate tracker used for behavior checks;
+                without one, recent posts are counted in the database
+            forum_index: Forum index snapshot to invalidate when bulk
+                moderation approves or rejects content
         """
         self.review_queue_repo = review_queue_repo
         self.post_repo = post_repo
         self.topic_repo = topic_repo
         self.user_repo = user_repo
         self.cache = cache
+        self.duplicate_index = duplicate_index
+        self.velocity_tracker = velocity_tracker
+        self.forum_index = forum_index
+        self.spam_scorer = SpamScorer(self.SPAM_PATTERNS, self.SUSPICIOUS_LINK_PATTERNS)
 
     # ========================================
     # Content Checking Methods
@@ -107,7 +131,8 @@ class ReviewQueueService:
 
         # Check for spam indicators
         spam_score = self.calculate_spam_score(post)
-        if spam_score > 0.7:  # High spam probability
+        spam_priority = self.spam_review_priority(spam_score)
+        if spam_priority == 2:  # High spam probability
             self.add_to_queue(
                 post=post,
                 review_type='spam_detection',
@@ -115,7 +140,7 @@ class ReviewQueueService:
                 priority=2,
                 reporter=None
             )
-        elif spam_score > 0.4:  # Medium spam probability
+        elif spam_priority == 3:  # Medium spam probability
             self.add_to_queue(
                 post=post,
                 review_type='spam_detection',
@@ -211,22 +236,31 @@ class ReviewQueueService:
         """
         trust_level = self._get_user_trust_level(user_id)
 
-        # Check for suspicious posting patterns
-        day_ago = timezone.now() - timedelta(hours=24)
-        recent_posts = self.post_repo.count(
-            poster_id=user_id,
-            created__gte=day_ago
-        )
-
-        # Too many posts in short time (potential spam)
-        if recent_posts > 20 and trust_level <= 1:
-            self.add_to_queue(
-                reported_user_id=user_id,
-                review_type='trust_level_review',
-                reason=f'User posted {recent_posts} times in 24 hours',
-                priority=3,
-                reporter=None
+        # Too many posts or links in short time (potential spam)
+        if self.velocity_tracker:
+            for reached in self.velocity_tracker.exceeded(user_id, trust_level, kind='REVIEW'):
+                window = f'{reached.minutes // 60} hours' if reached.minutes >= 60 else f'{reached.minutes} minutes'
+                self.add_to_queue(
+                    reported_user_id=user_id,
+                    review_type='trust_level_review',
+                    reason=f'User posted {reached.count} {reached.event}s in {window}',
+                    priority=3,
+                    reporter=None
+                )
+        else:
+            day_ago = timezone.now() - timedelta(hours=24)
+            recent_posts = self.post_repo.count(
+                poster_id=user_id,
+                created__gte=day_ago
             )
+            if recent_posts > 20 and trust_level <= 1:
+                self.add_to_queue(
+                    reported_user_id=user_id,
+                    review_type='trust_level_review',
+                    reason=f'User posted {recent_posts} times in 24 hours',
+                    priority=3,
+                    reporter=None
+                )
 
         # Check for multiple flags
         active_flags = self.review_queue_repo.count(
@@ -300,7 +334,8 @@ class ReviewQueueService:
             existing = existing_items[0]
             # Update existing item's priority if this is more urgent
             if priority < existing.priority:
-                self.review_queue_repo.update(existing.id, priority=priority)
+                self.review_queue_repo.escalate_item(existing.id, new_priority=priority)
+                existing.refresh_from_db()
             return existing
 
         # Create new review item using ORM (repository doesn't have create method)
@@ -365,6 +400,176 @@ class ReviewQueueService:
 
         return success
 
+    def bulk_review(
+        self,
+        item_ids: List[int],
+        reviewer: User,
+        action: str,
+        notes: Optional[str] = None,
+        ip_address: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Approve, reject or escalate many items in one transaction.
+
+        Items are written with bulk_update, the moderation log with one
+        bulk_create and post/topic approval with one UPDATE each. Caches are
+        invalidated in one batch and a single moderation_batch_reviewed event
+        is published for the WebSocket broadcast.
+
+        Args:
+            item_ids: ReviewQueue item IDs (at most MAX_BULK_REVIEW_ITEMS)
+            reviewer: User performing the review
+            action: 'approve', 'reject' or 'escalate'
+            notes: Optional moderator notes
+            ip_address: Reviewer IP address for the moderation log
+
+        Returns:
+            Dict with the action, number of items updated and per-item results
+            ('updated', 'not_found' or 'already_resolved')
+
+        Raises:
+            ValueError: For an unknown action or too many items
+        """
+        from django.db import transaction
+        from apps.api.cache.strategies import CacheKeyBuilder, invalidate_cache
+        from apps.forum_integration.event_bus import EventBus
+        from apps.forum_integration.models import ModerationLog, ReviewQueue
+        from apps.forum_integration.moderation_rollups import ModerationRollups
+
+        if action not in self.BULK_REVIEW_ACTIONS:
+            raise ValueError(f"Invalid action '{action}'")
+        item_ids = list(dict.fromkeys(item_ids))
+        if len(item_ids) > self.MAX_BULK_REVIEW_ITEMS:
+            raise ValueError(f'At most {self.MAX_BULK_REVIEW_ITEMS} items can be reviewed at once')
+
+        new_status = self.BULK_REVIEW_ACTIONS[action]
+        now = timezone.now()
+        results = dict.fromkeys(item_ids, 'not_found')
+
+        with transaction.atomic():
+            items = list(
+                ReviewQueue.objects.select_for_update(of=('self',))
+                .filter(pk__in=item_ids)
+                .select_related('reported_user__trust_level')
+            )
+
+            updated = []
+            previous_states = []
+            for item in items:
+                if item.is_resolved:
+                    results[item.pk] = 'already_resolved'
+                    continue
+                previous_states.append((item.created_at, item.review_type, item.status, item.resolved_at))
+                item.status = new_status
+                item.assigned_moderator = reviewer
+                if notes:
+                    item.moderator_notes = notes
+                if action == 'escalate':
+                    item.priority = max(1, item.priority - 1)
+                    item.refresh_scores()
+                else:
+                    item.resolved_at = now
+                results[item.pk] = 'updated'
+                updated.append(item)
+
+            if updated:
+                ReviewQueue.objects.bulk_update(updated, [
+                    'status', 'assigned_moderator', 'moderator_notes', 'resolved_at',
+                    'priority', 'score', 'decay_rank',
+                ])
+                ModerationRollups.record(
+                    added=[(item.created_at, item.review_type, item.status, item.resolved_at) for item in updated],
+                    removed=previous_states,
+                )
+                ModerationLog.objects.bulk_create([
+                    ModerationLog(
+                        action_type=action,
+                        moderator=reviewer,
+                        review_item=item,
+                        target_user=item.reported_user,
+                        target_post_id=item.post_id,
+                        target_topic_id=item.topic_id,
+                        reason=notes or '',
+                        details={'bulk': True, 'batch_size': len(updated)},
+                        ip_address=ip_address,
+                    )
+                    for item in updated
+                ])
+
+            post_ids = [item.post_id for item in updated if item.post_id]
+            topic_ids = [item.topic_id for item in updated if item.topic_id and not item.post_id]
+            stale_patterns = {CacheKeyBuilder.pattern('review_queue')}
+            if action != 'escalate':
+                stale_patterns |= self._set_content_approval(post_ids, topic_ids, approved=action == 'approve')
+
+            if updated:
+                EventBus.publish(
+                    'moderation_batch_reviewed',
+                    user=reviewer,
+                    action=action,
+                    item_ids=[item.pk for item in updated],
+                    post_ids=post_ids,
+                    topic_ids=topic_ids,
+                )
+
+        if updated:
+            self.invalidate_cache_many(post_ids=post_ids, topic_ids=topic_ids)
+            invalidate_cache(*sorted(stale_patterns))
+            if self.forum_index is not None and action != 'escalate' and (post_ids or topic_ids):
+                # The approval UPDATEs bypass the save signals that invalidate the index
+                transaction.on_commit(self.forum_index.invalidate)
+
+        return {
+            'action': action,
+            'updated': len(updated),
+            'results': [
+                {'id': item_id, 'result': result}
+                for item_id, result in results.items()
+            ],
+        }
+
+    def _set_content_approval(self, post_ids: List[int], topic_ids: List[int], approved: bool) -> Set[str]:
+        """
+        Set the approval flag of posts and topics with one UPDATE each, then
+        refresh the trackers of every affected topic once.
+
+        Returns:
+            Cache key patterns of listings the per-post save signals would
+            have invalidated
+        """
+        from machina.apps.forum_conversation.models import Post, Topic
+        from apps.api.cache.strategies import CacheKeyBuilder
+        from apps.forum_conversation import trackers
+
+        changed = list(
+            Post.objects.filter(pk__in=post_ids).exclude(approved=approved)
+            .values_list('pk', 'topic_id', 'poster_id')
+        )
+        affected_topics = {topic_id for _, topic_id, _ in changed} | set(topic_ids)
+        previous = {
+            topic['id']: topic
+            for topic in Topic.objects.filter(pk__in=affected_topics).values('id', *trackers.TRACKED_TOPIC_FIELDS)
+        }
+        if changed:
+            Post.objects.filter(pk__in=[pk for pk, _, _ in changed]).update(approved=approved)
+            # A topic shares the approval flag of its first post (as in Post.save())
+            Topic.objects.filter(first_post_id__in=[pk for pk, _, _ in changed]).update(approved=approved)
+        if topic_ids:
+            Topic.objects.filter(pk__in=topic_ids).update(approved=approved)
+
+        for topic_id, state in previous.items():
+            trackers.refresh_topic(topic_id, state)
+
+        if not affected_topics:
+            return set()
+        patterns = {CacheKeyBuilder.pattern('forum', 'statistics')}
+        patterns.update(CacheKeyBuilder.pattern('topics', topic_id, 'posts') for topic_id in affected_topics)
+        patterns.update(
+            CacheKeyBuilder.build_user_key(poster_id, 'posts') + '*'
+            for _, _, poster_id in changed if poster_id
+        )
+        return patterns
+
     def get_pending_queue(
         self,
         review_type: Optional[str] = None,
@@ -442,27 +647,36 @@ class ReviewQueueService:
         Returns:
             Float between 0 and 1 (1 = definitely spam)
         """
-        if not text:
-            return 0.0
+        return self.spam_scorer.score_text(text)
 
-        score = 0.0
+    def score_many(self, texts: List[str], kind: str = 'content') -> List[float]:
+        """
+        Score a batch of texts without touching the cache (bulk rescoring).
 
-        # Check against spam patterns
-        for pattern in self.SPAM_PATTERNS:
-            if re.search(pattern, text):
-                score += 0.4
+        Args:
+            texts: Post contents or titles
+            kind: 'content' for post bodies, 'text' for titles
 
-        # Check for excessive capitalization
-        caps_ratio = sum(1 for c in text if c.isupper()) / len(text)
-        if caps_ratio > 0.7:
-            score += 0.3
+        Returns:
+            Scores in input order
+        """
+        return self.spam_scorer.score_many(texts, kind=kind)
 
-        # Check for excessive punctuation
-        punct_ratio = sum(1 for c in text if c in '!?') / len(text)
-        if punct_ratio > 0.2:
-            score += 0.3
+    def spam_review_priority(self, score: float) -> Optional[int]:
+        """
+        Review queue priority for a post spam score.
+
+        Args:
+            score: Spam score between 0 and 1
 
-        return min(score, 1.0)
+        Returns:
+            2 for likely spam, 3 for possible spam, None if no review is needed
+        """
+        if score > 0.7:
+            return 2
+        if score > 0.4:
+            return 3
+        return None
 
     def _calculate_content_spam_score(self, content: str) -> float:
         """
@@ -474,43 +688,7 @@ class ReviewQueueService:
         Returns:
             Float between 0 and 1
         """
-        score = 0.0
-
-        # Check against spam patterns
-        pattern_matches = 0
-        for pattern in self.SPAM_PATTERNS:
-            if re.search(pattern, content):
-                pattern_matches += 1
-
-        if pattern_matches > 0:
-            score += min(0.3 + (pattern_matches * 0.2), 0.8)
-
-        # Check for suspicious links
-        link_matches = 0
-        for pattern in self.SUSPICIOUS_LINK_PATTERNS:
-            if re.search(pattern, content):
-                link_matches += 1
-
-        if link_matches > 0:
-            score += min(0.2 + (link_matches * 0.15), 0.5)
-
-        # Check for excessive capitalization
-        if content:
-            caps_ratio = sum(1 for c in content if c.isupper()) / len(content)
-            if caps_ratio > 0.5 and len(content) > 20:
-                score += 0.3
-
-        # Check for excessive punctuation
-        if content:
-            punct_ratio = sum(1 for c in content if c in '!?') / max(len(content), 1)
-            if punct_ratio > 0.1:
-                score += 0.2
-
-        # Check for very short posts with links
-        if content and len(content.strip()) < 50 and re.search(r'http', content):
-            score += 0.4
-
-        return min(score, 1.0)
+        return self.spam_scorer.score_content(content)
 
     # ========================================
     # Duplicate Detection (optimized)
@@ -519,7 +697,10 @@ class ReviewQueueService:
     def is_duplicate_content(self, post: Post) -> bool:
         """
         Check if post content is similar to existing posts.
-        Optimized to avoid N+1 queries by limiting posts checked.
+
+        With a duplicate index this is a constant number of indexed lookups
+        across all posts; otherwise recent posts by the same user or in the
+        same topic are compared one by one.
 
         Args:
             post: Post instance to check
@@ -540,8 +721,28 @@ class ReviewQueueService:
         if cached_result is not None:
             return cached_result
 
-        # Optimize: Only check recent posts by same user or in same topic/forum
-        # This prevents loading thousands of posts on active forums
+        if self.duplicate_index is not None:
+            is_duplicate = bool(self.duplicate_index.find_duplicates(post))
+        else:
+            is_duplicate = self.scan_recent_duplicates(post, content)
+
+        # Cache result (15 minutes)
+        self.cache.set(cache_key, is_duplicate, timeout=self.CACHE_TIMEOUT_MEDIUM)
+
+        return is_duplicate
+
+    def scan_recent_duplicates(self, post: Post, content: str) -> bool:
+        """
+        Compare a post pairwise with recent posts by the same user or in the
+        same topic. Limited to 100 posts to prevent unbounded queries.
+
+        Args:
+            post: Post instance to check
+            content: Stripped post content
+
+        Returns:
+            True if duplicate detected
+        """
         week_ago = timezone.now() - timedelta(days=7)
 
         # Build efficient query: same user OR same topic, limited to 100 recent posts
@@ -556,7 +757,6 @@ class ReviewQueueService:
             id=post.id
         ).order_by('-created')[:100]  # Hard limit to prevent unbounded queries
 
-        is_duplicate = False
         for recent_post in recent_posts:
             if not recent_post.content:
                 continue
@@ -565,18 +765,13 @@ class ReviewQueueService:
 
             # Simple similarity check (exact match)
             if content == recent_content:
-                is_duplicate = True
-                break
+                return True
 
             # Check for near-duplicates (90% similarity)
             if self.calculate_similarity(content, recent_content) > 0.9:
-                is_duplicate = True
-                break
-
-        # Cache result (15 minutes)
-        self.cache.set(cache_key, is_duplicate, timeout=self.CACHE_TIMEOUT_MEDIUM)
+                return True
 
-        return is_duplicate
+        return False
 
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -640,26 +835,51 @@ class ReviewQueueService:
         """
         return self.review_queue_repo.cleanup_old_items(days=days)
 
-    def recalculate_priorities(self) -> None:
+    def recalculate_priorities(self) -> int:
         """
-        Recalculate priority scores for all pending items.
+        Recompute the static priority score of all pending items.
+
+        The age bonus is applied at query time (ReviewQueue.objects.by_urgency),
+        so this is only needed when score weights or reported users' trust
+        levels change. Runs as one UPDATE with the trust level joined in a
+        subquery, and logs significant changes with one bulk insert.
+
+        Returns:
+            Number of items updated
         """
+        from django.db import transaction
+        from django.db.models import F
         from apps.forum_integration.models import ReviewQueue, ModerationLog
 
-        pending_items = ReviewQueue.objects.filter(status='pending')
-
-        for item in pending_items:
-            old_score = item.score
-            item.save()  # This triggers score recalculation in model
+        new_score = ReviewQueue.static_score_expression()
+        pending = ReviewQueue.objects.filter(status='pending')
+
+        with transaction.atomic():
+            changed = [
+                (item_id, old_score, score)
+                for item_id, old_score, score in pending.annotate(new_score=new_score)
+                .values_list('id', 'score', 'new_score')
+                if abs(score - old_score) > 10  # Significant change
+            ]
+
+            # decay_rank = score - age rate * created hours, so shift it by the score change
+            updated = pending.update(
+                score=new_score,
+                decay_rank=F('decay_rank') - F('score') + new_score,
+            )
 
-            if abs(item.score - old_score) > 10:  # Significant change
-                ModerationLog.objects.create(
-                    action_type='escalate' if item.score > old_score else 'de_escalate',
+            ModerationLog.objects.bulk_create([
+                ModerationLog(
+                    action_type='escalate' if score > old_score else 'de_escalate',
                     moderator=None,  # System action
-                    review_item=item,
-                    reason=f'Priority score updated: {old_score:.1f} → {item.score:.1f}',
-                    details={'old_score': old_score, 'new_score': item.score}
+                    review_item_id=item_id,
+                    reason=f'Priority score updated: {old_score:.1f} → {score:.1f}',
+                    details={'old_score': old_score, 'new_score': score}
                 )
+                for item_id, old_score, score in changed
+            ])
+
+        return updated
 
     # ========================================
     # Cache Invalidation
@@ -677,13 +897,30 @@ class ReviewQueueService:
             post_id: Post ID to invalidate
             topic_id: Topic ID to invalidate
         """
-        if post_id:
+        self.invalidate_cache_many(
+            post_ids=[post_id] if post_id else (),
+            topic_ids=[topic_id] if topic_id else ()
+        )
+
+    def invalidate_cache_many(
+        self,
+        post_ids: Sequence[int] = (),
+        topic_ids: Sequence[int] = ()
+    ) -> None:
+        """
+        Invalidate cached spam scores and duplicate checks with one delete_many.
+
+        Args:
+            post_ids: Post IDs to invalidate
+            topic_ids: Topic IDs to invalidate
+        """
+        keys = []
+        for post_id in post_ids:
             # Include spam pattern version in key
-            spam_key = f'{self.CACHE_VERSION}:spam:v{self.SPAM_PATTERN_VERSION}:post:{post_id}'
-            dup_key = f'{self.CACHE_VERSION}:duplicate:post:{post_id}'
-            self.cache.delete(spam_key)
-            self.cache.delete(dup_key)
+            keys.append(f'{self.CACHE_VERSION}:spam:v{self.SPAM_PATTERN_VERSION}:post:{post_id}')
+            keys.append(f'{self.CACHE_VERSION}:duplicate:post:{post_id}')
+        for topic_id in topic_ids:
+            keys.append(f'{self.CACHE_VERSION}:spam:v{self.SPAM_PATTERN_VERSION}:topic:{topic_id}')
 
-        if topic_id:
-            topic_key = f'{self.CACHE_VERSION}:spam:v{self.SPAM_PATTERN_VERSION}:topic:{topic_id}'
-            self.cache.delete(topic_key)
+        if keys:
+            self.cache.delete_many(keys)
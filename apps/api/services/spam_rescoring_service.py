@@ -0,0 +1,309 @@
+"""
+Background rescoring of recent posts when the spam rules change.
+
+Spam scores are cached under a key that includes SPAM_PATTERN_VERSION, so a
+rule change only invalidates them lazily and pending review items keep the
+priority they got under the old rules. SpamRescoringService streams recent
+posts in chunks, scores them (optionally across a process pool), then
+updates the review queue in bulk and warms the score cache for the new
+version. Progress is checkpointed per rule version in SpamRescoreJob, so an
+interrupted run resumes where it stopped.
+
+After a deploy that bumps SPAM_PATTERN_VERSION, ``manage.py rescore_spam
+--enqueue`` enqueues the rescore (see ``enqueue()``): a 'spam_rules_changed'
+forum event whose subscriber rescores one chunk and publishes the next event
+until the job completes. The dispatcher runs each subscriber in its own
+transaction, so every event commits exactly one chunk and its checkpoint.
+``manage.py rescore_spam`` without ``--enqueue`` rescores in the foreground.
+
+Usage:
+    from apps.api.services.container import container
+
+    container.get_spam_rescoring_service().run(processes=4)
+"""
+
+from __future__ import annotations
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+from django.db import transaction
+from django.utils import timezone
+from apps.api.services.spam_scorer import SpamScorer
+
+if TYPE_CHECKING:
+    from apps.api.services.review_queue_service import ReviewQueueService
+    from apps.forum_integration.models import SpamRescoreJob
+    from django.core.cache import BaseCache
+
+logger = logging.getLogger(__name__)
+
+_worker_scorer = None
+
+
+def _init_worker(spam_patterns: Sequence[str], link_patterns: Sequence[str]) -> None:
+    global _worker_scorer
+    _worker_scorer = SpamScorer(spam_patterns, link_patterns)
+
+
+def _score_batch(texts: List[str]) -> List[float]:
+    return _worker_scorer.score_many(texts)
+
+
+class SpamRescoringService:
+    """
+    Service for rescoring recent posts against the current spam rules.
+    """
+
+    DEFAULT_DAYS = 30
+    DEFAULT_CHUNK_SIZE = 1000
+    BATCHES_PER_PROCESS = 4
+    EVENT_TYPE = 'spam_rules_changed'
+
+    def __init__(self, review_queue_service: ReviewQueueService, cache: BaseCache):
+        """
+        Initialize with injected dependencies.
+
+        Args:
+            review_queue_service: Provides the rules, scorer and score thresholds
+            cache: Cache backend for the spam score cache
+        """
+        self.review_queue_service = review_queue_service
+        self.cache = cache
+
+    @property
+    def rules_version(self) -> str:
+        return self.review_queue_service.SPAM_PATTERN_VERSION
+
+    def needs_rescore(self) -> bool:
+        """
+        Whether the current rule version hasn't been fully applied yet.
+
+        Returns:
+            True if no completed job exists for the current rules
+        """
+        from apps.forum_integration.models import SpamRescoreJob
+
+        return not SpamRescoreJob.objects.filter(
+            rules_version=self.rules_version, completed_at__isnull=False
+        ).exists()
+
+    def get_job(self, days: Optional[int] = None, restart: bool = False) -> SpamRescoreJob:
+        """
+        Get the checkpoint row of the current rule version, creating it if needed.
+
+        Args:
+            days: Age of the oldest post to rescore (new jobs only)
+            restart: Discard existing progress and start over
+
+        Returns:
+            SpamRescoreJob instance
+        """
+        from apps.forum_integration.models import SpamRescoreJob
+
+        since = timezone.now() - timedelta(days=days or self.DEFAULT_DAYS)
+        if restart:
+            SpamRescoreJob.objects.filter(rules_version=self.rules_version).delete()
+        job, _ = SpamRescoreJob.objects.get_or_create(
+            rules_version=self.rules_version,
+            defaults={'since': since},
+        )
+        return job
+
+    def enqueue(self, restart: bool = False) -> Optional[SpamRescoreJob]:
+        """
+        Start rescoring in the background if the current rules haven't been
+        applied yet.
+
+        Creates the job and publishes a 'spam_rules_changed' event; the
+        event bus dispatches it once the current transaction commits. Run
+        as a deploy step via ``manage.py rescore_spam --enqueue``. Does
+        nothing if a rescore event is already pending or there are no
+        recent posts to rescore (e.g. a fresh database).
+
+        Args:
+            restart: Discard existing progress for this rule version
+
+        Returns:
+            The enqueued SpamRescoreJob, or None if nothing was enqueued
+        """
+        from machina.apps.forum_conversation.models import Post
+        from apps.forum_integration.event_bus import EventBus
+        from apps.forum_integration.models import ForumEvent
+
+        if not restart and not self.needs_rescore():
+            return None
+        if ForumEvent.objects.filter(event_type=self.EVENT_TYPE, status='pending').exists():
+            return None
+        if not Post.objects.filter(created__gte=timezone.now() - timedelta(days=self.DEFAULT_DAYS)).exists():
+            return None
+
+        with transaction.atomic():
+            job = self.get_job(restart=restart)
+            EventBus.publish(self.EVENT_TYPE, rules_version=self.rules_version)
+        logger.info(f"Spam rules v{self.rules_version} changed; rescore enqueued")
+        return job
+
+    def run(
+        self,
+        days: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        processes: int = 1,
+        restart: bool = False,
+        progress: Optional[Callable[[SpamRescoreJob], None]] = None,
+        max_chunks: Optional[int] = None
+    ) -> SpamRescoreJob:
+        """
+        Rescore recent posts, resuming from the last checkpoint.
+
+        Args:
+            days: Age of the oldest post to rescore (default DEFAULT_DAYS)
+            chunk_size: Posts per chunk; each chunk is written and checkpointed
+                in one transaction
+            processes: Scoring processes (1 scores in this process)
+            restart: Discard existing progress for this rule version
+            progress: Called with the job after each chunk
+            max_chunks: Stop after this many chunks; the next run resumes
+                from the checkpoint
+
+        Returns:
+            The SpamRescoreJob, completed unless an error or max_chunks
+            interrupted it
+        """
+        from machina.apps.forum_conversation.models import Post
+
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        job = self.get_job(days=days, restart=restart)
+        if job.completed_at:
+            return job
+
+        posts = Post.objects.filter(
+            created__gte=job.since, pk__gt=job.last_post_id
+        ).order_by('pk').values_list('pk', 'content')
+
+        pool = None
+        if processes > 1:
+            service = self.review_queue_service
+            pool = ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(service.SPAM_PATTERNS, service.SUSPICIOUS_LINK_PATTERNS),
+            )
+
+        try:
+            chunk = []
+            chunks = 0
+            for post_id, content in posts.iterator(chunk_size=chunk_size):
+                chunk.append((post_id, str(content) if content else ''))
+                if len(chunk) >= chunk_size:
+                    self._process_chunk(job, chunk, pool, processes)
+                    chunk = []
+                    chunks += 1
+                    if progress:
+                        progress(job)
+                    if max_chunks and chunks >= max_chunks:
+                        return job
+            if chunk:
+                self._process_chunk(job, chunk, pool, processes)
+                if progress:
+                    progress(job)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        job.completed_at = timezone.now()
+        job.save(update_fields=['completed_at', 'updated_at'])
+        logger.info(
+            f"Spam rules v{job.rules_version} rescore complete: {job.posts_scored} posts, "
+            f"{job.items_updated} queue items updated, {job.items_created} created"
+        )
+        return job
+
+    def _score(self, texts: List[str], pool, processes: int) -> List[float]:
+        if pool is None:
+            return self.review_queue_service.score_many(texts)
+
+        size = max(1, -(-len(texts) // (processes * self.BATCHES_PER_PROCESS)))
+        batches = [texts[start:start + size] for start in range(0, len(texts), size)]
+        return [score for batch in pool.map(_score_batch, batches) for score in batch]
+
+    def _process_chunk(self, job: SpamRescoreJob, chunk: List[Tuple[int, str]], pool, processes: int) -> None:
+        scores = dict(zip(
+            (post_id for post_id, _ in chunk),
+            self._score([text for _, text in chunk], pool, processes),
+        ))
+
+        with transaction.atomic():
+            updated, created = self._apply_scores(scores)
+            job.last_post_id = chunk[-1][0]
+            job.posts_scored += len(chunk)
+            job.items_updated += updated
+            job.items_created += created
+            job.save(update_fields=[
+                'last_post_id', 'posts_scored', 'items_updated', 'items_created', 'updated_at',
+            ])
+
+        service = self.review_queue_service
+        self.cache.set_many(
+            {
+                f'{service.CACHE_VERSION}:spam:v{self.rules_version}:post:{post_id}': score
+                for post_id, score in scores.items()
+            },
+            timeout=service.CACHE_TIMEOUT_SHORT,
+        )
+
+    def _apply_scores(self, scores: Dict[int, float]) -> Tuple[int, int]:
+        """
+        Reprioritize pending spam items and queue newly flagged posts
+        that have no reviewed spam item yet.
+
+        Returns:
+            (items updated, items created)
+        """
+        from apps.forum_integration.models import ReviewQueue
+        from apps.forum_integration.moderation_rollups import ModerationRollups
+
+        service = self.review_queue_service
+        items = ReviewQueue.objects.filter(review_type='spam_detection', post_id__in=list(scores))
+        pending = {
+            item.post_id: item
+            for item in items.filter(status='pending').select_related('reported_user__trust_level')
+        }
+        # A moderator already ruled on these; don't queue them again
+        reviewed = set(items.exclude(status='pending').values_list('post_id', flat=True))
+
+        to_update = []
+        to_create = []
+        for post_id, score in scores.items():
+            priority = service.spam_review_priority(score)
+            item = pending.get(post_id)
+            if item is None:
+                if post_id in reviewed:
+                    continue
+                if priority is None:
+                    continue
+                item = ReviewQueue(
+                    review_type='spam_detection',
+                    post_id=post_id,
+                    priority=priority,
+                    reason=self._reason(score),
+                )
+                item.refresh_scores()
+                to_create.append(item)
+            else:
+                item.priority = priority or 4
+                item.reason = self._reason(score)
+                item.refresh_scores()
+                to_update.append(item)
+
+        if to_update:
+            ReviewQueue.objects.bulk_update(to_update, ['priority', 'reason', 'score', 'decay_rank'])
+        if to_create:
+            ReviewQueue.objects.bulk_create(to_create)
+            ModerationRollups.record(added=[
+                (item.created_at, item.review_type, item.status, item.resolved_at) for item in to_create
+            ])
+        return len(to_update), len(to_create)
+
+    def _reason(self, score: float) -> str:
+        return f'Automatic spam detection (score: {score:.2f}, rules v{self.rules_version})'
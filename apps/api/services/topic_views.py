@@ -0,0 +1,311 @@
+"""
+Buffered topic view counter.
+
+Counting a view used to be a read-modify-write of the topic row on every
+page of posts fetched. Views are now de-duplicated per viewer (user, session
+or IP address) and time window with an in-process bloom filter, added to a
+pending delta in the cache (Redis in production, local memory when Redis
+isn't configured), and written to the database in batches: deltas are
+flushed with one ``UPDATE ... SET views_count = views_count + n`` per
+distinct n by a background thread, every FLUSH_INTERVAL seconds or as soon
+as MAX_PENDING views are buffered, and when the process exits. Requests
+only record views; a failed flush is logged and retried with the next one.
+
+Each process flushes only the views it buffered itself, so deltas are never
+applied twice. Read paths add the pending delta to the stored count with
+``views()`` / ``views_many()``; views buffered by a process that dies before
+flushing stop being reported once their cache keys expire.
+
+Settings come from settings.FORUM_TOPIC_VIEWS (see DEFAULTS).
+
+Usage:
+    from apps.api.services.container import container
+
+    counter = container.get_topic_view_counter()
+    counter.record_view(topic.pk, counter.viewer_key(request))
+    counter.views(topic)
+"""
+
+from __future__ import annotations
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+if TYPE_CHECKING:
+    from django.core.cache import BaseCache
+    from django.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULTS = {
+    'FLUSH_INTERVAL': 30,  # seconds between database flushes
+    'MAX_PENDING': 500,  # buffered views that trigger an early flush
+    'DEDUP_WINDOW': 1800,  # seconds a viewer's repeat views of a topic are ignored
+    'BLOOM_BITS': 2 ** 20,  # 128 KB per window; ~1% false positives at 100k views
+    'BLOOM_HASHES': 7,
+    'PENDING_TIMEOUT': 86400,  # seconds pending deltas stay readable
+}
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    May report an item it hasn't seen (with a rate set by its size and load),
+    never misses one it has.
+    """
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray((bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item.
+
+        Returns:
+            True if the item was (probably) not in the filter yet
+        """
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.array[byte] & (1 << bit):
+                self.array[byte] |= 1 << bit
+                added = True
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.array[position // 8] & (1 << (position % 8))
+            for position in self._positions(item)
+        )
+
+
+class TopicViewCounter:
+    """
+    De-duplicated topic views, buffered in the cache and flushed in batches.
+    """
+
+    CACHE_PREFIX = 'v1:topic_views'
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        options: Optional[Dict] = None,
+        register_exit_flush: bool = True,
+        flush_in_background: bool = True
+    ):
+        """
+        Initialize with injected dependencies.
+
+        Args:
+            cache: Cache backend holding pending deltas
+            options: Overrides of settings.FORUM_TOPIC_VIEWS
+            register_exit_flush: Flush buffered views when the process exits
+            flush_in_background: Flush from a background thread; without it
+                record_view() flushes inline when a flush is due
+        """
+        self.cache = cache
+        self.options = {**DEFAULTS, **getattr(settings, 'FORUM_TOPIC_VIEWS', {}), **(options or {})}
+        self._lock = threading.Lock()
+        self._local: Dict[int, int] = defaultdict(int)
+        self._local_total = 0
+        self._last_flush = time.monotonic()
+        self._window = None
+        self._seen = None
+        self.flush_in_background = flush_in_background
+        self._flusher = None
+        self._flush_due = threading.Event()
+        if register_exit_flush:
+            atexit.register(self._flush_at_exit)
+
+    # ========================================
+    # Recording
+    # ========================================
+
+    @staticmethod
+    def viewer_key(request: HttpRequest) -> Optional[str]:
+        """
+        Identify the viewer of a request: user, else session, else IP address.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'u:{user.pk}'
+        session = getattr(request, 'session', None)
+        if session is not None and session.session_key:
+            return f's:{session.session_key}'
+        address = request.META.get('REMOTE_ADDR')
+        return f'ip:{address}' if address else None
+
+    def record_view(self, topic_id: int, viewer: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """
+        Count a view of a topic unless the viewer already viewed it this window.
+
+        Args:
+            topic_id: Topic ID
+            viewer: Viewer key (see viewer_key); None counts every view
+            now: Unix timestamp (for tests)
+
+        Returns:
+            True if the view was counted
+        """
+        if viewer is not None and not self._first_view(topic_id, viewer, now):
+            return False
+
+        key = self._key(topic_id)
+        if not self.cache.add(key, 1, self.options['PENDING_TIMEOUT']):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                # Expired between add() and incr()
+                self.cache.set(key, 1, self.options['PENDING_TIMEOUT'])
+
+        with self._lock:
+            self._local[topic_id] += 1
+            self._local_total += 1
+            full = self._local_total >= self.options['MAX_PENDING']
+            due = full or time.monotonic() - self._last_flush >= self.options['FLUSH_INTERVAL']
+
+        if self.flush_in_background:
+            self._start_flusher()
+            if full:
+                self._flush_due.set()
+        elif due:
+            self.flush()
+        return True
+
+    def _first_view(self, topic_id: int, viewer: str, now: Optional[float]) -> bool:
+        window = int((time.time() if now is None else now) // self.options['DEDUP_WINDOW'])
+        with self._lock:
+            if window != self._window:
+                self._window = window
+                self._seen = BloomFilter(self.options['BLOOM_BITS'], self.options['BLOOM_HASHES'])
+            return self._seen.add(f'{topic_id}:{viewer}')
+
+    # ========================================
+    # Flushing
+    # ========================================
+
+    def _start_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name='topic-view-flusher', daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        """Background thread: flush every FLUSH_INTERVAL, or early when the buffer fills."""
+        while True:
+            self._flush_due.wait(self.options['FLUSH_INTERVAL'])
+            self._flush_due.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Topic view flusher failed')
+            finally:
+                connections.close_all()
+
+    def flush(self, exc_info: bool = True) -> int:
+        """
+        Write the views buffered by this process to the database.
+
+        Database errors are logged and the views kept for the next flush.
+
+        Args:
+            exc_info: Include the traceback when logging a failed flush
+
+        Returns:
+            Number of views written
+        """
+        from machina.apps.forum_conversation.models import Topic
+
+        with self._lock:
+            deltas, self._local = self._local, defaultdict(int)
+            self._local_total = 0
+            self._last_flush = time.monotonic()
+        if not deltas:
+            return 0
+
+        by_delta = defaultdict(list)
+        for topic_id, delta in deltas.items():
+            by_delta[delta].append(topic_id)
+        try:
+            with transaction.atomic():
+                for delta, topic_ids in by_delta.items():
+                    Topic.objects.filter(pk__in=topic_ids).update(views_count=F('views_count') + delta)
+        except Exception:
+            # Keep the views for the next flush
+            with self._lock:
+                for topic_id, delta in deltas.items():
+                    self._local[topic_id] += delta
+                    self._local_total += delta
+            logger.error(f'Failed to flush {sum(deltas.values())} buffered topic views', exc_info=exc_info)
+            return 0
+
+        for topic_id, delta in deltas.items():
+            try:
+                self.cache.decr(self._key(topic_id), delta)
+            except ValueError:
+                # Pending delta already expired
+                pass
+        return sum(deltas.values())
+
+    def _flush_at_exit(self):
+        # Connections or the cache may already be torn down: log, don't raise
+        try:
+            self.flush(exc_info=False)
+        except Exception as e:
+            logger.error(f'Failed to flush buffered topic views at exit: {e}')
+
+    # ========================================
+    # Queries
+    # ========================================
+
+    def pending(self, topic_id: int) -> int:
+        """
+        Views of a topic counted but not yet written to the database.
+        """
+        return max(0, self.cache.get(self._key(topic_id), 0))
+
+    def pending_many(self, topic_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Pending views of several topics with one cache lookup.
+        """
+        keys = {self._key(topic_id): topic_id for topic_id in topic_ids}
+        values = self.cache.get_many(list(keys))
+        return {topic_id: max(0, values.get(key, 0)) for key, topic_id in keys.items()}
+
+    def views(self, topic) -> int:
+        """
+        Views of a topic: the stored count plus pending views.
+        """
+        return topic.views_count + self.pending(topic.pk)
+
+    def views_many(self, topics) -> Dict[int, int]:
+        """
+        {topic ID: views} for several topics.
+        """
+        topics = list(topics)
+        pending = self.pending_many(topic.pk for topic in topics)
+        return {topic.pk: topic.views_count + pending[topic.pk] for topic in topics}
+
+    def _key(self, topic_id: int) -> str:
+        return f'{self.CACHE_PREFIX}:pending:{topic_id}'
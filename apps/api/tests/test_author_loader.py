@@ -0,0 +1,102 @@
+"""
+Tests for the request-scoped author metadata loader.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from rest_framework.test import APIClient
+
+from apps.api.utils.author_loader import AuthorLoader
+from apps.forum_integration.models import Badge, BadgeCategory, TrustLevel, UserBadge, UserPoints
+
+User = get_user_model()
+
+
+class AuthorLoaderTests(TestCase):
+    """Test batched author cards and their use by the post serializers."""
+
+    def setUp(self):
+        self.forum = Forum.objects.create(name='Author Forum', slug='author-forum', type=Forum.FORUM_POST)
+        category = BadgeCategory.objects.create(name='Participation')
+        self.badges = {
+            rarity: Badge.objects.create(
+                name=rarity.title(), description=rarity, category=category, rarity=rarity,
+                condition_type='posts_created', condition_value=1,
+            )
+            for rarity in ('common', 'rare', 'epic', 'legendary')
+        }
+        self.topic = None
+        self.authors = [self._author(i) for i in range(3)]
+
+    def _author(self, i):
+        user = User.objects.create_user(username=f'author{i}', email=f'author{i}@example.com', password='testpass123')
+        TrustLevel.objects.update_or_create(user=user, defaults={'level': i + 1})
+        UserPoints.objects.update_or_create(user=user, defaults={'total_points': 100 * i})
+        if self.topic is None:
+            self.topic = Topic.objects.create(
+                forum=self.forum, poster=user, subject='Authors',
+                type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+            )
+        for _ in range(i + 1):
+            Post.objects.create(
+                topic=Topic.objects.get(pk=self.topic.pk), poster=user, subject='Authors',
+                content='Content', approved=True,
+            )
+        # Kept by the post_created event handler, which runs after commit
+        TrustLevel.objects.filter(user=user).update(posts_created=i + 1)
+        return user
+
+    def test_loads_cards_in_one_batch(self):
+        author = self.authors[2]
+        for badge in self.badges.values():
+            UserBadge.objects.create(user=author, badge=badge)
+
+        loader = AuthorLoader()
+        loader.prime(user.pk for user in self.authors)
+        with CaptureQueriesContext(connection) as queries:
+            cards = loader.load_many([user.pk for user in self.authors])
+            loader.load(author.pk)
+
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(cards[author.pk]['trust_level'], {'level': 3, 'name': 'Regular', 'can_moderate': True})
+        self.assertEqual(cards[author.pk]['points'], 200)
+        self.assertEqual(cards[author.pk]['posts_count'], 3)
+        self.assertEqual([badge['rarity'] for badge in cards[author.pk]['badges']], ['legendary', 'epic', 'rare'])
+        self.assertEqual(cards[self.authors[0].pk]['badges'], [])
+
+    def test_topic_posts_cost_constant_queries(self):
+        client = APIClient()
+        client.force_authenticate(user=self.authors[0])
+        url = reverse('api:forum_api:topic-posts', args=[self.topic.pk])
+
+        client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        for i in range(3, 8):
+            self._author(i)
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url)
+
+        # Post.position still counts per post; author queries don't grow
+        self.assertEqual(len(self._author_queries(many)), len(self._author_queries(few)))
+        card = next(post['poster'] for post in response.data['results'] if post['poster']['id'] == self.authors[1].pk)
+        self.assertEqual((card['trust_level']['level'], card['points'], card['posts_count']), (2, 100, 2))
+
+    @staticmethod
+    def _author_queries(queries):
+        tables = ('users_user', 'forum_integration_trustlevel', 'forum_integration_userpoints',
+                  'forum_integration_userbadge')
+        return [q for q in queries if any(table in q['sql'] for table in tables) and 'django_session' not in q['sql']]
+
+    def test_loader_is_request_scoped(self):
+        request = APIClient().get('/').wsgi_request
+
+        self.assertIs(AuthorLoader.for_request(request), AuthorLoader.for_request(request))
+        self.assertIsNot(AuthorLoader.for_request(request), AuthorLoader.for_request(None))
@@ -0,0 +1,130 @@
+"""
+Tests for the cached forum index snapshot.
+"""
+
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from rest_framework.test import APIClient
+
+from apps.api.services.container import container
+from apps.api.services.forum_index import ForumIndexSnapshot
+from apps.forum_integration.context_processors import forum_stats
+from apps.forum_integration.models import ForumCustomization, ReviewQueue, TrustLevel
+
+User = get_user_model()
+
+
+class ForumIndexSnapshotTests(TestCase):
+    """Test the snapshot tree, its invalidation and the entry points serving it."""
+
+    def setUp(self):
+        self.index = container.get_forum_index()
+        self.index.invalidate()
+        self.user = User.objects.create_user(username='indexer', email='indexer@example.com', password='testpass123')
+        TrustLevel.objects.update_or_create(user=self.user, defaults={'level': 2})
+        self.category = Forum.objects.create(name='Index Category', slug='index-category', type=Forum.FORUM_CAT)
+        self.forums = [
+            Forum.objects.create(
+                name=f'Index Forum {i}', slug=f'index-forum-{i}', parent=self.category, type=Forum.FORUM_POST,
+            )
+            for i in range(3)
+        ]
+        ForumCustomization.objects.create(forum=self.forums[0], icon='🐍', color='bg-green-500')
+
+    def _post(self, forum, subject, count=1):
+        topic = Topic.objects.create(
+            forum=forum, poster=self.user, subject=subject,
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        for _ in range(count):
+            post = Post.objects.create(
+                topic=Topic.objects.get(pk=topic.pk), poster=self.user, subject=subject,
+                content='Content', approved=True,
+            )
+        return post
+
+    def _forum(self, snapshot, forum):
+        category = next(c for c in snapshot['categories'] if c['id'] == self.category.pk)
+        return next(f for f in category['forums'] if f['id'] == forum.pk)
+
+    def test_builds_tree_with_constant_queries(self):
+        self._post(self.forums[0], 'Older')
+        latest = self._post(self.forums[0], 'Newest', count=6)
+
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = self.index.build()
+        self.assertEqual(len(queries), 4)
+
+        forum = self._forum(snapshot, self.forums[0])
+        self.assertEqual((forum['icon'], forum['color']), ('🐍', 'bg-green-500'))
+        self.assertEqual(forum['last_post']['id'], latest.pk)
+        self.assertEqual(forum['last_post']['title'], 'Newest')
+        self.assertEqual(forum['last_post']['author']['trust_level']['level'], 2)
+        self.assertEqual(forum['stats'], {'online_users': 1, 'weekly_posts': 7, 'trending': True})
+
+        empty = self._forum(snapshot, self.forums[1])
+        self.assertEqual((empty['icon'], empty['last_post']), ('💬', None))
+        self.assertEqual(empty['stats'], {'online_users': 0, 'weekly_posts': 0, 'trending': False})
+
+        for i in range(3, 8):
+            Forum.objects.create(
+                name=f'Index Forum {i}', slug=f'index-forum-{i}', parent=self.category, type=Forum.FORUM_POST,
+            )
+        with CaptureQueriesContext(connection) as queries:
+            self.index.build()
+        self.assertEqual(len(queries), 4)
+
+    def test_cached_until_a_post_is_saved(self):
+        self.index.get()
+        with CaptureQueriesContext(connection) as queries:
+            self.index.get()
+        self.assertEqual(len(queries), 0)
+
+        with patch.object(ForumIndexSnapshot, 'invalidate', autospec=True) as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                post = self._post(self.forums[2], 'Fresh')
+                # Invalidated on commit, once the forum trackers are updated
+                invalidate.assert_not_called()
+            invalidate.assert_called()
+        self.index.invalidate()
+
+        self.assertEqual(self._forum(self.index.get(), self.forums[2])['last_post']['id'], post.pk)
+
+    def test_invalidated_by_bulk_moderation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = self._post(self.forums[1], 'Spam')
+        item = ReviewQueue.objects.create(review_type='spam_detection', post=post, reason='Spam', priority=2)
+        self.assertEqual(self._forum(self.index.get(), self.forums[1])['last_post']['id'], post.pk)
+
+        with patch.object(ForumIndexSnapshot, 'invalidate', autospec=True) as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                container.get_review_queue_service().bulk_review([item.pk], self.user, 'reject')
+            invalidate.assert_called_once()
+        self.index.invalidate()
+
+        self.assertIsNone(self._forum(self.index.get(), self.forums[1])['last_post'])
+
+    def test_entry_points_serve_the_snapshot(self):
+        self._post(self.forums[0], 'Served')
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(reverse('api:forum-list'))
+        self.assertEqual(response.status_code, 200)
+        forum = self._forum(response.data, self.forums[0])
+        self.assertEqual(forum['last_post']['author'], {'username': 'indexer', 'avatar': None, 'trust_level': 2})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('api:forum_api:forum-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'forum_conversation_topic' in q['sql']])
+        self.assertEqual(self._forum(response.data, self.forums[0])['last_post']['author']['trust_level']['level'], 2)
+
+        context = forum_stats(RequestFactory().get('/'))
+        self.assertIn(self.category.pk, [entry['category']['id'] for entry in context['forum_tree']])
@@ -0,0 +1,116 @@
+"""
+Tests for the single-pass HTML sanitizer and its result cache.
+"""
+
+import io
+from unittest.mock import patch
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.api.content_serializers.common import RICH_TEXT_POLICY
+from apps.api.management.commands.benchmark_sanitizer import legacy_rich_text
+from apps.api.services.html_sanitizer import HtmlSanitizer, SanitizationPolicy
+from apps.forum_integration.utils.sanitization import EMBED_POLICY
+
+User = get_user_model()
+
+LONG_TEXT = '<p>' + 'Lists are mutable sequences. ' * 30 + '</p>'
+
+
+class HtmlSanitizerTests(SimpleTestCase):
+    """Test single-pass sanitizing and result caching."""
+
+    def setUp(self):
+        cache.clear()
+        self.sanitizer = HtmlSanitizer(cache=cache)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_embed_policy_in_one_pass(self):
+        html = (
+            '<div onclick="x()">Intro<script>alert(1)</script><style>p{}</style>'
+            '<iframe src="https://www.youtube.com/embed/a"></iframe>'
+            '<iframe src="https://youtube.com.evil.example/a">fallback</iframe>'
+            '<iframe>no src</iframe><object>kept text</object></div>'
+        )
+
+        self.assertEqual(
+            self.sanitizer.clean(html, EMBED_POLICY),
+            '<div>Intro<iframe src="https://www.youtube.com/embed/a"></iframe>kept text</div>',
+        )
+
+    def test_rich_text_policy_matches_bleach(self):
+        samples = [
+            '<p>Use <code>list.sort()</code> &amp; <em>sorted()</em></p>',
+            '<script>alert(1)</script><a href="javascript:x()">x</a>',
+            '<img src="data:image/png;base64,AAA" onerror="x()"><!-- note -->',
+            '<h2 style="color:red">Unclosed <b>bold',
+        ]
+
+        for html in samples:
+            with self.subTest(html=html):
+                self.assertEqual(self.sanitizer.clean(html, RICH_TEXT_POLICY), legacy_rich_text(html))
+
+    def test_results_cached_by_content_and_policy(self):
+        with patch.object(HtmlSanitizer, 'clean', wraps=self.sanitizer.clean) as clean:
+            first = self.sanitizer.sanitize(LONG_TEXT, RICH_TEXT_POLICY)
+            self.assertEqual(self.sanitizer.sanitize(LONG_TEXT, RICH_TEXT_POLICY), first)
+            self.sanitizer.sanitize(LONG_TEXT, EMBED_POLICY)
+
+            # A second process finds the result in the shared cache
+            other = HtmlSanitizer(cache=cache)
+            with patch.object(other, 'clean') as other_clean:
+                self.assertEqual(other.sanitize(LONG_TEXT, RICH_TEXT_POLICY), first)
+                other_clean.assert_not_called()
+
+        self.assertEqual(clean.call_count, 2)
+
+    def test_policy_change_changes_cache_key(self):
+        narrower = SanitizationPolicy(
+            name=RICH_TEXT_POLICY.name,
+            tags=RICH_TEXT_POLICY.tags - {'h2'},
+            attributes=RICH_TEXT_POLICY.attributes,
+            protocols=RICH_TEXT_POLICY.protocols,
+        )
+
+        self.assertNotEqual(
+            self.sanitizer.cache_key(LONG_TEXT, narrower),
+            self.sanitizer.cache_key(LONG_TEXT, RICH_TEXT_POLICY),
+        )
+
+    def test_sanitize_many_and_local_lru(self):
+        sanitizer = HtmlSanitizer(local_cache_size=2)
+        texts = ['<p>a</p>', '', '<b onclick="x()">b</b>', '<p>a</p>']
+
+        self.assertEqual(
+            sanitizer.sanitize_many(texts, RICH_TEXT_POLICY),
+            ['<p>a</p>', '', '<b>b</b>', '<p>a</p>'],
+        )
+        sanitizer.sanitize('<i>c</i>', RICH_TEXT_POLICY)
+        self.assertEqual(len(sanitizer._local), 2)
+
+
+class BenchmarkSanitizerCommandTests(TestCase):
+    """Test benchmark_sanitizer management command."""
+
+    def setUp(self):
+        user = User.objects.create_user(username='sanitizer', email='sanitizer@example.com', password='testpass123')
+        forum = Forum.objects.create(name='Sanitizer Forum', slug='sanitizer-forum', type=Forum.FORUM_POST)
+        topic = Topic.objects.create(
+            forum=forum, poster=user, subject='Embeds',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        for text in ('<iframe src="https://codepen.io/pen/1"></iframe>', LONG_TEXT):
+            Post.objects.create(topic=topic, poster=user, subject='Re', content=text, approved=True)
+
+    def test_benchmark_reports_corpus(self):
+        out = io.StringIO()
+        call_command('benchmark_sanitizer', iterations=1, stdout=out)
+
+        self.assertIn('and 2 posts', out.getvalue())
+        self.assertIn('Rich text output matches', out.getvalue())
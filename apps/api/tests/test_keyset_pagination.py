@@ -0,0 +1,151 @@
+"""
+Tests for keyset (cursor) pagination.
+"""
+
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from rest_framework.test import APIClient
+
+from apps.api.pagination import InvalidCursor, KeysetPaginator
+from apps.api.repositories.post_repository import PostRepository
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(TestCase):
+    """Test seeking over composite keys, cursors and the opt-in endpoints."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='keyset', email='keyset@example.com', password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.forum = Forum.objects.create(name='Keyset Forum', slug='keyset-forum', type=Forum.FORUM_POST)
+        now = timezone.now()
+        for i in range(7):
+            topic = Topic.objects.create(
+                forum=self.forum, poster=self.user, subject=f'Topic {i}',
+                type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+            )
+            post = Post.objects.create(
+                topic=topic, poster=self.user, subject=topic.subject, content='Content', approved=True
+            )
+            # Ties on last_post_on and a topic without posts' activity
+            last_post_on = None if i == 3 else now - timedelta(hours=i // 2)
+            Topic.objects.filter(pk=topic.pk).update(last_post_on=last_post_on)
+            Post.objects.filter(pk=post.pk).update(created=now - timedelta(hours=i // 2))
+        self.ordering = ('-last_post_on', '-id')
+        self.expected = list(
+            Topic.objects.order_by(F('last_post_on').desc(nulls_last=True), '-id').values_list('pk', flat=True)
+        )
+
+    def _walk(self, paginator):
+        seen, cursor, page = [], None, None
+        while True:
+            page = paginator.paginate(cursor=cursor)
+            seen += [topic.pk for topic in page['results']]
+            if not page['has_next']:
+                return seen, page
+            cursor = page['next_cursor']
+
+    def test_walks_forward_and_backward(self):
+        paginator = KeysetPaginator(Topic.objects.all(), self.ordering, page_size=2)
+
+        seen, last_page = self._walk(paginator)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(self.expected[-1], Topic.objects.get(last_post_on__isnull=True).pk)
+
+        back, cursor = [], last_page['previous_cursor']
+        while cursor:
+            page = paginator.paginate(cursor=cursor)
+            back = [topic.pk for topic in page['results']] + back
+            cursor = page['previous_cursor']
+        self.assertEqual(back + [topic.pk for topic in last_page['results']], self.expected)
+        self.assertFalse(page['has_previous'])
+
+    def test_deep_pages_do_not_offset_or_count(self):
+        paginator = KeysetPaginator(Topic.objects.all(), self.ordering, page_size=2)
+        page = paginator.paginate(cursor=paginator.paginate()['next_cursor'])
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator.paginate(cursor=page['next_cursor'])
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'].upper())
+        self.assertNotIn('COUNT(', queries[0]['sql'].upper())
+
+    def test_cursor_is_signed_and_tied_to_ordering(self):
+        cursor = KeysetPaginator(Topic.objects.all(), self.ordering, page_size=2).paginate()['next_cursor']
+
+        with self.assertRaises(InvalidCursor):
+            KeysetPaginator(Topic.objects.all(), ('created', 'id'), page_size=2).paginate(cursor=cursor)
+        with self.assertRaises(InvalidCursor):
+            KeysetPaginator(Topic.objects.all(), self.ordering, page_size=2).paginate(cursor=cursor[:-2] + 'xx')
+
+    def test_optional_total(self):
+        paginator = KeysetPaginator(Topic.objects.all(), self.ordering, page_size=2)
+
+        self.assertNotIn('total_count', paginator.paginate())
+        page = paginator.paginate(include_total=True)
+        self.assertEqual((page['total_count'], page['total_is_exact']), (7, True))
+
+    def test_forum_topics_endpoint_flag(self):
+        url = reverse('api:forum_api:forum-topics', args=[self.forum.slug])
+
+        response = self.client.get(url, {'page_size': 3})
+        self.assertIn('current_page', response.data['pagination'])
+
+        seen, cursor = [], None
+        while True:
+            params = {'pagination': 'cursor', 'page_size': 3}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [topic['id'] for topic in response.data['results']]
+            cursor = response.data['pagination']['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, self.expected)
+
+        response = self.client.get(url, {'pagination': 'cursor', 'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_user_posts_endpoint_and_repository(self):
+        url = reverse('api:user-forum-posts', args=[self.user.pk])
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 4, 'total': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['posts']), 4)
+        self.assertEqual(response.data['pagination']['total_count'], 7)
+        self.assertTrue(response.data['pagination']['total_is_exact'])
+
+        response = self.client.get(url, {'pagination': 'cursor', 'cursor': response.data['pagination']['next_cursor']})
+        self.assertEqual(len(response.data['posts']), 3)
+        self.assertFalse(response.data['pagination']['has_next'])
+
+        topic = Topic.objects.first()
+        page = PostRepository().get_posts_for_topic(topic.pk, keyset=True)
+        self.assertEqual([post.topic_id for post in page['results']], [topic.pk])
+        self.assertFalse(page['has_prev'])
+
+    def test_search_pages_topics_and_posts_separately(self):
+        url = reverse('api:forum-search')
+        response = self.client.get(url, {'q': 'Topic', 'type': 'topics', 'pagination': 'cursor', 'page_size': 5})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['topics']), 5)
+        cursor = response.data['pagination']['topics']['next_cursor']
+
+        response = self.client.get(url, {'q': 'Topic', 'type': 'topics', 'pagination': 'cursor', 'topics_cursor': cursor})
+        self.assertEqual(len(response.data['topics']), 2)
+        self.assertNotIn('topics_count', response.data)
@@ -0,0 +1,145 @@
+"""
+Tests for the MinHash/LSH near-duplicate index.
+"""
+
+import io
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.forum_integration.event_bus import EventDispatcher
+from apps.forum_integration.models import PostSignature, PostSignatureBand
+from apps.forum_integration.utils import minhash
+from apps.api.services.container import container
+
+User = get_user_model()
+
+SPAM = (
+    "Learn Python fast with our exclusive bootcamp, enroll today and get "
+    "lifetime access to every course, project and mentor session we offer."
+)
+
+
+class NearDuplicateIndexTests(TestCase):
+    """Test signature indexing and LSH lookups."""
+
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.create_user(username='dup_user1', email='dup1@example.com', password='testpass123')
+        self.user2 = User.objects.create_user(username='dup_user2', email='dup2@example.com', password='testpass123')
+        self.forum = Forum.objects.create(name='Dup Forum', slug='dup-forum', type=Forum.FORUM_POST)
+        self.topic1 = self._create_topic(self.user1, 'First')
+        self.topic2 = self._create_topic(self.user2, 'Second')
+        self.index = container.get_near_duplicate_index()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _create_topic(self, user, subject):
+        return Topic.objects.create(
+            forum=self.forum, poster=user, subject=subject,
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+
+    def _create_post(self, topic, user, content):
+        post = Post.objects.create(topic=topic, poster=user, subject='Re', content=content, approved=True)
+        EventDispatcher.drain()
+        return post
+
+    def test_signature_similarity_estimate(self):
+        edited = SPAM.replace('today', 'now')
+        estimate = minhash.similarity(minhash.signature(SPAM), minhash.signature(edited))
+
+        self.assertAlmostEqual(estimate, minhash.jaccard(SPAM, edited), delta=0.15)
+        self.assertEqual(len(minhash.band_buckets(minhash.signature(SPAM))), minhash.BANDS)
+
+    def test_posts_indexed_on_save(self):
+        post = self._create_post(self.topic1, self.user1, SPAM)
+
+        self.assertTrue(PostSignature.objects.filter(post=post).exists())
+        self.assertEqual(PostSignatureBand.objects.filter(signature_id=post.pk).count(), minhash.BANDS)
+
+        post.content = 'Too short now'
+        post.save()
+        EventDispatcher.drain()
+        self.assertFalse(PostSignature.objects.filter(post=post).exists())
+
+    def test_signature_computed_once_per_save(self):
+        post = Post.objects.create(topic=self.topic1, poster=self.user1, subject='Re', content=SPAM, approved=True)
+        self.assertFalse(PostSignature.objects.filter(post=post).exists())
+
+        with mock.patch.object(minhash, 'signature', wraps=minhash.signature) as signature:
+            EventDispatcher.drain()
+            self.index.find_duplicates(post)
+
+        self.assertEqual(signature.call_count, 1)
+
+    def test_near_duplicate_found_across_users_and_topics(self):
+        original = self._create_post(self.topic1, self.user1, SPAM)
+        self._create_post(self.topic1, self.user1, "A genuine question about list comprehensions and generators in Python 3.")
+        copy = self._create_post(self.topic2, self.user2, SPAM + ' Hurry!')
+
+        self.assertEqual(self.index.find_duplicates(copy), [original.pk])
+        self.assertTrue(container.get_review_queue_service().is_duplicate_content(copy))
+
+    def test_lookup_is_one_query(self):
+        for i in range(5):
+            self._create_post(self.topic1, self.user1, f"Unrelated post number {i} about decorators, closures and scope rules.")
+        signature = minhash.signature(SPAM)
+
+        with self.assertNumQueries(1):
+            scores = self.index.candidates(signature)
+
+        self.assertEqual(scores, {})
+
+    def test_candidates_are_limited(self):
+        for i in range(3):
+            self._create_post(self.topic1, self.user1, SPAM + f' Copy {i}.')
+        signature = minhash.signature(SPAM)
+
+        self.assertEqual(len(self.index.candidates(signature)), 3)
+        self.assertEqual(len(self.index.candidates(signature, limit=2)), 2)
+
+
+class IndexPostSignaturesCommandTests(TestCase):
+    """Test backfill and benchmark commands."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='backfill', email='backfill@example.com', password='testpass123')
+        forum = Forum.objects.create(name='Backfill Forum', slug='backfill-forum', type=Forum.FORUM_POST)
+        topic = Topic.objects.create(
+            forum=forum, poster=self.user, subject='Backfill',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        self.posts = [
+            Post.objects.create(topic=topic, poster=self.user, subject='Re', content=content, approved=True)
+            for content in (SPAM, SPAM + ' Hurry!', 'Short one')
+        ]
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_backfill(self):
+        PostSignature.objects.all().delete()
+
+        out = io.StringIO()
+        call_command('index_post_signatures', chunk_size=1, stdout=out)
+
+        self.assertIn('Indexed 2 posts', out.getvalue())
+        self.assertEqual(
+            set(PostSignature.objects.values_list('post_id', flat=True)),
+            {self.posts[0].pk, self.posts[1].pk},
+        )
+        self.assertEqual(PostSignatureBand.objects.count(), 2 * minhash.BANDS)
+
+    def test_benchmark(self):
+        out = io.StringIO()
+        call_command('benchmark_duplicates', stdout=out)
+
+        self.assertIn('2 true duplicates', out.getvalue())
+        self.assertIn('lsh', out.getvalue())
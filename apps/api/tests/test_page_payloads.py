@@ -0,0 +1,107 @@
+"""
+Tests for precomputed page StreamField payloads.
+"""
+
+import io
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from wagtail.models import Page
+
+from apps.blog.models import BlogPage, HomePage, StepBasedExercisePage
+from apps.api.content_serializers import payloads
+from apps.api.content_serializers.streamfield import absolutize_media_urls
+
+User = get_user_model()
+
+
+class PagePayloadTests(TestCase):
+    """Test that page payloads are built on save and served by the API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='payloads', email='payloads@example.com', password='testpass123'
+        )
+        root = Page.objects.filter(depth=1).first() or Page.add_root(title='Root', slug='root')
+        self.home = root.add_child(instance=HomePage(
+            title='Payload Home', slug='payload-home', hero_title='Home', hero_subtitle='Home',
+            features_title='Features', live=True,
+        ))
+        self.post = self.home.add_child(instance=BlogPage(
+            title='Payload Post', slug='payload-post', intro='Intro', author=self.user,
+            date=timezone.now(), live=True,
+            body=[
+                ('heading', 'Lists'),
+                ('paragraph', '<p>Use <b onclick="x()">sorted()</b></p>'),
+            ],
+        ))
+
+    def test_payload_stored_on_save_and_served(self):
+        self.post.refresh_from_db()
+        self.assertTrue(payloads.is_current(self.post))
+        self.assertEqual(self.post.api_payload['fields']['body'][1]['value'], '<p>Use <b>sorted()</b></p>')
+
+        with patch('apps.api.content_serializers.streamfield.sanitize_rich_text') as sanitize:
+            response = self.client.get(reverse('api:blog-post-detail', args=['payload-post']))
+            sanitize.assert_not_called()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['body'], self.post.api_payload['fields']['body'])
+
+    def test_draft_revision_keeps_live_payload_until_publish(self):
+        post = BlogPage.objects.get(pk=self.post.pk)
+        post.body = [('heading', 'Draft heading')]
+        revision = post.save_revision(user=self.user)
+
+        post.refresh_from_db()
+        self.assertEqual(post.api_payload['fields']['body'][0]['value'], 'Lists')
+
+        revision.publish()
+        post.refresh_from_db()
+        self.assertEqual(post.api_payload['fields']['body'], [{'type': 'heading', 'value': 'Draft heading'}])
+
+    def test_stale_payload_serialized_on_read_and_rebuilt(self):
+        BlogPage.objects.filter(pk=self.post.pk).update(api_payload={'version': 0, 'fields': {}})
+        post = BlogPage.objects.get(pk=self.post.pk)
+
+        self.assertFalse(payloads.is_current(post))
+        self.assertEqual(payloads.page_payload(post, None)['body'][0], {'type': 'heading', 'value': 'Lists'})
+
+        out = io.StringIO()
+        call_command('rebuild_page_payloads', stdout=out)
+
+        self.assertIn('Rebuilt 1 page payloads', out.getvalue())
+        self.assertTrue(payloads.is_current(BlogPage.objects.get(pk=self.post.pk)))
+
+    def test_step_exercise_payload(self):
+        exercise = self.home.add_child(instance=StepBasedExercisePage(
+            title='Steps', slug='payload-steps', live=True,
+            exercise_steps=[
+                ('exercise_step', {'step_number': 2, 'title': 'Second', 'solutions': '{"1": "x"}'}),
+                ('exercise_step', {'step_number': 1, 'title': 'First', 'solutions': 'not json'}),
+            ],
+        ))
+
+        fields = StepBasedExercisePage.objects.get(pk=exercise.pk).api_payload['fields']
+
+        self.assertEqual([step['title'] for step in fields['exercise_steps']], ['First', 'Second'])
+        self.assertEqual(fields['exercise_steps'][1]['solutions'], {'1': 'x'})
+        self.assertEqual(fields['general_hints'], [])
+
+    def test_media_urls_made_absolute_per_request(self):
+        blocks = [
+            {'type': 'image', 'value': {'original': '/media/a.png', 'renditions': {'thumb': {'url': '/media/a.thumb.png'}}}},
+            {'type': 'heading', 'value': 'Kept'},
+        ]
+
+        result = absolutize_media_urls(blocks, RequestFactory().get('/'))
+
+        self.assertEqual(result[0]['value']['original'], 'http://testserver/media/a.png')
+        self.assertEqual(result[0]['value']['renditions']['thumb']['url'], 'http://testserver/media/a.thumb.png')
+        self.assertIs(result[1], blocks[1])
+        self.assertEqual(blocks[0]['value']['original'], '/media/a.png')
@@ -0,0 +1,92 @@
+"""
+Tests for the paginator counting strategies.
+"""
+
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.api import pagination
+from apps.api.forum.pagination import PostPagination
+from apps.api.pagination import count_rows
+
+User = get_user_model()
+
+
+@override_settings(FORUM_PAGINATION_COUNTS={'EXACT_THRESHOLD': 5, 'CACHE_TTL': 60})
+class PaginatorCountTests(TestCase):
+    """Test exact, cached and estimated paginator totals."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='counts', email='counts@example.com', password='testpass123'
+        )
+        forum = Forum.objects.create(name='Count Forum', slug='count-forum', type=Forum.FORUM_POST)
+        topic = Topic.objects.create(
+            forum=forum, poster=self.user, subject='Counts',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        for i in range(8):
+            Post.objects.create(topic=topic, poster=self.user, subject='Counts', content=f'Post {i}', approved=True)
+
+    def test_small_lists_are_exact(self):
+        self.assertEqual(count_rows(Post.objects.filter(content__in=['Post 1', 'Post 2'])), (2, True))
+
+    def test_large_filtered_lists_are_cached(self):
+        queryset = Post.objects.filter(approved=True)
+
+        self.assertEqual(count_rows(queryset), (8, True))
+        Post.objects.filter(pk=Post.objects.last().pk).update(approved=False)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(count_rows(Post.objects.filter(approved=True)), (8, False))
+        # Only the bounded probe; the full count came from the cache
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LIMIT 6', queries[0]['sql'].upper())
+
+        # A different filter has its own count
+        self.assertEqual(count_rows(Post.objects.filter(approved=False)), (1, True))
+
+    def test_large_unfiltered_lists_use_planner_estimate(self):
+        with patch.object(pagination, '_planner_estimate', return_value=1200) as estimate:
+            self.assertEqual(count_rows(Post.objects.all()), (1200, False))
+            self.assertEqual(count_rows(Post.objects.filter(approved=True)), (8, True))
+        estimate.assert_called_once()
+
+    def test_paginated_response_reports_exactness(self):
+        request = Request(APIRequestFactory().get('/', {'page_size': 3}))
+        paginator = PostPagination()
+
+        paginator.paginate_queryset(Post.objects.order_by('created'), request)
+        data = paginator.get_paginated_response([]).data['pagination']
+        self.assertEqual((data['total_count'], data['total_is_exact'], data['total_pages']), (8, True, 3))
+
+        paginator.paginate_queryset(Post.objects.order_by('created'), request)
+        self.assertFalse(paginator.get_paginated_response([]).data['pagination']['total_is_exact'])
+
+    def test_underestimated_total_still_pages_through_all_rows(self):
+        paginator = PostPagination()
+        pages = []
+
+        with patch.object(pagination, '_planner_estimate', return_value=3):
+            for number in (1, 2, 3, 4):
+                request = Request(APIRequestFactory().get('/', {'page_size': 3, 'page': number}))
+                try:
+                    rows = paginator.paginate_queryset(Post.objects.order_by('created'), request)
+                except NotFound:
+                    pages.append(None)
+                    continue
+                data = paginator.get_paginated_response([]).data['pagination']
+                pages.append((len(rows), data['has_next'], data['total_is_exact']))
+
+        self.assertEqual(pages, [(3, True, False), (3, True, False), (2, False, False), None])
+        self.assertEqual((data['total_count'], data['total_pages']), (8, 3))
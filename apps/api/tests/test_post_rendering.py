@@ -0,0 +1,103 @@
+"""
+Tests for the rendered post HTML store.
+"""
+
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from rest_framework.test import APIClient
+
+from apps.api.services.container import container
+
+User = get_user_model()
+
+
+class PostRenderCacheTests(TestCase):
+    """Test rendering on save, eviction on edit and bulk reads."""
+
+    def setUp(self):
+        self.store = container.get_post_render_cache()
+        self.store.cache.clear()
+        self.user = User.objects.create_user(
+            username='render', email='render@example.com', password='testpass123'
+        )
+        self.forum = Forum.objects.create(name='Render Forum', slug='render-forum', type=Forum.FORUM_POST)
+        self.topic = Topic.objects.create(
+            forum=self.forum, poster=self.user, subject='Rendering',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+
+    def _post(self, content):
+        return Post.objects.create(
+            topic=Topic.objects.get(pk=self.topic.pk), poster=self.user, subject='Rendering',
+            content=content, approved=True,
+        )
+
+    def test_renders_and_sanitizes(self):
+        rendered = self.store.render(
+            '# Title\n\nSome **bold** text <script>alert(1)</script> [link](javascript:alert(1))\n\n'
+            '```python\nprint("hi")\n```'
+        )
+
+        self.assertIn('<strong>bold</strong>', rendered['html'])
+        self.assertIn('class="highlight"', rendered['html'])
+        self.assertNotIn('<script', rendered['html'])
+        self.assertNotIn('alert(1)</script>', rendered['html'])
+        self.assertNotIn('javascript:', rendered['html'])
+        self.assertTrue(rendered['excerpt'].startswith('Title Some bold text'))
+
+    def test_stored_on_save_and_evicted_on_edit(self):
+        post = self._post('First **revision**')
+        first_key = self.store.cache_key(post.pk, post.updated)
+        self.assertIn('<strong>revision</strong>', self.store.cache.get(first_key)['html'])
+
+        post = Post.objects.get(pk=post.pk)
+        post.content = 'Second *revision*'
+        post.save()
+
+        self.assertIsNone(self.store.cache.get(first_key))
+        self.assertIn('<em>revision</em>', self.store.get(Post.objects.get(pk=post.pk))['html'])
+
+    def test_delete_survives_a_failing_cache(self):
+        self._post('First')
+        post = self._post('Second')
+
+        with patch.object(self.store.cache, 'delete', side_effect=ConnectionError('cache down')):
+            post.delete()
+
+        self.assertFalse(Post.objects.filter(pk=post.pk).exists())
+
+    def test_page_is_read_with_one_get_many_without_rendering(self):
+        posts = [self._post(f'Post **{i}**') for i in range(5)]
+        posts = list(Post.objects.filter(pk__in=[p.pk for p in posts]))
+
+        with patch.object(self.store.cache, 'get_many', wraps=self.store.cache.get_many) as get_many, \
+                patch.object(self.store, 'render', wraps=self.store.render) as render:
+            rendered = self.store.get_many(posts)
+
+        self.assertEqual(get_many.call_count, 1)
+        render.assert_not_called()
+        self.assertEqual(rendered[posts[2].pk]['excerpt'], 'Post 2')
+
+        # Missing entries are rendered once and stored
+        self.store.cache.clear()
+        self.store.get_many(posts)
+        with patch.object(self.store, 'render', wraps=self.store.render) as render:
+            self.store.get_many(posts)
+        render.assert_not_called()
+
+    def test_topic_posts_include_rendered_html(self):
+        self._post('A **reply**')
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(reverse('api:forum_api:topic-posts', args=[self.topic.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        result = response.data['results'][0]
+        self.assertEqual(result['content'], 'A **reply**')
+        self.assertIn('<strong>reply</strong>', result['content_html'])
+        self.assertEqual(result['excerpt'], 'A reply')
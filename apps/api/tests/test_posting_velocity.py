@@ -0,0 +1,154 @@
+"""
+Tests for the posting-velocity tracker, throttles and review checks.
+"""
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.forum_integration.models import ReviewQueue
+from apps.api.services.container import container
+from apps.api.services.posting_velocity import DEFAULT_LIMITS, PostingVelocityTracker
+
+User = get_user_model()
+
+NOW = 1_800_000_000.0  # on a day boundary
+
+
+class PostingVelocityTrackerTests(TestCase):
+    """Test bucketed sliding-window counts."""
+
+    def setUp(self):
+        cache.clear()
+        self.tracker = PostingVelocityTracker(cache)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_minute_windows_slide(self):
+        self.tracker.record(1, 'post', now=NOW - 9 * 60)
+        self.tracker.record(1, 'post', now=NOW - 60)
+        self.tracker.record(1, 'post', count=2, now=NOW)
+        self.tracker.record(2, 'post', now=NOW)
+
+        self.assertEqual(self.tracker.count(1, 'post', minutes=1, now=NOW), 2)
+        self.assertEqual(self.tracker.count(1, 'post', minutes=2, now=NOW), 3)
+        self.assertEqual(self.tracker.count(1, 'post', minutes=10, now=NOW), 4)
+        self.assertEqual(self.tracker.count(1, 'post', minutes=10, now=NOW + 9 * 60), 2)
+        self.assertEqual(self.tracker.count(1, 'topic', minutes=10, now=NOW), 0)
+
+    def test_hour_windows(self):
+        self.tracker.record(1, 'link', count=3, now=NOW - 20 * 3600)
+        self.tracker.record(1, 'link', count=2, now=NOW)
+
+        self.assertEqual(
+            self.tracker.counts(1, {'link': 1440, 'post': 60}, now=NOW),
+            {'link': 5, 'post': 0},
+        )
+        self.assertEqual(self.tracker.count(1, 'link', minutes=120, now=NOW), 2)
+        with self.assertRaises(ValueError):
+            self.tracker.count(1, 'link', minutes=2 * 1440)
+
+    def test_record_post_counts_links(self):
+        self.tracker.record_post(1, 'See https://a.example and www.b.example, or http://c.example', now=NOW)
+
+        self.assertEqual(self.tracker.counts(1, {'post': 5, 'link': 5}, now=NOW), {'post': 1, 'link': 3})
+
+    def test_limits_default_per_kind(self):
+        self.assertEqual(PostingVelocityTracker.limits(0), DEFAULT_LIMITS['THROTTLE'][0])
+        with override_settings(FORUM_POSTING_VELOCITY={'THROTTLE': {0: {'post': (3, 10)}}}):
+            self.assertEqual(PostingVelocityTracker.limits(0), {'post': (3, 10)})
+            self.assertEqual(PostingVelocityTracker.limits(1, 'REVIEW'), DEFAULT_LIMITS['REVIEW'][1])
+
+    @override_settings(FORUM_POSTING_VELOCITY={'THROTTLE': {0: {'post': (3, 10)}}})
+    def test_exceeded_reports_retry_after(self):
+        self.tracker.record(1, 'post', now=NOW - 5 * 60)
+        self.tracker.record(1, 'post', count=2, now=NOW)
+
+        reached = self.tracker.exceeded(1, trust_level=0, now=NOW)
+
+        self.assertEqual(len(reached), 1)
+        self.assertEqual((reached[0].event, reached[0].count, reached[0].limit), ('post', 3, 3))
+        # The oldest post leaves the 10 minute window in 5 minutes
+        self.assertEqual(reached[0].retry_after, 5 * 60)
+        self.assertEqual(self.tracker.exceeded(1, trust_level=3, now=NOW), [])
+        self.assertEqual(self.tracker.exceeded(1, trust_level=0, kind='REVIEW', now=NOW), [])
+
+
+@override_settings(FORUM_POSTING_VELOCITY={
+    'THROTTLE': {0: {'post': (3, 10), 'topic': (1, 60)}},
+    'REVIEW': {0: {'post': (2, 1440)}},
+})
+class PostingVelocityIntegrationTests(TestCase):
+    """Test that posting feeds the throttles and behavior checks."""
+
+    def setUp(self):
+        container.get_posting_velocity_tracker().cache.clear()
+        self.user = User.objects.create_user(
+            username='velocity', email='velocity@example.com', password='testpass123'
+        )
+        self.forum = Forum.objects.create(name='Velocity Forum', slug='velocity-forum', type=Forum.FORUM_POST)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        container.get_posting_velocity_tracker().cache.clear()
+
+    def _post(self, url, data):
+        # Posts are counted once their transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, data, format='json')
+
+    def test_post_throttle(self):
+        response = self._post(
+            reverse('api:topic-create'), {'forum_id': self.forum.id, 'subject': 'First', 'content': 'Hello'}
+        )
+        self.assertEqual(response.status_code, 201)
+        topic_id = response.data['topic']['id']
+
+        # Second topic within the hour is throttled
+        response = self._post(
+            reverse('api:topic-create'), {'forum_id': self.forum.id, 'subject': 'Second', 'content': 'Hello again'}
+        )
+        self.assertEqual(response.status_code, 429)
+
+        statuses = [
+            self._post(reverse('api:post-reply', args=[topic_id]), {'content': f'Reply {i}'}).status_code
+            for i in range(3)
+        ]
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertEqual(Post.objects.filter(poster=self.user).count(), 3)
+
+    def test_behavior_check_uses_tracker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            topic = Topic.objects.create(
+                forum=self.forum, poster=self.user, subject='Busy',
+                type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+            )
+            for i in range(3):
+                Post.objects.create(topic=topic, poster=self.user, subject='Re', content=f'Post {i}', approved=True)
+
+        container.get_review_queue_service().check_user_behavior(self.user.id)
+
+        item = ReviewQueue.objects.get(reported_user=self.user, review_type='trust_level_review')
+        self.assertEqual(item.reason, 'User posted 3 posts in 24 hours')
+
+    def test_rolled_back_posts_are_not_counted(self):
+        tracker = container.get_posting_velocity_tracker()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Topic.objects.create(
+                        forum=self.forum, poster=self.user, subject='Rolled back',
+                        type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+                    )
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+
+        self.assertEqual(tracker.count(self.user.id, 'topic', minutes=60), 0)
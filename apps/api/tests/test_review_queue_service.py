@@ -13,6 +13,7 @@ from datetime import timedelta
 
 from machina.apps.forum.models import Forum
 from machina.apps.forum_conversation.models import Topic, Post
+from apps.forum_integration.event_bus import EventDispatcher
 from apps.forum_integration.models import ReviewQueue, TrustLevel
 from apps.api.services.container import container
 from apps.api.services.review_queue_service import ReviewQueueService
@@ -268,6 +269,8 @@ class ReviewQueueServiceDuplicateDetectionTests(TestCase):
             content=content,
             approved=True
         )
+        # Index it the way the post_created subscribers do after commit
+        EventDispatcher.drain()
 
         # Create second post with same content
         post2 = Post.objects.create(
@@ -659,3 +662,215 @@ class ReviewQueueServiceUtilityTests(TestCase):
 
         # Should return 0 for nonexistent user
         self.assertEqual(trust_level, 0)
+
+
+class ReviewQueuePriorityTests(TestCase):
+    """Test static priority scores and query-time age ordering."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username='prioritytest',
+            email='priority@example.com',
+            password='pass123'
+        )
+
+    def tearDown(self):
+        """Clean up."""
+        cache.clear()
+
+    def _create_item(self, priority, hours_old=0):
+        item = ReviewQueue.objects.create(
+            review_type='user_report',
+            reported_user=self.user,
+            reason='Test',
+            priority=priority
+        )
+        if hours_old:
+            item.created_at = timezone.now() - timedelta(hours=hours_old)
+            item.save()
+        return item
+
+    def test_age_bonus_applied_at_query_time(self):
+        """Older items overtake newer ones without rewriting rows."""
+        old_medium = self._create_item(priority=3, hours_old=60)
+        new_high = self._create_item(priority=2)
+
+        ordered = list(ReviewQueue.objects.by_urgency())
+        self.assertEqual(ordered, [old_medium, new_high])
+        self.assertAlmostEqual(
+            ordered[0].effective_score, old_medium.calculate_priority_score(), places=1
+        )
+
+        # Age bonus is capped
+        later = timezone.now() + timedelta(days=30)
+        scores = dict(
+            ReviewQueue.objects.with_effective_score(now=later).values_list('id', 'effective_score')
+        )
+        self.assertAlmostEqual(scores[new_high.id], new_high.score + ReviewQueue.MAX_AGE_POINTS)
+
+    def test_capped_age_bonus_keeps_urgent_items_first(self):
+        """A weeks-old low-priority item doesn't overtake a fresh priority-1 report."""
+        old_low = self._create_item(priority=4, hours_old=20 * 24)
+        new_urgent = ReviewQueue.objects.create(
+            review_type='spam_detection', reported_user=self.user, reason='Spam', priority=1
+        )
+
+        ordered = list(ReviewQueue.objects.by_urgency())
+        self.assertEqual(ordered, [new_urgent, old_low])
+        self.assertEqual(ordered[1].effective_score, old_low.score + ReviewQueue.MAX_AGE_POINTS)
+        self.assertGreater(ordered[0].effective_score, ordered[1].effective_score)
+
+    def test_escalation_moves_item_up(self):
+        """Escalating recomputes the stored score, so the item moves up the queue."""
+        first = self._create_item(priority=3, hours_old=10)
+        second = self._create_item(priority=3, hours_old=5)
+        self.assertEqual(list(ReviewQueue.objects.by_urgency()), [first, second])
+
+        service = container.get_review_queue_service()
+        service.review_queue_repo.escalate_item(second.id, new_priority=1)
+
+        self.assertEqual(list(ReviewQueue.objects.by_urgency()), [second, first])
+        second.refresh_from_db()
+        self.assertEqual(second.score, second.calculate_static_score())
+        second_rank = second.decay_rank
+        second.refresh_scores()
+        self.assertAlmostEqual(second_rank, second.decay_rank, places=3)
+
+        # Re-reporting at a higher priority escalates the existing item
+        escalated = service.add_to_queue(
+            review_type='user_report', reason='Again', priority=2, reported_user=self.user
+        )
+        self.assertEqual(escalated.priority, 2)
+        self.assertGreater(escalated.score, first.score)
+
+    def test_recalculate_priorities_set_based(self):
+        """Static scores are recomputed with one UPDATE and logs are bulk inserted."""
+        from apps.forum_integration.models import ModerationLog
+
+        item = self._create_item(priority=3, hours_old=10)
+        other = self._create_item(priority=4)
+        effective_before = ReviewQueue.objects.with_effective_score().get(pk=item.pk).effective_score
+        TrustLevel.objects.filter(user=self.user).update(level=4)
+
+        service = container.get_review_queue_service()
+        with self.assertNumQueries(5):
+            updated = service.recalculate_priorities()
+
+        self.assertEqual(updated, 2)
+        item.refresh_from_db()
+        self.assertEqual(item.score, item.calculate_static_score())
+        effective_after = ReviewQueue.objects.with_effective_score().get(pk=item.pk).effective_score
+        self.assertAlmostEqual(effective_before - effective_after, 20, places=1)
+
+        logs = ModerationLog.objects.filter(action_type='de_escalate')
+        self.assertEqual({log.review_item_id for log in logs}, {item.id, other.id})
+        self.assertIsNone(logs[0].moderator)
+
+
+class ReviewQueueBulkReviewTests(TestCase):
+    """Test single-transaction bulk moderation."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username='bulkposter',
+            email='bulkposter@example.com',
+            password='testpass123'
+        )
+        self.moderator = User.objects.create_user(
+            username='bulkmod',
+            email='bulkmod@example.com',
+            password='modpass123',
+            is_staff=True
+        )
+        self.forum = Forum.objects.create(name='Bulk Forum', slug='bulk-forum', type=Forum.FORUM_POST)
+        self.topic = Topic.objects.create(
+            forum=self.forum,
+            poster=self.user,
+            subject='Bulk Topic',
+            type=Topic.TOPIC_POST,
+            status=Topic.TOPIC_UNLOCKED,
+            approved=True
+        )
+        Post.objects.create(topic=self.topic, poster=self.user, subject='First', content='First post', approved=True)
+        self.posts = [
+            Post.objects.create(topic=self.topic, poster=self.user, subject='Spam', content=f'Spam {i}', approved=True)
+            for i in range(3)
+        ]
+        self.items = [
+            ReviewQueue.objects.create(review_type='spam_detection', post=post, reason='Spam wave')
+            for post in self.posts
+        ]
+        self.service = container.get_review_queue_service()
+
+    def tearDown(self):
+        """Clean up."""
+        cache.clear()
+
+    def test_bulk_reject(self):
+        """Items, posts, log and topic trackers are updated together."""
+        from apps.forum_integration.models import ForumEvent, ModerationLog
+
+        resolved = self.items[2]
+        resolved.status = 'approved'
+        resolved.save()
+
+        result = self.service.bulk_review(
+            [item.pk for item in self.items] + [999999],
+            self.moderator,
+            'reject',
+            notes='Spam wave',
+        )
+
+        self.assertEqual(result['updated'], 2)
+        self.assertEqual(
+            {entry['id']: entry['result'] for entry in result['results']},
+            {self.items[0].pk: 'updated', self.items[1].pk: 'updated',
+             resolved.pk: 'already_resolved', 999999: 'not_found'},
+        )
+        self.assertEqual(
+            ReviewQueue.objects.filter(status='rejected', assigned_moderator=self.moderator).count(), 2
+        )
+        self.assertEqual(Post.objects.filter(approved=False).count(), 2)
+        self.assertEqual(ModerationLog.objects.filter(action_type='reject').count(), 2)
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.posts_count, 2)
+
+        event = ForumEvent.objects.get(event_type='moderation_batch_reviewed')
+        self.assertEqual(sorted(event.payload['post_ids']), sorted(p.pk for p in self.posts[:2]))
+
+    def test_bulk_escalate_keeps_content(self):
+        """Escalation raises priority without touching post approval."""
+        result = self.service.bulk_review([self.items[0].pk], self.moderator, 'escalate')
+
+        self.assertEqual(result['updated'], 1)
+        item = ReviewQueue.objects.get(pk=self.items[0].pk)
+        self.assertEqual((item.status, item.priority), ('escalated', 2))
+        self.assertEqual(item.score, item.calculate_static_score())
+        self.assertIsNone(item.resolved_at)
+        self.assertFalse(Post.objects.filter(approved=False).exists())
+
+    def test_query_count_is_independent_of_batch_size(self):
+        """The number of queries doesn't grow with the batch."""
+        more = [
+            ReviewQueue.objects.create(review_type='spam_detection', post=self.posts[0], reason='Dup')
+            for _ in range(10)
+        ]
+        with self.assertNumQueries(12):
+            self.service.bulk_review([self.items[0].pk], self.moderator, 'approve')
+        with self.assertNumQueries(12):
+            self.service.bulk_review([item.pk for item in more], self.moderator, 'approve')
+
+    def test_invalid_action(self):
+        """Unknown actions and oversized batches are rejected."""
+        with self.assertRaises(ValueError):
+            self.service.bulk_review([self.items[0].pk], self.moderator, 'delete')
+        with self.assertRaises(ValueError):
+            self.service.bulk_review(
+                list(range(ReviewQueueService.MAX_BULK_REVIEW_ITEMS + 1)), self.moderator, 'approve'
+            )
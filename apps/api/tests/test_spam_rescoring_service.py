@@ -0,0 +1,137 @@
+"""
+Tests for background spam rescoring.
+"""
+
+import io
+from unittest.mock import patch
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.forum_integration.event_bus import EventDispatcher
+from apps.forum_integration.models import ForumEvent, ReviewQueue, SpamRescoreJob
+from apps.api.services.container import container
+from apps.api.services.review_queue_service import ReviewQueueService
+
+User = get_user_model()
+
+SPAM = 'Buy cheap pills and win the casino lottery! Click here: bit.ly/deal'
+CLEAN = 'What is the difference between a list and a tuple in Python?'
+
+
+@patch.object(ReviewQueueService, 'SPAM_PATTERN_VERSION', '2')
+class SpamRescoringServiceTests(TestCase):
+    """Test chunked, checkpointed rescoring."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='rescore', email='rescore@example.com', password='testpass123')
+        forum = Forum.objects.create(name='Rescore Forum', slug='rescore-forum', type=Forum.FORUM_POST)
+        self.topic = Topic.objects.create(
+            forum=forum, poster=self.user, subject='Rescoring',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        self.clean = self._create_post(CLEAN)
+        self.spam = self._create_post(SPAM)
+        self.other_clean = self._create_post(CLEAN + ' Thanks!')
+
+        # Flagged under the old rules, clean under the current ones
+        self.stale = ReviewQueue.objects.create(
+            review_type='spam_detection', post=self.clean, priority=2,
+            reason='Automatic spam detection (score: 0.90)',
+        )
+        self.service = container.get_spam_rescoring_service()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _create_post(self, content):
+        return Post.objects.create(topic=self.topic, poster=self.user, subject='Re', content=content, approved=True)
+
+    def test_rescore_updates_queue_and_cache(self):
+        self.assertTrue(self.service.needs_rescore())
+
+        job = self.service.run(chunk_size=2)
+
+        self.assertIsNotNone(job.completed_at)
+        self.assertEqual(job.posts_scored, 3)
+        self.assertEqual((job.items_updated, job.items_created), (1, 1))
+
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.priority, 4)
+        self.assertIn('rules v2', self.stale.reason)
+
+        flagged = ReviewQueue.objects.get(post=self.spam, review_type='spam_detection')
+        self.assertEqual(flagged.priority, 2)
+        self.assertEqual(flagged.score, flagged.calculate_static_score())
+
+        review_service = container.get_review_queue_service()
+        cached = cache.get(f'{review_service.CACHE_VERSION}:spam:v2:post:{self.spam.pk}')
+        self.assertEqual(cached, review_service._calculate_content_spam_score(SPAM))
+        self.assertGreater(cached, 0.7)
+        self.assertFalse(self.service.needs_rescore())
+
+    def test_resumes_from_checkpoint(self):
+        job = self.service.get_job()
+        job.last_post_id = self.spam.pk
+        job.save()
+
+        job = self.service.run()
+
+        self.assertEqual(job.posts_scored, 1)
+        self.assertFalse(ReviewQueue.objects.filter(post=self.spam).exists())
+
+    def test_reviewed_posts_are_not_queued_again(self):
+        approved = ReviewQueue.objects.create(
+            review_type='spam_detection', post=self.spam, priority=4, status='approved',
+            reason='Automatic spam detection (score: 0.30)',
+        )
+
+        job = self.service.run()
+
+        self.assertEqual((job.items_updated, job.items_created), (1, 0))
+        self.assertEqual(list(ReviewQueue.objects.filter(post=self.spam)), [approved])
+
+    def test_process_pool(self):
+        job = self.service.run(processes=2)
+
+        self.assertEqual(job.posts_scored, 3)
+        self.assertTrue(ReviewQueue.objects.filter(post=self.spam, priority=2).exists())
+
+    @patch('apps.api.services.spam_rescoring_service.SpamRescoringService.DEFAULT_CHUNK_SIZE', 2)
+    def test_command_enqueues_rescore_in_steps(self):
+        ForumEvent.objects.all().delete()  # events of the setUp posts
+        out = io.StringIO()
+        call_command('rescore_spam', '--enqueue', stdout=out)
+
+        self.assertIn('rescore enqueued', out.getvalue())
+        job = SpamRescoreJob.objects.get(rules_version='2')
+        self.assertIsNone(job.completed_at)
+        self.assertEqual(job.posts_scored, 0)
+        event = ForumEvent.objects.get(event_type='spam_rules_changed')
+        event.full_clean()
+
+        # Already pending: a second deploy doesn't enqueue it again
+        self.assertIsNone(self.service.enqueue())
+
+        # One chunk per event: the first step publishes the next one
+        self.assertEqual(EventDispatcher.drain(), 2)
+
+        job.refresh_from_db()
+        self.assertIsNotNone(job.completed_at)
+        self.assertEqual(job.posts_scored, 3)
+        self.assertTrue(ReviewQueue.objects.filter(post=self.spam, priority=2).exists())
+        self.assertFalse(ForumEvent.objects.exists())
+        self.assertIsNone(self.service.enqueue())
+
+    def test_command_is_noop_once_applied(self):
+        out = io.StringIO()
+        call_command('rescore_spam', stdout=out)
+        call_command('rescore_spam', stdout=out)
+
+        self.assertIn('rescored 3 posts', out.getvalue())
+        self.assertIn('Spam rules v2 already applied', out.getvalue())
+        self.assertEqual(SpamRescoreJob.objects.count(), 1)
@@ -0,0 +1,105 @@
+"""
+Tests for the compiled spam scorer.
+"""
+
+import io
+from unittest.mock import Mock
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.api.management.commands.benchmark_spam_scorer import legacy_content_score
+from apps.api.services.review_queue_service import ReviewQueueService
+from apps.api.services.spam_scorer import SpamScorer
+
+User = get_user_model()
+
+SAMPLES = [
+    '',
+    'How do I reverse a list in Python without creating a copy?',
+    'Buy cheap pills now! Visit bit.ly/xyz and click here to win the lottery!!!',
+    'FREE DOWNLOAD!!! ABSOLUTELY FREE, ACT NOW',
+    'see http://192.168.0.1',
+    'Make money working from home: work from home and earn $500 a day. Limited time!',
+    'I tried the casino example from chapter 3 and lose weight tracking app, any tips?',
+]
+
+
+class SpamScorerTests(SimpleTestCase):
+    """Test that the compiled scorer agrees with per-pattern scoring."""
+
+    def setUp(self):
+        self.scorer = SpamScorer(ReviewQueueService.SPAM_PATTERNS, ReviewQueueService.SUSPICIOUS_LINK_PATTERNS)
+
+    def test_matches_legacy_scores(self):
+        for text in SAMPLES:
+            with self.subTest(text=text):
+                self.assertAlmostEqual(
+                    self.scorer.score_content(text),
+                    legacy_content_score(
+                        text, ReviewQueueService.SPAM_PATTERNS, ReviewQueueService.SUSPICIOUS_LINK_PATTERNS
+                    ),
+                )
+
+    def test_overlapping_patterns_all_counted(self):
+        """A match consumed by an earlier alternative doesn't hide later patterns."""
+        scorer = SpamScorer([r'(?i)\bfree money\b', r'(?i)\bmoney\b'], [])
+
+        self.assertEqual(scorer.features('Get FREE MONEY').spam_matches, 2)
+        self.assertEqual(scorer.features('Nothing to see').spam_matches, 0)
+
+    def test_same_start_patterns_all_counted(self):
+        scorer = SpamScorer([r'(?i)\bfree\b', r'(?i)\bfree money\b'], [])
+
+        self.assertEqual(scorer.features('free money here').spam_matches, 2)
+
+    def test_links_are_scanned_in_one_pass(self):
+        """A post with an ordinary link doesn't run the patterns one by one."""
+        self.scorer._compiled = {name: Mock(wraps=compiled) for name, compiled in self.scorer._compiled.items()}
+
+        features = self.scorer.features('See http://docs.python.org/3/tutorial for the details.')
+
+        self.assertTrue(features.has_http)
+        self.assertEqual((features.spam_matches, features.link_matches), (0, 0))
+        for compiled in self.scorer._compiled.values():
+            self.assertFalse(compiled.method_calls)
+
+    def test_link_patterns_stay_case_sensitive(self):
+        self.assertEqual(self.scorer.features('visit site.TK').link_matches, 0)
+        self.assertEqual(self.scorer.features('visit site.tk').link_matches, 1)
+
+    def test_score_many(self):
+        self.assertEqual(
+            self.scorer.score_many(SAMPLES),
+            [self.scorer.score_content(text) for text in SAMPLES],
+        )
+        # pattern (0.4) + punctuation (0.3); caps ratio is below the title threshold
+        self.assertEqual(self.scorer.score_many(['WIN THE LOTTERY!!!!'], kind='text'), [0.7])
+
+
+class BenchmarkSpamScorerCommandTests(TestCase):
+    """Test benchmark_spam_scorer management command."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='scorer', email='scorer@example.com', password='testpass123')
+        forum = Forum.objects.create(name='Scorer Forum', slug='scorer-forum', type=Forum.FORUM_POST)
+        topic = Topic.objects.create(
+            forum=forum, poster=user, subject='Scoring',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        for text in SAMPLES[1:]:
+            Post.objects.create(topic=topic, poster=user, subject='Re', content=text, approved=True)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_benchmark_reports_matching_scores(self):
+        out = io.StringIO()
+        call_command('benchmark_spam_scorer', iterations=1, stdout=out)
+
+        self.assertIn('Scored 6 posts', out.getvalue())
+        self.assertIn('Scores match', out.getvalue())
@@ -0,0 +1,190 @@
+"""
+Tests for the buffered topic view counter.
+"""
+
+import threading
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic
+
+from apps.api.services.container import container
+from apps.api.services.topic_views import BloomFilter, TopicViewCounter
+
+User = get_user_model()
+
+
+class TopicViewCounterTests(TestCase):
+    """Test de-duplication, buffering and batched flushes."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='viewer', email='viewer@example.com', password='testpass123'
+        )
+        forum = Forum.objects.create(name='Views Forum', slug='views-forum', type=Forum.FORUM_POST)
+        self.topics = [
+            Topic.objects.create(
+                forum=forum, poster=self.user, subject=f'Topic {i}',
+                type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+            )
+            for i in range(3)
+        ]
+        self.counter = TopicViewCounter(
+            cache=LocMemCache('test-topic-views', {}),
+            options={'FLUSH_INTERVAL': 3600, 'MAX_PENDING': 1000},
+            register_exit_flush=False,
+            flush_in_background=False,
+        )
+        self.counter.cache.clear()
+
+    def test_views_deduplicated_per_viewer_and_window(self):
+        topic = self.topics[0]
+
+        self.assertTrue(self.counter.record_view(topic.pk, 'u:1', now=0))
+        self.assertFalse(self.counter.record_view(topic.pk, 'u:1', now=10))
+        self.assertTrue(self.counter.record_view(topic.pk, 'u:2', now=10))
+        self.assertTrue(self.counter.record_view(self.topics[1].pk, 'u:1', now=10))
+        # Next window
+        self.assertTrue(self.counter.record_view(topic.pk, 'u:1', now=1800))
+
+        self.assertEqual(self.counter.pending(topic.pk), 3)
+
+    def test_pending_views_reported_and_flushed_in_batches(self):
+        first, second, third = self.topics
+        for viewer in ('a', 'b'):
+            self.counter.record_view(first.pk, viewer)
+            self.counter.record_view(second.pk, viewer)
+        self.counter.record_view(third.pk, 'a')
+
+        first.refresh_from_db()
+        self.assertEqual(first.views_count, 0)
+        self.assertEqual(self.counter.views(first), 2)
+
+        # One UPDATE per distinct delta, in one transaction
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 5)
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE')]), 2)
+
+        for topic in self.topics:
+            topic.refresh_from_db()
+        self.assertEqual([topic.views_count for topic in self.topics], [2, 2, 1])
+        self.assertEqual(self.counter.views_many(self.topics), {first.pk: 2, second.pk: 2, third.pk: 1})
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_flush_when_buffer_full(self):
+        self.counter.options['MAX_PENDING'] = 2
+
+        self.counter.record_view(self.topics[0].pk, 'a')
+        self.counter.record_view(self.topics[0].pk, 'b')
+
+        self.topics[0].refresh_from_db()
+        self.assertEqual(self.topics[0].views_count, 2)
+        self.assertEqual(self.counter.pending(self.topics[0].pk), 0)
+
+    def test_failed_flush_keeps_views(self):
+        self.counter.record_view(self.topics[0].pk, 'a')
+
+        with patch('django.db.models.query.QuerySet.update', side_effect=DatabaseError):
+            with patch('apps.api.services.topic_views.logger') as logger:
+                self.assertEqual(self.counter.flush(), 0)
+        logger.error.assert_called_once()
+
+        self.assertEqual(self.counter.flush(), 1)
+
+    def test_exit_flush_logs_errors_without_raising(self):
+        self.counter.record_view(self.topics[0].pk, 'a')
+
+        with patch('django.db.models.query.QuerySet.update', side_effect=DatabaseError('no such table')):
+            with patch('apps.api.services.topic_views.logger') as logger:
+                self.counter._flush_at_exit()
+        self.assertFalse(logger.error.call_args.kwargs['exc_info'])
+
+        with patch.object(self.counter.cache, 'decr', side_effect=RuntimeError('cache closed')):
+            with patch('apps.api.services.topic_views.logger') as logger:
+                self.counter._flush_at_exit()
+        logger.error.assert_called_once()
+
+    def test_container_instance_skips_exit_flush_under_tests(self):
+        container.clear()
+        with patch('apps.api.services.topic_views.atexit.register') as register:
+            container.get_topic_view_counter()
+        register.assert_not_called()
+
+    def test_background_flusher_runs_off_the_request(self):
+        counter = TopicViewCounter(
+            cache=LocMemCache('test-topic-views-background', {}),
+            options={'FLUSH_INTERVAL': 0.05, 'MAX_PENDING': 2},
+            register_exit_flush=False,
+        )
+        flushed = threading.Event()
+        threads = []
+
+        def flush():
+            threads.append(threading.current_thread())
+            flushed.set()
+            return 0
+
+        with patch.object(counter, 'flush', side_effect=flush):
+            counter.record_view(self.topics[0].pk, 'a')
+            # Nothing due yet: the timer flushes
+            self.assertTrue(flushed.wait(2))
+            flushed.clear()
+            counter.options['FLUSH_INTERVAL'] = 3600
+            counter.record_view(self.topics[0].pk, 'b')
+            counter.record_view(self.topics[0].pk, 'c')
+            # A full buffer wakes the flusher early
+            self.assertTrue(flushed.wait(2))
+
+        self.assertEqual({thread.name for thread in threads}, {'topic-view-flusher'})
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(bits=1024, hashes=4)
+
+        self.assertTrue(bloom.add('1:u:1'))
+        self.assertFalse(bloom.add('1:u:1'))
+        self.assertIn('1:u:1', bloom)
+        self.assertNotIn('2:u:1', bloom)
+
+
+class TopicPostsViewCountTests(TestCase):
+    """Test that fetching posts counts a view without writing the topic."""
+
+    def setUp(self):
+        # A fresh counter: viewer and topic IDs are reused between tests
+        container.clear()
+        self.counter = container.get_topic_view_counter()
+        self.counter.cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='testpass123'
+        )
+        forum = Forum.objects.create(name='Read Forum', slug='read-forum', type=Forum.FORUM_POST)
+        self.topic = Topic.objects.create(
+            forum=forum, poster=self.user, subject='Read me',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        self.counter.cache.clear()
+
+    def test_posts_pages_count_one_view(self):
+        url = reverse('api:forum_api:topic-posts', args=[self.topic.pk])
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.views_count, 0)
+
+        response = self.client.get(reverse('api:forum_api:topic-detail', args=[self.topic.pk]))
+        self.assertEqual(response.data['views_count'], 1)
+
+        self.counter.flush()
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.views_count, 1)
@@ -2,10 +2,13 @@
 Throttle classes for API rate limiting.
 
 Provides specialized throttling for resource-intensive operations
-like file uploads to prevent abuse and ensure fair usage.
+like file uploads, and trust-level posting limits for forum content,
+to prevent abuse and ensure fair usage.
 """
 
-from rest_framework.throttling import UserRateThrottle
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle, UserRateThrottle
 
 
 class FileUploadThrottle(UserRateThrottle):
@@ -59,3 +62,52 @@ class FileUploadThrottle(UserRateThrottle):
             'scope': self.scope,
             'ident': ident
         }
+
+
+class PostingVelocityThrottle(BaseThrottle):
+    """
+    Throttle for creating forum content, by trust level.
+
+    Rejects a write when the user has reached one of the THROTTLE limits of
+    their trust level in settings.FORUM_POSTING_VELOCITY. Counts come from
+    PostingVelocityTracker (cache buckets), so the check doesn't query posts.
+    Staff and trust levels without limits are never throttled; reads pass.
+
+    **Usage:**
+        @api_view(['POST'])
+        @throttle_classes([PostVelocityThrottle])
+        def post_create(request):
+            pass
+    """
+    velocity_events = ()
+
+    def allow_request(self, request, view):
+        user = request.user
+        if request.method in SAFE_METHODS or not user or not user.is_authenticated or user.is_staff:
+            return True
+
+        from apps.api.services.container import container
+
+        try:
+            trust_level = user.trust_level.level
+        except ObjectDoesNotExist:
+            trust_level = 0
+
+        reached = container.get_posting_velocity_tracker().exceeded(
+            user.pk, trust_level, events=self.velocity_events
+        )
+        self.retry_after = max((limit.retry_after for limit in reached), default=None)
+        return not reached
+
+    def wait(self):
+        return self.retry_after
+
+
+class PostVelocityThrottle(PostingVelocityThrottle):
+    """Posting-velocity throttle for new posts and replies."""
+    velocity_events = ('post',)
+
+
+class TopicVelocityThrottle(PostingVelocityThrottle):
+    """Posting-velocity throttle for new topics (each also creates a post)."""
+    velocity_events = ('topic', 'post')
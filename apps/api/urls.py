@@ -120,6 +120,9 @@ urlpatterns = [
     path('v1/topics/<int:topic_id>/subscribe/', forum_api.topic_subscribe, name='topic-subscribe'),
     path('v1/topics/<int:topic_id>/unsubscribe/', forum_api.topic_unsubscribe, name='topic-unsubscribe'),
 
+    # Reading progress (batched read receipts)
+    path('v1/forums/reading/batch/', forum_api.reading_batch, name='forum-reading-batch'),
+
     # Search & Discovery
     path('v1/forums/search/', forum_api.forum_search, name='forum-search'),
     path('v1/forums/recent-activity/', forum_api.forum_recent_activity, name='forum-recent-activity'),
@@ -132,6 +135,7 @@ urlpatterns = [
     path('v1/topics/<int:topic_id>/move/', forum_api.topic_move, name='topic-move'),
     path('v1/moderation/queue/', forum_api.moderation_queue, name='moderation-queue'),
     path('v1/moderation/queue/<int:item_id>/review/', forum_api.moderation_review, name='moderation-review'),
+    path('v1/moderation/queue/bulk-review/', forum_api.moderation_bulk_review, name='moderation-bulk-review'),
     path('v1/moderation/stats/', forum_api.moderation_stats, name='moderation-stats'),
 
     # Integrated Content API (Wagtail + Forum)
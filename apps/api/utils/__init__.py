@@ -1,6 +1,7 @@
 """
 API utilities package.
 """
+from .author_loader import AuthorLoader
 from .queryset_annotations import (
     annotate_enrollment_data,
     annotate_exercise_stats,
@@ -14,6 +15,7 @@ from .serialization import (
 )
 
 __all__ = [
+    'AuthorLoader',
     'annotate_enrollment_data',
     'annotate_exercise_stats',
     'annotate_lesson_progress',
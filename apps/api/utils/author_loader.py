@@ -0,0 +1,124 @@
+"""
+Request-scoped batch loader for forum author metadata.
+
+Author cards (trust level, points, top badges, post count) used to be read
+per post, one query per relation per author. AuthorLoader collects the
+author IDs of a page first (prime()), then fetches every relation for all
+of them with one query each the first time any of them is loaded, and
+memoizes the results for the rest of the request. A page of posts costs
+the same three queries however many authors it has. Post counts come from
+TrustLevel.posts_created, which the post signals keep current, rather than
+a COUNT over the post table.
+
+Usage:
+    from apps.api.utils.author_loader import AuthorLoader
+
+    loader = AuthorLoader.for_request(request)
+    loader.prime(post.poster_id for post in posts)
+    card = loader.load(post.poster_id)
+"""
+
+from collections import defaultdict
+
+
+class AuthorLoader:
+    """
+    DataLoader-style batcher of author metadata, memoized per request.
+    """
+
+    TOP_BADGES = 3
+    RARITY_RANK = {'legendary': 5, 'epic': 4, 'rare': 3, 'uncommon': 2, 'common': 1}
+    REQUEST_ATTRIBUTE = '_author_loader'
+
+    def __init__(self):
+        self._loaded = {}
+        self._queued = set()
+
+    @classmethod
+    def for_request(cls, request=None):
+        """
+        Get the loader of a request (a new loader when there is none).
+
+        DRF requests share the loader of the HttpRequest they wrap.
+        """
+        if request is None:
+            return cls()
+        target = getattr(request, '_request', request)
+        loader = getattr(target, cls.REQUEST_ATTRIBUTE, None)
+        if loader is None:
+            loader = cls()
+            setattr(target, cls.REQUEST_ATTRIBUTE, loader)
+        return loader
+
+    def prime(self, user_ids):
+        """Queue author IDs to be fetched with the next batch."""
+        self._queued.update(
+            user_id for user_id in user_ids if user_id is not None and user_id not in self._loaded
+        )
+
+    def is_known(self, user_id):
+        """Whether an author was loaded or is queued for the next batch."""
+        return user_id in self._loaded or user_id in self._queued
+
+    def load(self, user_id):
+        """
+        Get the card of one author, fetching the queued batch if needed.
+
+        Returns:
+            Dict with 'trust_level', 'points', 'badges' and 'posts_count'
+        """
+        return self.load_many([user_id])[user_id]
+
+    def load_many(self, user_ids):
+        """
+        Get the cards of several authors.
+
+        Returns:
+            {user ID: card}
+        """
+        user_ids = [user_id for user_id in user_ids if user_id is not None]
+        self.prime(user_ids)
+        if self._queued:
+            self._dispatch()
+        return {user_id: self._loaded[user_id] for user_id in user_ids}
+
+    def _dispatch(self):
+        """Fetch all queued authors, one query per relation."""
+        from apps.forum_integration.models import TrustLevel, UserBadge, UserPoints
+
+        user_ids = list(self._queued)
+        self._queued.clear()
+
+        levels = {
+            user_id: (level, posts_created)
+            for user_id, level, posts_created in TrustLevel.objects.filter(user_id__in=user_ids)
+            .values_list('user_id', 'level', 'posts_created')
+        }
+        points = dict(UserPoints.objects.filter(user_id__in=user_ids).values_list('user_id', 'total_points'))
+        badges = defaultdict(list)
+        earned = UserBadge.objects.filter(user_id__in=user_ids, badge__is_active=True).values_list(
+            'user_id', 'earned_at', 'badge__id', 'badge__name', 'badge__icon', 'badge__color', 'badge__rarity'
+        )
+        for user_id, earned_at, badge_id, name, icon, color, rarity in earned:
+            badges[user_id].append((self.RARITY_RANK.get(rarity, 0), earned_at, {
+                'id': badge_id,
+                'name': name,
+                'icon': icon,
+                'color': color,
+                'rarity': rarity,
+            }))
+
+        for user_id in user_ids:
+            level, posts_created = levels.get(user_id, (0, 0))
+            trust_level = TrustLevel(level=level)
+            top_badges = sorted(badges.get(user_id, ()), key=lambda badge: badge[:2], reverse=True)
+            self._loaded[user_id] = {
+                'trust_level': {
+                    'level': trust_level.level,
+                    'name': trust_level.level_name,
+                    'can_moderate': trust_level.can_moderate_basic,
+                },
+                'points': points.get(user_id, 0),
+                'badges': [badge for _, _, badge in top_badges[:self.TOP_BADGES]],
+                'posts_count': posts_created,
+            }
@@ -1090,6 +1090,7 @@ def forum_topic_detail(request, forum_slug, forum_id, topic_slug, topic_id):
             })
         
         # Format topic data
+        from apps.api.services.container import container
         topic_data = {
             'id': topic.id,
             'subject': topic.subject,
@@ -1097,7 +1098,7 @@ def forum_topic_detail(request, forum_slug, forum_id, topic_slug, topic_id):
             'created': topic.created.isoformat(),
             'updated': topic.updated.isoformat(),
             'posts_count': topic.posts_count,
-            'views_count': topic.views_count,
+            'views_count': container.get_topic_view_counter().views(topic),
             'poster': {
                 'id': topic.poster.id,
                 'username': topic.poster.username,
@@ -1144,7 +1145,9 @@ def forum_detail(request, forum_slug, forum_id):
         ).order_by('-last_post_on')[:20]  # Limit to 20 most recent topics
         
         # Format topics data
+        from apps.api.services.container import container
         topics_data = []
+        views = container.get_topic_view_counter().views_many(topics)
         for topic in topics:
             last_post_data = None
             if topic.last_post:
@@ -1163,7 +1166,7 @@ def forum_detail(request, forum_slug, forum_id):
                 'slug': topic.slug,
                 'created': topic.created.isoformat(),
                 'posts_count': topic.posts_count,
-                'views_count': topic.views_count,
+                'views_count': views[topic.id],
                 'last_post_on': topic.last_post_on.isoformat() if topic.last_post_on else None,
                 'poster': {
                     'id': topic.poster.id,
@@ -1284,13 +1287,14 @@ def topic_create(request):
         forum.refresh_from_db()
         
         # Return successful response
+        from apps.api.services.container import container
         topic_data = {
             'id': topic.id,
             'subject': topic.subject,
             'slug': topic.slug,
             'created': topic.created.isoformat(),
             'posts_count': topic.posts_count,
-            'views_count': getattr(topic, 'views_count', 0),
+            'views_count': container.get_topic_view_counter().views(topic),
             'forum': {
                 'id': forum.id,
                 'name': forum.name,
@@ -1388,13 +1392,14 @@ def topic_edit(request, topic_id):
             updated_topic = post.topic
             
             # Return updated topic data
+            from apps.api.services.container import container
             topic_data = {
                 'id': updated_topic.id,
                 'subject': updated_topic.subject,
                 'slug': updated_topic.slug,
                 'updated': updated_topic.updated.isoformat(),
                 'posts_count': updated_topic.posts_count,
-                'views_count': updated_topic.views_count,
+                'views_count': container.get_topic_view_counter().views(updated_topic),
                 'forum': {
                     'id': updated_topic.forum.id,
                     'name': updated_topic.forum.name,
@@ -1859,6 +1864,8 @@ def dashboard_forum_stats(request):
         from django.utils import timezone
         from datetime import timedelta
         
+        from apps.api.services.container import container
+        
         User = get_user_model()
         
         # Get user's recent activity
@@ -1892,6 +1899,7 @@ def dashboard_forum_stats(request):
             })
         
         recent_topics_data = []
+        views = container.get_topic_view_counter().views_many(user_recent_topics)
         for topic in user_recent_topics:
             recent_topics_data.append({
                 'id': topic.id,
@@ -1899,7 +1907,7 @@ def dashboard_forum_stats(request):
                 'slug': topic.slug,
                 'created': topic.created.isoformat(),
                 'posts_count': topic.posts_count,
-                'views_count': topic.views_count,
+                'views_count': views[topic.id],
                 'forum': {
                     'id': topic.forum.id,
                     'name': topic.forum.name,
@@ -1908,7 +1916,6 @@ def dashboard_forum_stats(request):
             })
         
         # Get overall forum statistics using the centralized service
-        from apps.api.services.container import container
         stats_service = container.get_statistics_service()
         overall_stats = stats_service.get_forum_statistics()
         total_forums = Forum.objects.filter(type=Forum.FORUM_POST).count()
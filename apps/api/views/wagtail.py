@@ -8,6 +8,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.api.content_serializers.payloads import page_payload
 from apps.api.content_serializers.streamfield import serialize_streamfield
 from apps.api.utils import serialize_tags, get_featured_image_url
 
@@ -152,8 +153,8 @@ def blog_post_detail(request: Request, post_slug: str) -> Response:
         # Get tags
         tags = [tag.name for tag in post.tags.all()]
         
-        # Serialize full body content via shared serializer
-        body_content = serialize_streamfield(post.body, request)
+        # Body content serialized on publish; only media URLs are per request
+        body_content = page_payload(post, request)['body']
         
         # Get related posts with optimized prefetch
         related_posts = BlogPage.objects.live().public().exclude(
@@ -936,51 +937,11 @@ def exercise_detail(request: Request, exercise_slug: str) -> Response:
                 except (ValueError, json.JSONDecodeError):
                     alternative_solutions = {}
         
-        # Serialize exercise content
-        exercise_content = []
-        if exercise.exercise_content:
-            for block in exercise.exercise_content:
-                if block.block_type == 'instruction':
-                    exercise_content.append({
-                        'type': 'instruction',
-                        'value': str(block.value)
-                    })
-                elif block.block_type == 'code_example':
-                    exercise_content.append({
-                        'type': 'code_example',
-                        'title': block.value.get('title', ''),
-                        'language': block.value.get('language', 'python'),
-                        'code': block.value.get('code', ''),
-                        'explanation': str(block.value.get('explanation', ''))
-                    })
-                elif block.block_type == 'hint_block':
-                    exercise_content.append({
-                        'type': 'hint_block',
-                        'hint_type': block.value.get('hint_type', 'general'),
-                        'content': str(block.value.get('content', ''))
-                    })
-        
-        # Serialize test cases
-        test_cases = []
-        if exercise.test_cases:
-            for block in exercise.test_cases:
-                if block.block_type == 'test_case':
-                    test_cases.append({
-                        'input': block.value.get('input', ''),
-                        'expected_output': block.value.get('expected_output', ''),
-                        'description': block.value.get('description', ''),
-                        'is_hidden': block.value.get('is_hidden', False)
-                    })
-        
-        # Serialize hints
-        hints_data = []
-        if exercise.hints:
-            for block in exercise.hints:
-                if block.block_type == 'hint':
-                    hints_data.append({
-                        'hint_text': str(block.value.get('hint_text', '')),
-                        'reveal_after_attempts': block.value.get('reveal_after_attempts', 3)
-                    })
+        # StreamFields serialized on publish
+        payload = page_payload(exercise, request)
+        exercise_content = payload['exercise_content']
+        test_cases = payload['test_cases']
+        hints_data = payload['hints']
 
         # Get context (lesson and course info)
         # Cache parent lookups to avoid N+1 queries (prevents calling get_parent() multiple times)
@@ -1056,48 +1017,11 @@ def step_exercise_detail(request: Request, exercise_slug: str) -> Response:
             slug=exercise_slug
         )
         
-        # Serialize exercise steps
-        steps = []
-        if exercise.exercise_steps:
-            for block in exercise.exercise_steps:
-                if block.block_type == 'exercise_step':
-                    step_data = {
-                        'step_number': block.value.get('step_number', 1),
-                        'title': block.value.get('title', ''),
-                        'description': str(block.value.get('description', '')),
-                        'exercise_type': block.value.get('exercise_type', 'code'),
-                        'template': block.value.get('template', ''),
-                        'points': block.value.get('points', 10),
-                        'success_message': block.value.get('success_message', ''),
-                        'hint': block.value.get('hint', ''),
-                    }
-                    
-                    # Parse solutions JSON for this step
-                    solutions_text = block.value.get('solutions', '')
-                    if solutions_text:
-                        try:
-                            import json
-                            step_data['solutions'] = json.loads(solutions_text)
-                        except (ValueError, json.JSONDecodeError):
-                            step_data['solutions'] = {}
-                    else:
-                        step_data['solutions'] = {}
-                    
-                    steps.append(step_data)
-        
-        # Sort steps by step_number
-        steps.sort(key=lambda x: x['step_number'])
-        
-        # Serialize general hints
-        general_hints = []
-        if exercise.general_hints:
-            for block in exercise.general_hints:
-                if block.block_type == 'hint':
-                    general_hints.append({
-                        'hint_text': str(block.value.get('hint_text', '')),
-                        'reveal_after_attempts': block.value.get('reveal_after_attempts', 3)
-                    })
-        
+        # StreamFields serialized on publish (steps sorted by step_number)
+        payload = page_payload(exercise, request)
+        steps = payload['exercise_steps']
+        general_hints = payload['general_hints']
+
         # Get context (lesson and course info)
         # Cache parent lookups to avoid N+1 queries (prevents calling get_parent() multiple times)
         parent_page = exercise.get_parent()
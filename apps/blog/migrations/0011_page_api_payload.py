@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_coursepage_course_page_featured_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpage',
+            name='api_payload',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='exercisepage',
+            name='api_payload',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lessonpage',
+            name='api_payload',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='stepbasedexercisepage',
+            name='api_payload',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -33,6 +33,20 @@ except ImportError:
 User = get_user_model()
 
 
+class ApiPayloadMixin(models.Model):
+    """
+    Precomputed, versioned API serialization of a page's StreamFields.
+
+    Filled in whenever the page is saved with changed content (e.g. on
+    publish) by apps.api.content_serializers.payloads, so API views can
+    return it without walking and sanitizing the blocks on every request.
+    """
+    api_payload = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+
 class HomePage(Page):
     """
     Home page for the Python Learning Studio.
@@ -181,7 +195,7 @@ class BlogIndexPage(Page):
         return context
 
 
-class BlogPage(Page):
+class BlogPage(ApiPayloadMixin, Page):
     """
     Individual blog post page.
     """
@@ -748,7 +762,7 @@ class CoursePage(Page):
         super().save(*args, **kwargs)
 
 
-class LessonPage(Page):
+class LessonPage(ApiPayloadMixin, Page):
     """
     Individual lesson page with interactive content and exercises.
     Complements the existing Lesson Django model.
@@ -934,7 +948,7 @@ class LessonPage(Page):
         return context
 
 
-class ExercisePage(Page):
+class ExercisePage(ApiPayloadMixin, Page):
     """
     Interactive coding exercise page with validation and hints.
     Enhanced for headless CMS with fill-in-blank templates and progressive hints.
@@ -1211,7 +1225,7 @@ class ExercisePage(Page):
                 raise ValidationError('Either starter code or solution code is required for coding exercises')
 
 
-class StepBasedExercisePage(Page):
+class StepBasedExercisePage(ApiPayloadMixin, Page):
     """
     Multi-step exercise page for progressive learning experiences.
     Each step can be a different exercise type with its own validation.
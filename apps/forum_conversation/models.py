@@ -5,14 +5,25 @@ This module overrides django-machina's Post and Topic models to change
 on_delete=CASCADE to on_delete=SET_NULL for the poster foreign key.
 
 This preserves forum content when users delete their accounts (GDPR compliance).
+
+Both models also keep topic and forum trackers up to date incrementally
+(see trackers.py) instead of machina's full recomputation on every save.
+Posts are rendered to HTML when saved (see apps.api.services.post_rendering).
 """
 
+import logging
 from django.conf import settings
 from django.db import models
+from django.utils.encoding import force_str
+from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
 from machina.apps.forum_conversation.abstract_models import AbstractTopic, AbstractPost
 
+from . import trackers
+
+logger = logging.getLogger(__name__)
+
 
 class Topic(AbstractTopic):
     """
@@ -21,6 +32,7 @@ class Topic(AbstractTopic):
     Changes from AbstractTopic:
     - poster: on_delete=CASCADE → on_delete=SET_NULL
     - Add poster_username field to cache username for display after deletion
+    - save()/delete() update forum trackers incrementally
 
     GDPR Compliance:
     When a user deletes their account, their topics are preserved with:
@@ -51,6 +63,27 @@ class Topic(AbstractTopic):
         abstract = False
         app_label = 'forum_conversation'
 
+    def save(self, *args, **kwargs):
+        """Save the topic and apply changes of its approval or counts to its forum."""
+        previous = trackers.tracked_state(self.pk) if self.pk else None
+
+        self.slug = slugify(force_str(self.subject), allow_unicode=True) or 'topic'
+        super(AbstractTopic, self).save(*args, **kwargs)
+
+        if previous and previous['forum_id'] != self.forum_id:
+            # Moved: recompute both forums (rare, moderator action)
+            self.update_trackers()
+            type(self.forum).objects.get(pk=previous['forum_id']).update_trackers()
+        else:
+            trackers.topic_saved(self, previous)
+
+    def delete(self, using=None):
+        """Delete the topic and remove its contribution from its forum."""
+        previous = trackers.tracked_state(self.pk)
+        result = super(AbstractTopic, self).delete(using)
+        trackers.topic_deleted(previous)
+        return result
+
 
 class Post(AbstractPost):
     """
@@ -59,6 +92,8 @@ class Post(AbstractPost):
     Changes from AbstractPost:
     - poster: on_delete=CASCADE → on_delete=SET_NULL
     - username field (inherited) already handles caching
+    - save()/delete() update topic and forum trackers incrementally
+    - save() stores the rendered HTML of the new revision
 
     GDPR Compliance:
     When a user deletes their account, their posts are preserved with:
@@ -84,6 +119,42 @@ class Post(AbstractPost):
         abstract = False
         app_label = 'forum_conversation'
 
+    def save(self, *args, **kwargs):
+        """Save the post, update its topic's and forum's trackers and render it."""
+        created = self.pk is None
+        was_approved, previous_updated = False, None
+        if not created:
+            was_approved, previous_updated = (
+                type(self).objects.filter(pk=self.pk).values_list('approved', 'updated').first()
+                or (False, None)
+            )
+
+        super(AbstractPost, self).save(*args, **kwargs)
+        trackers.post_saved(self, created, was_approved)
+
+        from apps.api.services.container import container
+        try:
+            container.get_post_render_cache().store(self, previous_updated)
+        except Exception as e:
+            # Rendered on the next read instead
+            logger.warning(f"Failed to store rendered post {self.pk}: {e}")
+
+    def delete(self, using=None):
+        """Delete the post (or its topic if it is the only post) and update trackers."""
+        if self.is_alone:
+            return self.topic.delete()
+        post_id = self.pk
+        result = super(AbstractPost, self).delete(using)
+        trackers.post_deleted(self, post_id)
+
+        from apps.api.services.container import container
+        try:
+            container.get_post_render_cache().evict(post_id, self.updated)
+        except Exception as e:
+            # The entry is keyed by revision and expires on its own
+            logger.warning(f"Failed to evict rendered post {post_id}: {e}")
+        return result
+
 
 # CRITICAL: Import machina models AFTER custom models
 # This ensures our custom models are loaded instead of the defaults
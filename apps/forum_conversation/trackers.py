@@ -0,0 +1,278 @@
+"""
+Incremental maintenance of topic and forum trackers.
+
+django-machina recomputes trackers after every post or topic change:
+Topic.update_trackers() counts the topic's posts, then
+Forum.update_trackers() counts the forum's topics and sums their posts.
+Here the same trackers are kept up to date with F() increments and
+decrements and conditional updates of the last post, so a new post costs a
+few single-row UPDATEs whatever the size of the forum.
+
+A topic contributes to its forum's trackers while it is approved: one topic,
+its posts_count posts and its last post. Every change is applied as the
+difference between a topic's contribution before and after it.
+
+Forum counts are direct counts (posts and topics of the forum itself);
+machina's forum visibility tree adds up sub-forums when displaying them, so
+ancestors have nothing to update. The full recomputations stay available as
+the reconciliation path: Topic.update_trackers(), Forum.update_trackers()
+and the rebuild_topic_trackers/rebuild_forum_trackers commands.
+"""
+
+from collections import namedtuple
+
+from django.db.models import BigIntegerField, Case, DateTimeField, F, Q, Value, When
+from django.db.models.functions import Greatest
+
+
+# A topic's share of its forum's trackers
+Contribution = namedtuple('Contribution', 'topics posts last_post_id last_post_on')
+
+NO_CONTRIBUTION = Contribution(0, 0, None, None)
+
+TRACKED_TOPIC_FIELDS = ('forum_id', 'approved', 'posts_count', 'first_post_id', 'last_post_id', 'last_post_on')
+
+
+def contribution(approved, posts_count, last_post_id, last_post_on):
+    if not approved:
+        return NO_CONTRIBUTION
+    return Contribution(1, posts_count, last_post_id, last_post_on)
+
+
+def topic_contribution(topic):
+    """Contribution of a Topic instance (or a dict of TRACKED_TOPIC_FIELDS)."""
+    if topic is None:
+        return NO_CONTRIBUTION
+    if isinstance(topic, dict):
+        return contribution(topic['approved'], topic['posts_count'], topic['last_post_id'], topic['last_post_on'])
+    return contribution(topic.approved, topic.posts_count, topic.last_post_id, topic.last_post_on)
+
+
+def _adjust(field, delta):
+    if delta >= 0:
+        return F(field) + delta
+    return Greatest(F(field) + delta, 0)
+
+
+def _latest_on(post_id, posted_on):
+    """Set a last post unless a later one is already recorded."""
+    newer = Q(last_post_on__isnull=True) | Q(last_post_on__lte=posted_on)
+    return {
+        'last_post_id': Case(
+            When(newer, then=Value(post_id)), default=F('last_post_id'), output_field=BigIntegerField()
+        ),
+        'last_post_on': Case(
+            When(newer, then=Value(posted_on)), default=F('last_post_on'), output_field=DateTimeField()
+        ),
+    }
+
+
+# ========================================
+# Forums
+# ========================================
+
+def apply_forum_change(forum_id, before, after):
+    """
+    Apply the change of a topic's contribution to its forum's trackers.
+
+    Args:
+        forum_id: Forum ID
+        before: Contribution before the change
+        after: Contribution after the change
+    """
+    from machina.apps.forum.models import Forum
+
+    if not forum_id or before == after:
+        return
+
+    updates = {}
+    if after.topics != before.topics:
+        updates['direct_topics_count'] = _adjust('direct_topics_count', after.topics - before.topics)
+    if after.posts != before.posts:
+        updates['direct_posts_count'] = _adjust('direct_posts_count', after.posts - before.posts)
+    if after.last_post_id and after.last_post_id != before.last_post_id:
+        updates.update(_latest_on(after.last_post_id, after.last_post_on))
+    if updates:
+        Forum.objects.filter(pk=forum_id).update(**updates)
+
+    # The forum may still point at a last post the topic no longer contributes,
+    # unless the update above replaced it with a later one
+    superseded = after.last_post_id and before.last_post_on and after.last_post_on >= before.last_post_on
+    if before.last_post_id and before.last_post_id != after.last_post_id and not superseded:
+        refresh_forum_last_post(forum_id, stale_post_id=before.last_post_id)
+
+
+def refresh_forum_last_post(forum_id, stale_post_id=None):
+    """
+    Point a forum at the last post of its latest approved topic.
+
+    Args:
+        forum_id: Forum ID
+        stale_post_id: Only refresh if the forum currently points at this post
+            (or at no post: deleting its last post clears the reference)
+    """
+    from machina.apps.forum.models import Forum
+    from machina.apps.forum_conversation.models import Topic
+
+    forums = Forum.objects.filter(pk=forum_id)
+    if stale_post_id is not None:
+        forums = forums.filter(Q(last_post_id=stale_post_id) | Q(last_post_id__isnull=True))
+        if not forums.exists():
+            return
+
+    latest = (
+        Topic.objects.filter(forum_id=forum_id, approved=True, last_post_on__isnull=False)
+        .order_by('-last_post_on')
+        .values('last_post_id', 'last_post_on')
+        .first()
+    ) or {'last_post_id': None, 'last_post_on': None}
+    forums.update(**latest)
+
+
+# ========================================
+# Topics
+# ========================================
+
+def topic_saved(topic, previous):
+    """
+    Apply a saved topic's change to its forum (Topic.save()).
+
+    Args:
+        topic: Saved topic
+        previous: Dict of TRACKED_TOPIC_FIELDS before the save, or None if created
+    """
+    apply_forum_change(topic.forum_id, topic_contribution(previous), topic_contribution(topic))
+
+
+def topic_deleted(previous):
+    """
+    Remove a deleted topic's contribution from its forum (Topic.delete()).
+
+    Args:
+        previous: Dict of TRACKED_TOPIC_FIELDS before the deletion
+    """
+    if previous is not None:
+        apply_forum_change(previous['forum_id'], topic_contribution(previous), NO_CONTRIBUTION)
+
+
+def tracked_state(topic_id):
+    """Current TRACKED_TOPIC_FIELDS of a topic, or None if it doesn't exist."""
+    from machina.apps.forum_conversation.models import Topic
+
+    return Topic.objects.filter(pk=topic_id).values(*TRACKED_TOPIC_FIELDS).first()
+
+
+def refresh_topic(topic_id, previous):
+    """
+    Recompute one topic's trackers and apply the difference to its forum.
+
+    Used after bulk changes that bypass Post.save(); only the topic's own
+    posts are queried.
+
+    Args:
+        topic_id: Topic ID
+        previous: Dict of TRACKED_TOPIC_FIELDS before the change
+    """
+    from machina.apps.forum_conversation.models import Post, Topic
+
+    topic = Topic.objects.filter(pk=topic_id).values('approved').first()
+    if topic is None:
+        topic_deleted(previous)
+        return
+
+    posts = Post.objects.filter(topic_id=topic_id)
+    last = posts.filter(approved=True).order_by('-created').values('id', 'created').first()
+    current = {
+        'forum_id': previous['forum_id'],
+        'approved': topic['approved'],
+        'posts_count': posts.filter(approved=True).count(),
+        'first_post_id': posts.order_by('created').values_list('id', flat=True).first(),
+        'last_post_id': last['id'] if last else None,
+        'last_post_on': last['created'] if last else None,
+    }
+    Topic.objects.filter(pk=topic_id).update(
+        posts_count=current['posts_count'],
+        first_post_id=current['first_post_id'],
+        last_post_id=current['last_post_id'],
+        last_post_on=current['last_post_on'],
+    )
+    apply_forum_change(previous['forum_id'], topic_contribution(previous), topic_contribution(current))
+
+
+# ========================================
+# Posts
+# ========================================
+
+def post_saved(post, created, was_approved):
+    """
+    Update the trackers of a saved post's topic and forum (Post.save()).
+
+    As in machina, the first post of a topic sets the topic's subject and
+    approval flag.
+
+    Args:
+        post: Saved post
+        created: True if the post was just created
+        was_approved: Approval flag of the post before the save
+    """
+    topic = post.topic
+    previous = topic_contribution(topic)
+    updates = {}
+
+    if created and topic.first_post_id is None:
+        topic.first_post = post
+        updates['first_post_id'] = post.pk
+    if topic.first_post_id == post.pk and (post.subject != topic.subject or post.approved != topic.approved):
+        topic.subject = post.subject
+        topic.approved = post.approved
+        updates.update(subject=post.subject, approved=post.approved)
+
+    delta = int(post.approved) - int(bool(was_approved))
+    _apply_post_change(topic, post.pk, post.created, delta, updates, previous)
+
+
+def post_deleted(post, post_id):
+    """
+    Update the trackers of a deleted post's topic and forum (Post.delete()).
+
+    Args:
+        post: Deleted post (its topic still exists)
+        post_id: ID the post had (deleting it resets post.pk)
+    """
+    from machina.apps.forum_conversation.models import Post
+
+    topic = post.topic
+    previous = topic_contribution(topic)
+    updates = {}
+
+    if topic.first_post_id in (None, post_id):
+        topic.first_post_id = (
+            Post.objects.filter(topic_id=topic.pk).order_by('created').values_list('id', flat=True).first()
+        )
+        updates['first_post_id'] = topic.first_post_id
+
+    _apply_post_change(topic, post_id, post.created, -1 if post.approved else 0, updates, previous)
+
+
+def _apply_post_change(topic, post_id, posted_on, delta, updates, previous):
+    from machina.apps.forum_conversation.models import Post, Topic
+
+    if delta:
+        updates['posts_count'] = _adjust('posts_count', delta)
+        topic.posts_count = max(topic.posts_count + delta, 0)
+    if delta > 0:
+        updates.update(_latest_on(post_id, posted_on))
+        if topic.last_post_on is None or topic.last_post_on <= posted_on:
+            topic.last_post_id, topic.last_post_on = post_id, posted_on
+    elif delta < 0 and topic.last_post_id == post_id:
+        last = (
+            Post.objects.filter(topic_id=topic.pk, approved=True).exclude(pk=post_id)
+            .order_by('-created').values('id', 'created').first()
+        )
+        topic.last_post_id = last['id'] if last else None
+        topic.last_post_on = last['created'] if last else None
+        updates.update(last_post_id=topic.last_post_id, last_post_on=topic.last_post_on)
+
+    if updates:
+        Topic.objects.filter(pk=topic.pk).update(**updates)
+    apply_forum_change(topic.forum_id, previous, topic_contribution(topic))
@@ -0,0 +1,160 @@
+"""
+Compiled achievement requirement rules.
+
+``Achievement.requirements`` JSON such as ``{"min_trust_level": 2, "min_points": 500}``
+is compiled once into a tuple of (feature, threshold) conditions. Users are
+then evaluated against every active achievement from a feature vector loaded
+with a single query, instead of interpreting the JSON and querying counters
+per achievement.
+"""
+
+import logging
+from collections import namedtuple
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Achievement, ForumUserAchievement, UserBadge
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+CompiledAchievement = namedtuple('CompiledAchievement', ['id', 'name', 'points_reward', 'conditions'])
+
+
+class AchievementRules:
+    """
+    Compiles achievement requirements and evaluates them against user features.
+    """
+
+    CACHE_KEY = 'v1:gamification:achievement_rules'
+    CACHE_TIMEOUT = 3600
+
+    # Requirement keys are "min_<feature>". A feature is None when the row it
+    # comes from (TrustLevel, UserPoints) doesn't exist, which fails the rule.
+    FEATURES = (
+        'trust_level',
+        'badges',
+        'points',
+        'streak',
+        'longest_streak',
+        'posts_created',
+        'topics_created',
+        'likes_received',
+        'likes_given',
+        'days_visited',
+    )
+
+    @classmethod
+    def compile(cls, requirements):
+        """
+        Compile a requirements dict into a tuple of (feature, threshold) pairs.
+
+        Unknown keys are ignored, as they always have been.
+        """
+        conditions = []
+        for key, threshold in (requirements or {}).items():
+            feature = key[len('min_'):] if key.startswith('min_') else None
+            if feature not in cls.FEATURES:
+                logger.warning(f"Ignoring unknown achievement requirement '{key}'")
+                continue
+            conditions.append((feature, threshold))
+        return tuple(conditions)
+
+    @classmethod
+    def get_compiled(cls):
+        """
+        Get the compiled rules for all active achievements.
+        """
+        rules = cache.get(cls.CACHE_KEY)
+        if rules is None:
+            rules = [
+                CompiledAchievement(
+                    id=achievement.id,
+                    name=achievement.name,
+                    points_reward=achievement.points_reward,
+                    conditions=cls.compile(achievement.requirements),
+                )
+                for achievement in Achievement.objects.filter(is_active=True)
+            ]
+            cache.set(cls.CACHE_KEY, rules, timeout=cls.CACHE_TIMEOUT)
+        return rules
+
+    @classmethod
+    def invalidate(cls):
+        cache.delete(cls.CACHE_KEY)
+
+    @classmethod
+    def feature_vectors(cls, user_ids):
+        """
+        Load the feature vectors for many users in one query.
+
+        Returns a dict mapping user_id -> {feature: value}.
+        """
+        badge_count = (
+            UserBadge.objects.filter(user=OuterRef('pk'))
+            .order_by()
+            .values('user')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        rows = User.objects.filter(pk__in=user_ids).order_by().values(
+            'pk',
+            trust_level_value=F('trust_level__level'),
+            points_value=F('points__total_points'),
+            streak_value=F('points__current_streak'),
+            longest_streak_value=F('points__longest_streak'),
+            posts_created_value=F('trust_level__posts_created'),
+            topics_created_value=F('trust_level__topics_created'),
+            likes_received_value=F('trust_level__likes_received'),
+            likes_given_value=F('trust_level__likes_given'),
+            days_visited_value=F('trust_level__days_visited'),
+            badges_value=Coalesce(Subquery(badge_count, output_field=IntegerField()), 0),
+        )
+        return {
+            row['pk']: {feature: row[f'{feature}_value'] for feature in cls.FEATURES}
+            for row in rows
+        }
+
+    @staticmethod
+    def matches(conditions, features):
+        """Evaluate compiled conditions against a feature vector."""
+        if features is None:
+            return False
+        for feature, threshold in conditions:
+            value = features[feature]
+            if value is None or value < threshold:
+                return False
+        return True
+
+    @classmethod
+    def find_unearned(cls, user_ids, rules=None):
+        """
+        Find achievements users qualify for but haven't earned yet.
+
+        Two queries for any number of users and achievements: the feature
+        vectors and the already earned pairs.
+
+        Returns a dict mapping user_id -> [CompiledAchievement, ...].
+        """
+        if rules is None:
+            rules = cls.get_compiled()
+        if not rules:
+            return {}
+
+        vectors = cls.feature_vectors(user_ids)
+        earned = set(
+            ForumUserAchievement.objects.filter(user_id__in=user_ids)
+            .values_list('user_id', 'achievement_id')
+        )
+
+        unearned = {}
+        for user_id, features in vectors.items():
+            qualified = [
+                rule for rule in rules
+                if (user_id, rule.id) not in earned and cls.matches(rule.conditions, features)
+            ]
+            if qualified:
+                unearned[user_id] = qualified
+        return unearned
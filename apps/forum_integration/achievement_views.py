@@ -11,6 +11,7 @@ from django.core.paginator import Paginator
 from django.db.models import Count, Q
 from .models import Badge, UserBadge, UserPoints, PointHistory, BadgeCategory, Achievement, ForumUserAchievement
 from .gamification_service import GamificationService
+from .badge_progress_service import BadgeProgressService
 
 User = get_user_model()
 
@@ -30,21 +31,22 @@ def achievement_dashboard(request):
     recent_points = PointHistory.objects.filter(user=user)[:10]
     
     # Get progress toward next badges
+    snapshot = BadgeProgressService.get_snapshot(user)
     available_badges = Badge.objects.filter(
         is_active=True,
         is_hidden=False
     ).exclude(
-        id__in=UserBadge.objects.filter(user=user).values_list('badge_id', flat=True)
+        id__in=snapshot['earned']
     ).select_related('category')[:6]
     
-    # Calculate progress for available badges
+    # Progress values come from the cached snapshot
     badge_progress = []
     for badge in available_badges:
-        progress = badge.calculate_progress(user)
+        progress = snapshot['progress'].get(badge.id, 0)
         badge_progress.append({
             'badge': badge,
             'progress': progress,
-            'percentage': min(100, (progress / badge.condition_value) * 100) if badge.condition_value > 0 else 0
+            'percentage': BadgeProgressService.percentage(badge, progress)
         })
     
     # Get leaderboard position
@@ -173,7 +175,7 @@ def badge_detail(request, badge_id):
     # Calculate progress if not earned
     progress = None
     if not user_badge:
-        progress = badge.calculate_progress(request.user)
+        progress = BadgeProgressService.get_progress(request.user, badge)
     
     # Get other users who have this badge (recent earners)
     recent_earners = UserBadge.objects.filter(badge=badge).select_related(
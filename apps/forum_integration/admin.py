@@ -182,12 +182,12 @@ class ReviewQueueAdmin(admin.ModelAdmin):
     actions = ['approve_selected', 'reject_selected', 'assign_to_me']
     
     def approve_selected(self, request, queryset):
-        count = queryset.filter(status='pending').update(status='approved')
+        count = queryset.filter(status='pending').transition('approved')
         self.message_user(request, f"Approved {count} items.")
     approve_selected.short_description = "Approve selected pending items"
     
     def reject_selected(self, request, queryset):
-        count = queryset.filter(status='pending').update(status='rejected')
+        count = queryset.filter(status='pending').transition('rejected')
         self.message_user(request, f"Rejected {count} items.")
     reject_selected.short_description = "Reject selected pending items"
     
@@ -10,3 +10,4 @@ class ForumIntegrationConfig(AppConfig):
         """Import signals when the app is ready"""
         import apps.forum_integration.signals
         import apps.forum_integration.cache_signals
+        import apps.forum_integration.event_handlers
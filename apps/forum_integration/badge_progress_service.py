@@ -0,0 +1,306 @@
+"""
+Per-user badge progress snapshots.
+
+Badge progress used to be recomputed badge by badge (``Badge.calculate_progress``)
+on every gamification event and again on every achievements page view. This
+service keeps one cached snapshot per user instead: the counters the badge
+conditions are based on, the earned badge ids, and a vector of progress values
+for every active badge. Events refresh the counters once and re-derive the
+whole vector in memory.
+"""
+
+import logging
+from collections import namedtuple
+from uuid import uuid4
+from django.core.cache import cache
+from django.utils import timezone
+from .models import Badge, ModerationLog, TrustLevel, UserBadge
+
+logger = logging.getLogger(__name__)
+
+
+# Lightweight, picklable stand-in for a Badge row. Exposes the same attribute
+# names as the model so notification code can take either.
+BadgeEntry = namedtuple('BadgeEntry', [
+    'id', 'name', 'icon', 'condition_type', 'condition_value', 'condition_data', 'is_hidden',
+])
+
+
+class BadgeProgressService:
+    """
+    Service for reading and maintaining cached badge progress snapshots.
+
+    A snapshot is a dict with:
+        catalog_version: version of the badge catalog it was computed against
+        counters: condition counters (posts_created, level, reading_hours, ...)
+        earned: set of earned badge ids
+        progress: {badge_id: progress value} for every active badge
+        notified: {badge_id: highest progress threshold already notified}
+    """
+
+    CACHE_VERSION = 'v1'
+    SNAPSHOT_TIMEOUT = 900  # 15 minutes; bounds staleness of time-based counters
+    CATALOG_TIMEOUT = 3600
+
+    # Near-completion notification thresholds (percent)
+    NOTIFY_THRESHOLDS = (50, 75, 90)
+
+    # TrustLevel fields copied straight into the counters
+    TRUST_LEVEL_COUNTERS = (
+        'posts_created', 'topics_created', 'likes_received', 'likes_given', 'days_visited',
+    )
+
+    @classmethod
+    def snapshot_key(cls, user_id):
+        return f'{cls.CACHE_VERSION}:gamification:badge_progress:{user_id}'
+
+    @classmethod
+    def catalog_key(cls):
+        return f'{cls.CACHE_VERSION}:gamification:badge_catalog'
+
+    # Catalog
+
+    @classmethod
+    def get_catalog(cls):
+        """
+        Get the active badge catalog as (version, [BadgeEntry, ...]).
+        """
+        catalog = cache.get(cls.catalog_key())
+        if catalog is None:
+            entries = [
+                BadgeEntry(**row) for row in Badge.objects.filter(is_active=True).values(*BadgeEntry._fields)
+            ]
+            catalog = (uuid4().hex, entries)
+            cache.set(cls.catalog_key(), catalog, timeout=cls.CATALOG_TIMEOUT)
+        return catalog
+
+    @classmethod
+    def invalidate_catalog(cls):
+        """Drop the cached catalog; snapshots built against it rebuild lazily."""
+        cache.delete(cls.catalog_key())
+
+    # Snapshots
+
+    @classmethod
+    def get_snapshot(cls, user):
+        """
+        Get the user's badge progress snapshot, building it on a cache miss.
+        """
+        version, entries = cls.get_catalog()
+        snapshot = cache.get(cls.snapshot_key(user.id))
+        if snapshot is not None and snapshot['catalog_version'] == version:
+            return snapshot
+        return cls._build(user, version, entries, previous=snapshot)
+
+    @classmethod
+    def refresh(cls, user):
+        """
+        Reload the counters for a user and re-derive their progress vector.
+
+        Called on gamification events. Costs one TrustLevel query (plus one
+        ModerationLog count when a moderation badge exists) regardless of the
+        number of badges.
+        """
+        version, entries = cls.get_catalog()
+        previous = cache.get(cls.snapshot_key(user.id))
+        if previous is None or previous['catalog_version'] != version:
+            return cls._build(user, version, entries, previous=previous)
+
+        previous['counters'] = cls._load_counters(user, entries)
+        previous['progress'] = cls._progress_vector(entries, previous['counters'])
+        cls._save(user.id, previous)
+        return previous
+
+    @classmethod
+    def update_counters(cls, user_id, trust_level):
+        """
+        Update a cached snapshot from a saved TrustLevel without querying.
+        Does nothing when the user has no cached snapshot.
+        """
+        snapshot = cache.get(cls.snapshot_key(user_id))
+        if snapshot is None:
+            return
+        version, entries = cls.get_catalog()
+        if snapshot['catalog_version'] != version:
+            cls.invalidate(user_id)
+            return
+
+        snapshot['counters'].update(cls._trust_level_counters(trust_level))
+        snapshot['progress'] = cls._progress_vector(entries, snapshot['counters'])
+        cls._save(user_id, snapshot)
+
+    @classmethod
+    def mark_earned(cls, user_id, badge_id):
+        """Record a newly earned badge in a cached snapshot."""
+        snapshot = cache.get(cls.snapshot_key(user_id))
+        if snapshot is not None:
+            snapshot['earned'].add(badge_id)
+            cls._save(user_id, snapshot)
+
+    @classmethod
+    def invalidate(cls, user_id):
+        cache.delete(cls.snapshot_key(user_id))
+
+    @classmethod
+    def invalidate_many(cls, user_ids):
+        cache.delete_many([cls.snapshot_key(user_id) for user_id in user_ids])
+
+    # Reads
+
+    @classmethod
+    def eligible_badge_ids(cls, user, snapshot):
+        """Ids of active, unearned badges whose condition the snapshot meets."""
+        _, entries = cls.get_catalog()
+        return [
+            entry.id for entry in entries
+            if entry.id not in snapshot['earned']
+            and cls._meets_condition(entry, snapshot['progress'].get(entry.id, 0), user)
+        ]
+
+    @classmethod
+    def get_progress(cls, user, badge):
+        """Progress value toward a single badge, read from the snapshot."""
+        snapshot = cls.get_snapshot(user)
+        if badge.id in snapshot['progress']:
+            return snapshot['progress'][badge.id]
+        # Inactive badges are not part of the snapshot
+        return badge.calculate_progress(user)
+
+    @classmethod
+    def percentage(cls, badge, progress):
+        if badge.condition_value > 0:
+            return min(100, progress / badge.condition_value * 100)
+        return 0
+
+    @classmethod
+    def take_progress_notifications(cls, user, snapshot=None, badge_ids=None):
+        """
+        Collect near-completion thresholds crossed since the last call.
+
+        Each (badge, threshold) pair is returned once; the snapshot remembers
+        what was already notified. Limited to badge_ids when given. Returns a
+        list of (BadgeEntry, progress, percentage, threshold) tuples.
+        """
+        if snapshot is None:
+            snapshot = cls.get_snapshot(user)
+        _, entries = cls.get_catalog()
+
+        pending = []
+        for entry in entries:
+            if entry.id in snapshot['earned'] or (badge_ids is not None and entry.id not in badge_ids):
+                continue
+            progress = snapshot['progress'].get(entry.id, 0)
+            percentage = cls.percentage(entry, progress)
+            threshold = cls._reached_threshold(percentage)
+            if threshold > snapshot['notified'].get(entry.id, 0):
+                snapshot['notified'][entry.id] = threshold
+                pending.append((entry, progress, percentage, threshold))
+
+        if pending:
+            cls._save(user.id, snapshot)
+        return pending
+
+    # Internals
+
+    @classmethod
+    def _build(cls, user, version, entries, previous=None):
+        counters = cls._load_counters(user, entries)
+        progress = cls._progress_vector(entries, counters)
+        earned = set(UserBadge.objects.filter(user=user).values_list('badge_id', flat=True))
+
+        if previous is not None:
+            notified = previous['notified']
+        else:
+            # Without history, treat thresholds already reached as notified
+            # rather than re-sending them after every cache expiry.
+            notified = {
+                entry.id: cls._reached_threshold(cls.percentage(entry, progress[entry.id]))
+                for entry in entries
+            }
+
+        snapshot = {
+            'catalog_version': version,
+            'counters': counters,
+            'earned': earned,
+            'progress': progress,
+            'notified': notified,
+        }
+        cls._save(user.id, snapshot)
+        return snapshot
+
+    @classmethod
+    def _save(cls, user_id, snapshot):
+        cache.set(cls.snapshot_key(user_id), snapshot, timeout=cls.SNAPSHOT_TIMEOUT)
+
+    @classmethod
+    def _load_counters(cls, user, entries):
+        trust_level = TrustLevel.objects.filter(user=user).first()
+        counters = cls._trust_level_counters(trust_level)
+        counters['years_member'] = int((timezone.now() - user.date_joined).days / 365)
+        if any(entry.condition_type == 'moderation_actions' for entry in entries):
+            counters['moderation_actions'] = ModerationLog.objects.filter(moderator=user).count()
+        else:
+            counters['moderation_actions'] = 0
+        return counters
+
+    @classmethod
+    def _trust_level_counters(cls, trust_level):
+        if trust_level is None:
+            counters = {field: 0 for field in cls.TRUST_LEVEL_COUNTERS}
+            counters.update(level=0, reading_hours=0)
+            return counters
+        counters = {field: getattr(trust_level, field) for field in cls.TRUST_LEVEL_COUNTERS}
+        counters['level'] = trust_level.level
+        counters['reading_hours'] = int(trust_level.time_read.total_seconds() / 3600)
+        return counters
+
+    @classmethod
+    def _progress_vector(cls, entries, counters):
+        return {entry.id: cls._progress_value(entry, counters) for entry in entries}
+
+    @classmethod
+    def _progress_value(cls, entry, counters):
+        """In-memory equivalent of Badge.calculate_progress()."""
+        condition_type = entry.condition_type
+        if condition_type in cls.TRUST_LEVEL_COUNTERS:
+            return counters[condition_type]
+        elif condition_type == 'reading_time':
+            return counters['reading_hours']
+        elif condition_type == 'trust_level':
+            return counters['level']
+        elif condition_type == 'moderation_actions':
+            return counters['moderation_actions']
+        elif condition_type == 'first_post':
+            return 1 if counters['posts_created'] >= 1 else 0
+        elif condition_type == 'first_like':
+            return 1 if counters['likes_given'] >= 1 else 0
+        elif condition_type == 'anniversary':
+            return counters['years_member']
+        return 0
+
+    @classmethod
+    def _meets_condition(cls, entry, progress, user):
+        """In-memory equivalent of Badge.check_condition()."""
+        condition_type = entry.condition_type
+        if condition_type in ('first_post', 'first_like'):
+            return progress >= 1
+        elif condition_type == 'early_adopter':
+            cutoff_date = entry.condition_data.get('cutoff_date')
+            if cutoff_date:
+                return user.date_joined <= timezone.datetime.fromisoformat(cutoff_date)
+            return False
+        elif condition_type in (
+            *cls.TRUST_LEVEL_COUNTERS, 'reading_time', 'trust_level', 'moderation_actions', 'anniversary',
+        ):
+            return progress >= entry.condition_value
+        # consecutive_days, helpful_posts, flags_resolved and special_event
+        # are not automatically awarded
+        return False
+
+    @classmethod
+    def _reached_threshold(cls, percentage):
+        reached = 0
+        for threshold in cls.NOTIFY_THRESHOLDS:
+            if percentage >= threshold:
+                reached = threshold
+        return reached
@@ -0,0 +1,237 @@
+"""
+Outbox for WebSocket broadcasts.
+
+``broadcast_to_channel()`` used to call ``group_send`` synchronously from
+signal handlers, one Redis round-trip per group, inside the writing
+transaction: the write waited on the channel layer, and broadcasts went out
+even when the transaction rolled back. Broadcasts are now recorded with
+``BroadcastOutbox.record()`` and handed to the dispatcher by
+``transaction.on_commit``, so a rolled-back transaction sends nothing.
+
+Dispatch (settings.FORUM_BROADCASTS['DISPATCH']):
+    thread: a background asyncio loop sends them (default). Messages are
+            queued per group and each group is drained by its own task, so
+            sends to different groups are in flight together while a group
+            keeps its order; messages queued for a group while a send is in
+            flight go out together as one ``broadcast_batch`` message that
+            consumers unpack (see BaseForumConsumer.broadcast_batch).
+    eager:  the committing thread sends them (tests, management commands)
+
+A failed send is retried with exponential backoff up to MAX_ATTEMPTS times.
+Delivery lag (commit to ``group_send``), batch sizes, retries and failures
+are kept in ``BroadcastDispatcher.metrics``.
+
+Broadcasts are live-only notifications, so the outbox is in memory: the
+durable side-effects of forum writes go through the ForumEvent outbox
+(event_bus), and broadcasts pending when the process exits are dropped.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SETTINGS = {
+    'DISPATCH': 'thread',
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BASE_SECONDS': 0.5,
+    'LAG_WARNING_SECONDS': 5,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'FORUM_BROADCASTS', {}).get(name, DEFAULT_SETTINGS[name])
+
+
+@dataclass
+class Broadcast:
+    """A message for a channel layer group, recorded by a transaction."""
+
+    group: str
+    message: dict
+    recorded_at: float = field(default_factory=time.monotonic)
+    committed_at: Optional[float] = None
+
+
+class BroadcastMetrics:
+    """
+    Delivery counters and lag of the broadcasts of this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.recorded = 0
+            self.sent = 0
+            self.batches = 0
+            self.retries = 0
+            self.failed = 0
+            self.last_lag = 0.0
+            self.max_lag = 0.0
+            self._total_lag = 0.0
+
+    def record_committed(self, count=1):
+        with self._lock:
+            self.recorded += count
+
+    def record_sent(self, broadcasts):
+        now = time.monotonic()
+        lags = [now - (broadcast.committed_at or broadcast.recorded_at) for broadcast in broadcasts]
+        with self._lock:
+            self.sent += len(broadcasts)
+            self.batches += 1
+            self.last_lag = max(lags)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            self._total_lag += sum(lags)
+        return self.last_lag
+
+    def record_retry(self, count):
+        with self._lock:
+            self.retries += count
+
+    def record_failed(self, count):
+        with self._lock:
+            self.failed += count
+
+    def snapshot(self):
+        """
+        Returns:
+            Dict of counters and lags (seconds from commit to group_send)
+        """
+        with self._lock:
+            return {
+                'recorded': self.recorded,
+                'sent': self.sent,
+                'batches': self.batches,
+                'retries': self.retries,
+                'failed': self.failed,
+                'pending': self.recorded - self.sent - self.failed,
+                'last_lag': self.last_lag,
+                'max_lag': self.max_lag,
+                'avg_lag': self._total_lag / self.sent if self.sent else 0.0,
+            }
+
+
+class BroadcastOutbox:
+    """
+    Records broadcasts in the current transaction.
+    """
+
+    @classmethod
+    def record(cls, group, message):
+        """
+        Send a message to a group once the current transaction commits
+        (at once outside a transaction); dropped if it rolls back.
+        """
+        broadcast = Broadcast(group=group, message=message)
+        transaction.on_commit(lambda: BroadcastDispatcher.enqueue(broadcast))
+        return broadcast
+
+
+class BroadcastDispatcher:
+    """
+    Sends committed broadcasts to the channel layer.
+    """
+
+    metrics = BroadcastMetrics()
+
+    _lock = threading.Lock()
+    _loop = None
+    _groups = {}
+
+    @classmethod
+    def enqueue(cls, broadcast):
+        """
+        Called after the commit that recorded a broadcast.
+        """
+        broadcast.committed_at = time.monotonic()
+        cls.metrics.record_committed()
+
+        if get_setting('DISPATCH') == 'eager':
+            async_to_sync(cls._send)(broadcast.group, [broadcast])
+            return
+
+        loop = cls._ensure_loop()
+        loop.call_soon_threadsafe(cls._queue, broadcast)
+
+    @classmethod
+    def _ensure_loop(cls):
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name='forum-broadcasts', daemon=True
+                )
+                thread.start()
+                cls._loop = loop
+        return cls._loop
+
+    @classmethod
+    def _queue(cls, broadcast):
+        """Runs in the dispatcher loop: append to the group, start its drain task."""
+        pending = cls._groups.get(broadcast.group)
+        if pending is None:
+            pending = cls._groups[broadcast.group] = deque()
+            asyncio.get_running_loop().create_task(cls._drain_group(broadcast.group, pending))
+        pending.append(broadcast)
+
+    @classmethod
+    async def _drain_group(cls, group, pending):
+        """Send a group's queued broadcasts in order, in batches."""
+        batch_size = get_setting('BATCH_SIZE')
+        try:
+            while pending:
+                batch = [pending.popleft() for _ in range(min(len(pending), batch_size))]
+                await cls._send(group, batch)
+        except Exception:
+            logger.exception(f"Broadcast dispatcher crashed for {group}")
+        finally:
+            cls._groups.pop(group, None)
+
+    @classmethod
+    async def _send(cls, group, batch):
+        """
+        Send a batch with one group_send, retrying with backoff.
+        """
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            logger.warning("Channel layer not available for broadcasting")
+            cls.metrics.record_failed(len(batch))
+            return
+
+        if len(batch) == 1:
+            message = batch[0].message
+        else:
+            message = {'type': 'broadcast_batch', 'messages': [broadcast.message for broadcast in batch]}
+
+        max_attempts = get_setting('MAX_ATTEMPTS')
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await channel_layer.group_send(group, message)
+            except Exception as e:
+                if attempt >= max_attempts:
+                    cls.metrics.record_failed(len(batch))
+                    logger.error(f"Error broadcasting {len(batch)} messages to {group} after {attempt} attempts: {e}")
+                    return
+                cls.metrics.record_retry(len(batch))
+                await asyncio.sleep(get_setting('RETRY_BASE_SECONDS') * 2 ** (attempt - 1))
+            else:
+                lag = cls.metrics.record_sent(batch)
+                if lag > get_setting('LAG_WARNING_SECONDS'):
+                    logger.warning(f"Broadcasts to {group} delivered {lag:.1f}s after commit")
+                logger.debug(f"Broadcasted {len(batch)} messages to {group}")
+                return
@@ -1,37 +1,35 @@
 """
 Signal handlers for invalidating forum statistics cache
 """
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from machina.apps.forum.models import Forum
 from machina.apps.forum_conversation.models import Topic, Post
 from django.contrib.auth import get_user_model
 from apps.api.services.container import container
+from .achievement_rules import AchievementRules
+from .badge_progress_service import BadgeProgressService
+from .models import Achievement, Badge, ForumCustomization, TrustLevel, UserBadge
 
 User = get_user_model()
 
 
 @receiver(post_save, sender=Topic)
-def invalidate_stats_on_topic_save(sender, instance, created, **kwargs):
-    """Topics and posts are now live data - no cache invalidation needed for forum activity"""
-    pass  # Live data - no cache to invalidate
-
-
 @receiver(post_delete, sender=Topic)
-def invalidate_stats_on_topic_delete(sender, instance, **kwargs):
-    """Topics and posts are now live data - no cache invalidation needed for forum activity"""
-    pass  # Live data - no cache to invalidate
-
-
 @receiver(post_save, sender=Post)
-def invalidate_stats_on_post_save(sender, instance, created, **kwargs):
-    """Topics and posts are now live data - no cache invalidation needed for forum activity"""
-    pass  # Live data - no cache to invalidate
-
-
 @receiver(post_delete, sender=Post)
-def invalidate_stats_on_post_delete(sender, instance, **kwargs):
-    """Topics and posts are now live data - no cache invalidation needed for forum activity"""
-    pass  # Live data - no cache to invalidate
+@receiver(post_save, sender=Forum)
+@receiver(post_delete, sender=Forum)
+@receiver(post_save, sender=ForumCustomization)
+@receiver(post_delete, sender=ForumCustomization)
+def invalidate_forum_index(sender, instance, **kwargs):
+    """
+    Rebuild the forum index snapshot after a post, topic or forum changes;
+    deferred to the commit so the snapshot can't be rebuilt from the forum
+    trackers of before the change
+    """
+    transaction.on_commit(container.get_forum_index().invalidate)
 
 
 @receiver(post_save, sender=User)
@@ -49,4 +47,37 @@ def invalidate_stats_on_user_save(sender, instance, created, **kwargs):
 def invalidate_stats_on_user_delete(sender, instance, **kwargs):
     """Invalidate statistics cache when a user is deleted"""
     stats_service = container.get_statistics_service()
-    stats_service.invalidate_cache()
\ No newline at end of file
+    stats_service.invalidate_cache()
+
+
+@receiver(post_save, sender=Badge)
+@receiver(post_delete, sender=Badge)
+def invalidate_badge_catalog(sender, instance, **kwargs):
+    """Rebuild badge progress snapshots against the changed badge catalog"""
+    BadgeProgressService.invalidate_catalog()
+
+
+@receiver(post_save, sender=UserBadge)
+def update_badge_progress_on_award(sender, instance, created, **kwargs):
+    """Keep the earned set of a cached badge progress snapshot current"""
+    if created:
+        BadgeProgressService.mark_earned(instance.user_id, instance.badge_id)
+
+
+@receiver(post_delete, sender=UserBadge)
+def invalidate_badge_progress_on_revoke(sender, instance, **kwargs):
+    """Drop the snapshot when a badge is revoked"""
+    BadgeProgressService.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=TrustLevel)
+def update_badge_progress_on_trust_level_save(sender, instance, **kwargs):
+    """Re-derive cached badge progress from the saved counters"""
+    BadgeProgressService.update_counters(instance.user_id, instance)
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def invalidate_achievement_rules(sender, instance, **kwargs):
+    """Recompile achievement rules after an achievement changes"""
+    AchievementRules.invalidate()
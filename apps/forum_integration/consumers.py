@@ -4,6 +4,7 @@ WebSocket consumers for real-time forum functionality
 
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
@@ -11,6 +12,7 @@ from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.utils import timezone
 from .notification_service import NotificationService
+from .realtime_fanout import ActivityBuffer, RateLimiter, TypingCoalescer, get_setting
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -24,6 +26,9 @@ class BaseForumConsumer(AsyncWebsocketConsumer):
         self.room_group_name = None
         self.user = None
         self.last_heartbeat = timezone.now()
+        self.rate_limiter = RateLimiter()
+        self.typing_sources = {}
+        self.typing_sent = []
         
     async def connect(self):
         """Handle WebSocket connection"""
@@ -59,6 +64,8 @@ class BaseForumConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 self.channel_name
             )
+            if self.user and self.user.is_authenticated:
+                TypingCoalescer.for_loop(self.channel_layer).stop(self.room_group_name, self.user.id)
             
         # Update user presence
         await self.update_user_presence(online=False)
@@ -71,6 +78,10 @@ class BaseForumConsumer(AsyncWebsocketConsumer):
             data = json.loads(text_data)
             message_type = data.get('type')
             
+            if not self.rate_limiter.allow():
+                logger.debug(f"Dropped {message_type} from {self.user.username}: rate limit exceeded")
+                return
+            
             # Handle different message types
             if message_type == 'heartbeat':
                 await self.handle_heartbeat(data)
@@ -105,40 +116,25 @@ class BaseForumConsumer(AsyncWebsocketConsumer):
         }))
     
     async def handle_typing_start(self, data):
-        """Handle typing start notifications"""
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'typing_notification',
-                'user_id': self.user.id,
-                'username': self.user.username,
-                'is_typing': True,
-                'timestamp': timezone.now().isoformat()
-            }
-        )
+        """Handle typing start notifications (coalesced per room)"""
+        if self.room_group_name:
+            TypingCoalescer.for_loop(self.channel_layer).start(
+                self.room_group_name, self.user.id, self.user.username
+            )
     
     async def handle_typing_stop(self, data):
-        """Handle typing stop notifications"""
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'typing_notification',
-                'user_id': self.user.id,
-                'username': self.user.username,
-                'is_typing': False,
-                'timestamp': timezone.now().isoformat()
-            }
-        )
+        """Handle typing stop notifications (coalesced per room)"""
+        if self.room_group_name:
+            TypingCoalescer.for_loop(self.channel_layer).stop(self.room_group_name, self.user.id)
     
     async def handle_user_activity(self, data):
         """Handle user activity updates"""
-        # Track user activity in cache
-        cache_key = f"user_activity_{self.user.id}"
-        cache.set(cache_key, {
+        # Track user activity in cache (written in batches)
+        ActivityBuffer.for_loop().record(self.user.id, {
             'last_seen': timezone.now().isoformat(),
             'current_page': data.get('page'),
             'action': data.get('action')
-        }, 300)  # 5 minutes
+        })
     
     async def update_user_presence(self, online=True):
         """Update user's online presence"""
@@ -156,14 +152,31 @@ class BaseForumConsumer(AsyncWebsocketConsumer):
         else:
             cache.delete(cache_key)
     
-    async def typing_notification(self, event):
-        """Send typing notification to WebSocket"""
-        if event['user_id'] != self.user.id:  # Don't send to the typing user
+    async def broadcast_batch(self, event):
+        """Handle messages the broadcast dispatcher sent to the group together"""
+        for message in event['messages']:
+            await self.dispatch(message)
+
+    async def typing_state(self, event):
+        """Send who is typing, merged over the frames of every server process"""
+        now = time.monotonic()
+        self.typing_sources[event['source']] = (event['users'], now + get_setting('TYPING_TTL'))
+        
+        users = {}
+        for source, (source_users, expires_at) in list(self.typing_sources.items()):
+            if expires_at <= now or not source_users:
+                del self.typing_sources[source]
+                continue
+            for user in source_users:
+                if user['id'] != self.user.id:  # Don't send to the typing user
+                    users[user['id']] = user
+        users = [users[user_id] for user_id in sorted(users)]
+        
+        if users != self.typing_sent:
+            self.typing_sent = users
             await self.send(text_data=json.dumps({
-                'type': 'typing',
-                'user_id': event['user_id'],
-                'username': event['username'],
-                'is_typing': event['is_typing'],
+                'type': 'typing_state',
+                'users': users,
                 'timestamp': event['timestamp']
             }))
 
@@ -0,0 +1,279 @@
+"""
+Transactional outbox for forum events.
+
+Signal handlers call ``EventBus.publish()``, which only inserts a ForumEvent
+row in the current transaction. Subscribers registered with
+``@EventBus.subscribe(event_type)`` run later in the dispatcher, so the cost
+of saving a post doesn't grow with the number of features hooked onto it.
+
+Dispatch (settings.FORUM_EVENTS['DISPATCH']):
+    thread: after commit, a background thread drains the outbox with a
+            thread pool (default; fine for a single process)
+    worker: events wait for ``manage.py process_forum_events`` (production)
+    eager:  after commit, the committing thread drains the outbox
+
+Events of the same user are handled in insertion order; a failing event is
+retried with exponential backoff and holds back that user's later events
+until it succeeds or is marked failed. In thread mode the dispatcher wakes
+itself when the next backoff expires.
+"""
+
+import logging
+import threading
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, Min, OuterRef
+from django.utils import timezone
+from .models import ForumEvent
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SETTINGS = {
+    'DISPATCH': 'thread',
+    'MAX_WORKERS': 4,
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 5,
+    'LEASE_SECONDS': 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'FORUM_EVENTS', {}).get(name, DEFAULT_SETTINGS[name])
+
+
+class EventBus:
+    """
+    Publish/subscribe API for forum events.
+    """
+
+    _subscribers = defaultdict(list)
+
+    @classmethod
+    def subscribe(cls, event_type):
+        """
+        Decorator registering a handler for an event type.
+
+        Handlers receive the ForumEvent and must tolerate being re-run for
+        an event whose other handlers failed; a handler that succeeded is not
+        run again for the same event.
+        """
+        def decorator(handler):
+            cls._subscribers[event_type].append(handler)
+            return handler
+        return decorator
+
+    @classmethod
+    def subscribers(cls, event_type):
+        return cls._subscribers.get(event_type, [])
+
+    @classmethod
+    def publish(cls, event_type, user=None, **payload):
+        """
+        Append an event to the outbox in the current transaction.
+        """
+        event = ForumEvent.objects.create(
+            event_type=event_type,
+            user=user,
+            payload=payload,
+        )
+        transaction.on_commit(EventDispatcher.wake)
+        return event
+
+
+class EventDispatcher:
+    """
+    Consumes pending ForumEvent rows and runs their subscribers.
+    """
+
+    _lock = threading.Lock()
+    _wake_scheduled = False
+    _coordinator = None
+    _pool = None
+    _retry_timer = None
+    _retry_at = None
+
+    @classmethod
+    def wake(cls):
+        """
+        Called after a commit that published events.
+        """
+        mode = get_setting('DISPATCH')
+        if mode == 'eager':
+            cls.drain()
+        elif mode == 'thread':
+            with cls._lock:
+                if cls._wake_scheduled:
+                    return
+                cls._wake_scheduled = True
+                if cls._coordinator is None:
+                    cls._coordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='forum-events')
+                    cls._pool = ThreadPoolExecutor(
+                        max_workers=get_setting('MAX_WORKERS'), thread_name_prefix='forum-events-worker'
+                    )
+            cls._coordinator.submit(cls._drain_in_background)
+
+    @classmethod
+    def _drain_in_background(cls):
+        with cls._lock:
+            cls._wake_scheduled = False
+        try:
+            cls.drain(executor=cls._pool)
+            cls._schedule_retry()
+        except Exception:
+            logger.exception("Forum event dispatcher crashed")
+        finally:
+            close_old_connections()
+
+    @classmethod
+    def _schedule_retry(cls):
+        """
+        Wake again when the next backoff or lease expires, so retries run
+        even if nothing is published in the meantime.
+        """
+        next_at = ForumEvent.objects.filter(status='pending').aggregate(
+            next_at=Min('available_at')
+        )['next_at']
+        if next_at is None:
+            return
+        with cls._lock:
+            if cls._retry_timer is not None and cls._retry_timer.is_alive() and cls._retry_at <= next_at:
+                return
+            if cls._retry_timer is not None:
+                cls._retry_timer.cancel()
+            delay = max((next_at - timezone.now()).total_seconds(), 0)
+            cls._retry_timer = threading.Timer(delay, cls.wake)
+            cls._retry_timer.daemon = True
+            cls._retry_timer.start()
+            cls._retry_at = next_at
+
+    @classmethod
+    def drain(cls, executor=None):
+        """
+        Dispatch batches until no event is ready. Returns the number handled.
+        """
+        handled = 0
+        while True:
+            count = cls.dispatch_pending(executor=executor)
+            if not count:
+                return handled
+            handled += count
+
+    @classmethod
+    def dispatch_pending(cls, executor=None, batch_size=None):
+        """
+        Claim and dispatch one batch of ready events.
+
+        Events are grouped per user; each group runs in order (on the
+        executor when given, so different users are handled in parallel).
+        Returns the number of events attempted.
+        """
+        now = timezone.now()
+        batch_size = batch_size or get_setting('BATCH_SIZE')
+        # An earlier event of the same user that is backing off or leased
+        # holds back the user's later events
+        held_back = ForumEvent.objects.filter(
+            status='pending', user_id=OuterRef('user_id'), id__lt=OuterRef('id'), available_at__gt=now
+        )
+        rows = (
+            ForumEvent.objects.filter(status='pending', available_at__lte=now)
+            .exclude(Exists(held_back))
+            .order_by('id')
+            .values_list('id', 'user_id')[:batch_size]
+        )
+
+        groups = defaultdict(list)
+        for event_id, user_id in rows:
+            groups[user_id or f'event-{event_id}'].append(event_id)
+
+        claimed = [ids for ids in groups.values() if cls._claim(ids, now)]
+        if not claimed:
+            return 0
+
+        if executor is None:
+            for ids in claimed:
+                cls._run_group(ids)
+        else:
+            wait([executor.submit(cls._run_group_in_thread, ids) for ids in claimed])
+        return sum(len(ids) for ids in claimed)
+
+    @classmethod
+    def _claim(cls, ids, now):
+        """
+        Lease a group by pushing available_at forward. Fails if another
+        dispatcher got to any of the events first.
+        """
+        lease_until = now + timedelta(seconds=get_setting('LEASE_SECONDS'))
+        claimed = ForumEvent.objects.filter(
+            pk__in=ids, status='pending', available_at__lte=now
+        ).update(available_at=lease_until)
+        return claimed == len(ids)
+
+    @classmethod
+    def _run_group_in_thread(cls, ids):
+        try:
+            cls._run_group(ids)
+        finally:
+            close_old_connections()
+
+    @classmethod
+    def _run_group(cls, ids):
+        events = {event.id: event for event in ForumEvent.objects.filter(pk__in=ids)}
+        for event_id in ids:
+            event = events.get(event_id)
+            if event is None:
+                continue
+            if not cls._run_event(event):
+                # Keep per-user order: stop until this event is retried
+                cls._release(events[later] for later in ids[ids.index(event_id) + 1:] if later in events)
+                return
+
+    @classmethod
+    def _run_event(cls, event):
+        """
+        Run the pending subscribers of an event. Returns True on success.
+        """
+        completed = set(event.completed_handlers)
+        for handler in EventBus.subscribers(event.event_type):
+            name = f'{handler.__module__}.{handler.__qualname__}'
+            if name in completed:
+                continue
+            try:
+                with transaction.atomic():
+                    handler(event)
+            except Exception as e:
+                cls._record_failure(event, completed, e)
+                return False
+            completed.add(name)
+
+        ForumEvent.objects.filter(pk=event.pk).delete()
+        return True
+
+    @classmethod
+    def _record_failure(cls, event, completed, error):
+        attempts = event.attempts + 1
+        max_attempts = get_setting('MAX_ATTEMPTS')
+        delay = get_setting('RETRY_BASE_SECONDS') * 2 ** (attempts - 1)
+        ForumEvent.objects.filter(pk=event.pk).update(
+            attempts=attempts,
+            status='failed' if attempts >= max_attempts else 'pending',
+            available_at=timezone.now() + timedelta(seconds=delay),
+            completed_handlers=sorted(completed),
+            last_error=''.join(traceback.format_exception(error))[-4000:],
+        )
+        logger.error(
+            f"Forum event {event.pk} ({event.event_type}) failed on attempt "
+            f"{attempts}/{max_attempts}: {error}"
+        )
+
+    @classmethod
+    def _release(cls, events):
+        """Make leased events available again without counting an attempt."""
+        ids = [event.pk for event in events]
+        if ids:
+            ForumEvent.objects.filter(pk__in=ids, status='pending').update(available_at=timezone.now())
@@ -0,0 +1,250 @@
+"""
+Subscribers for forum events published by the post/topic save signals.
+
+Each subscriber is retried independently by the event dispatcher, so they
+are kept small and reload their objects from the database.
+"""
+
+import logging
+from django.utils import timezone
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.api.services.container import container
+from .event_bus import EventBus
+from .gamification_service import GamificationService
+from .middleware import ForumActivityTracker
+from .signals import broadcast_to_channel
+
+logger = logging.getLogger(__name__)
+
+
+def _load_post(event):
+    return Post.objects.select_related('poster', 'topic', 'topic__forum').filter(
+        pk=event.payload.get('post_id')
+    ).first()
+
+
+def _load_topic(event):
+    return Topic.objects.select_related('poster', 'forum').filter(
+        pk=event.payload.get('topic_id')
+    ).first()
+
+
+def _post_data(post):
+    created_time = post.created.isoformat() if post.created else timezone.now().isoformat()
+    return {
+        'id': post.id,
+        'content': post.content.raw if hasattr(post.content, 'raw') else str(post.content),
+        'poster': {
+            'id': post.poster.id,
+            'username': post.poster.username
+        },
+        'created': created_time,
+        'topic_id': post.topic.id,
+        'forum_id': post.topic.forum.id
+    }
+
+
+def _topic_data(topic):
+    try:
+        created_time = topic.created.isoformat() if topic.created else timezone.now().isoformat()
+    except (AttributeError, TypeError):
+        created_time = timezone.now().isoformat()
+    return {
+        'id': topic.id,
+        'subject': topic.subject,
+        'posts_count': topic.posts_count,
+        'views_count': getattr(topic, 'views_count', 0),
+        'is_locked': topic.is_locked,
+        'is_sticky': topic.is_sticky,
+        'poster': {
+            'id': topic.poster.id,
+            'username': topic.poster.username
+        },
+        'created': created_time,
+        'forum_id': topic.forum.id
+    }
+
+
+# Post created
+
+@EventBus.subscribe('post_created')
+def track_post_activity(event):
+    post = _load_post(event)
+    if post and post.poster:
+        ForumActivityTracker.track_post_created(post.poster, post)
+
+
+@EventBus.subscribe('post_created')
+def award_post_gamification(event):
+    post = _load_post(event)
+    if post and post.poster:
+        GamificationService.handle_post_created(post.poster, post)
+
+
+@EventBus.subscribe('post_created')
+@EventBus.subscribe('post_updated')
+def index_post_signature(event):
+    # Off the save path; the duplicate check of review_new_post reuses the stored signature
+    post = _load_post(event)
+    if post:
+        container.get_near_duplicate_index().index_post(post)
+
+
+@EventBus.subscribe('post_created')
+def review_new_post(event):
+    post = _load_post(event)
+    if post:
+        container.get_review_queue_service().check_new_post(post)
+
+
+@EventBus.subscribe('post_created')
+def review_poster_behavior(event):
+    if event.user_id:
+        container.get_review_queue_service().check_user_behavior(event.user_id)
+
+
+@EventBus.subscribe('post_created')
+def broadcast_new_post(event):
+    post = _load_post(event)
+    if not post or not post.poster:
+        return
+
+    post_data = _post_data(post)
+
+    # Broadcast to topic-specific and forum-wide groups
+    broadcast_to_channel(f'topic_{post.topic.id}', 'new_post', {'post': post_data})
+    broadcast_to_channel(f'forum_{post.topic.forum.id}', 'new_post', {'post': post_data})
+
+    # Broadcast to global activity feed
+    broadcast_to_channel('forum_activity', 'activity_update', {
+        'activity': {
+            'type': 'new_post',
+            'user': post_data['poster'],
+            'topic': {
+                'id': post.topic.id,
+                'subject': post.topic.subject
+            },
+            'forum': {
+                'id': post.topic.forum.id,
+                'name': post.topic.forum.name
+            }
+        }
+    })
+
+    logger.info(f"New post created by {post.poster} in topic {post.topic.id}")
+
+
+# Post updated
+
+@EventBus.subscribe('post_updated')
+def review_edited_post(event):
+    post = _load_post(event)
+    if post and post.poster:
+        container.get_review_queue_service().check_edited_post(post, post.poster)
+
+
+@EventBus.subscribe('post_updated')
+def broadcast_post_update(event):
+    post = _load_post(event)
+    if not post or not post.poster:
+        return
+
+    post_data = _post_data(post)
+    post_data['updated'] = post.updated.isoformat() if post.updated else timezone.now().isoformat()
+
+    broadcast_to_channel(f'topic_{post.topic.id}', 'post_updated', {'post': post_data})
+    logger.info(f"Post {post.id} updated by {post.poster}")
+
+
+# Topic created
+
+@EventBus.subscribe('topic_created')
+def track_topic_activity(event):
+    topic = _load_topic(event)
+    if topic and topic.poster:
+        ForumActivityTracker.track_topic_created(topic.poster, topic)
+
+
+@EventBus.subscribe('topic_created')
+def award_topic_gamification(event):
+    topic = _load_topic(event)
+    if topic and topic.poster:
+        GamificationService.handle_topic_created(topic.poster, topic)
+
+
+@EventBus.subscribe('topic_created')
+def review_new_topic(event):
+    topic = _load_topic(event)
+    if topic:
+        container.get_review_queue_service().check_new_topic(topic)
+
+
+@EventBus.subscribe('topic_created')
+def broadcast_new_topic(event):
+    topic = _load_topic(event)
+    if not topic or not topic.poster:
+        return
+
+    topic_data = _topic_data(topic)
+
+    broadcast_to_channel(f'forum_{topic.forum.id}', 'new_topic', {'topic': topic_data})
+    broadcast_to_channel('forum_activity', 'activity_update', {
+        'activity': {
+            'type': 'new_topic',
+            'user': topic_data['poster'],
+            'topic': topic_data,
+            'forum': {
+                'id': topic.forum.id,
+                'name': topic.forum.name
+            }
+        }
+    })
+
+    logger.info(f"New topic '{topic.subject}' created by {topic.poster} in forum {topic.forum.id}")
+
+
+# Topic updated
+
+@EventBus.subscribe('topic_updated')
+def broadcast_topic_update(event):
+    topic = _load_topic(event)
+    if not topic or not topic.poster:
+        return
+
+    topic_data = _topic_data(topic)
+    broadcast_to_channel(f'forum_{topic.forum.id}', 'topic_updated', {'topic': topic_data})
+    broadcast_to_channel(f'topic_{topic.id}', 'topic_updated', {'topic': topic_data})
+    logger.info(f"Topic {topic.id} updated")
+
+
+# Moderation batch reviewed
+
+@EventBus.subscribe('moderation_batch_reviewed')
+def broadcast_moderation_batch(event):
+    # One message for the whole batch, so clients refresh once
+    payload = event.payload
+    broadcast_to_channel('forum_activity', 'activity_update', {
+        'activity': {
+            'type': 'moderation_batch',
+            'action': payload.get('action'),
+            'item_ids': payload.get('item_ids', []),
+            'post_ids': payload.get('post_ids', []),
+            'topic_ids': payload.get('topic_ids', []),
+        }
+    })
+    logger.info(f"Moderation batch: {payload.get('action')} {len(payload.get('item_ids', []))} items")
+
+
+# Spam rules changed
+
+@EventBus.subscribe('spam_rules_changed')
+def rescore_spam(event):
+    # One chunk per event: the dispatcher wraps this handler in a single
+    # transaction, so each event commits one chunk and its checkpoint
+    service = container.get_spam_rescoring_service()
+    if event.payload.get('rules_version') != service.rules_version:
+        return
+    job = service.run(max_chunks=1)
+    if job.completed_at is None:
+        EventBus.publish('spam_rules_changed', rules_version=job.rules_version)
+    logger.info(f"Spam rules v{job.rules_version} rescore: {job.posts_scored} posts scored")
@@ -6,11 +6,14 @@ import logging
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import F
 from .models import (
     Badge, UserBadge, UserPoints, PointHistory, 
     Achievement, ForumUserAchievement, TrustLevel
 )
 from .notification_service import NotificationService
+from .badge_progress_service import BadgeProgressService
+from .achievement_rules import AchievementRules
 from machina.apps.forum_conversation.models import Post, Topic
 
 User = get_user_model()
@@ -177,26 +180,157 @@ class GamificationService:
         # Check for trust level badges
         cls.check_and_award_badges(user)
     
+    @classmethod
+    def handle_bulk_trust_level_promotions(cls, promotions, chunk_size=1000):
+        """
+        Handle gamification for a batch of trust level promotions.
+
+        Set-based counterpart of handle_trust_level_promotion() used by the
+        bulk promotion engine: points, point history and trust level badges
+        are written with a few bulk statements per chunk, and notifications
+        go out as one batch.
+
+        Args:
+            promotions: Dict mapping user_id -> new trust level
+            chunk_size: Users per bulk statement
+        """
+        if not promotions:
+            return {'points_awarded': 0, 'badges_awarded': 0}
+
+        user_ids = list(promotions)
+        trust_level_badges = list(
+            Badge.objects.filter(is_active=True, condition_type='trust_level')
+        )
+        badge_awards = []  # (user_id, badge)
+        points_awarded = 0
+
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+
+            with transaction.atomic():
+                UserPoints.objects.bulk_create(
+                    [UserPoints(user_id=user_id) for user_id in chunk],
+                    ignore_conflicts=True,
+                )
+
+                # Promotion points: one UPDATE per target level
+                by_level = {}
+                for user_id in chunk:
+                    by_level.setdefault(promotions[user_id], []).append(user_id)
+                history = []
+                for new_level, level_user_ids in by_level.items():
+                    points = cls.POINT_VALUES['trust_level_up'] * new_level
+                    cls._bulk_add_points(level_user_ids, points)
+                    history.append((level_user_ids, points, 'Action: trust_level_up', None))
+                    points_awarded += points * len(level_user_ids)
+
+                # Trust level badges the promoted users now qualify for
+                for badge in trust_level_badges:
+                    eligible = [
+                        user_id for user_id in chunk
+                        if promotions[user_id] >= badge.condition_value
+                    ]
+                    if not eligible:
+                        continue
+                    already_earned = set(
+                        UserBadge.objects.filter(badge=badge, user_id__in=eligible)
+                        .values_list('user_id', flat=True)
+                    )
+                    new_holders = [user_id for user_id in eligible if user_id not in already_earned]
+                    if not new_holders:
+                        continue
+                    UserBadge.objects.bulk_create(
+                        [UserBadge(user_id=user_id, badge=badge) for user_id in new_holders],
+                        ignore_conflicts=True,
+                    )
+                    cls._bulk_add_points(new_holders, badge.points_awarded)
+                    history.append(
+                        (new_holders, badge.points_awarded, f"Badge earned: {badge.name}", badge)
+                    )
+                    badge_awards.extend((user_id, badge) for user_id in new_holders)
+                    points_awarded += badge.points_awarded * len(new_holders)
+
+                PointHistory.objects.bulk_create(cls._running_point_history(chunk, history))
+
+        BadgeProgressService.invalidate_many(user_ids)
+        NotificationService.notify_trust_level_promotions(promotions, badge_awards)
+
+        logger.info(
+            f"Bulk trust level gamification: {len(promotions)} promotions, "
+            f"{len(badge_awards)} badges, {points_awarded} points"
+        )
+        return {'points_awarded': points_awarded, 'badges_awarded': len(badge_awards)}
+
+    @staticmethod
+    def _running_point_history(user_ids, history):
+        """
+        Build PointHistory rows for points already added with _bulk_add_points().
+
+        Args:
+            user_ids: Users whose current totals include the points
+            history: (user_ids, points, reason, badge) entries in the order
+                the points were added
+
+        Each row's new_total is the user's total right after that entry, so
+        the last row of each user matches their current total.
+        """
+        running = dict(
+            UserPoints.objects.filter(user_id__in=user_ids)
+            .values_list('user_id', 'total_points')
+        )
+        for entry_user_ids, points, _, _ in history:
+            for user_id in entry_user_ids:
+                running[user_id] = running.get(user_id, 0) - points
+
+        rows = []
+        for entry_user_ids, points, reason, badge in history:
+            for user_id in entry_user_ids:
+                running[user_id] += points
+                rows.append(PointHistory(
+                    user_id=user_id,
+                    points_change=points,
+                    reason=reason,
+                    new_total=running[user_id],
+                    badge=badge,
+                ))
+        return rows
+
+    @staticmethod
+    def _bulk_add_points(user_ids, points):
+        """Add the same number of points to many users with a single UPDATE."""
+        UserPoints.objects.filter(user_id__in=user_ids).update(
+            total_points=F('total_points') + points,
+            monthly_points=F('monthly_points') + points,
+            weekly_points=F('weekly_points') + points,
+            updated_at=timezone.now(),
+        )
+
     @classmethod
     def check_and_award_badges(cls, user):
         """
         Check all badges and award any that the user has newly earned.
+        
+        Conditions are evaluated against the user's badge progress snapshot,
+        so the cost doesn't grow with the number of badges.
         """
-        # Get all active badges the user hasn't earned yet
-        earned_badge_ids = UserBadge.objects.filter(user=user).values_list('badge_id', flat=True)
-        available_badges = Badge.objects.filter(
-            is_active=True
-        ).exclude(id__in=earned_badge_ids)
+        snapshot = BadgeProgressService.refresh(user)
+        eligible_ids = BadgeProgressService.eligible_badge_ids(user, snapshot)
         
         newly_earned = []
         
-        for badge in available_badges:
-            if badge.check_condition(user):
+        if eligible_ids:
+            # Guard against earned ids missing from a stale snapshot
+            already_earned = set(
+                UserBadge.objects.filter(user=user, badge_id__in=eligible_ids)
+                .values_list('badge_id', flat=True)
+            )
+            for badge in Badge.objects.filter(id__in=eligible_ids).exclude(id__in=already_earned):
                 # Award the badge
                 user_badge = UserBadge.objects.create(
                     user=user,
                     badge=badge,
                 )
+                snapshot['earned'].add(badge.id)
                 
                 # Send notification for badge earned
                 NotificationService.notify_badge_earned(user_badge)
@@ -207,9 +341,11 @@ class GamificationService:
                 
                 newly_earned.append(user_badge)
                 logger.info(f"Awarded badge '{badge.name}' to {user.username}")
-            else:
-                # Check if user is close to earning this badge
-                NotificationService.check_and_notify_progress(user, badge)
+            snapshot['earned'].update(already_earned)
+        
+        # Notify about badges the user is close to earning
+        for entry, progress, percentage, threshold in BadgeProgressService.take_progress_notifications(user, snapshot):
+            NotificationService.notify_badge_progress(user, entry, progress, percentage, threshold)
         
         return newly_earned
     
@@ -217,37 +353,40 @@ class GamificationService:
     def check_achievements(cls, user):
         """
         Check for complex achievements that the user might have earned.
+        
+        Uses the compiled achievement rules, so all achievements are evaluated
+        against one feature vector query.
         """
-        # Get achievements the user hasn't earned
-        earned_achievement_ids = ForumUserAchievement.objects.filter(user=user).values_list('achievement_id', flat=True)
-        available_achievements = Achievement.objects.filter(
-            is_active=True
-        ).exclude(id__in=earned_achievement_ids)
+        qualified = AchievementRules.find_unearned([user.id]).get(user.id)
+        if not qualified:
+            return []
         
         newly_earned = []
         
-        for achievement in available_achievements:
-            if cls.check_achievement_condition(user, achievement):
-                user_achievement = ForumUserAchievement.objects.create(
-                    user=user,
-                    achievement=achievement
-                )
-                
-                # Send notification for achievement
-                NotificationService.notify_achievement_unlocked(user_achievement)
-                
-                # Award points (don't trigger recursive checks)
-                user_points = cls.initialize_user(user)
-                user_points.add_points(achievement.points_reward, reason=f"Achievement: {achievement.name}")
-                
-                # Award any associated badges
-                for badge in achievement.badges_granted.all():
-                    if not UserBadge.objects.filter(user=user, badge=badge).exists():
-                        user_badge = UserBadge.objects.create(user=user, badge=badge)
-                        NotificationService.notify_badge_earned(user_badge)
-                
-                newly_earned.append(user_achievement)
-                logger.info(f"Awarded achievement '{achievement.name}' to {user.username}")
+        achievements = Achievement.objects.filter(
+            id__in=[rule.id for rule in qualified]
+        ).prefetch_related('badges_granted')
+        for achievement in achievements:
+            user_achievement = ForumUserAchievement.objects.create(
+                user=user,
+                achievement=achievement
+            )
+            
+            # Send notification for achievement
+            NotificationService.notify_achievement_unlocked(user_achievement)
+            
+            # Award points (don't trigger recursive checks)
+            user_points = cls.initialize_user(user)
+            user_points.add_points(achievement.points_reward, reason=f"Achievement: {achievement.name}")
+            
+            # Award any associated badges
+            for badge in achievement.badges_granted.all():
+                if not UserBadge.objects.filter(user=user, badge=badge).exists():
+                    user_badge = UserBadge.objects.create(user=user, badge=badge)
+                    NotificationService.notify_badge_earned(user_badge)
+            
+            newly_earned.append(user_achievement)
+            logger.info(f"Awarded achievement '{achievement.name}' to {user.username}")
         
         return newly_earned
     
@@ -256,37 +395,110 @@ class GamificationService:
         """
         Check if user meets complex achievement requirements.
         """
-        requirements = achievement.requirements
-        
-        # Example requirement checking (extend as needed)
-        if 'min_trust_level' in requirements:
-            try:
-                if user.trust_level.level < requirements['min_trust_level']:
-                    return False
-            except TrustLevel.DoesNotExist:
-                return False
-        
-        if 'min_badges' in requirements:
-            badge_count = UserBadge.objects.filter(user=user).count()
-            if badge_count < requirements['min_badges']:
-                return False
-        
-        if 'min_points' in requirements:
-            try:
-                if user.points.total_points < requirements['min_points']:
-                    return False
-            except UserPoints.DoesNotExist:
-                return False
-        
-        if 'min_streak' in requirements:
-            try:
-                if user.points.current_streak < requirements['min_streak']:
-                    return False
-            except UserPoints.DoesNotExist:
-                return False
-        
-        # Add more complex requirements as needed
-        return True
+        conditions = AchievementRules.compile(achievement.requirements)
+        if not conditions:
+            return True
+        features = AchievementRules.feature_vectors([user.id]).get(user.id)
+        return AchievementRules.matches(conditions, features)
+    
+    @classmethod
+    def award_achievements_bulk(cls, awards, chunk_size=1000, emit_events=True):
+        """
+        Award achievements to many users with bulk statements.
+        
+        Set-based counterpart of check_achievements() used by the
+        recompute_achievements command.
+        
+        Args:
+            awards: Dict mapping user_id -> [CompiledAchievement, ...]
+            chunk_size: Users per bulk statement
+            emit_events: Send achievement notifications
+        """
+        if not awards:
+            return {'achievements_awarded': 0, 'badges_awarded': 0}
+        
+        achievements = {
+            achievement.id: achievement
+            for achievement in Achievement.objects.filter(
+                id__in={rule.id for rules in awards.values() for rule in rules}
+            ).prefetch_related('badges_granted')
+        }
+        user_ids = list(awards)
+        achievement_count = 0
+        badge_count = 0
+        notifications = []
+        
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            
+            with transaction.atomic():
+                UserPoints.objects.bulk_create(
+                    [UserPoints(user_id=user_id) for user_id in chunk],
+                    ignore_conflicts=True,
+                )
+                
+                by_achievement = {}
+                for user_id in chunk:
+                    for rule in awards[user_id]:
+                        if rule.id in achievements:
+                            by_achievement.setdefault(rule.id, []).append(user_id)
+                
+                history = []
+                for achievement_id, holder_ids in by_achievement.items():
+                    achievement = achievements[achievement_id]
+                    # Users who already have it are skipped by the INSERT: don't credit them again
+                    already_unlocked = set(
+                        ForumUserAchievement.objects.filter(achievement=achievement, user_id__in=holder_ids)
+                        .values_list('user_id', flat=True)
+                    )
+                    holder_ids = [user_id for user_id in holder_ids if user_id not in already_unlocked]
+                    if not holder_ids:
+                        continue
+                    ForumUserAchievement.objects.bulk_create(
+                        [ForumUserAchievement(user_id=user_id, achievement=achievement) for user_id in holder_ids],
+                        ignore_conflicts=True,
+                    )
+                    cls._bulk_add_points(holder_ids, achievement.points_reward)
+                    history.append((holder_ids, achievement.points_reward, f"Achievement: {achievement.name}", None))
+                    achievement_count += len(holder_ids)
+                    
+                    for badge in achievement.badges_granted.all():
+                        already_earned = set(
+                            UserBadge.objects.filter(badge=badge, user_id__in=holder_ids)
+                            .values_list('user_id', flat=True)
+                        )
+                        new_holders = [user_id for user_id in holder_ids if user_id not in already_earned]
+                        UserBadge.objects.bulk_create(
+                            [UserBadge(user_id=user_id, badge=badge) for user_id in new_holders],
+                            ignore_conflicts=True,
+                        )
+                        badge_count += len(new_holders)
+                    
+                    notifications.extend(
+                        (user_id, {
+                            'type': 'achievement_unlocked',
+                            'achievement': {
+                                'id': achievement.id,
+                                'name': achievement.name,
+                                'description': achievement.description,
+                                'icon': achievement.icon,
+                                'color': achievement.color,
+                                'points_reward': achievement.points_reward,
+                                'achievement_type': achievement.achievement_type,
+                            },
+                            'celebration_type': 'fireworks',
+                        })
+                        for user_id in holder_ids
+                    )
+                
+                PointHistory.objects.bulk_create(cls._running_point_history(chunk, history))
+        
+        BadgeProgressService.invalidate_many(user_ids)
+        if emit_events:
+            NotificationService._send_bulk_notifications(notifications)
+        
+        logger.info(f"Bulk achievements: {achievement_count} achievements, {badge_count} granted badges")
+        return {'achievements_awarded': achievement_count, 'badges_awarded': badge_count}
     
     @classmethod
     def get_user_stats(cls, user):
@@ -298,10 +510,8 @@ class GamificationService:
         except UserPoints.DoesNotExist:
             user_points = cls.initialize_user(user)
         
-        try:
-            trust_level = user.trust_level
-        except TrustLevel.DoesNotExist:
-            trust_level = None
+        snapshot = BadgeProgressService.get_snapshot(user)
+        trust_level = snapshot['counters']['level']
         
         badges = UserBadge.objects.filter(user=user).select_related('badge', 'badge__category')
         achievements = ForumUserAchievement.objects.filter(user=user).select_related('achievement')
@@ -325,7 +535,7 @@ class GamificationService:
                 'last_activity': user_points.last_activity_date,
             },
             'badges': {
-                'total': badges.count(),
+                'total': len(snapshot['earned']),
                 'by_rarity': badge_stats,
                 'recent': badges[:5],  # 5 most recent
             },
@@ -334,8 +544,8 @@ class GamificationService:
                 'recent': achievements[:3],  # 3 most recent
             },
             'trust_level': {
-                'level': trust_level.level if trust_level else 0,
-                'name': trust_level.get_level_display() if trust_level else 'New User',
+                'level': trust_level,
+                'name': dict(TrustLevel.TRUST_LEVELS).get(trust_level, 'New User'),
             }
         }
     
@@ -1,10 +1,11 @@
 """
 Management command to calculate and update trust levels for all users
 """
+import time
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
-from django.db import transaction
 from apps.forum_integration.models import TrustLevel
+from apps.forum_integration.trust_level_service import TrustLevelService
 
 User = get_user_model()
 
@@ -28,6 +29,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Show detailed information about each user',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=TrustLevelService.DEFAULT_CHUNK_SIZE,
+            help='Rows per bulk INSERT/UPDATE when updating all users',
+        )
+        parser.add_argument(
+            '--no-events',
+            action='store_true',
+            help='Skip gamification points, badges and notifications for promotions',
+        )
     
     def handle(self, *args, **options):
         if options['user']:
@@ -42,25 +54,28 @@ class Command(BaseCommand):
             self.update_all_trust_levels(options)
     
     def update_all_trust_levels(self, options):
-        """Update trust levels for all users"""
-        users_with_trust_levels = User.objects.filter(trust_level__isnull=False)
-        users_without_trust_levels = User.objects.filter(trust_level__isnull=True)
-        
-        # Create trust levels for users who don't have them
-        for user in users_without_trust_levels:
-            if not options['dry_run']:
-                TrustLevel.objects.create(user=user, level=0)
-            if options['verbose']:
-                self.stdout.write(f'Created trust level for {user.username}')
+        """Update trust levels for all users with set-based bulk statements"""
+        started = time.monotonic()
+        stats = TrustLevelService.recalculate_all(
+            dry_run=options['dry_run'],
+            emit_events=not options['no_events'],
+            chunk_size=options['chunk_size'],
+        )
+        elapsed = time.monotonic() - started
         
-        # Update existing trust levels
-        promoted_count = 0
-        total_users = users_with_trust_levels.count() + users_without_trust_levels.count()
+        promoted_count = sum(stats['promotions'].values())
+        total_users = stats['total_users']
         
-        for user in User.objects.filter(trust_level__isnull=False):
-            was_promoted = self.update_user_trust_level(user, options)
-            if was_promoted:
-                promoted_count += 1
+        if options['verbose'] or options['dry_run']:
+            level_names = dict(TrustLevel.TRUST_LEVELS)
+            prefix = 'Would create' if options['dry_run'] else 'Created'
+            self.stdout.write(f'{prefix} {stats["created"]} missing trust levels')
+            self.stdout.write('Current distribution:')
+            for level, count in sorted(stats['distribution'].items()):
+                self.stdout.write(f'  TL{level} ({level_names[level]}): {count} users')
+            self.stdout.write('Promotions:')
+            for new_level, count in sorted(stats['promotions'].items()):
+                self.stdout.write(f'  TL{new_level - 1} -> TL{new_level}: {count} users')
         
         if options['dry_run']:
             self.stdout.write(
@@ -71,7 +86,8 @@ class Command(BaseCommand):
         else:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'Successfully promoted {promoted_count} out of {total_users} users'
+                    f'Successfully promoted {promoted_count} out of {total_users} users '
+                    f'in {elapsed:.2f}s'
                 )
             )
     
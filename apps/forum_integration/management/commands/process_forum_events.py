@@ -0,0 +1,66 @@
+"""
+Management command that consumes the forum event outbox.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.forum_integration.event_bus import EventDispatcher, get_setting
+from apps.forum_integration.models import ForumEvent
+
+
+class Command(BaseCommand):
+    help = 'Dispatch pending forum events to their subscribers (production event worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the outbox once and exit instead of polling',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls when the outbox is empty',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=get_setting('MAX_WORKERS'),
+            help='Users handled in parallel (1 dispatches inline)',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Move events that exhausted their retries back to pending first',
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            count = ForumEvent.objects.filter(status='failed').update(
+                status='pending', attempts=0, available_at=timezone.now()
+            )
+            self.stdout.write(f'Requeued {count} failed events')
+
+        # A single worker dispatches inline in this thread
+        executor = None
+        if options['workers'] > 1:
+            executor = ThreadPoolExecutor(max_workers=options['workers'])
+
+        try:
+            if options['once']:
+                handled = EventDispatcher.drain(executor=executor)
+                self.stdout.write(self.style.SUCCESS(f'Dispatched {handled} events'))
+                return
+
+            self.stdout.write(self.style.SUCCESS('Processing forum events...'))
+            while True:
+                if not EventDispatcher.drain(executor=executor):
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
+        finally:
+            if executor is not None:
+                executor.shutdown()
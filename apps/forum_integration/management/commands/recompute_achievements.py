@@ -0,0 +1,82 @@
+"""
+Management command to recompute achievements for all users.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from apps.forum_integration.achievement_rules import AchievementRules
+from apps.forum_integration.gamification_service import GamificationService
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Award achievements to every user who meets their requirements'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be awarded without making changes',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Users evaluated and written per batch',
+        )
+        parser.add_argument(
+            '--no-events',
+            action='store_true',
+            help='Skip achievement notifications',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        chunk_size = options['chunk_size']
+
+        # Compile once and reuse for every chunk
+        AchievementRules.invalidate()
+        rules = AchievementRules.get_compiled()
+        if not rules:
+            self.stdout.write(self.style.WARNING('No active achievements'))
+            return
+
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        awarded = {}
+        totals = {'achievements_awarded': 0, 'badges_awarded': 0}
+
+        for start in range(0, len(user_ids), chunk_size):
+            chunk_awards = AchievementRules.find_unearned(user_ids[start:start + chunk_size], rules)
+            for qualified in chunk_awards.values():
+                for rule in qualified:
+                    awarded[rule.name] = awarded.get(rule.name, 0) + 1
+
+            if not options['dry_run']:
+                stats = GamificationService.award_achievements_bulk(
+                    chunk_awards,
+                    chunk_size=chunk_size,
+                    emit_events=not options['no_events'],
+                )
+                for key, value in stats.items():
+                    totals[key] += value
+
+        for name, count in sorted(awarded.items()):
+            self.stdout.write(f'  {name}: {count} users')
+
+        total = sum(awarded.values())
+        if options['dry_run']:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'DRY RUN: Would award {total} achievements across {len(user_ids)} users'
+                )
+            )
+        else:
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Awarded {totals["achievements_awarded"]} achievements and '
+                    f'{totals["badges_awarded"]} badges across {len(user_ids)} users in {elapsed:.2f}s'
+                )
+            )
@@ -101,6 +101,13 @@ class ForumActivityTracker:
     This should be called from forum views and signals.
     """
     
+    # Limits for batched read receipts sent by the client
+    MAX_BATCH_EVENTS = 200
+    MAX_EVENT_DWELL = timedelta(minutes=30)
+    MAX_TOPIC_DWELL = timedelta(minutes=30)  # per topic per batch
+    MAX_BATCH_DWELL = timedelta(hours=1)  # and never more than the time since the last batch
+    MAX_BATCH_POSTS = 500  # posts a batch can mark read, however wide its ranges
+    
     @staticmethod
     def track_post_read(user, post):
         """Track when a user reads a post"""
@@ -262,4 +269,222 @@ class ForumActivityTracker:
             defaults={}
         )
         activity.time_spent_reading += time_spent
-        activity.save(update_fields=['time_spent_reading'])
\ No newline at end of file
+        activity.save(update_fields=['time_spent_reading'])
+    
+    @staticmethod
+    def normalize_reading_events(raw_events):
+        """
+        Validate and merge a compact batch of reading events.
+        
+        Each event is either a list ``[topic_id, first_post_id, last_post_id,
+        dwell_ms, scroll_depth]`` or a dict with the keys ``topic``, ``from``,
+        ``to``, ``dwell_ms`` and ``scroll``. Events for the same topic are
+        merged: post ranges are collected, dwell time is summed (up to
+        MAX_TOPIC_DWELL) and the deepest scroll position wins.
+        
+        Returns:
+            Dict mapping topic_id -> {'ranges', 'time_spent', 'scroll_depth'}
+        
+        Raises:
+            ValueError: If the batch is malformed or too large
+        """
+        if not isinstance(raw_events, list):
+            raise ValueError('events must be a list')
+        if len(raw_events) > ForumActivityTracker.MAX_BATCH_EVENTS:
+            raise ValueError(
+                f'At most {ForumActivityTracker.MAX_BATCH_EVENTS} events are accepted per batch'
+            )
+        
+        merged = {}
+        for raw in raw_events:
+            if isinstance(raw, dict):
+                raw = [raw.get('topic'), raw.get('from'), raw.get('to'),
+                       raw.get('dwell_ms', 0), raw.get('scroll')]
+            if not isinstance(raw, (list, tuple)) or len(raw) not in (4, 5):
+                raise ValueError('Each event must be [topic, from, to, dwell_ms, scroll]')
+            
+            try:
+                topic_id, first_post, last_post = int(raw[0]), int(raw[1]), int(raw[2])
+                dwell_ms = max(0, int(raw[3] or 0))
+                scroll = raw[4] if len(raw) == 5 else None
+                scroll = None if scroll is None else min(1.0, max(0.0, float(scroll)))
+            except (TypeError, ValueError):
+                raise ValueError('Event fields must be numeric')
+            
+            if first_post > last_post:
+                first_post, last_post = last_post, first_post
+            
+            entry = merged.setdefault(topic_id, {
+                'ranges': [],
+                'time_spent': timedelta(),
+                'scroll_depth': None,
+            })
+            entry['ranges'].append((first_post, last_post))
+            entry['time_spent'] += min(
+                timedelta(milliseconds=dwell_ms), ForumActivityTracker.MAX_EVENT_DWELL
+            )
+            if scroll is not None:
+                entry['scroll_depth'] = max(entry['scroll_depth'] or 0.0, scroll)
+        
+        for entry in merged.values():
+            entry['time_spent'] = min(entry['time_spent'], ForumActivityTracker.MAX_TOPIC_DWELL)
+        return merged
+    
+    @staticmethod
+    def track_reading_batch(user, raw_events):
+        """
+        Ingest a batch of read receipts with a few bulk statements.
+        
+        Batched counterpart of track_post_read() and track_reading_time():
+        posts are resolved with one query, de-duplicated against the user's
+        UserReadPosts bitmap, and the results are merged into ReadingProgress,
+        TrustLevel and UserActivity without a write per post.
+        
+        The dwell time a batch adds is capped at MAX_BATCH_DWELL and at the
+        wall-clock time since the user's previous batch, so replayed batches
+        can't inflate time_read; topics keep their share of what's left.
+        At most MAX_BATCH_POSTS posts (lowest IDs first) are marked read per
+        batch, so oversized ranges can't inflate posts_read.
+        
+        Returns:
+            Summary dict with topics, posts_marked_read, duplicate_posts and
+            time_read_seconds
+        """
+        from django.db import transaction
+        from django.db.models import F, Q
+        from machina.apps.forum_conversation.models import Post
+        from .models import ReadingProgress, UserReadPosts
+        from .utils.bitmap import PostIdBitmap
+        
+        events = ForumActivityTracker.normalize_reading_events(raw_events)
+        summary = {
+            'topics': 0,
+            'posts_marked_read': 0,
+            'duplicate_posts': 0,
+            'time_read_seconds': 0,
+        }
+        if not events or not user.is_authenticated:
+            return summary
+        
+        # Resolve every referenced post range in one query, clipped to the cap
+        range_filter = Q()
+        for topic_id, entry in events.items():
+            for first_post, last_post in entry['ranges']:
+                range_filter |= Q(topic_id=topic_id, id__range=(first_post, last_post))
+        post_rows = list(
+            Post.objects.filter(range_filter, approved=True, topic__approved=True)
+            .values_list('id', 'topic_id')
+            .order_by('id')[:ForumActivityTracker.MAX_BATCH_POSTS]
+        )
+        visible_topics = {topic_id for _, topic_id in post_rows}
+        events = {topic_id: entry for topic_id, entry in events.items() if topic_id in visible_topics}
+        if not events:
+            return summary
+        
+        now = timezone.now()
+        today = now.date()
+        
+        with transaction.atomic():
+            # Lock the user's bitmap so concurrent batches can't double count.
+            # The first batch creates the row first, tolerating a concurrent
+            # batch that got there before it, then locks it.
+            read_posts = UserReadPosts.objects.select_for_update().filter(user=user).first()
+            allowed_time = ForumActivityTracker.MAX_BATCH_DWELL
+            if read_posts is None:
+                UserReadPosts.objects.bulk_create([UserReadPosts(user=user)], ignore_conflicts=True)
+                read_posts = UserReadPosts.objects.select_for_update().get(user=user)
+            else:
+                # updated_at is the time of the previous batch
+                allowed_time = min(allowed_time, max(now - read_posts.updated_at, timedelta()))
+            
+            total_time = sum((entry['time_spent'] for entry in events.values()), timedelta())
+            if total_time > allowed_time:
+                ratio = allowed_time / total_time
+                for entry in events.values():
+                    entry['time_spent'] *= ratio
+                total_time = sum((entry['time_spent'] for entry in events.values()), timedelta())
+            
+            bitmap = PostIdBitmap.from_bytes(read_posts.bitmap)
+            
+            newly_read = {}
+            for post_id, topic_id in post_rows:
+                if bitmap.add(post_id):
+                    newly_read.setdefault(topic_id, []).append(post_id)
+            new_posts_count = sum(len(ids) for ids in newly_read.values())
+            
+            # Merge into ReadingProgress: bulk_update existing, bulk_create new
+            existing = {
+                progress.topic_id: progress
+                for progress in ReadingProgress.objects.filter(user=user, topic_id__in=events)
+            }
+            last_post_by_topic = {}
+            for post_id, topic_id in post_rows:
+                last_post_by_topic[topic_id] = post_id
+            
+            to_create = []
+            newly_completed = 0
+            for topic_id, entry in events.items():
+                progress = existing.get(topic_id)
+                if progress is None:
+                    progress = ReadingProgress(user=user, topic_id=topic_id)
+                    to_create.append(progress)
+                was_completed = progress.completed
+                progress.time_spent += entry['time_spent']
+                progress.last_read_post = max(progress.last_read_post, last_post_by_topic[topic_id])
+                if entry['scroll_depth'] is not None:
+                    progress.scroll_depth = max(progress.scroll_depth, entry['scroll_depth'])
+                    if progress.scroll_depth >= 0.95:  # Consider 95% as completed
+                        progress.completed = True
+                progress.last_accessed = now
+                if progress.completed and not was_completed:
+                    newly_completed += 1
+            
+            if existing:
+                ReadingProgress.objects.bulk_update(
+                    existing.values(),
+                    ['time_spent', 'scroll_depth', 'last_read_post', 'completed', 'last_accessed'],
+                )
+            if to_create:
+                ReadingProgress.objects.bulk_create(to_create)
+            
+            # Aggregate counters with single F() updates
+            # (the bitmap lock serializes batches per user, so the create
+            # fallbacks can't race with each other)
+            updated = TrustLevel.objects.filter(user=user).update(
+                posts_read=F('posts_read') + new_posts_count,
+                time_read=F('time_read') + total_time,
+            )
+            if not updated:
+                TrustLevel.objects.create(
+                    user=user, level=0, posts_read=new_posts_count, time_read=total_time
+                )
+            
+            updated = UserActivity.objects.filter(user=user, date=today).update(
+                posts_read_today=F('posts_read_today') + new_posts_count,
+                time_spent_reading=F('time_spent_reading') + total_time,
+                topics_completed=F('topics_completed') + newly_completed,
+                last_activity_time=now,
+                updated_at=now,
+            )
+            if not updated:
+                UserActivity.objects.create(
+                    user=user,
+                    date=today,
+                    posts_read_today=new_posts_count,
+                    time_spent_reading=total_time,
+                    topics_completed=newly_completed,
+                    first_visit_time=now,
+                    last_activity_time=now,
+                )
+            
+            read_posts.bitmap = bitmap.to_bytes()
+            read_posts.posts_count = F('posts_count') + new_posts_count
+            read_posts.save(update_fields=['bitmap', 'posts_count', 'updated_at'])
+        
+        summary.update({
+            'topics': len(events),
+            'posts_marked_read': new_posts_count,
+            'duplicate_posts': len(post_rows) - new_posts_count,
+            'time_read_seconds': int(total_time.total_seconds()),
+        })
+        return summary
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_integration', '0008_userreadposts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForumEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('post_created', 'Post Created'), ('post_updated', 'Post Updated'), ('topic_created', 'Topic Created'), ('topic_updated', 'Topic Updated')], max_length=30)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Not dispatched before this time (retry backoff or claim lease)')),
+                ('completed_handlers', models.JSONField(blank=True, default=list, help_text='Subscribers that already succeeded')),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='forum_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Forum Event',
+                'verbose_name_plural': 'Forum Events',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='forum_integ_status_fcce68_idx'), models.Index(fields=['user', 'status'], name='forum_integ_user_id_ddf06f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_conversation', '0015_topic_poster_username_alter_post_poster_and_more'),
+        ('forum_integration', '0009_forumevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSignature',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='forum_conversation.post')),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Post Signature',
+                'verbose_name_plural': 'Post Signatures',
+            },
+        ),
+        migrations.CreateModel(
+            name='PostSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='forum_integration.postsignature')),
+            ],
+            options={
+                'verbose_name': 'Post Signature Band',
+                'verbose_name_plural': 'Post Signature Bands',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='forum_integ_band_b225f9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_integration', '0010_postsignature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpamRescoreJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rules_version', models.CharField(max_length=50, unique=True)),
+                ('since', models.DateTimeField(help_text='Posts created after this time are rescored')),
+                ('last_post_id', models.IntegerField(default=0)),
+                ('posts_scored', models.IntegerField(default=0)),
+                ('items_updated', models.IntegerField(default=0)),
+                ('items_created', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Spam Rescore Job',
+                'verbose_name_plural': 'Spam Rescore Jobs',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+PRIORITY_POINTS = {1: 100, 2: 75, 3: 50, 4: 25}
+TYPE_POINTS = {
+    'spam_detection': 30,
+    'flagged_post': 25,
+    'user_report': 20,
+    'new_user_post': 10,
+    'edited_post': 5,
+    'trust_level_review': 5,
+}
+
+
+def split_scores(apps, schema_editor):
+    """Store the static score and decay rank of existing review items."""
+    ReviewQueue = apps.get_model('forum_integration', 'ReviewQueue')
+    TrustLevel = apps.get_model('forum_integration', 'TrustLevel')
+
+    items = list(ReviewQueue.objects.all())
+    trust_levels = dict(
+        TrustLevel.objects.filter(
+            user_id__in={item.reported_user_id for item in items if item.reported_user_id}
+        ).values_list('user_id', 'level')
+    )
+    for item in items:
+        score = float(PRIORITY_POINTS.get(item.priority, 50))
+        score += item.upvotes * 10
+        if item.reported_user_id:
+            score += (4 - trust_levels.get(item.reported_user_id, 0)) * 5
+        score += TYPE_POINTS.get(item.review_type, 10)
+        item.score = score
+        item.decay_rank = score - item.created_at.timestamp() / 3600 * 0.5
+    ReviewQueue.objects.bulk_update(items, ['score', 'decay_rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_conversation', '0015_topic_poster_username_alter_post_poster_and_more'),
+        ('forum_integration', '0011_spamrescorejob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewqueue',
+            name='decay_rank',
+            field=models.FloatField(default=0.0, help_text='score minus the age bonus rate times creation time in hours'),
+        ),
+        migrations.AlterField(
+            model_name='moderationlog',
+            name='action_type',
+            field=models.CharField(choices=[('approve', 'Approved'), ('reject', 'Rejected'), ('edit', 'Edited'), ('delete', 'Deleted'), ('ban_user', 'Banned User'), ('trust_level_change', 'Trust Level Changed'), ('assign_moderator', 'Assigned Moderator'), ('escalate', 'Escalated'), ('de_escalate', 'De-escalated'), ('bulk_action', 'Bulk Action')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='moderationlog',
+            name='moderator',
+            field=models.ForeignKey(blank=True, help_text='Empty for system actions', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='moderation_actions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='reviewqueue',
+            name='score',
+            field=models.FloatField(default=0.0, help_text='Static priority score; the age bonus is added at query time'),
+        ),
+        migrations.RunPython(split_scores, migrations.RunPython.noop),
+    ]
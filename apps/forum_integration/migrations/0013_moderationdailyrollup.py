@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_integration', '0012_reviewqueue_decay_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('review_type', models.CharField(choices=[('flagged_post', 'Flagged Post'), ('new_user_post', 'New User Post'), ('edited_post', 'Edited Post'), ('user_report', 'User Report'), ('spam_detection', 'Spam Detection'), ('trust_level_review', 'Trust Level Review')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('needs_info', 'Needs More Information'), ('escalated', 'Escalated')], max_length=15)),
+                ('items', models.IntegerField(default=0)),
+                ('resolved_items', models.IntegerField(default=0, help_text='Items with a recorded resolution time')),
+                ('resolution_seconds', models.FloatField(default=0.0, help_text='Sum of resolution times')),
+                ('resolution_histogram', models.JSONField(blank=True, default=dict, help_text='Resolution time bucket -> count')),
+            ],
+            options={
+                'verbose_name': 'Moderation Daily Rollup',
+                'verbose_name_plural': 'Moderation Daily Rollups',
+                'ordering': ['-date', 'review_type', 'status'],
+                'unique_together': {('date', 'review_type', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_integration', '0014_forumevent_moderation_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackerRebuildJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=100, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('checked', models.IntegerField(default=0)),
+                ('updated', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tracker Rebuild Job',
+                'verbose_name_plural': 'Tracker Rebuild Jobs',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
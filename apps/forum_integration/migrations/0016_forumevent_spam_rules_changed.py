@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_integration', '0015_trackerrebuildjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='forumevent',
+            name='event_type',
+            field=models.CharField(choices=[('post_created', 'Post Created'), ('post_updated', 'Post Updated'), ('topic_created', 'Topic Created'), ('topic_updated', 'Topic Updated'), ('moderation_batch_reviewed', 'Moderation Batch Reviewed'), ('spam_rules_changed', 'Spam Rules Changed')], max_length=30),
+        ),
+    ]
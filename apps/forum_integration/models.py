@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, ExpressionWrapper, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Least
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
 from django.utils import timezone
@@ -73,6 +75,31 @@ class TrustLevel(models.Model):
         (4, 'Leader'),
     ]
     
+    # Automatic promotion thresholds keyed by the level being promoted from.
+    # Shared by check_for_promotion() and the set-based bulk engine in
+    # trust_level_service so both paths always agree.
+    PROMOTION_REQUIREMENTS = {
+        # TL0 -> TL1: Read 10 posts, spend 10 minutes reading
+        0: {
+            'posts_read': 10,
+            'time_read': timedelta(minutes=10),
+        },
+        # TL1 -> TL2: Visit 15 days, read 100 posts, receive 1 like
+        1: {
+            'days_visited': 15,
+            'posts_read': 100,
+            'likes_received': 1,
+        },
+        # TL2 -> TL3: Visit 50 days, read 500 posts, receive 10 likes, give 30 likes
+        2: {
+            'days_visited': 50,
+            'posts_read': 500,
+            'likes_received': 10,
+            'likes_given': 30,
+        },
+        # TL3 -> TL4: Manual promotion by admins only
+    }
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='trust_level')
     level = models.IntegerField(
         default=0, 
@@ -162,31 +189,11 @@ class TrustLevel(models.Model):
         Check if user qualifies for promotion and return the new level
         Returns None if no promotion is warranted
         """
-        current_level = self.level
-        
-        # TL0 -> TL1: Read 10 posts, spend 10 minutes reading
-        if current_level == 0:
-            if (self.posts_read >= 10 and 
-                self.time_read >= timedelta(minutes=10)):
-                return 1
-        
-        # TL1 -> TL2: Visit 15 days, read 100 posts, receive 1 like
-        elif current_level == 1:
-            if (self.days_visited >= 15 and
-                self.posts_read >= 100 and
-                self.likes_received >= 1):
-                return 2
-        
-        # TL2 -> TL3: Visit 50 days, read 500 posts, receive 10 likes, give 30 likes
-        elif current_level == 2:
-            if (self.days_visited >= 50 and
-                self.posts_read >= 500 and
-                self.likes_received >= 10 and
-                self.likes_given >= 30):
-                return 3
-        
-        # TL3 -> TL4: Manual promotion by admins only
-        # This requires staff intervention
+        requirements = self.PROMOTION_REQUIREMENTS.get(self.level)
+        if requirements and all(
+            getattr(self, field) >= minimum for field, minimum in requirements.items()
+        ):
+            return self.level + 1
         
         return None
     
@@ -275,8 +282,109 @@ class ReadingProgress(models.Model):
         return int(self.scroll_depth * 100)
 
 
+class UserReadPosts(models.Model):
+    """
+    Compact record of every post a user has been credited for reading.
+
+    Stores a compressed PostIdBitmap so batched read receipts can skip posts
+    already counted toward TrustLevel.posts_read without a row per post.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='read_posts')
+    bitmap = models.BinaryField(default=bytes)
+    posts_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "User Read Posts"
+        verbose_name_plural = "User Read Posts"
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.posts_count} posts read"
+
+
 # Review Queue and Moderation Models
 
+def _epoch_hours(value):
+    return value.timestamp() / 3600
+
+
+class ReviewQueueQuerySet(models.QuerySet):
+    """
+    Orders the queue by effective priority: the stored static score plus an
+    age bonus computed in the query, so rows never need rewriting as they age.
+    
+    At any given time decay_rank + now_hours * AGE_POINTS_PER_HOUR is the
+    uncapped effective score; ordering uses it capped at score +
+    MAX_AGE_POINTS, the same effective_score moderators see, so a stale
+    low-priority item can't outrank a fresh urgent one. The cap depends on
+    the current time, so by_urgency() sorts the filtered rows rather than
+    reading them in index order.
+    """
+    
+    def with_effective_score(self, now=None):
+        """
+        Annotate effective_score = score + min(age_hours * AGE_POINTS_PER_HOUR, MAX_AGE_POINTS).
+        
+        decay_rank stores score - created_hours * AGE_POINTS_PER_HOUR, so the
+        uncapped term is decay_rank + now_hours * AGE_POINTS_PER_HOUR.
+        """
+        now_hours = _epoch_hours(now or timezone.now())
+        return self.annotate(effective_score=Least(
+            F('decay_rank') + Value(now_hours * ReviewQueue.AGE_POINTS_PER_HOUR),
+            F('score') + Value(float(ReviewQueue.MAX_AGE_POINTS)),
+            output_field=models.FloatField(),
+        ))
+    
+    def by_urgency(self, now=None):
+        """Most urgent first; oldest first among equals"""
+        return self.with_effective_score(now).order_by('-effective_score', 'created_at')
+    
+    def set_priority(self, priority):
+        """
+        Bulk priority change that recomputes score and decay_rank in the same
+        UPDATE, so escalated items move up the queue.
+        
+        Returns the number of items updated.
+        """
+        new_score = ReviewQueue.static_score_expression(priority=priority)
+        # decay_rank = score - age rate * created hours, so shift it by the score change
+        return self.update(
+            priority=priority,
+            score=new_score,
+            decay_rank=F('decay_rank') - F('score') + new_score,
+        )
+    
+    def transition(self, status, **fields):
+        """
+        Bulk status change that keeps the moderation rollups in step.
+        
+        Sets resolved_at for resolved statuses unless given. Returns the
+        number of items updated.
+        """
+        from .moderation_rollups import ModerationRollups
+        
+        if status in ModerationRollups.RESOLVED_STATUSES:
+            fields.setdefault('resolved_at', timezone.now())
+        
+        with transaction.atomic():
+            previous = list(self.select_for_update().values_list(
+                'pk', 'created_at', 'review_type', 'status', 'resolved_at'
+            ))
+            if not previous:
+                return 0
+            updated = ReviewQueue.objects.filter(
+                pk__in=[pk for pk, *_ in previous]
+            ).update(status=status, **fields)
+            ModerationRollups.record(
+                added=[
+                    (created_at, review_type, status, fields.get('resolved_at', resolved_at))
+                    for _, created_at, review_type, _, resolved_at in previous
+                ],
+                removed=[state for _, *state in previous],
+            )
+        return updated
+
+
 class ReviewQueue(models.Model):
     """
     Unified review queue for all moderation tasks.
@@ -331,9 +439,29 @@ class ReviewQueue(models.Model):
     resolved_at = models.DateTimeField(null=True, blank=True)
     
     # Priority scoring factors
-    score = models.FloatField(default=0.0, help_text="Calculated priority score")
+    score = models.FloatField(default=0.0, help_text="Static priority score; the age bonus is added at query time")
+    decay_rank = models.FloatField(default=0.0, help_text="score minus the age bonus rate times creation time in hours")
     upvotes = models.IntegerField(default=0, help_text="Community upvotes for this review")
     
+    objects = ReviewQueueQuerySet.as_manager()
+    
+    # Priority score weights
+    PRIORITY_POINTS = {1: 100, 2: 75, 3: 50, 4: 25}
+    DEFAULT_PRIORITY_POINTS = 50
+    TYPE_POINTS = {
+        'spam_detection': 30,
+        'flagged_post': 25,
+        'user_report': 20,
+        'new_user_post': 10,
+        'edited_post': 5,
+        'trust_level_review': 5,
+    }
+    DEFAULT_TYPE_POINTS = 10
+    UPVOTE_POINTS = 10
+    TRUST_POINTS_PER_LEVEL = 5  # TL0 gets +20, TL4 gets 0
+    AGE_POINTS_PER_HOUR = 0.5
+    MAX_AGE_POINTS = 50
+    
     class Meta:
         verbose_name = "Review Queue Item"
         verbose_name_plural = "Review Queue Items"
@@ -357,55 +485,103 @@ class ReviewQueue(models.Model):
         
         return f"{self.get_review_type_display()} - {content_desc} ({self.get_status_display()})"
     
-    def calculate_priority_score(self):
-        """Calculate priority score based on multiple factors"""
-        score = 0.0
-        
-        # Base priority score
-        priority_scores = {1: 100, 2: 75, 3: 50, 4: 25}
-        score += priority_scores.get(self.priority, 50)
-        
-        # Age factor (older items get higher priority)
-        if self.created_at:
-            age_hours = (timezone.now() - self.created_at).total_seconds() / 3600
-            score += min(age_hours * 0.5, 50)  # Cap at 50 points for age
-        else:
-            # If created_at is None (during creation), assume 0 age
-            score += 0
+    def calculate_static_score(self):
+        """Priority score without the age bonus"""
+        score = float(self.PRIORITY_POINTS.get(self.priority, self.DEFAULT_PRIORITY_POINTS))
         
         # Community upvotes
-        score += self.upvotes * 10
+        score += self.upvotes * self.UPVOTE_POINTS
         
         # Trust level of reported user (lower trust = higher priority)
-        if self.reported_user:
+        if self.reported_user_id:
             try:
                 trust_level = self.reported_user.trust_level.level
-                score += (4 - trust_level) * 5  # TL0 gets +20, TL4 gets 0
-            except:
-                score += 20  # No trust level = treat as TL0
+            except (AttributeError, TrustLevel.DoesNotExist):
+                trust_level = 0  # No trust level = treat as TL0
+            score += (4 - trust_level) * self.TRUST_POINTS_PER_LEVEL
         
         # Review type specific scoring
-        type_scores = {
-            'spam_detection': 30,
-            'flagged_post': 25,
-            'user_report': 20,
-            'new_user_post': 10,
-            'edited_post': 5,
-            'trust_level_review': 5,
-        }
-        score += type_scores.get(self.review_type, 10)
+        score += self.TYPE_POINTS.get(self.review_type, self.DEFAULT_TYPE_POINTS)
         
         return score
     
+    def calculate_priority_score(self):
+        """Effective priority score: static score plus the age bonus"""
+        age_points = 0.0
+        if self.created_at:
+            age_hours = (timezone.now() - self.created_at).total_seconds() / 3600
+            age_points = min(age_hours * self.AGE_POINTS_PER_HOUR, self.MAX_AGE_POINTS)
+        return self.calculate_static_score() + age_points
+    
+    def refresh_scores(self):
+        """Set score and decay_rank without saving (for bulk writes)"""
+        self.score = self.calculate_static_score()
+        created = self.created_at or timezone.now()
+        self.decay_rank = self.score - _epoch_hours(created) * self.AGE_POINTS_PER_HOUR
+    
+    @classmethod
+    def static_score_expression(cls, priority=None):
+        """
+        calculate_static_score() as a database expression, with the reported
+        user's trust level joined in a subquery. Pass priority to score rows
+        as if they had that priority (for updates that change it).
+        """
+        trust_level = Subquery(
+            TrustLevel.objects.filter(user_id=OuterRef('reported_user_id')).values('level')[:1]
+        )
+        if priority is None:
+            priority_points = Case(
+                *[When(priority=level, then=Value(points)) for level, points in cls.PRIORITY_POINTS.items()],
+                default=Value(cls.DEFAULT_PRIORITY_POINTS),
+            )
+        else:
+            priority_points = Value(cls.PRIORITY_POINTS.get(priority, cls.DEFAULT_PRIORITY_POINTS))
+        return ExpressionWrapper(
+            priority_points
+            + F('upvotes') * cls.UPVOTE_POINTS
+            + Case(
+                When(reported_user__isnull=True, then=Value(0)),
+                default=(Value(4) - Coalesce(trust_level, Value(0))) * cls.TRUST_POINTS_PER_LEVEL,
+            )
+            + Case(
+                *[When(review_type=review_type, then=Value(points)) for review_type, points in cls.TYPE_POINTS.items()],
+                default=Value(cls.DEFAULT_TYPE_POINTS),
+            ),
+            output_field=models.FloatField(),
+        )
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so save() can move the item between rollups
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_resolved_at = instance.__dict__.get('resolved_at')
+        return instance
+    
     def save(self, *args, **kwargs):
-        # Update score on save
-        self.score = self.calculate_priority_score()
+        # Update static score on save; the age bonus is applied when querying
+        self.refresh_scores()
         
         # Set resolved_at when status changes to resolved
         if self.status in ['approved', 'rejected'] and not self.resolved_at:
             self.resolved_at = timezone.now()
         
+        created = self._state.adding
+        previous = (getattr(self, '_loaded_status', None), getattr(self, '_loaded_resolved_at', None))
         super().save(*args, **kwargs)
+        
+        # Keep the daily analytics rollups in step with creation and status changes
+        update_fields = kwargs.get('update_fields')
+        status_saved = update_fields is None or 'status' in update_fields
+        if created or (status_saved and previous[0] is not None and (self.status, self.resolved_at) != previous):
+            from .moderation_rollups import ModerationRollups
+            ModerationRollups.record_item(
+                self,
+                previous_status=None if created else previous[0],
+                previous_resolved_at=None if created else previous[1],
+            )
+        if created or status_saved:
+            self._loaded_status, self._loaded_resolved_at = self.status, self.resolved_at
     
     @property
     def is_pending(self):
@@ -435,12 +611,13 @@ class ModerationLog(models.Model):
         ('trust_level_change', 'Trust Level Changed'),
         ('assign_moderator', 'Assigned Moderator'),
         ('escalate', 'Escalated'),
+        ('de_escalate', 'De-escalated'),
         ('bulk_action', 'Bulk Action'),
     ]
     
     # Action details
     action_type = models.CharField(max_length=20, choices=ACTION_TYPES)
-    moderator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='moderation_actions')
+    moderator = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='moderation_actions', help_text="Empty for system actions")
     
     # Target references
     review_item = models.ForeignKey(ReviewQueue, on_delete=models.CASCADE, null=True, blank=True)
@@ -478,7 +655,8 @@ class ModerationLog(models.Model):
         elif self.review_item:
             target = f"Review: {self.review_item.id}"
         
-        return f"{self.moderator.username} {self.get_action_type_display()} {target}"
+        moderator = self.moderator.username if self.moderator else 'System'
+        return f"{moderator} {self.get_action_type_display()} {target}"
 
 
 class FlaggedContent(models.Model):
@@ -530,6 +708,131 @@ class FlaggedContent(models.Model):
         return f"{content_type} flagged by {self.flagger.username} for {self.get_reason_display()}"
 
 
+class PostSignature(models.Model):
+    """
+    MinHash signature of a post's content for near-duplicate detection.
+    
+    The signature is split into LSH bands (PostSignatureBand) so similar
+    posts can be found with one indexed lookup per band instead of
+    comparing content pairwise.
+    """
+    post = models.OneToOneField('forum_conversation.Post', on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Post Signature"
+        verbose_name_plural = "Post Signatures"
+    
+    def __str__(self):
+        return f"Signature for post {self.post_id}"
+
+
+class PostSignatureBand(models.Model):
+    """
+    LSH bucket of one band of a post signature
+    """
+    signature = models.ForeignKey(PostSignature, on_delete=models.CASCADE, related_name='bands')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+    
+    class Meta:
+        verbose_name = "Post Signature Band"
+        verbose_name_plural = "Post Signature Bands"
+        indexes = [
+            models.Index(fields=['band', 'bucket']),
+        ]
+    
+    def __str__(self):
+        return f"Post {self.signature_id} band {self.band}"
+
+
+class SpamRescoreJob(models.Model):
+    """
+    Progress of rescoring recent posts after a spam rule change.
+    
+    One row per rule version; last_post_id is the checkpoint an interrupted
+    run resumes from.
+    """
+    rules_version = models.CharField(max_length=50, unique=True)
+    since = models.DateTimeField(help_text="Posts created after this time are rescored")
+    last_post_id = models.IntegerField(default=0)
+    
+    # Progress counters
+    posts_scored = models.IntegerField(default=0)
+    items_updated = models.IntegerField(default=0)
+    items_created = models.IntegerField(default=0)
+    
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Spam Rescore Job"
+        verbose_name_plural = "Spam Rescore Jobs"
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        state = 'complete' if self.completed_at else f'at post {self.last_post_id}'
+        return f"Spam rules v{self.rules_version} rescore ({state})"
+
+
+class TrackerRebuildJob(models.Model):
+    """
+    Progress of a topic or forum tracker rebuild.
+    
+    One row per scope (e.g. "topics", "topics:forum=3", "forums"); last_id is
+    the checkpoint an interrupted run resumes from.
+    """
+    scope = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    
+    # Progress counters
+    checked = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    
+    started_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Tracker Rebuild Job"
+        verbose_name_plural = "Tracker Rebuild Jobs"
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        state = 'complete' if self.completed_at else f'at {self.last_id}'
+        return f"Tracker rebuild {self.scope} ({state})"
+
+
+class ModerationDailyRollup(models.Model):
+    """
+    Daily moderation analytics per review type and status.
+    
+    Counts review items by the day they were created and their current
+    status, with resolution-time sums and a log-bucketed histogram for
+    percentiles. Maintained incrementally by moderation_rollups as items are
+    created and change status; rows are kept when old items are cleaned up.
+    """
+    date = models.DateField()
+    review_type = models.CharField(max_length=20, choices=ReviewQueue.REVIEW_TYPES)
+    status = models.CharField(max_length=15, choices=ReviewQueue.STATUS_CHOICES)
+    
+    items = models.IntegerField(default=0)
+    resolved_items = models.IntegerField(default=0, help_text="Items with a recorded resolution time")
+    resolution_seconds = models.FloatField(default=0.0, help_text="Sum of resolution times")
+    resolution_histogram = models.JSONField(default=dict, blank=True, help_text="Resolution time bucket -> count")
+    
+    class Meta:
+        verbose_name = "Moderation Daily Rollup"
+        verbose_name_plural = "Moderation Daily Rollups"
+        unique_together = ['date', 'review_type', 'status']
+        ordering = ['-date', 'review_type', 'status']
+    
+    def __str__(self):
+        return f"{self.date} {self.review_type}/{self.status}: {self.items}"
+
+
 # Badge and Gamification Models
 
 class BadgeCategory(models.Model):
@@ -980,6 +1283,56 @@ class ForumUserAchievement(models.Model):
         return f"{self.user.username} earned {self.achievement.name}"
 
 
+# Event Outbox
+
+class ForumEvent(models.Model):
+    """
+    Transactional outbox of forum events.
+    
+    Signal handlers append rows in the same transaction as the change that
+    caused them; the event dispatcher consumes them afterwards, in order per
+    user, and deletes them once every subscriber has succeeded.
+    """
+    EVENT_TYPES = [
+        ('post_created', 'Post Created'),
+        ('post_updated', 'Post Updated'),
+        ('topic_created', 'Topic Created'),
+        ('topic_updated', 'Topic Updated'),
+        ('moderation_batch_reviewed', 'Moderation Batch Reviewed'),
+        ('spam_rules_changed', 'Spam Rules Changed'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),
+    ]
+    
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='forum_events')
+    payload = models.JSONField(default=dict, blank=True)
+    
+    # Delivery state
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not dispatched before this time (retry backoff or claim lease)")
+    completed_handlers = models.JSONField(default=list, blank=True, help_text="Subscribers that already succeeded")
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Forum Event"
+        verbose_name_plural = "Forum Events"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['user', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} #{self.id} ({self.status})"
+
+
 class ForumIndexPage(Page):
     """
     Wagtail page that displays the forum index.
@@ -0,0 +1,259 @@
+"""
+Incremental daily rollups of moderation analytics.
+
+Every review item contributes to one ModerationDailyRollup row keyed by its
+creation date, review type and current status. Creating an item adds its
+contribution; a status change moves it from the old row to the new one, and
+deleting it (directly, by queryset or by CASCADE) subtracts it. Dashboards
+aggregate rollup rows instead of scanning ReviewQueue.
+
+Resolution times are kept as sums and as a histogram with logarithmic
+buckets (each bucket is BUCKET_BASE times wider than the previous one), which
+merges across rows and gives percentiles within about 12%.
+"""
+
+import logging
+import math
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import ModerationDailyRollup, ReviewQueue
+
+logger = logging.getLogger(__name__)
+
+_removals = threading.local()
+
+
+class ModerationRollups:
+    """
+    Maintains and reads ModerationDailyRollup rows.
+    """
+
+    RESOLVED_STATUSES = ('approved', 'rejected')
+    BUCKET_BASE = 1.25
+
+    # Contributions
+
+    @classmethod
+    def bucket(cls, seconds):
+        """Histogram bucket of a resolution time: 0 for under a second"""
+        if seconds < 1:
+            return 0
+        return int(math.log(seconds, cls.BUCKET_BASE)) + 1
+
+    @classmethod
+    def bucket_value(cls, bucket):
+        """Representative resolution time of a bucket (geometric midpoint)"""
+        if bucket == 0:
+            return 0.5
+        return cls.BUCKET_BASE ** (bucket - 0.5)
+
+    @classmethod
+    def contribution(cls, created_at, review_type, status, resolved_at=None):
+        """
+        Rollup key and resolution time an item in this state contributes.
+        """
+        key = (timezone.localdate(created_at), review_type, status)
+        seconds = None
+        if status in cls.RESOLVED_STATUSES and resolved_at:
+            seconds = max((resolved_at - created_at).total_seconds(), 0.0)
+        return key, seconds
+
+    @classmethod
+    def record_item(cls, item, previous_status=None, previous_resolved_at=None):
+        """
+        Record a created item (previous_status None) or a status change.
+        """
+        removed = []
+        if previous_status is not None:
+            removed.append((item.created_at, item.review_type, previous_status, previous_resolved_at))
+        cls.record(
+            added=[(item.created_at, item.review_type, item.status, item.resolved_at)],
+            removed=removed,
+        )
+
+    @classmethod
+    def record_deleted(cls, item):
+        """
+        Subtract a deleted item, as it was last stored (ReviewQueue post_delete).
+        """
+        state = (
+            item.created_at,
+            item.review_type,
+            getattr(item, '_loaded_status', None) or item.status,
+            getattr(item, '_loaded_resolved_at', item.resolved_at),
+        )
+        pending = getattr(_removals, 'states', None)
+        if pending is not None:
+            pending.append(state)
+        else:
+            cls.record(removed=[state])
+
+    @classmethod
+    @contextmanager
+    def batched_removals(cls):
+        """
+        Subtract the items deleted inside the block with one rollup write,
+        in the same transaction as the deletes (for bulk deletes).
+        """
+        if getattr(_removals, 'states', None) is not None:
+            yield
+            return
+        _removals.states = []
+        try:
+            with transaction.atomic():
+                yield
+                states, _removals.states = _removals.states, None
+                cls.record(removed=states)
+        finally:
+            _removals.states = None
+
+    @classmethod
+    def record(cls, added=(), removed=()):
+        """
+        Apply item contributions to the rollups in one transaction.
+
+        Args:
+            added: (created_at, review_type, status, resolved_at) tuples to add
+            removed: tuples in the same form to subtract
+        """
+        deltas = defaultdict(lambda: {'items': 0, 'resolved_items': 0, 'seconds': 0.0, 'histogram': defaultdict(int)})
+        for sign, states in ((1, added), (-1, removed)):
+            for state in states:
+                key, seconds = cls.contribution(*state)
+                delta = deltas[key]
+                delta['items'] += sign
+                if seconds is not None:
+                    delta['resolved_items'] += sign
+                    delta['seconds'] += sign * seconds
+                    delta['histogram'][str(cls.bucket(seconds))] += sign
+
+        # Contributions that cancel out (e.g. a no-op status change) need no write
+        deltas = {
+            key: delta for key, delta in deltas.items()
+            if delta['items'] or delta['resolved_items'] or any(delta['histogram'].values())
+        }
+        if not deltas:
+            return
+
+        key_filter = Q()
+        for date, review_type, status in deltas:
+            key_filter |= Q(date=date, review_type=review_type, status=status)
+
+        with transaction.atomic():
+            ModerationDailyRollup.objects.bulk_create(
+                [
+                    ModerationDailyRollup(date=date, review_type=review_type, status=status)
+                    for date, review_type, status in deltas
+                ],
+                ignore_conflicts=True,
+            )
+            rows = list(ModerationDailyRollup.objects.select_for_update().filter(key_filter))
+            for row in rows:
+                delta = deltas[(row.date, row.review_type, row.status)]
+                row.items += delta['items']
+                row.resolved_items += delta['resolved_items']
+                row.resolution_seconds += delta['seconds']
+                histogram = dict(row.resolution_histogram)
+                for bucket, count in delta['histogram'].items():
+                    total = histogram.get(bucket, 0) + count
+                    if total > 0:
+                        histogram[bucket] = total
+                    else:
+                        histogram.pop(bucket, None)
+                row.resolution_histogram = histogram
+            ModerationDailyRollup.objects.bulk_update(
+                rows, ['items', 'resolved_items', 'resolution_seconds', 'resolution_histogram']
+            )
+
+    @classmethod
+    def rebuild(cls, chunk_size=2000):
+        """
+        Recompute all rollups from ReviewQueue. Returns the number of items counted.
+        """
+        count = 0
+        with transaction.atomic():
+            ModerationDailyRollup.objects.all().delete()
+            states = []
+            rows = ReviewQueue.objects.order_by('pk').values_list(
+                'created_at', 'review_type', 'status', 'resolved_at'
+            )
+            for state in rows.iterator(chunk_size=chunk_size):
+                states.append(state)
+                if len(states) >= chunk_size:
+                    cls.record(added=states)
+                    count += len(states)
+                    states = []
+            if states:
+                cls.record(added=states)
+                count += len(states)
+        return count
+
+    # Reading
+
+    @classmethod
+    def percentile(cls, histogram, fraction):
+        """Approximate resolution time at a fraction (0-1) of a merged histogram"""
+        total = sum(histogram.values())
+        if not total:
+            return None
+
+        target = fraction * total
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= target:
+                return cls.bucket_value(bucket)
+        return cls.bucket_value(max(histogram))
+
+    @classmethod
+    def summary(cls, since=None):
+        """
+        Aggregate rollups, optionally from a date on.
+
+        Returns:
+            Dict with totals by status, type and date plus resolution time
+            average and p50/p90 in seconds
+        """
+        rows = ModerationDailyRollup.objects.all()
+        if since is not None:
+            rows = rows.filter(date__gte=since)
+
+        by_status = defaultdict(int)
+        by_type = defaultdict(int)
+        pending_by_type = defaultdict(int)
+        by_date = defaultdict(int)
+        histogram = defaultdict(int)
+        resolved_items = 0
+        resolution_seconds = 0.0
+
+        for row in rows.values_list(
+            'date', 'review_type', 'status', 'items',
+            'resolved_items', 'resolution_seconds', 'resolution_histogram'
+        ):
+            date, review_type, status, items, row_resolved, row_seconds, row_histogram = row
+            if items:
+                by_status[status] += items
+                by_type[review_type] += items
+                by_date[date] += items
+                if status == 'pending':
+                    pending_by_type[review_type] += items
+            resolved_items += row_resolved
+            resolution_seconds += row_seconds
+            for bucket, count in row_histogram.items():
+                histogram[int(bucket)] += count
+
+        return {
+            'total': sum(by_status.values()),
+            'by_status': dict(by_status),
+            'by_type': dict(by_type),
+            'pending_by_type': dict(pending_by_type),
+            'by_date': dict(sorted(by_date.items())),
+            'resolved': resolved_items,
+            'avg_resolution_seconds': resolution_seconds / resolved_items if resolved_items else None,
+            'p50_resolution_seconds': cls.percentile(histogram, 0.5),
+            'p90_resolution_seconds': cls.percentile(histogram, 0.9),
+        }
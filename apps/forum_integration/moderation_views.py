@@ -9,7 +9,7 @@ from django.http import JsonResponse, HttpResponseForbidden
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
-from django.db.models import Q, Count, Avg, F, ExpressionWrapper, DurationField, IntegerField
+from django.db.models import Q, Count, F, ExpressionWrapper, DurationField, IntegerField
 from django.db.models.functions import Cast, Extract
 from django.core.paginator import Paginator
 from django.utils import timezone
@@ -17,6 +17,8 @@ from django.contrib.auth import get_user_model
 import json
 
 from .models import ReviewQueue, ModerationLog, FlaggedContent, TrustLevel
+from .moderation_rollups import ModerationRollups
+from apps.api.services.container import container
 from machina.apps.forum_conversation.models import Post, Topic
 
 User = get_user_model()
@@ -44,7 +46,7 @@ def moderation_dashboard(request):
     # Base queryset
     queryset = ReviewQueue.objects.select_related(
         'post', 'topic', 'reported_user', 'reporter', 'assigned_moderator'
-    )
+    ).by_urgency()
     
     # Apply filters
     if status_filter != 'all':
@@ -67,6 +69,8 @@ def moderation_dashboard(request):
     page_obj = paginator.get_page(page_number)
     
     # Statistics
+    avg_resolution_seconds = ModerationRollups.summary()['avg_resolution_seconds']
+    avg_resolution_hours = avg_resolution_seconds / 3600 if avg_resolution_seconds is not None else None
     stats = {
         'total_pending': ReviewQueue.objects.filter(status='pending').count(),
         'assigned_to_me': ReviewQueue.objects.filter(
@@ -75,11 +79,7 @@ def moderation_dashboard(request):
         'critical_items': ReviewQueue.objects.filter(
             priority=1, status='pending'
         ).count(),
-        'avg_resolution_time': ReviewQueue.objects.filter(
-            status__in=['approved', 'rejected'], resolved_at__isnull=False
-        ).aggregate(
-            avg_time=Avg('resolved_at') - Avg('created_at')
-        )['avg_time'],
+        'avg_resolution_time': avg_resolution_hours,
     }
     
     # Review type choices for filter
@@ -247,41 +247,20 @@ def bulk_moderate(request):
         if action not in valid_actions:
             return JsonResponse({'error': 'Invalid action'}, status=400)
         
-        with transaction.atomic():
-            items = ReviewQueue.objects.filter(id__in=item_ids, status='pending')
-            updated_count = 0
-            
-            for item in items:
-                if action == 'approve':
-                    item.status = 'approved'
-                    item.resolved_at = timezone.now()
-                elif action == 'reject':
-                    item.status = 'rejected'
-                    item.resolved_at = timezone.now()
-                elif action == 'assign_to_me':
-                    item.assigned_moderator = request.user
-                elif action == 'escalate':
-                    item.status = 'escalated'
-                    item.priority = max(1, item.priority - 1)
-                
-                item.save()
-                updated_count += 1
-                
-                # Create log entry for each item
-                ModerationLog.objects.create(
-                    action_type='bulk_action',
-                    moderator=request.user,
-                    review_item=item,
-                    target_user=item.reported_user,
-                    target_post=item.post,
-                    target_topic=item.topic,
-                    reason=reason,
-                    details={
-                        'bulk_action': action,
-                        'total_items': len(item_ids),
-                    },
-                    ip_address=request.META.get('REMOTE_ADDR')
-                )
+        if action == 'assign_to_me':
+            updated_count = ReviewQueue.objects.filter(
+                id__in=item_ids, status='pending'
+            ).update(assigned_moderator=request.user)
+        else:
+            # One transaction with bulk writes, batched cache invalidation and one broadcast
+            result = container.get_review_queue_service().bulk_review(
+                item_ids=item_ids,
+                reviewer=request.user,
+                action=action,
+                notes=reason,
+                ip_address=request.META.get('REMOTE_ADDR'),
+            )
+            updated_count = result['updated']
         
         return JsonResponse({
             'success': True,
@@ -4,10 +4,12 @@ Badge notification and celebration service for real-time achievement alerts.
 
 import logging
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from .models import UserBadge, Badge, UserPoints, Achievement, ForumUserAchievement
+from .badge_progress_service import BadgeProgressService
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -177,33 +179,115 @@ class NotificationService:
         """
         Check if user is close to earning a badge and send progress notification.
         """
-        if UserBadge.objects.filter(user=user, badge=badge).exists():
-            return
+        pending = BadgeProgressService.take_progress_notifications(user, badge_ids={badge.id})
+        for entry, progress, percentage, threshold in pending:
+            cls.notify_badge_progress(user, entry, progress, percentage, threshold)
+    
+    @classmethod
+    def notify_badge_progress(cls, user, badge, progress, percentage, threshold):
+        """
+        Send a near-completion notification for a badge.
         
-        progress = badge.calculate_progress(user)
-        percentage = (progress / badge.condition_value * 100) if badge.condition_value > 0 else 0
+        Accepts a Badge or a BadgeProgressService catalog entry.
+        """
+        notification_data = {
+            'type': 'badge_progress',
+            'badge': {
+                'id': badge.id,
+                'name': badge.name,
+                'icon': badge.icon,
+                'progress': progress,
+                'required': badge.condition_value,
+                'percentage': int(percentage),
+                'threshold': threshold,
+            },
+            'message': f"You're {int(percentage)}% of the way to earning {badge.name}!",
+        }
         
-        # Notify at 50%, 75%, and 90% progress
-        thresholds = [50, 75, 90]
-        for threshold in thresholds:
-            if percentage >= threshold and percentage < threshold + 5:
-                notification_data = {
-                    'type': 'badge_progress',
-                    'badge': {
-                        'id': badge.id,
-                        'name': badge.name,
-                        'icon': badge.icon,
-                        'progress': progress,
-                        'required': badge.condition_value,
-                        'percentage': int(percentage),
-                        'threshold': threshold,
-                    },
-                    'message': f"You're {int(percentage)}% of the way to earning {badge.name}!",
-                }
-                
-                cls._send_user_notification(user.id, notification_data)
-                break
+        cls._send_user_notification(user.id, notification_data)
     
+    @classmethod
+    def notify_trust_level_promotions(cls, promotions, badge_awards=()):
+        """
+        Notify a batch of users about trust level promotions.
+
+        Used by the bulk promotion engine. All messages are sent from a
+        single event loop entry instead of one async_to_sync() round-trip
+        per user.
+
+        Args:
+            promotions: Dict mapping user_id -> new trust level
+            badge_awards: Iterable of (user_id, badge) earned alongside
+        """
+        from .models import TrustLevel
+        level_names = dict(TrustLevel.TRUST_LEVELS)
+
+        notifications = [
+            (user_id, {
+                'type': 'trust_level_promotion',
+                'trust_level': {
+                    'level': new_level,
+                    'name': level_names.get(new_level, ''),
+                },
+                'message': f"You've been promoted to TL{new_level} ({level_names.get(new_level, '')})!",
+                'celebration_type': 'confetti',
+            })
+            for user_id, new_level in promotions.items()
+        ]
+        notifications.extend(
+            (user_id, {
+                'type': 'badge_earned',
+                'badge': {
+                    'id': badge.id,
+                    'name': badge.name,
+                    'description': badge.description,
+                    'icon': badge.icon,
+                    'color': badge.color,
+                    'rarity': badge.rarity,
+                    'rarity_display': badge.get_rarity_display(),
+                    'points_awarded': badge.points_awarded,
+                },
+                'celebration_type': cls._get_celebration_type(badge),
+            })
+            for user_id, badge in badge_awards
+        )
+
+        cls._send_bulk_notifications(notifications)
+
+        # Only the awarded (user, badge) pairs, not every combination of them
+        awarded = Q()
+        for user_id, badge in badge_awards:
+            awarded |= Q(user_id=user_id, badge_id=badge.id)
+        if awarded:
+            UserBadge.objects.filter(awarded, notification_sent=False).update(notification_sent=True)
+
+        logger.info(f"Trust level promotion notifications sent to {len(promotions)} users")
+
+    @classmethod
+    def _send_bulk_notifications(cls, notifications):
+        """
+        Send many (user_id, notification_data) pairs in one event loop entry.
+        """
+        if not channel_layer or not notifications:
+            return
+
+        timestamp = timezone.now().isoformat()
+
+        async def send_all():
+            for user_id, notification_data in notifications:
+                message = {
+                    'type': 'notification_message',
+                    **notification_data,
+                    'timestamp': timestamp,
+                }
+                await channel_layer.group_send(f'user_notifications_{user_id}', message)
+                await channel_layer.group_send(f'user_{user_id}', message)
+
+        try:
+            async_to_sync(send_all)()
+        except Exception as e:
+            logger.error(f"Error sending bulk notifications: {e}")
+
     @classmethod
     def _send_user_notification(cls, user_id, notification_data):
         """
@@ -0,0 +1,221 @@
+"""
+Coalesced typing indicators, per-connection rate limits and batched
+activity writes for the forum WebSocket consumers.
+
+Consumers used to ``group_send`` a typing notification to the whole room
+for every typing_start/typing_stop a client sent, and to write the cache for
+every user_activity message. Now:
+
+- TypingCoalescer keeps the typing state of each room of this process and
+  sends it as one ``typing_state`` frame (who is typing) at most every
+  TYPING_INTERVAL_MS, and only when it changed: a typing_start from someone
+  already typing only refreshes their expiry. Typing expires after
+  TYPING_TTL seconds without a refresh; rooms with typists re-send their
+  state every TYPING_TTL / 2 so consumers can merge the frames of several
+  processes (see BaseForumConsumer.typing_state) and drop those of a
+  process that went away.
+- RateLimiter is a token bucket over a connection's inbound messages;
+  messages beyond RATE_LIMIT per second (bursts of RATE_BURST) are dropped.
+- ActivityBuffer keeps the latest activity of each user and writes them to
+  the cache with one ``set_many`` every ACTIVITY_FLUSH_INTERVAL seconds.
+
+Coalescers and buffers belong to the event loop that uses them (one per
+ASGI server process). Settings come from settings.FORUM_REALTIME (see
+DEFAULTS).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+import weakref
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULTS = {
+    'TYPING_INTERVAL_MS': 500,  # at most one typing frame per room per interval
+    'TYPING_TTL': 6,  # seconds a typing_start holds without a refresh
+    'RATE_LIMIT': 10,  # inbound messages per second per connection
+    'RATE_BURST': 20,
+    'ACTIVITY_FLUSH_INTERVAL': 5,  # seconds between activity cache writes
+    'ACTIVITY_TIMEOUT': 300,  # seconds activity entries stay in the cache
+}
+
+# Identifies the typing frames of this process
+SOURCE = uuid.uuid4().hex
+
+
+def get_setting(name):
+    return getattr(settings, 'FORUM_REALTIME', {}).get(name, DEFAULTS[name])
+
+
+class RateLimiter:
+    """
+    Token bucket over the inbound messages of one connection.
+    """
+
+    def __init__(self, rate=None, burst=None, clock=time.monotonic):
+        self.rate = rate if rate is not None else get_setting('RATE_LIMIT')
+        self.burst = burst if burst is not None else get_setting('RATE_BURST')
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.dropped = 0
+
+    def allow(self):
+        """Take a token; False (and the message should be dropped) if there is none."""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.dropped += 1
+        return False
+
+
+class _PerLoop:
+    """One instance per event loop, created on first use."""
+
+    _instances = None
+
+    @classmethod
+    def for_loop(cls, *args, **kwargs):
+        if cls._instances is None:
+            cls._instances = weakref.WeakKeyDictionary()
+        loop = asyncio.get_running_loop()
+        instance = cls._instances.get(loop)
+        if instance is None:
+            instance = cls._instances[loop] = cls(*args, **kwargs)
+        return instance
+
+
+class TypingCoalescer(_PerLoop):
+    """
+    Typing state of the rooms of this process, sent as one frame per room.
+    """
+
+    def __init__(self, channel_layer, interval_ms=None, ttl=None):
+        self.channel_layer = channel_layer
+        self.interval = (interval_ms if interval_ms is not None else get_setting('TYPING_INTERVAL_MS')) / 1000
+        self.ttl = ttl if ttl is not None else get_setting('TYPING_TTL')
+        self.frames = 0
+        self._typing = {}  # room -> {user ID: (username, expires at)}
+        self._sent = {}  # room -> users in the last frame
+        self._last_frame = {}  # room -> loop time of the last frame
+        self._timers = {}  # room -> TimerHandle of the next flush
+
+    def start(self, room, user_id, username):
+        """Record a typing_start; only a user who wasn't typing changes the room."""
+        now = asyncio.get_running_loop().time()
+        typing = self._typing.setdefault(room, {})
+        previous = typing.get(user_id)
+        typing[user_id] = (username, now + self.ttl)
+        if previous is None or previous[1] <= now:
+            self._changed(room)
+
+    def stop(self, room, user_id):
+        """Record a typing_stop (or a disconnect); ignored if the user wasn't typing."""
+        if self._typing.get(room, {}).pop(user_id, None) is not None:
+            self._changed(room)
+
+    def typing(self, room):
+        """Users typing in a room, as sent in frames."""
+        now = asyncio.get_running_loop().time()
+        return [
+            {'id': user_id, 'username': username}
+            for user_id, (username, expires_at) in sorted(self._typing.get(room, {}).items())
+            if expires_at > now
+        ]
+
+    def _changed(self, room):
+        loop = asyncio.get_running_loop()
+        last_frame = self._last_frame.get(room)
+        at = loop.time() if last_frame is None else max(loop.time(), last_frame + self.interval)
+        self._schedule(room, at)
+
+    def _schedule(self, room, at):
+        """Flush a room at loop time `at`, unless a flush is already due sooner."""
+        timer = self._timers.get(room)
+        if timer is not None:
+            if timer.when() <= at:
+                return
+            timer.cancel()
+        self._timers[room] = asyncio.get_running_loop().call_at(at, self._start_flush, room)
+
+    def _start_flush(self, room):
+        self._timers.pop(room, None)
+        asyncio.get_running_loop().create_task(self._flush(room))
+
+    async def _flush(self, room):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        typing = self._typing.get(room, {})
+        for user_id, (_, expires_at) in list(typing.items()):
+            if expires_at <= now:
+                del typing[user_id]
+
+        users = self.typing(room)
+        last_frame = self._last_frame.get(room)
+        refresh_due = users and (last_frame is None or now - last_frame >= self.ttl / 2)
+        if users != self._sent.get(room, []) or refresh_due:
+            self._sent[room] = users
+            self._last_frame[room] = now
+            try:
+                await self.channel_layer.group_send(room, {
+                    'type': 'typing_state',
+                    'source': SOURCE,
+                    'users': users,
+                    'timestamp': timezone.now().isoformat(),
+                })
+                self.frames += 1
+            except Exception as e:
+                logger.error(f"Error sending typing state to {room}: {e}")
+
+        if typing:
+            next_expiry = min(expires_at for _, expires_at in typing.values())
+            self._schedule(room, max(now + self.interval, min(next_expiry, now + self.ttl / 2)))
+        elif not users:
+            # Nobody typing and the empty state was sent: forget the room
+            self._typing.pop(room, None)
+            self._sent.pop(room, None)
+            self._last_frame.pop(room, None)
+
+
+class ActivityBuffer(_PerLoop):
+    """
+    Latest activity of each user, written to the cache in batches.
+    """
+
+    KEY_PREFIX = 'user_activity_'
+
+    def __init__(self, interval=None, timeout=None):
+        self.interval = interval if interval is not None else get_setting('ACTIVITY_FLUSH_INTERVAL')
+        self.timeout = timeout if timeout is not None else get_setting('ACTIVITY_TIMEOUT')
+        self.writes = 0
+        self._pending = {}
+        self._timer = None
+
+    def record(self, user_id, activity):
+        """Buffer a user's activity; later records replace earlier ones."""
+        self._pending[f'{self.KEY_PREFIX}{user_id}'] = activity
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.interval, lambda: loop.create_task(self.flush()))
+
+    async def flush(self):
+        """Write the buffered activity with one cache call."""
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            await sync_to_async(cache.set_many)(pending, self.timeout)
+            self.writes += 1
+        except Exception as e:
+            logger.error(f"Error writing {len(pending)} user activity entries: {e}")
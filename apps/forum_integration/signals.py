@@ -3,41 +3,32 @@ Django signals for tracking forum activity, trust level progression, and real-ti
 """
 import json
 import logging
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 from machina.apps.forum_conversation.models import Topic, Post
-from .middleware import ForumActivityTracker
-from .models import TrustLevel
-from apps.api.services.container import container
+from .models import ReviewQueue, TrustLevel
 from .gamification_service import GamificationService
+from .broadcast_outbox import BroadcastOutbox
+from .event_bus import EventBus
+from apps.api.services.container import container
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
-channel_layer = get_channel_layer()
 
 
 def broadcast_to_channel(group_name, message_type, data):
-    """Helper function to broadcast messages to WebSocket groups"""
-    if not channel_layer:
-        logger.warning("Channel layer not available for broadcasting")
-        return
-        
-    try:
-        async_to_sync(channel_layer.group_send)(
-            group_name,
-            {
-                'type': message_type,
-                **data,
-                'timestamp': timezone.now().isoformat()
-            }
-        )
-        logger.debug(f"Broadcasted {message_type} to {group_name}")
-    except Exception as e:
-        logger.error(f"Error broadcasting to {group_name}: {e}")
+    """
+    Broadcast a message to a WebSocket group once the current transaction
+    commits (see broadcast_outbox)
+    """
+    BroadcastOutbox.record(group_name, {
+        'type': message_type,
+        **data,
+        'timestamp': timezone.now().isoformat()
+    })
 
 
 @receiver(post_save, sender=User)
@@ -63,181 +54,47 @@ def create_trust_level_for_new_user(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Post)
-def track_post_creation(sender, instance, created, **kwargs):
+def track_post_creation(sender, instance, created, raw=False, **kwargs):
     """
-    Track when users create new posts and broadcast real-time updates
+    Publish post events; tracking, gamification, review checks, forum
+    trackers and broadcasts run in the event_handlers subscribers
     """
-    if created and instance.poster:
-        ForumActivityTracker.track_post_created(instance.poster, instance)
-        
-        # Handle gamification for post creation
-        GamificationService.handle_post_created(instance.poster, instance)
-        
-        # Check if post needs moderation review
-        review_service = container.get_review_queue_service()
-        review_service.check_new_post(instance)
-        
-        # Update forum trackers to show latest post
-        if instance.topic and instance.topic.forum:
-            instance.topic.forum.update_trackers()
-            instance.topic.forum.save(update_fields=['last_post_id', 'last_post_on'])
-        
-        # Broadcast real-time updates
-        # Use instance.created if available, otherwise use current time
-        created_time = instance.created.isoformat() if instance.created else timezone.now().isoformat()
-            
-        post_data = {
-            'id': instance.id,
-            'content': instance.content.raw if hasattr(instance.content, 'raw') else str(instance.content),
-            'poster': {
-                'id': instance.poster.id,
-                'username': instance.poster.username
-            },
-            'created': created_time,
-            'topic_id': instance.topic.id,
-            'forum_id': instance.topic.forum.id
-        }
-        
-        # Broadcast to topic-specific group
-        topic_group = f'topic_{instance.topic.id}'
-        broadcast_to_channel(topic_group, 'new_post', {'post': post_data})
-        
-        # Broadcast to forum-wide group
-        forum_group = f'forum_{instance.topic.forum.id}'
-        broadcast_to_channel(forum_group, 'new_post', {'post': post_data})
-        
-        # Broadcast to global activity feed
-        broadcast_to_channel('forum_activity', 'activity_update', {
-            'activity': {
-                'type': 'new_post',
-                'user': post_data['poster'],
-                'topic': {
-                    'id': instance.topic.id,
-                    'subject': instance.topic.subject
-                },
-                'forum': {
-                    'id': instance.topic.forum.id,
-                    'name': instance.topic.forum.name
-                }
-            }
-        })
-        
-        logger.info(f"New post created by {instance.poster} in topic {instance.topic.id}")
+    if raw or not instance.poster_id:
+        return
     
-    elif not created and instance.poster:
-        # Check if edited post needs review
-        review_service = container.get_review_queue_service()
-        review_service.check_edited_post(instance, instance.poster)
-        
-        # Handle post updates
-        # Use instance timestamps if available, otherwise use current time
-        created_time = instance.created.isoformat() if instance.created else timezone.now().isoformat()
-        updated_time = instance.updated.isoformat() if instance.updated else timezone.now().isoformat()
-            
-        post_data = {
-            'id': instance.id,
-            'content': instance.content.raw if hasattr(instance.content, 'raw') else str(instance.content),
-            'poster': {
-                'id': instance.poster.id,
-                'username': instance.poster.username
-            },
-            'created': created_time,
-            'updated': updated_time,
-            'topic_id': instance.topic.id,
-            'forum_id': instance.topic.forum.id
-        }
-        
-        topic_group = f'topic_{instance.topic.id}'
-        broadcast_to_channel(topic_group, 'post_updated', {'post': post_data})
-        logger.info(f"Post {instance.id} updated by {instance.poster}")
+    event_type = 'post_created' if created else 'post_updated'
+    EventBus.publish(event_type, user=instance.poster, post_id=instance.id)
+
+
+@receiver(post_save, sender=Post)
+def record_post_velocity(sender, instance, created, raw=False, **kwargs):
+    """
+    Count the new post and its links in the poster's posting-rate windows
+    once the transaction commits, so rolled-back posts don't count
+    """
+    if created and not raw and instance.poster_id:
+        poster_id, content = instance.poster_id, instance.content
+        transaction.on_commit(
+            lambda: container.get_posting_velocity_tracker().record_post(poster_id, content)
+        )
 
 
 @receiver(post_save, sender=Topic)
-def track_topic_creation(sender, instance, created, **kwargs):
+def track_topic_creation(sender, instance, created, raw=False, **kwargs):
     """
-    Track when users create new topics and broadcast real-time updates
+    Publish topic events; see event_handlers for the subscribers
     """
-    if created and instance.poster:
-        ForumActivityTracker.track_topic_created(instance.poster, instance)
-        
-        # Handle gamification for topic creation
-        GamificationService.handle_topic_created(instance.poster, instance)
-        
-        # Check if topic needs moderation review
-        review_service = container.get_review_queue_service()
-        review_service.check_new_topic(instance)
-        
-        # Update forum trackers to show latest topic
-        if instance.forum:
-            instance.forum.update_trackers()
-            instance.forum.save(update_fields=['last_post_id', 'last_post_on'])
-        
-        # Broadcast real-time updates
-        # Use instance.created if available, otherwise use current time
-        created_time = instance.created.isoformat() if instance.created else timezone.now().isoformat()
-            
-        topic_data = {
-            'id': instance.id,
-            'subject': instance.subject,
-            'posts_count': instance.posts_count,
-            'views_count': getattr(instance, 'views_count', 0),
-            'is_locked': instance.is_locked,
-            'is_sticky': instance.is_sticky,
-            'poster': {
-                'id': instance.poster.id,
-                'username': instance.poster.username
-            },
-            'created': created_time,
-            'forum_id': instance.forum.id
-        }
-        
-        # Broadcast to forum-wide group
-        forum_group = f'forum_{instance.forum.id}'
-        broadcast_to_channel(forum_group, 'new_topic', {'topic': topic_data})
-        
-        # Broadcast to global activity feed
-        broadcast_to_channel('forum_activity', 'activity_update', {
-            'activity': {
-                'type': 'new_topic',
-                'user': topic_data['poster'],
-                'topic': topic_data,
-                'forum': {
-                    'id': instance.forum.id,
-                    'name': instance.forum.name
-                }
-            }
-        })
-        
-        logger.info(f"New topic '{instance.subject}' created by {instance.poster} in forum {instance.forum.id}")
+    if raw or not instance.poster_id:
+        return
     
-    elif not created and instance.poster:
-        # Handle topic updates
-        try:
-            created_time = instance.created.isoformat() if instance.created else timezone.now().isoformat()
-        except (AttributeError, TypeError):
-            created_time = timezone.now().isoformat()
-            
-        topic_data = {
-            'id': instance.id,
-            'subject': instance.subject,
-            'posts_count': instance.posts_count,
-            'views_count': getattr(instance, 'views_count', 0),
-            'is_locked': instance.is_locked,
-            'is_sticky': instance.is_sticky,
-            'poster': {
-                'id': instance.poster.id,
-                'username': instance.poster.username
-            },
-            'created': created_time,
-            'forum_id': instance.forum.id
-        }
-        
-        # Broadcast to forum and topic groups
-        forum_group = f'forum_{instance.forum.id}'
-        topic_group = f'topic_{instance.id}'
-        broadcast_to_channel(forum_group, 'topic_updated', {'topic': topic_data})
-        broadcast_to_channel(topic_group, 'topic_updated', {'topic': topic_data})
-        logger.info(f"Topic {instance.id} updated")
+    event_type = 'topic_created' if created else 'topic_updated'
+    EventBus.publish(event_type, user=instance.poster, topic_id=instance.id)
+    
+    if created:
+        poster_id = instance.poster_id
+        transaction.on_commit(
+            lambda: container.get_posting_velocity_tracker().record(poster_id, 'topic')
+        )
 
 
 # Note: For tracking likes, views, and reading time, we'll need to integrate
@@ -291,6 +148,16 @@ def handle_topic_deletion(sender, instance, **kwargs):
             pass
 
 
+@receiver(post_delete, sender=ReviewQueue)
+def remove_review_item_from_rollups(sender, instance, **kwargs):
+    """
+    Subtract deleted review items from the moderation rollups, including
+    items removed by queryset deletes and CASCADE
+    """
+    from .moderation_rollups import ModerationRollups
+    ModerationRollups.record_deleted(instance)
+
+
 @receiver(post_save, sender=TrustLevel)
 def handle_trust_level_promotion(sender, instance, created, **kwargs):
     """
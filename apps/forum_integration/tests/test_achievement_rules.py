@@ -0,0 +1,148 @@
+"""
+Tests for compiled achievement rules.
+"""
+
+import io
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from apps.forum_integration.achievement_rules import AchievementRules
+from apps.forum_integration.gamification_service import GamificationService
+from apps.forum_integration.models import (
+    Achievement, Badge, BadgeCategory, ForumUserAchievement, PointHistory, TrustLevel, UserBadge,
+    UserPoints,
+)
+
+User = get_user_model()
+
+
+class AchievementRulesTests(TestCase):
+    """Test requirement compilation and feature vector evaluation."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f'achiever_{i}', email=f'achiever_{i}@example.com', password='testpass123'
+            )
+            for i in range(3)
+        ]
+        self.veteran = Achievement.objects.create(
+            name='Veteran', description='TL2 with 100 points', achievement_type='milestone',
+            requirements={'min_trust_level': 2, 'min_points': 100}, points_reward=40,
+        )
+        self.collector = Achievement.objects.create(
+            name='Collector', description='Two badges', achievement_type='milestone',
+            requirements={'min_badges': 2}, points_reward=10,
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_compile(self):
+        self.assertEqual(
+            AchievementRules.compile({'min_trust_level': 2, 'min_streak': 7, 'unknown': 1}),
+            (('trust_level', 2), ('streak', 7)),
+        )
+
+    def test_missing_rows_fail_requirements(self):
+        """A user without UserPoints never meets a points requirement."""
+        UserPoints.objects.filter(user=self.users[0]).delete()
+        TrustLevel.objects.filter(user=self.users[0]).update(level=3)
+
+        self.assertFalse(GamificationService.check_achievement_condition(self.users[0], self.veteran))
+
+    def test_feature_vectors_in_one_query(self):
+        category = BadgeCategory.objects.create(name='Participation')
+        for i in range(2):
+            badge = Badge.objects.create(
+                name=f'Badge {i}', description='', category=category,
+                condition_type='special_event', condition_value=1,
+            )
+            UserBadge.objects.create(user=self.users[1], badge=badge)
+        UserPoints.objects.filter(user=self.users[1]).update(total_points=150, current_streak=3)
+
+        with self.assertNumQueries(1):
+            vectors = AchievementRules.feature_vectors([user.id for user in self.users])
+
+        self.assertEqual(vectors[self.users[1].id]['badges'], 2)
+        self.assertEqual(vectors[self.users[1].id]['points'], 150)
+        self.assertEqual(vectors[self.users[1].id]['streak'], 3)
+        self.assertEqual(vectors[self.users[0].id]['badges'], 0)
+
+    def test_check_achievements(self):
+        TrustLevel.objects.filter(user=self.users[0]).update(level=2)
+        UserPoints.objects.filter(user=self.users[0]).update(total_points=100)
+
+        with patch('apps.forum_integration.notification_service.NotificationService.notify_achievement_unlocked'):
+            earned = GamificationService.check_achievements(self.users[0])
+            self.assertEqual(GamificationService.check_achievements(self.users[0]), [])
+
+        self.assertEqual([user_achievement.achievement for user_achievement in earned], [self.veteran])
+        self.assertEqual(UserPoints.objects.get(user=self.users[0]).total_points, 140)
+
+    def test_rules_recompile_when_achievements_change(self):
+        AchievementRules.get_compiled()
+
+        self.collector.requirements = {'min_badges': 5}
+        self.collector.save()
+
+        rules = {rule.name: rule for rule in AchievementRules.get_compiled()}
+        self.assertEqual(rules['Collector'].conditions, (('badges', 5),))
+
+
+class RecomputeAchievementsCommandTests(TestCase):
+    """Test recompute_achievements management command."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f'bulk_{i}', email=f'bulk_{i}@example.com', password='testpass123'
+            )
+            for i in range(3)
+        ]
+        self.achievement = Achievement.objects.create(
+            name='Streaker', description='Seven day streak', achievement_type='milestone',
+            requirements={'min_streak': 7}, points_reward=25,
+        )
+        UserPoints.objects.filter(user__in=self.users[:2]).update(current_streak=7)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_dry_run(self):
+        out = io.StringIO()
+        call_command('recompute_achievements', dry_run=True, stdout=out)
+
+        self.assertIn('Streaker: 2 users', out.getvalue())
+        self.assertFalse(ForumUserAchievement.objects.exists())
+
+    @patch('apps.forum_integration.notification_service.NotificationService._send_bulk_notifications')
+    def test_awards_in_bulk(self, mock_send):
+        call_command('recompute_achievements', chunk_size=2, stdout=io.StringIO())
+        call_command('recompute_achievements', stdout=io.StringIO())
+
+        self.assertEqual(
+            set(ForumUserAchievement.objects.values_list('user_id', flat=True)),
+            {self.users[0].id, self.users[1].id},
+        )
+        self.assertEqual(UserPoints.objects.get(user=self.users[0]).total_points, 25)
+        self.assertEqual(UserPoints.objects.get(user=self.users[2]).total_points, 0)
+        self.assertEqual(mock_send.call_count, 1)
+
+    @patch('apps.forum_integration.notification_service.NotificationService._send_bulk_notifications')
+    def test_bulk_award_skips_existing_holders(self, mock_send):
+        ForumUserAchievement.objects.create(user=self.users[0], achievement=self.achievement)
+        # Unlocked after the rules were evaluated
+        rule = next(rule for rule in AchievementRules.get_compiled() if rule.id == self.achievement.id)
+
+        result = GamificationService.award_achievements_bulk({user.id: [rule] for user in self.users[:2]})
+
+        self.assertEqual(result['achievements_awarded'], 1)
+        self.assertEqual(UserPoints.objects.get(user=self.users[0]).total_points, 0)
+        self.assertEqual(UserPoints.objects.get(user=self.users[1]).total_points, 25)
+        self.assertFalse(PointHistory.objects.filter(user=self.users[0]).exists())
+        self.assertEqual([user_id for user_id, _ in mock_send.call_args[0][0]], [self.users[1].id])
@@ -0,0 +1,124 @@
+"""
+Tests for cached badge progress snapshots.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from apps.forum_integration.badge_progress_service import BadgeProgressService
+from apps.forum_integration.gamification_service import GamificationService
+from apps.forum_integration.models import Badge, BadgeCategory, TrustLevel, UserBadge
+
+User = get_user_model()
+
+
+class BadgeProgressServiceTests(TestCase):
+    """Test badge progress snapshots and the gamification paths reading them."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='badger', email='badger@example.com', password='testpass123'
+        )
+        self.category = BadgeCategory.objects.create(name='Participation')
+
+    def tearDown(self):
+        cache.clear()
+
+    def _badge(self, name, condition_type, condition_value, **kwargs):
+        return Badge.objects.create(
+            name=name, description=name, category=self.category,
+            condition_type=condition_type, condition_value=condition_value, **kwargs
+        )
+
+    def _set_counters(self, **counters):
+        trust_level = TrustLevel.objects.get(user=self.user)
+        for field, value in counters.items():
+            setattr(trust_level, field, value)
+        trust_level.save()
+
+    def test_snapshot_matches_calculate_progress(self):
+        """The in-memory progress vector agrees with Badge.calculate_progress."""
+        badges = [
+            self._badge('Poster', 'posts_created', 10),
+            self._badge('Starter', 'topics_created', 5),
+            self._badge('Liked', 'likes_received', 10),
+            self._badge('Reader', 'reading_time', 2),
+            self._badge('Trusted', 'trust_level', 2),
+            self._badge('First', 'first_post', 1),
+            self._badge('Helper', 'moderation_actions', 10),
+        ]
+        self._set_counters(
+            posts_created=7, topics_created=1, likes_received=3,
+            time_read=timedelta(hours=1, minutes=30), level=1,
+        )
+
+        snapshot = BadgeProgressService.get_snapshot(self.user)
+
+        user = User.objects.get(pk=self.user.pk)
+        for badge in badges:
+            self.assertEqual(snapshot['progress'][badge.id], badge.calculate_progress(user), badge.name)
+
+    def test_award_cost_is_independent_of_badge_count(self):
+        """Checking badges costs the same number of queries for 2 or 20 badges."""
+        self._badge('First', 'first_post', 1, points_awarded=0)
+        for i in range(20):
+            self._badge(f'Poster {i}', 'posts_created', 100 + i)
+        self._set_counters(posts_created=1)
+        BadgeProgressService.get_snapshot(self.user)
+
+        with patch('apps.forum_integration.notification_service.NotificationService._send_user_notification'):
+            with patch('apps.forum_integration.notification_service.NotificationService._broadcast_achievement'):
+                with self.assertNumQueries(10):
+                    earned = GamificationService.check_and_award_badges(self.user)
+
+        self.assertEqual([user_badge.badge.name for user_badge in earned], ['First'])
+        self.assertIn(earned[0].badge_id, BadgeProgressService.get_snapshot(self.user)['earned'])
+
+    @patch('apps.forum_integration.notification_service.NotificationService._send_user_notification')
+    def test_progress_notification_sent_once_per_threshold(self, mock_send):
+        badge = self._badge('Poster', 'posts_created', 10)
+        BadgeProgressService.get_snapshot(self.user)
+
+        self._set_counters(posts_created=5)
+        GamificationService.check_and_award_badges(self.user)
+        GamificationService.check_and_award_badges(self.user)
+        self._set_counters(posts_created=9)
+        GamificationService.check_and_award_badges(self.user)
+
+        thresholds = [call[0][1]['badge']['threshold'] for call in mock_send.call_args_list]
+        self.assertEqual(thresholds, [50, 90])
+        self.assertEqual(mock_send.call_args_list[0][0][1]['badge']['id'], badge.id)
+
+    def test_trust_level_save_updates_cached_snapshot(self):
+        badge = self._badge('Poster', 'posts_created', 10)
+        BadgeProgressService.get_snapshot(self.user)
+
+        self._set_counters(posts_created=4)
+
+        with self.assertNumQueries(0):
+            snapshot = BadgeProgressService.get_snapshot(self.user)
+        self.assertEqual(snapshot['progress'][badge.id], 4)
+
+    def test_badge_changes_invalidate_catalog(self):
+        BadgeProgressService.get_snapshot(self.user)
+        badge = self._badge('Poster', 'posts_created', 10)
+
+        self.assertIn(badge.id, BadgeProgressService.get_snapshot(self.user)['progress'])
+
+        badge.is_active = False
+        badge.save()
+
+        self.assertNotIn(badge.id, BadgeProgressService.get_snapshot(self.user)['progress'])
+
+    def test_user_stats_read_snapshot(self):
+        badge = self._badge('Poster', 'posts_created', 1)
+        self._set_counters(level=2)
+        UserBadge.objects.create(user=self.user, badge=badge)
+
+        stats = GamificationService.get_user_stats(self.user)
+
+        self.assertEqual(stats['badges']['total'], 1)
+        self.assertEqual(stats['trust_level'], {'level': 2, 'name': 'Member'})
@@ -0,0 +1,109 @@
+"""
+Tests for the WebSocket broadcast outbox and dispatcher.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+from django.db import transaction
+from django.test import TestCase, override_settings
+from apps.forum_integration.broadcast_outbox import BroadcastDispatcher
+from apps.forum_integration.signals import broadcast_to_channel
+
+EAGER = {'DISPATCH': 'eager', 'MAX_ATTEMPTS': 2, 'RETRY_BASE_SECONDS': 0}
+THREAD = {'DISPATCH': 'thread', 'BATCH_SIZE': 50, 'MAX_ATTEMPTS': 3, 'RETRY_BASE_SECONDS': 0}
+
+
+class RecordingLayer:
+    """Channel layer double recording group_send calls; the first send is slow."""
+
+    def __init__(self, failures=0):
+        self.sent = []
+        self.failures = failures
+
+    async def group_send(self, group, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('redis unavailable')
+        if not self.sent:
+            await asyncio.sleep(0.05)
+        self.sent.append((group, message))
+
+
+class BroadcastOutboxTests(TestCase):
+    """Test that broadcasts wait for the commit and are batched per group."""
+
+    def setUp(self):
+        BroadcastDispatcher.metrics.reset()
+
+    def _wait_for(self, count):
+        deadline = time.monotonic() + 5
+        while True:
+            metrics = BroadcastDispatcher.metrics.snapshot()
+            if metrics['sent'] >= count and not metrics['pending']:
+                return
+            self.assertLess(time.monotonic(), deadline, 'broadcasts were not dispatched')
+            time.sleep(0.01)
+
+    @override_settings(FORUM_BROADCASTS=EAGER)
+    def test_sent_after_commit_and_dropped_on_rollback(self):
+        layer = InMemoryChannelLayer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)('topic_1', channel)
+
+        with patch('apps.forum_integration.broadcast_outbox.get_channel_layer', return_value=layer):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                broadcast_to_channel('topic_1', 'post_deleted', {'post_id': 1})
+                self.assertEqual(BroadcastDispatcher.metrics.snapshot()['recorded'], 0)
+            self.assertEqual(len(callbacks), 1)
+
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        broadcast_to_channel('topic_1', 'post_deleted', {'post_id': 2})
+                        raise RuntimeError('rolled back')
+                except RuntimeError:
+                    pass
+            self.assertEqual(callbacks, [])
+
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual((message['type'], message['post_id']), ('post_deleted', 1))
+        self.assertEqual(BroadcastDispatcher.metrics.snapshot()['sent'], 1)
+
+    @override_settings(FORUM_BROADCASTS=THREAD)
+    def test_background_dispatch_batches_per_group(self):
+        layer = RecordingLayer()
+
+        with patch('apps.forum_integration.broadcast_outbox.get_channel_layer', return_value=layer):
+            with self.captureOnCommitCallbacks(execute=True):
+                for n in range(5):
+                    broadcast_to_channel('topic_1', 'new_post', {'n': n})
+                broadcast_to_channel('forum_1', 'new_post', {'n': 0})
+            self._wait_for(6)
+
+        sent = {}
+        for group, message in layer.sent:
+            messages = message['messages'] if message['type'] == 'broadcast_batch' else [message]
+            sent.setdefault(group, []).extend(m['n'] for m in messages)
+        self.assertEqual(sent, {'topic_1': [0, 1, 2, 3, 4], 'forum_1': [0]})
+        # The messages queued behind the first send of a group went out together
+        self.assertLess(len(layer.sent), 6)
+
+        metrics = BroadcastDispatcher.metrics.snapshot()
+        self.assertEqual((metrics['sent'], metrics['failed'], metrics['pending']), (6, 0, 0))
+        self.assertGreater(metrics['max_lag'], 0)
+
+    @override_settings(FORUM_BROADCASTS=THREAD)
+    def test_failed_send_is_retried(self):
+        layer = RecordingLayer(failures=2)
+
+        with patch('apps.forum_integration.broadcast_outbox.get_channel_layer', return_value=layer):
+            with self.captureOnCommitCallbacks(execute=True):
+                broadcast_to_channel('forum_activity', 'activity_update', {'n': 0})
+            self._wait_for(1)
+
+        self.assertEqual(len(layer.sent), 1)
+        metrics = BroadcastDispatcher.metrics.snapshot()
+        self.assertEqual((metrics['sent'], metrics['retries'], metrics['failed']), (1, 2, 0))
@@ -0,0 +1,169 @@
+"""
+Tests for the forum event outbox and dispatcher.
+"""
+
+import io
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.forum_integration.event_bus import EventBus, EventDispatcher
+from apps.forum_integration.models import ForumEvent, TrustLevel
+
+User = get_user_model()
+
+EAGER = {'DISPATCH': 'eager', 'MAX_ATTEMPTS': 2, 'RETRY_BASE_SECONDS': 0}
+
+
+class ForumEventOutboxTests(TestCase):
+    """Test that post saves publish events and the dispatcher consumes them."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='poster', email='poster@example.com', password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        self.forum = Forum.objects.create(name='Events Forum', slug='events-forum', type=Forum.FORUM_POST)
+
+    def tearDown(self):
+        cache.clear()
+
+    def _create_post(self):
+        topic = Topic.objects.create(
+            forum=self.forum, poster=self.user, subject='Hello',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        return Post.objects.create(
+            topic=topic, poster=self.user, subject='Hello', content='First post', approved=True,
+        )
+
+    def test_post_save_only_appends_events(self):
+        """Subscribers don't run inside the post's transaction."""
+        post = self._create_post()
+
+        self.assertTrue(
+            ForumEvent.objects.filter(event_type='post_created', payload__post_id=post.id).exists()
+        )
+        self.assertEqual(TrustLevel.objects.get(user=self.user).posts_created, 0)
+
+    @override_settings(FORUM_EVENTS=EAGER)
+    def test_events_dispatched_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = self._create_post()
+
+        self.assertEqual(TrustLevel.objects.get(user=self.user).posts_created, 1)
+        self.assertEqual(TrustLevel.objects.get(user=self.user).topics_created, 1)
+        self.forum.refresh_from_db()
+        self.assertEqual(self.forum.last_post_id, post.id)
+        self.assertFalse(ForumEvent.objects.exists())
+
+    @override_settings(FORUM_EVENTS=EAGER)
+    def test_failed_event_is_retried_and_holds_back_user_queue(self):
+        calls = []
+
+        def flaky(event):
+            calls.append(('flaky', event.payload['n']))
+            if calls.count(('flaky', 1)) == 1 and event.payload['n'] == 1:
+                raise RuntimeError('boom')
+
+        def steady(event):
+            calls.append(('steady', event.payload['n']))
+
+        with patch.dict(EventBus._subscribers, {'test_event': [steady, flaky]}):
+            EventBus.publish('test_event', user=self.user, n=1)
+            EventBus.publish('test_event', user=self.user, n=2)
+            EventBus.publish('test_event', user=self.other, n=3)
+
+            EventDispatcher.dispatch_pending()
+
+            first = ForumEvent.objects.get(payload__n=1)
+            self.assertEqual(first.attempts, 1)
+            self.assertIn('boom', first.last_error)
+            self.assertNotIn(('steady', 2), calls)
+            self.assertIn(('steady', 3), calls)
+
+            EventDispatcher.drain()
+
+        # steady isn't re-run for event 1 and user order is preserved
+        self.assertEqual(
+            [call for call in calls if call[1] != 3],
+            [('steady', 1), ('flaky', 1), ('flaky', 1), ('steady', 2), ('flaky', 2)],
+        )
+        self.assertFalse(ForumEvent.objects.exists())
+
+    @override_settings(FORUM_EVENTS=EAGER)
+    def test_event_fails_after_max_attempts(self):
+        def broken(event):
+            raise RuntimeError('always')
+
+        with patch.dict(EventBus._subscribers, {'test_event': [broken]}):
+            EventBus.publish('test_event', user=self.user)
+            EventBus.publish('test_event', user=self.user)
+            EventDispatcher.drain()
+
+        self.assertEqual(list(ForumEvent.objects.values_list('status', flat=True)), ['failed', 'failed'])
+
+        out = io.StringIO()
+        call_command('process_forum_events', once=True, retry_failed=True, stdout=out)
+        self.assertIn('Requeued 2 failed events', out.getvalue())
+
+    def test_ready_events_behind_held_back_ones_are_dispatched(self):
+        calls = []
+
+        with patch.dict(EventBus._subscribers, {'test_event': [lambda event: calls.append(event.payload['n'])]}):
+            for n in range(3):
+                EventBus.publish('test_event', user=self.user, n=n)
+            EventBus.publish('test_event', user=self.other, n=3)
+            ForumEvent.objects.filter(payload__n=0).update(available_at=timezone.now() + timedelta(minutes=5))
+
+            # The first two pending rows are held back; the ready one is still found
+            self.assertEqual(EventDispatcher.dispatch_pending(batch_size=2), 1)
+
+        # The user's events wait behind the one backing off
+        self.assertEqual(calls, [3])
+        self.assertEqual(ForumEvent.objects.count(), 3)
+
+    @override_settings(FORUM_EVENTS={**EAGER, 'DISPATCH': 'thread', 'RETRY_BASE_SECONDS': 30})
+    def test_thread_dispatcher_wakes_for_retries(self):
+        def broken(event):
+            raise RuntimeError('boom')
+
+        with patch.dict(EventBus._subscribers, {'test_event': [broken]}):
+            EventBus.publish('test_event', user=self.user)
+            EventDispatcher.drain()
+
+        with patch('apps.forum_integration.event_bus.threading.Timer') as timer:
+            EventDispatcher._schedule_retry()
+        EventDispatcher._retry_timer = EventDispatcher._retry_at = None
+
+        delay, callback = timer.call_args.args
+        self.assertAlmostEqual(delay, 30, delta=5)
+        self.assertEqual(callback, EventDispatcher.wake)
+        timer.return_value.start.assert_called_once()
+
+    def test_raw_saves_publish_nothing(self):
+        post = self._create_post()
+        ForumEvent.objects.all().delete()
+
+        post_save.send(Post, instance=post, created=True, raw=True, using='default', update_fields=None)
+        post_save.send(Topic, instance=post.topic, created=True, raw=True, using='default', update_fields=None)
+
+        self.assertFalse(ForumEvent.objects.exists())
+
+    def test_command_drains_outbox(self):
+        self._create_post()
+
+        out = io.StringIO()
+        call_command('process_forum_events', once=True, workers=1, stdout=out)
+
+        self.assertFalse(ForumEvent.objects.exists())
+        self.assertEqual(TrustLevel.objects.get(user=self.user).posts_created, 1)
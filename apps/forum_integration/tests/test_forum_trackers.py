@@ -0,0 +1,136 @@
+"""
+Tests for incremental topic and forum tracker updates.
+"""
+
+import io
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+
+from apps.api.services.container import container
+
+User = get_user_model()
+
+TOPIC_FIELDS = ('posts_count', 'first_post_id', 'last_post_id', 'last_post_on', 'approved')
+FORUM_FIELDS = ('direct_topics_count', 'direct_posts_count', 'last_post_id', 'last_post_on')
+
+
+class IncrementalTrackerTests(TestCase):
+    """Test that incremental updates match machina's full recomputation."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tracker', email='tracker@example.com', password='testpass123'
+        )
+        self.forum = Forum.objects.create(name='Tracker Forum', slug='tracker-forum', type=Forum.FORUM_POST)
+
+    def _topic(self, subject='Topic', approved=True):
+        topic = Topic.objects.create(
+            forum=self.forum, poster=self.user, subject=subject,
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        Post.objects.create(topic=topic, poster=self.user, subject=subject, content='First', approved=approved)
+        return topic
+
+    def _reply(self, topic, approved=True):
+        return Post.objects.create(
+            topic=Topic.objects.get(pk=topic.pk), poster=self.user, subject='Re', content='Reply', approved=approved
+        )
+
+    def assertTrackersConsistent(self):
+        """Incremental trackers equal those of a full update_trackers()."""
+        topics = {topic.pk: [getattr(topic, f) for f in TOPIC_FIELDS] for topic in Topic.objects.all()}
+        forum = Forum.objects.get(pk=self.forum.pk)
+        incremental = [getattr(forum, f) for f in FORUM_FIELDS]
+
+        for topic in Topic.objects.all():
+            topic.update_trackers()
+        forum.refresh_from_db()
+
+        self.assertEqual(
+            {topic.pk: [getattr(topic, f) for f in TOPIC_FIELDS] for topic in Topic.objects.all()}, topics
+        )
+        self.assertEqual([getattr(forum, f) for f in FORUM_FIELDS], incremental)
+
+    def test_new_posts_and_topics(self):
+        first = self._topic('First')
+        self._reply(first)
+        self._topic('Second')
+        self._reply(first, approved=False)
+
+        forum = Forum.objects.get(pk=self.forum.pk)
+        self.assertEqual((forum.direct_topics_count, forum.direct_posts_count), (2, 3))
+        self.assertTrackersConsistent()
+
+    def test_unapproved_first_post_hides_topic(self):
+        self._topic('Visible')
+        hidden = self._topic('Hidden', approved=False)
+        self.assertFalse(Topic.objects.get(pk=hidden.pk).approved)
+        self.assertTrackersConsistent()
+
+        # Approving the first post approves the topic
+        post = Post.objects.get(topic=hidden)
+        post.approved = True
+        post.save()
+
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).direct_topics_count, 2)
+        self.assertTrackersConsistent()
+
+    def test_deleting_last_post_and_topic(self):
+        first = self._topic('First')
+        reply = self._reply(first)
+        second = self._topic('Second')
+        latest = self._reply(second)
+
+        Post.objects.get(pk=latest.pk).delete()
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).last_post_id, second.first_post_id)
+        self.assertTrackersConsistent()
+
+        Topic.objects.get(pk=second.pk).delete()
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).last_post_id, reply.pk)
+        self.assertTrackersConsistent()
+
+        # The only post of a topic deletes the topic
+        Post.objects.get(pk=Topic.objects.get(pk=first.pk).first_post_id).delete()
+        Post.objects.get(pk=reply.pk).delete()
+        forum = Forum.objects.get(pk=self.forum.pk)
+        self.assertEqual((forum.direct_topics_count, forum.direct_posts_count, forum.last_post_id), (0, 0, None))
+
+    def test_bulk_moderation(self):
+        topic = self._topic('Queued')
+        pending = [self._reply(topic, approved=False) for _ in range(2)]
+
+        container.get_review_queue_service()._set_content_approval([post.pk for post in pending], [], True)
+
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).direct_posts_count, 3)
+        self.assertTrackersConsistent()
+
+        container.get_review_queue_service()._set_content_approval([pending[1].pk], [topic.pk], False)
+
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).direct_topics_count, 0)
+        self.assertTrackersConsistent()
+
+    def test_new_post_does_not_aggregate_forum(self):
+        for i in range(5):
+            self._topic(f'Topic {i}')
+        topic = Topic.objects.get(subject='Topic 0')
+
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.create(topic=topic, poster=self.user, subject='Re', content='Reply', approved=True)
+
+        forum_queries = [q['sql'] for q in queries if 'forum_forum' in q['sql']]
+        self.assertEqual(len(forum_queries), 1)
+        self.assertNotIn('SUM', forum_queries[0].upper())
+        self.assertTrackersConsistent()
+
+    def test_reconciliation(self):
+        self._topic('Drifted')
+        Forum.objects.filter(pk=self.forum.pk).update(direct_posts_count=10)
+
+        call_command('rebuild_forum_trackers', stdout=io.StringIO())
+
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).direct_posts_count, 1)
@@ -0,0 +1,166 @@
+"""
+Tests for the incremental moderation analytics rollups.
+"""
+
+import io
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from apps.api.repositories.review_queue_repository import ReviewQueueRepository
+from apps.forum_integration.models import ModerationDailyRollup, ReviewQueue
+from apps.forum_integration.moderation_rollups import ModerationRollups
+
+User = get_user_model()
+
+
+class ModerationRollupsTests(TestCase):
+    """Test that rollups track review item creation and status changes."""
+
+    def setUp(self):
+        self.moderator = User.objects.create_user(
+            username='rollupmod', email='rollupmod@example.com', password='testpass123'
+        )
+
+    def _create_item(self, review_type='user_report', **kwargs):
+        return ReviewQueue.objects.create(review_type=review_type, reason='Test', **kwargs)
+
+    def _resolve_after(self, item, status, seconds):
+        item.status = status
+        item.resolved_at = item.created_at + timedelta(seconds=seconds)
+        item.save()
+
+    def _row(self, review_type, status):
+        return ModerationDailyRollup.objects.get(
+            date=timezone.localdate(), review_type=review_type, status=status
+        )
+
+    def test_create_and_resolve_move_item_between_rows(self):
+        item = self._create_item()
+        self.assertEqual(self._row('user_report', 'pending').items, 1)
+
+        self._resolve_after(item, 'approved', 120)
+
+        self.assertEqual(self._row('user_report', 'pending').items, 0)
+        approved = self._row('user_report', 'approved')
+        self.assertEqual((approved.items, approved.resolved_items), (1, 1))
+        self.assertAlmostEqual(approved.resolution_seconds, 120)
+        self.assertEqual(sum(approved.resolution_histogram.values()), 1)
+
+        # Saving without a status change leaves the rollups alone
+        item.moderator_notes = 'Looks fine'
+        item.save()
+        self.assertEqual(self._row('user_report', 'approved').items, 1)
+
+    def test_reopen_removes_resolution_time(self):
+        item = self._create_item()
+        self._resolve_after(item, 'rejected', 60)
+
+        item = ReviewQueue.objects.get(pk=item.pk)
+        item.status = 'pending'
+        item.resolved_at = None
+        item.save()
+
+        rejected = self._row('user_report', 'rejected')
+        self.assertEqual((rejected.items, rejected.resolved_items), (0, 0))
+        self.assertEqual(rejected.resolution_histogram, {})
+        self.assertEqual(self._row('user_report', 'pending').items, 1)
+
+    def test_bulk_transition(self):
+        items = [self._create_item('spam_detection') for _ in range(3)]
+
+        updated = ReviewQueue.objects.filter(pk__in=[item.pk for item in items[:2]]).transition(
+            'rejected', assigned_moderator=self.moderator
+        )
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(self._row('spam_detection', 'pending').items, 1)
+        self.assertEqual(self._row('spam_detection', 'rejected').resolved_items, 2)
+        self.assertEqual(ReviewQueue.objects.filter(resolved_at__isnull=False).count(), 2)
+
+    def test_deleted_items_are_subtracted(self):
+        reported = User.objects.create_user(
+            username='rollupreported', email='rollupreported@example.com', password='testpass123'
+        )
+        self._create_item(reported_user=reported)
+        self._create_item(reported_user=reported)
+        self._create_item().delete()
+        self.assertEqual(self._row('user_report', 'pending').items, 2)
+
+        # CASCADE from the reported user
+        reported.delete()
+
+        self.assertEqual(self._row('user_report', 'pending').items, 0)
+        self.assertEqual(ModerationRollups.summary()['total'], 0)
+
+    def test_cleanup_subtracts_items_in_one_write(self):
+        old = timezone.now() - timedelta(days=40)
+        for _ in range(3):
+            item = self._create_item()
+            item.status = 'approved'
+            item.resolved_at = old
+            item.save()
+        self._create_item()
+
+        with patch.object(ModerationRollups, 'record', wraps=ModerationRollups.record) as record:
+            deleted = ReviewQueueRepository().cleanup_old_items(days=30)
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(record.call_count, 1)
+        self.assertEqual(self._row('user_report', 'approved').items, 0)
+        self.assertEqual(self._row('user_report', 'pending').items, 1)
+
+    def test_summary_percentiles(self):
+        for seconds in [10] * 5 + [1000] * 5:
+            self._resolve_after(self._create_item(), 'approved', seconds)
+        self._create_item('flagged_post')
+
+        summary = ModerationRollups.summary()
+
+        self.assertEqual(summary['total'], 11)
+        self.assertEqual(summary['pending_by_type'], {'flagged_post': 1})
+        self.assertAlmostEqual(summary['avg_resolution_seconds'], 505)
+        self.assertAlmostEqual(summary['p50_resolution_seconds'], 10, delta=1.5)
+        self.assertAlmostEqual(summary['p90_resolution_seconds'], 1000, delta=150)
+
+    def test_repository_stats_match_queue(self):
+        repo = ReviewQueueRepository()
+        for _ in range(2):
+            item = self._create_item()
+        self._create_item('flagged_post')
+        self.assertTrue(repo.approve_item(item.pk, self.moderator.pk, 'ok'))
+
+        stats = repo.get_queue_stats()
+
+        self.assertEqual(
+            (stats['total'], stats['pending'], stats['approved'], stats['rejected']),
+            (3, 2, 1, 0),
+        )
+        self.assertEqual(stats['by_type'], {'user_report': 1, 'flagged_post': 1})
+        self.assertIsNotNone(stats['p90_resolution_time_seconds'])
+
+        analytics = repo.get_analytics(days=7)
+        self.assertEqual(analytics['total_items'], 3)
+        self.assertEqual(analytics['approval_rate'], 100)
+        self.assertEqual(analytics['by_date'], {timezone.localdate(): 3})
+
+    def test_rebuild_command(self):
+        item = self._create_item()
+        self._resolve_after(item, 'approved', 30)
+        self._create_item()
+        expected = list(ModerationDailyRollup.objects.values_list(
+            'review_type', 'status', 'items', 'resolved_items', 'resolution_histogram'
+        ))
+
+        # Backfill from scratch, as after deploying the rollup tables
+        ModerationDailyRollup.objects.all().delete()
+        out = io.StringIO()
+        call_command('rebuild_moderation_rollups', stdout=out)
+
+        self.assertIn('from 2 review items', out.getvalue())
+        rebuilt = list(ModerationDailyRollup.objects.values_list(
+            'review_type', 'status', 'items', 'resolved_items', 'resolution_histogram'
+        ))
+        self.assertEqual(rebuilt, expected)
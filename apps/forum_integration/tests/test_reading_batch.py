@@ -0,0 +1,210 @@
+"""
+Tests for batched read-receipt ingestion.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+from apps.forum_integration.middleware import ForumActivityTracker
+from apps.forum_integration.models import (
+    ReadingProgress, TrustLevel, UserActivity, UserReadPosts
+)
+from apps.forum_integration.utils.bitmap import PostIdBitmap
+
+User = get_user_model()
+
+
+class PostIdBitmapTests(TestCase):
+    """Test the compact read-post bitmap."""
+
+    def test_add_and_contains(self):
+        bitmap = PostIdBitmap()
+        self.assertTrue(bitmap.add(5))
+        self.assertFalse(bitmap.add(5))
+        self.assertIn(5, bitmap)
+        self.assertNotIn(6, bitmap)
+
+    def test_round_trip_sparse_ids(self):
+        bitmap = PostIdBitmap()
+        ids = [0, 1, 4095, 4096, 10_000_000]
+        self.assertEqual(bitmap.add_many(ids + [1]), ids)
+
+        restored = PostIdBitmap.from_bytes(bitmap.to_bytes())
+
+        self.assertEqual(len(restored), len(ids))
+        for post_id in ids:
+            self.assertIn(post_id, restored)
+        self.assertLess(len(bitmap.to_bytes()), 200)
+
+    def test_empty_bytes(self):
+        self.assertEqual(len(PostIdBitmap.from_bytes(b'')), 0)
+
+
+class ReadingBatchTests(TestCase):
+    """Test ForumActivityTracker.track_reading_batch and its endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='testpass123'
+        )
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='testpass123'
+        )
+        self.forum = Forum.objects.create(name='Reading Forum', slug='reading-forum', type=Forum.FORUM_POST)
+        self.topic = Topic.objects.create(
+            forum=self.forum, poster=self.author, subject='Long topic',
+            type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+        )
+        self.posts = [
+            Post.objects.create(
+                topic=self.topic, poster=self.author, subject='Long topic',
+                content=f'Post number {i}', approved=True,
+            )
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        cache.clear()
+
+    def _event(self, first, last, dwell_ms=60_000, scroll=0.5):
+        return [self.topic.id, first.id, last.id, dwell_ms, scroll]
+
+    def _previous_batch_ago(self, **delta):
+        UserReadPosts.objects.filter(user=self.user).update(updated_at=timezone.now() - timedelta(**delta))
+
+    def test_merges_batch_into_counters(self):
+        """A whole topic's receipts update every counter in one call."""
+        summary = ForumActivityTracker.track_reading_batch(self.user, [
+            self._event(self.posts[0], self.posts[2], dwell_ms=30_000, scroll=0.4),
+            self._event(self.posts[3], self.posts[4], dwell_ms=30_000, scroll=1.0),
+        ])
+
+        self.assertEqual(summary['posts_marked_read'], 5)
+        self.assertEqual(summary['duplicate_posts'], 0)
+
+        trust_level = TrustLevel.objects.get(user=self.user)
+        self.assertEqual(trust_level.posts_read, 5)
+        self.assertEqual(trust_level.time_read, timedelta(minutes=1))
+
+        progress = ReadingProgress.objects.get(user=self.user, topic=self.topic)
+        self.assertTrue(progress.completed)
+        self.assertEqual(progress.scroll_depth, 1.0)
+        self.assertEqual(progress.last_read_post, self.posts[4].id)
+
+        activity = UserActivity.objects.get(user=self.user, date=timezone.now().date())
+        self.assertEqual(activity.posts_read_today, 5)
+        self.assertEqual(activity.topics_completed, 1)
+        self.assertEqual(UserReadPosts.objects.get(user=self.user).posts_count, 5)
+
+    def test_already_read_posts_are_not_counted_twice(self):
+        """Overlapping ranges only credit unseen posts."""
+        ForumActivityTracker.track_reading_batch(self.user, [self._event(self.posts[0], self.posts[2])])
+        self._previous_batch_ago(minutes=5)
+        summary = ForumActivityTracker.track_reading_batch(
+            self.user, [self._event(self.posts[1], self.posts[4])]
+        )
+
+        self.assertEqual(summary['posts_marked_read'], 2)
+        self.assertEqual(summary['duplicate_posts'], 2)
+        self.assertEqual(TrustLevel.objects.get(user=self.user).posts_read, 5)
+        self.assertEqual(
+            ReadingProgress.objects.get(user=self.user, topic=self.topic).time_spent,
+            timedelta(minutes=2),
+        )
+
+    def test_dwell_time_is_capped_per_topic_and_by_wall_clock(self):
+        """Oversized or replayed batches can't inflate time_read."""
+        events = [self._event(self.posts[0], self.posts[4], dwell_ms=30 * 60_000)] * 4
+
+        summary = ForumActivityTracker.track_reading_batch(self.user, events)
+        self.assertEqual(summary['time_read_seconds'], 30 * 60)
+
+        # Replayed right away: no time has passed since the previous batch
+        summary = ForumActivityTracker.track_reading_batch(self.user, events)
+        self.assertEqual(summary['time_read_seconds'], 0)
+
+        self._previous_batch_ago(minutes=10)
+        summary = ForumActivityTracker.track_reading_batch(self.user, events)
+        self.assertAlmostEqual(summary['time_read_seconds'], 10 * 60, delta=1)
+
+        time_read = TrustLevel.objects.get(user=self.user).time_read
+        self.assertAlmostEqual(time_read.total_seconds(), 40 * 60, delta=1)
+        self.assertEqual(
+            ReadingProgress.objects.get(user=self.user, topic=self.topic).time_spent, time_read
+        )
+
+    @patch.object(ForumActivityTracker, 'MAX_BATCH_POSTS', 3)
+    def test_posts_marked_read_are_capped(self):
+        """An oversized range can't mark a whole topic read."""
+        summary = ForumActivityTracker.track_reading_batch(self.user, [[self.topic.id, 1, 10**9, 1000, 0.5]])
+
+        self.assertEqual(summary['posts_marked_read'], 3)
+        self.assertEqual(TrustLevel.objects.get(user=self.user).posts_read, 3)
+        self.assertEqual(UserReadPosts.objects.get(user=self.user).posts_count, 3)
+        self.assertEqual(
+            ReadingProgress.objects.get(user=self.user, topic=self.topic).last_read_post, self.posts[2].id
+        )
+
+    def test_first_batches_racing_share_one_bitmap(self):
+        """A batch that finds no bitmap row tolerates one created concurrently."""
+        bulk_create = UserReadPosts.objects.bulk_create
+
+        def create_concurrently(objs, **kwargs):
+            UserReadPosts.objects.create(user=self.user)
+            return bulk_create(objs, **kwargs)
+
+        with patch.object(UserReadPosts.objects, 'bulk_create', side_effect=create_concurrently):
+            summary = ForumActivityTracker.track_reading_batch(
+                self.user, [self._event(self.posts[0], self.posts[2])]
+            )
+
+        self.assertEqual(summary['posts_marked_read'], 3)
+        self.assertEqual(UserReadPosts.objects.get(user=self.user).posts_count, 3)
+
+    def test_unknown_topics_are_ignored(self):
+        summary = ForumActivityTracker.track_reading_batch(self.user, [[999999, 1, 10, 1000, 0.5]])
+
+        self.assertEqual(summary['topics'], 0)
+        self.assertFalse(ReadingProgress.objects.filter(user=self.user).exists())
+
+    def test_rejects_malformed_batches(self):
+        with self.assertRaises(ValueError):
+            ForumActivityTracker.track_reading_batch(self.user, {'topic': 1})
+        with self.assertRaises(ValueError):
+            ForumActivityTracker.track_reading_batch(self.user, [['a', 'b', 'c', 'd', 'e']])
+        with self.assertRaises(ValueError):
+            ForumActivityTracker.track_reading_batch(
+                self.user, [[1, 1, 1, 1, 1]] * (ForumActivityTracker.MAX_BATCH_EVENTS + 1)
+            )
+
+    def test_write_count_is_independent_of_posts_in_batch(self):
+        """Ten single-post events cost the same number of queries as one range."""
+        events = [self._event(post, post, dwell_ms=1000) for post in self.posts]
+
+        with self.assertNumQueries(12):
+            ForumActivityTracker.track_reading_batch(self.user, events)
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(
+            reverse('api:forum-reading-batch'),
+            {'events': [{'topic': self.topic.id, 'from': self.posts[0].id,
+                         'to': self.posts[1].id, 'dwell_ms': 5000, 'scroll': 0.3}]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['posts_marked_read'], 2)
+
+        response = client.post(reverse('api:forum-reading-batch'), {'events': 'nope'}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,130 @@
+"""
+Tests for coalesced typing frames, connection rate limits and batched
+activity writes.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from apps.forum_integration.consumers import BaseForumConsumer
+from apps.forum_integration.realtime_fanout import ActivityBuffer, RateLimiter, TypingCoalescer
+
+
+class CountingLayer:
+    """Channel layer double counting group_send calls."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def group_send(self, group, message):
+        self.sent.append((group, message))
+
+
+class TypingCoalescerTests(SimpleTestCase):
+    """Test typing fan-out volume and state transitions."""
+
+    def test_load_typing_volume_is_coalesced(self):
+        """5 of 50 room members typing at 25 keystrokes/s for 0.6s."""
+        members, typists = 50, 5
+        layer = CountingLayer()
+
+        async def simulate():
+            coalescer = TypingCoalescer(layer, interval_ms=100, ttl=6)
+            events = 0
+            for _ in range(15):
+                for user_id in range(typists):
+                    coalescer.start('topic_1', user_id, f'user{user_id}')
+                    events += 1
+                await asyncio.sleep(0.04)
+            for user_id in range(typists):
+                coalescer.stop('topic_1', user_id)
+                events += 1
+            await asyncio.sleep(0.25)
+            return events
+
+        events = async_to_sync(simulate)()
+
+        # Per-keystroke fan-out sent one message per event to every member
+        before, after = events * members, len(layer.sent) * members
+        self.assertEqual(events, 80)
+        self.assertLessEqual(len(layer.sent), 3)
+        self.assertGreaterEqual(before / after, 25)
+
+        self.assertEqual([user['id'] for user in layer.sent[0][1]['users']], list(range(typists)))
+        self.assertEqual(layer.sent[-1][1]['users'], [])
+
+    def test_redundant_transitions_are_dropped_and_typing_expires(self):
+        layer = CountingLayer()
+
+        async def simulate():
+            coalescer = TypingCoalescer(layer, interval_ms=10, ttl=0.2)
+            coalescer.stop('topic_1', 1)
+            await asyncio.sleep(0.03)
+            self.assertEqual(layer.sent, [])
+
+            coalescer.start('topic_1', 1, 'alice')
+            await asyncio.sleep(0.03)
+            self.assertEqual(len(layer.sent), 1)
+            coalescer.start('topic_1', 1, 'alice')
+            await asyncio.sleep(0.03)
+            self.assertEqual(len(layer.sent), 1)
+
+            await asyncio.sleep(0.25)
+
+        async_to_sync(simulate)()
+
+        self.assertEqual(layer.sent[0][1]['users'], [{'id': 1, 'username': 'alice'}])
+        self.assertEqual(layer.sent[-1][1]['users'], [])
+
+    def test_consumer_merges_frames_of_server_processes(self):
+        consumer = BaseForumConsumer()
+        consumer.user = SimpleNamespace(id=1, username='me')
+        sent = []
+
+        async def send(text_data):
+            sent.append(json.loads(text_data)['users'])
+
+        def frame(source, *user_ids):
+            return {
+                'type': 'typing_state', 'source': source, 'timestamp': 'now',
+                'users': [{'id': user_id, 'username': f'user{user_id}'} for user_id in user_ids],
+            }
+
+        with patch.object(consumer, 'send', send):
+            async_to_sync(consumer.typing_state)(frame('a', 1, 2))
+            async_to_sync(consumer.typing_state)(frame('b', 3))
+            async_to_sync(consumer.typing_state)(frame('b', 3))
+            async_to_sync(consumer.typing_state)(frame('a'))
+
+        self.assertEqual([[user['id'] for user in users] for users in sent], [[2], [2, 3], [3]])
+
+
+class ConnectionLimitsTests(SimpleTestCase):
+    """Test the inbound rate limit and batched activity writes."""
+
+    def test_rate_limiter_refills(self):
+        clock = SimpleNamespace(now=0.0)
+        limiter = RateLimiter(rate=10, burst=5, clock=lambda: clock.now)
+
+        self.assertEqual(sum(limiter.allow() for _ in range(20)), 5)
+        clock.now += 0.3
+        self.assertEqual(sum(limiter.allow() for _ in range(20)), 3)
+        self.assertEqual(limiter.dropped, 32)
+
+    def test_activity_writes_are_batched(self):
+        async def simulate():
+            buffer = ActivityBuffer(interval=0.05, timeout=60)
+            with patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+                for n in range(30):
+                    buffer.record(n % 3, {'action': f'scroll-{n}'})
+                await asyncio.sleep(0.1)
+            return buffer, set_many
+
+        buffer, set_many = async_to_sync(simulate)()
+
+        self.assertEqual((set_many.call_count, buffer.writes), (1, 1))
+        self.assertEqual(cache.get('user_activity_2'), {'action': 'scroll-29'})
@@ -0,0 +1,146 @@
+"""
+Tests for the chunked tracker rebuild commands.
+"""
+
+import io
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Topic, Post
+
+from apps.forum_integration import tracker_rebuild
+from apps.forum_integration.models import TrackerRebuildJob
+from apps.forum_integration.tracker_rebuild import TrackerRebuild
+
+User = get_user_model()
+
+
+class TrackerRebuildTests(TestCase):
+    """Test set-based rebuilds, verification and checkpoints."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='rebuild', email='rebuild@example.com', password='testpass123'
+        )
+        self.forum = Forum.objects.create(name='Rebuild Forum', slug='rebuild-forum', type=Forum.FORUM_POST)
+        self.topics = []
+        for i in range(5):
+            topic = Topic.objects.create(
+                forum=self.forum, poster=self.user, subject=f'Topic {i}',
+                type=Topic.TOPIC_POST, status=Topic.TOPIC_UNLOCKED, approved=True,
+            )
+            for j in range(i + 1):
+                Post.objects.create(
+                    topic=topic, poster=self.user, subject='Post', content='Content', approved=j != 2
+                )
+            self.topics.append(topic)
+        self.expected = {
+            topic.pk: list(Topic.objects.filter(pk=topic.pk).values_list(
+                'posts_count', 'first_post_id', 'last_post_id', 'last_post_on'
+            ))[0]
+            for topic in self.topics
+        }
+
+    def _drift(self):
+        Topic.objects.filter(pk__in=[self.topics[1].pk, self.topics[4].pk]).update(
+            posts_count=99, last_post=None, last_post_on=None
+        )
+        Forum.objects.filter(pk=self.forum.pk).update(direct_posts_count=0, direct_topics_count=0)
+
+    def _stored(self):
+        return {
+            topic.pk: list(Topic.objects.filter(pk=topic.pk).values_list(
+                'posts_count', 'first_post_id', 'last_post_id', 'last_post_on'
+            ))[0]
+            for topic in self.topics
+        }
+
+    def test_verify_only_reports_drift(self):
+        self._drift()
+        out = io.StringIO()
+
+        call_command('rebuild_topic_trackers', '--verify', stdout=out)
+
+        self.assertIn('Checked 5 topics: 2 have drifted trackers', out.getvalue())
+        self.assertIn('posts_count: 99 -> 2', out.getvalue())
+        self.assertEqual(self._stored()[self.topics[1].pk][0], 99)
+        self.assertFalse(TrackerRebuildJob.objects.exists())
+
+    def test_rebuild_in_chunks(self):
+        self._drift()
+
+        with CaptureQueriesContext(connection) as queries:
+            job, _ = TrackerRebuild('topics').run(chunk_size=2)
+
+        # One aggregate and one first/last post lookup per chunk of topics
+        post_queries = [q for q in queries if 'FROM "forum_conversation_post"' in q['sql']]
+        self.assertEqual(len(post_queries), 2 * 3)
+
+        self.assertEqual((job.checked, job.updated), (5, 2))
+        self.assertIsNotNone(job.completed_at)
+        self.assertEqual(self._stored(), self.expected)
+
+        out = io.StringIO()
+        call_command('rebuild_forum_trackers', stdout=out)
+        forum = Forum.objects.get(pk=self.forum.pk)
+        self.assertEqual((forum.direct_topics_count, forum.direct_posts_count), (5, 12))
+        self.assertEqual(forum.last_post_id, self.expected[self.topics[4].pk][2])
+        self.assertIn('Checked 1 forums: 1 updated', out.getvalue())
+
+    def test_multiple_processes(self):
+        self._drift()
+        closed_after = []
+        close_all = tracker_rebuild.connections.close_all
+
+        def record_close_all():
+            closed_after.append(len(queries))
+            close_all()
+
+        with CaptureQueriesContext(connection) as queries:
+            with patch.object(tracker_rebuild.connections, 'close_all', side_effect=record_close_all):
+                job, report = TrackerRebuild('topics', verify=True).run(chunk_size=2, processes=2)
+
+        # The IDs were read before the connections were closed and the workers forked
+        self.assertEqual(closed_after, [len(queries)])
+        self.assertEqual((job.checked, job.updated), (5, 2))
+        self.assertEqual({pk for pk, _ in report}, {self.topics[1].pk, self.topics[4].pk})
+
+    def test_resumes_from_checkpoint(self):
+        self._drift()
+        calls = []
+        original = tracker_rebuild.rebuild_chunk
+
+        def fail_second_chunk(kind, ids, verify=False):
+            calls.append(ids)
+            if len(calls) == 2:
+                raise RuntimeError('interrupted')
+            return original(kind, ids, verify)
+
+        with patch.object(tracker_rebuild, 'rebuild_chunk', side_effect=fail_second_chunk):
+            with self.assertRaises(RuntimeError):
+                TrackerRebuild('topics').run(chunk_size=2)
+
+        job = TrackerRebuildJob.objects.get(scope='topics')
+        self.assertEqual((job.last_id, job.checked), (self.topics[1].pk, 2))
+        self.assertIsNone(job.completed_at)
+
+        job, _ = TrackerRebuild('topics').run(chunk_size=2)
+
+        self.assertEqual(job.checked, 5)
+        self.assertEqual(self._stored(), self.expected)
+
+        # A completed job starts over
+        job, _ = TrackerRebuild('topics').run(chunk_size=2)
+        self.assertEqual((job.checked, job.updated), (5, 0))
+
+    def test_single_topic_scope(self):
+        self._drift()
+
+        job, _ = TrackerRebuild('topics', topic_id=self.topics[4].pk).run()
+
+        self.assertEqual((job.scope, job.checked, job.updated), (f'topics:topic={self.topics[4].pk}', 1, 1))
+        self.assertEqual(self._stored()[self.topics[1].pk][0], 99)
@@ -0,0 +1,184 @@
+"""
+Tests for the set-based trust level promotion engine.
+"""
+
+import io
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from apps.forum_integration.models import (
+    Badge, BadgeCategory, PointHistory, TrustLevel, UserBadge, UserPoints
+)
+from apps.forum_integration.trust_level_service import TrustLevelService
+
+User = get_user_model()
+
+
+class TrustLevelServiceTests(TestCase):
+    """Test bulk trust level recalculation."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f'tl_user_{i}', email=f'tl_user_{i}@example.com', password='testpass123'
+            )
+            for i in range(4)
+        ]
+
+    def _set_metrics(self, user, **metrics):
+        TrustLevel.objects.filter(user=user).update(**metrics)
+
+    def test_promotion_filter_matches_check_for_promotion(self):
+        """SQL filters and the per-row check agree on the same thresholds."""
+        self._set_metrics(self.users[0], posts_read=10, time_read=timedelta(minutes=10))
+        self._set_metrics(self.users[1], posts_read=10, time_read=timedelta(minutes=9))
+
+        eligible = set(
+            TrustLevel.objects.filter(**TrustLevelService.promotion_filter(0))
+            .values_list('user_id', flat=True)
+        )
+        expected = {
+            trust_level.user_id for trust_level in TrustLevel.objects.all()
+            if trust_level.check_for_promotion() == 1
+        }
+        self.assertEqual(eligible, expected)
+        self.assertEqual(eligible, {self.users[0].id})
+
+    def test_no_filter_for_manual_levels(self):
+        """TL3 -> TL4 is manual only."""
+        self.assertIsNone(TrustLevelService.promotion_filter(3))
+        self.assertIsNone(TrustLevelService.promotion_filter(4))
+
+    def test_creates_missing_trust_levels(self):
+        """Users without a TrustLevel row get a TL0 row in bulk."""
+        TrustLevel.objects.filter(user__in=self.users[:2]).delete()
+
+        created = TrustLevelService.create_missing_trust_levels()
+
+        self.assertEqual(created, 2)
+        self.assertEqual(TrustLevel.objects.filter(user__in=self.users).count(), 4)
+
+    def test_created_counts_only_inserted_rows(self):
+        """Rows created by someone else after the missing users were read aren't counted."""
+        TrustLevel.objects.filter(user__in=self.users[:2]).delete()
+        chunked = TrustLevelService._chunked
+
+        def create_concurrently(iterable, size):
+            for chunk in chunked(iterable, size):
+                TrustLevel.objects.create(user=self.users[0], level=0)
+                yield chunk
+
+        with patch.object(TrustLevelService, '_chunked', side_effect=create_concurrently):
+            created = TrustLevelService.create_missing_trust_levels()
+
+        self.assertEqual(created, 1)
+        self.assertEqual(TrustLevel.objects.filter(user__in=self.users).count(), 4)
+
+    def test_promotes_at_most_one_level_per_run(self):
+        """A TL0 user meeting TL2 thresholds still only reaches TL1."""
+        self._set_metrics(
+            self.users[0],
+            posts_read=1000, time_read=timedelta(hours=5),
+            days_visited=100, likes_received=100, likes_given=100,
+        )
+        self._set_metrics(
+            self.users[1], level=1,
+            posts_read=100, days_visited=15, likes_received=1,
+        )
+
+        stats = TrustLevelService.recalculate_all(emit_events=False)
+
+        self.assertEqual(TrustLevel.objects.get(user=self.users[0]).level, 1)
+        self.assertEqual(TrustLevel.objects.get(user=self.users[1]).level, 2)
+        self.assertEqual(stats['promotions'], {1: 1, 2: 1})
+        self.assertIsNotNone(TrustLevel.objects.get(user=self.users[0]).promoted_at)
+
+    def test_dry_run_makes_no_changes(self):
+        """Dry run reports promotions without writing them."""
+        TrustLevel.objects.filter(user=self.users[3]).delete()
+        self._set_metrics(self.users[0], posts_read=10, time_read=timedelta(minutes=10))
+
+        stats = TrustLevelService.recalculate_all(dry_run=True)
+
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['promotions'], {1: 1})
+        self.assertEqual(TrustLevel.objects.get(user=self.users[0]).level, 0)
+        self.assertFalse(TrustLevel.objects.filter(user=self.users[3]).exists())
+
+    def test_bulk_query_count_is_independent_of_user_count(self):
+        """Promoting many users costs a bounded number of queries."""
+        TrustLevel.objects.update(posts_read=10, time_read=timedelta(minutes=10))
+
+        with self.assertNumQueries(10):
+            TrustLevelService.recalculate_all(emit_events=False)
+
+        self.assertEqual(TrustLevel.objects.filter(user__in=self.users, level=1).count(), 4)
+
+    @patch('apps.forum_integration.notification_service.NotificationService._send_bulk_notifications')
+    def test_emits_single_event_batch(self, mock_send):
+        """Promotions award points and trust level badges, notified as one batch."""
+        category = BadgeCategory.objects.create(name='Special')
+        badge = Badge.objects.create(
+            name='Basic', description='Reached TL1', category=category,
+            condition_type='trust_level', condition_value=1, points_awarded=20,
+        )
+        self._set_metrics(self.users[0], posts_read=10, time_read=timedelta(minutes=10))
+        self._set_metrics(self.users[1], posts_read=10, time_read=timedelta(minutes=10))
+
+        TrustLevelService.recalculate_all()
+
+        mock_send.assert_called_once()
+        notifications = mock_send.call_args[0][0]
+        self.assertEqual(
+            sorted(n['type'] for _, n in notifications),
+            ['badge_earned', 'badge_earned', 'trust_level_promotion', 'trust_level_promotion'],
+        )
+        points = UserPoints.objects.get(user=self.users[0])
+        self.assertEqual(points.total_points, 50 + 20)
+        self.assertTrue(UserBadge.objects.filter(user=self.users[0], badge=badge).exists())
+        self.assertEqual(
+            list(PointHistory.objects.filter(user=self.users[0]).order_by('pk')
+                 .values_list('points_change', 'new_total')),
+            [(50, 50), (20, 70)],
+        )
+
+    @patch('apps.forum_integration.notification_service.NotificationService._send_bulk_notifications')
+    def test_marks_only_awarded_badges_notified(self, mock_send):
+        """Another user's badge in the batch doesn't mark an unrelated award as sent."""
+        from apps.forum_integration.notification_service import NotificationService
+
+        category = BadgeCategory.objects.create(name='Special')
+        first, second = (
+            Badge.objects.create(
+                name=name, description=name, category=category, condition_type='trust_level', condition_value=1,
+            )
+            for name in ('First', 'Second')
+        )
+        user_a, user_b = self.users[:2]
+        for user, badge in ((user_a, first), (user_b, second), (user_a, second)):
+            UserBadge.objects.create(user=user, badge=badge, notification_sent=False)
+
+        NotificationService.notify_trust_level_promotions({}, [(user_a.id, first), (user_b.id, second)])
+
+        self.assertEqual(
+            set(UserBadge.objects.filter(notification_sent=False).values_list('user_id', 'badge_id')),
+            {(user_a.id, second.id)},
+        )
+
+
+class CalculateTrustLevelsCommandTests(TestCase):
+    """Test calculate_trust_levels management command."""
+
+    def test_dry_run_reports_stats(self):
+        user = User.objects.create_user(username='cmd_user', password='testpass123')
+        TrustLevel.objects.filter(user=user).update(posts_read=10, time_read=timedelta(minutes=10))
+
+        out = io.StringIO()
+        call_command('calculate_trust_levels', dry_run=True, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('TL0 -> TL1: 1 users', output)
+        self.assertIn('DRY RUN: Would promote 1', output)
+        self.assertEqual(TrustLevel.objects.get(user=user).level, 0)
@@ -0,0 +1,274 @@
+"""
+Set-based rebuild of topic and forum trackers.
+
+Topics and forums are processed in chunks of IDs. Each chunk takes one
+grouped aggregate over its posts (or topics), one query to resolve the
+first/last post IDs, and a bulk_update of the rows that drifted, all in one
+transaction. Chunks can run across a process pool; progress is checkpointed
+in TrackerRebuildJob in chunk order, so an interrupted run resumes after the
+last chunk whose predecessors all finished. Verify runs compute the same
+values but only report drift.
+
+This is the reconciliation path for the incremental trackers maintained by
+apps.forum_conversation.trackers.
+
+Usage:
+    from apps.forum_integration.tracker_rebuild import TrackerRebuild
+
+    TrackerRebuild('topics').run(processes=4)
+    TrackerRebuild('forums', verify=True).run()
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.db import connections, transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.utils import timezone
+from machina.apps.forum.models import Forum
+from machina.apps.forum_conversation.models import Post, Topic
+from .models import TrackerRebuildJob
+
+logger = logging.getLogger(__name__)
+
+
+def topic_trackers(topic_ids):
+    """
+    {topic ID: tracker values} computed from the topics' posts, as
+    Topic.update_trackers() would set them.
+    """
+    rows = list(
+        Post.objects.filter(topic_id__in=topic_ids)
+        .values('topic_id')
+        .annotate(
+            posts_count=Count('id', filter=Q(approved=True)),
+            first_on=Min('created'),
+            last_on=Max('created', filter=Q(approved=True)),
+        )
+        .order_by()
+    )
+    times = {row['first_on'] for row in rows} | {row['last_on'] for row in rows if row['last_on']}
+    first, last = {}, {}
+    boundaries = Post.objects.filter(topic_id__in=topic_ids, created__in=times).order_by('pk')
+    for topic_id, created, post_id, approved in boundaries.values_list('topic_id', 'created', 'id', 'approved'):
+        first.setdefault((topic_id, created), post_id)
+        if approved:
+            last[(topic_id, created)] = post_id
+
+    trackers = {topic_id: dict(TRACKERS['topics']['empty']) for topic_id in topic_ids}
+    for row in rows:
+        trackers[row['topic_id']] = {
+            'posts_count': row['posts_count'],
+            'first_post_id': first.get((row['topic_id'], row['first_on'])),
+            'last_post_id': last.get((row['topic_id'], row['last_on'])),
+            'last_post_on': row['last_on'],
+        }
+    return trackers
+
+
+def forum_trackers(forum_ids):
+    """
+    {forum ID: tracker values} computed from the forums' approved topics, as
+    Forum.update_trackers() would set them.
+    """
+    rows = list(
+        Topic.objects.filter(forum_id__in=forum_ids, approved=True)
+        .values('forum_id')
+        .annotate(
+            direct_topics_count=Count('id'),
+            direct_posts_count=Sum('posts_count'),
+            last_on=Max('last_post_on'),
+        )
+        .order_by()
+    )
+    times = {row['last_on'] for row in rows if row['last_on']}
+    last = {}
+    boundaries = Topic.objects.filter(forum_id__in=forum_ids, approved=True, last_post_on__in=times).order_by('pk')
+    for forum_id, last_post_on, last_post_id in boundaries.values_list('forum_id', 'last_post_on', 'last_post_id'):
+        last[(forum_id, last_post_on)] = last_post_id
+
+    trackers = {forum_id: dict(TRACKERS['forums']['empty']) for forum_id in forum_ids}
+    for row in rows:
+        trackers[row['forum_id']] = {
+            'direct_topics_count': row['direct_topics_count'],
+            'direct_posts_count': row['direct_posts_count'] or 0,
+            'last_post_id': last.get((row['forum_id'], row['last_on'])),
+            'last_post_on': row['last_on'],
+        }
+    return trackers
+
+
+TRACKERS = {
+    'topics': {
+        'model': Topic,
+        'compute': topic_trackers,
+        'fields': ('posts_count', 'first_post', 'last_post', 'last_post_on'),
+        'empty': {'posts_count': 0, 'first_post_id': None, 'last_post_id': None, 'last_post_on': None},
+    },
+    'forums': {
+        'model': Forum,
+        'compute': forum_trackers,
+        'fields': ('direct_topics_count', 'direct_posts_count', 'last_post', 'last_post_on'),
+        'empty': {'direct_topics_count': 0, 'direct_posts_count': 0, 'last_post_id': None, 'last_post_on': None},
+    },
+}
+
+
+def rebuild_chunk(kind, ids, verify=False):
+    """
+    Recompute the trackers of one chunk and write those that drifted.
+
+    Args:
+        kind: 'topics' or 'forums'
+        ids: Primary keys of the chunk
+        verify: Only report drift
+
+    Returns:
+        (rows checked, [(pk, {attname: (stored, actual)}) for drifted rows])
+    """
+    spec = TRACKERS[kind]
+    model = spec['model']
+    with transaction.atomic():
+        objects = list(model.objects.filter(pk__in=ids).only(*spec['fields']).order_by())
+        actual = spec['compute'](ids)
+        drifted = []
+        changed = []
+        for obj in objects:
+            diff = {
+                attname: (getattr(obj, attname), value)
+                for attname, value in actual[obj.pk].items()
+                if getattr(obj, attname) != value
+            }
+            if diff:
+                drifted.append((obj.pk, diff))
+                for attname, (_, value) in diff.items():
+                    setattr(obj, attname, value)
+                changed.append(obj)
+        if changed and not verify:
+            model.objects.bulk_update(changed, spec['fields'])
+    return len(objects), drifted
+
+
+class TrackerRebuild:
+    """
+    Chunked, checkpointed rebuild (or verification) of topic or forum trackers.
+    """
+
+    DEFAULT_CHUNK_SIZE = 500
+    CHUNKS_PER_PROCESS = 2
+
+    def __init__(self, kind, forum_id=None, topic_id=None, verify=False):
+        """
+        Args:
+            kind: 'topics' or 'forums'
+            forum_id: Limit to one forum (or the topics of one forum)
+            topic_id: Limit to one topic
+            verify: Only report drift; nothing is written or checkpointed
+        """
+        if kind not in TRACKERS:
+            raise ValueError(f"Unknown tracker kind '{kind}'")
+        self.kind = kind
+        self.verify = verify
+        self.model = TRACKERS[kind]['model']
+
+        self.queryset = self.model.objects.all()
+        self.scope = kind
+        if kind == 'forums':
+            self.queryset = self.queryset.filter(type=Forum.FORUM_POST)
+            if forum_id:
+                self.queryset = self.queryset.filter(pk=forum_id)
+                self.scope += f':forum={forum_id}'
+        elif topic_id:
+            self.queryset = self.queryset.filter(pk=topic_id)
+            self.scope += f':topic={topic_id}'
+        elif forum_id:
+            self.queryset = self.queryset.filter(forum_id=forum_id)
+            self.scope += f':forum={forum_id}'
+
+    def get_job(self, restart=False):
+        """
+        Get the checkpoint row of this scope. A completed job starts over.
+
+        Verify runs get an unsaved job that only carries their counters.
+        """
+        if self.verify:
+            return TrackerRebuildJob(scope=self.scope)
+        job, created = TrackerRebuildJob.objects.get_or_create(scope=self.scope)
+        if not created and (restart or job.completed_at):
+            job.last_id = job.checked = job.updated = 0
+            job.started_at = timezone.now()
+            job.completed_at = None
+            job.save()
+        return job
+
+    def run(self, chunk_size=None, processes=1, restart=False, progress=None):
+        """
+        Rebuild or verify all trackers in scope, resuming from the last checkpoint.
+
+        Args:
+            chunk_size: Rows per chunk; each chunk is one transaction
+            processes: Worker processes (1 works in this process)
+            restart: Discard the checkpoint and start over
+            progress: Called with (job, drifted rows of the chunk) after each chunk
+
+        Returns:
+            (job, drifted rows); drifted rows are only collected when verifying
+        """
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        job = self.get_job(restart=restart)
+        report = []
+
+        ids = self.queryset.filter(pk__gt=job.last_id).order_by('pk').values_list('pk', flat=True)
+
+        if processes > 1:
+            # Read all chunks before forking: workers must open their own
+            # connections, so none may be open here when the pool forks them
+            # (on the first submit)
+            chunks = list(self._chunks(ids, chunk_size))
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append((chunk, pool.submit(rebuild_chunk, self.kind, chunk, self.verify)))
+                    if len(pending) >= processes * self.CHUNKS_PER_PROCESS:
+                        chunk, future = pending.popleft()
+                        self._record(job, chunk, *future.result(), report, progress)
+                while pending:
+                    chunk, future = pending.popleft()
+                    self._record(job, chunk, *future.result(), report, progress)
+        else:
+            chunks = self._chunks(ids.iterator(chunk_size=chunk_size), chunk_size)
+            for chunk in chunks:
+                self._record(job, chunk, *rebuild_chunk(self.kind, chunk, self.verify), report, progress)
+
+        if not self.verify:
+            job.completed_at = timezone.now()
+            job.save(update_fields=['completed_at', 'updated_at'])
+        logger.info(
+            f"Tracker {'verification' if self.verify else 'rebuild'} {self.scope}: "
+            f"{job.checked} checked, {job.updated} drifted"
+        )
+        return job, report
+
+    @staticmethod
+    def _chunks(ids, size):
+        chunk = []
+        for pk in ids:
+            chunk.append(pk)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _record(self, job, chunk, checked, drifted, report, progress):
+        """Checkpoint a finished chunk (chunks are recorded in order)."""
+        job.last_id = chunk[-1]
+        job.checked += checked
+        job.updated += len(drifted)
+        if self.verify:
+            report.extend(drifted)
+        else:
+            job.save(update_fields=['last_id', 'checked', 'updated', 'updated_at'])
+        if progress:
+            progress(job, drifted)
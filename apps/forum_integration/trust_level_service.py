@@ -0,0 +1,192 @@
+"""
+Set-based trust level promotion engine.
+
+Evaluates the TrustLevel.PROMOTION_REQUIREMENTS thresholds as SQL filters
+instead of loading users one at a time, so recalculating trust levels for the
+whole user base costs a handful of queries per chunk rather than several
+queries per user.
+"""
+
+import logging
+from collections import Counter
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from .models import TrustLevel
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+class TrustLevelService:
+    """
+    Bulk trust level maintenance.
+
+    Promotions are applied one level per run, matching the behaviour of
+    TrustLevel.check_for_promotion(): source levels are processed from the
+    highest down, so a user promoted TL0 -> TL1 is not re-evaluated for TL2
+    in the same pass.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    @classmethod
+    def promotion_filter(cls, level):
+        """
+        Build the queryset filter kwargs for users eligible to leave `level`.
+
+        Returns None if the level has no automatic promotion path.
+        """
+        requirements = TrustLevel.PROMOTION_REQUIREMENTS.get(level)
+        if not requirements:
+            return None
+
+        filters = {'level': level}
+        for field, minimum in requirements.items():
+            filters[f'{field}__gte'] = minimum
+        return filters
+
+    @classmethod
+    def create_missing_trust_levels(cls, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Create TL0 rows for users that don't have a TrustLevel yet.
+
+        Returns:
+            Number of rows created (or that would be created in dry-run mode)
+        """
+        missing_user_ids = User.objects.filter(
+            trust_level__isnull=True
+        ).values_list('id', flat=True)
+
+        if dry_run:
+            return missing_user_ids.count()
+
+        created = 0
+        for chunk in cls._chunked(missing_user_ids.iterator(chunk_size=chunk_size), chunk_size):
+            rows = TrustLevel.objects.filter(user_id__in=chunk)
+            with transaction.atomic():
+                # Rows created concurrently since the SELECT are skipped, not counted
+                existing = rows.count()
+                TrustLevel.objects.bulk_create(
+                    [TrustLevel(user_id=user_id, level=0) for user_id in chunk],
+                    ignore_conflicts=True,
+                )
+                created += rows.count() - existing
+
+        return created
+
+    @classmethod
+    def find_promotions(cls):
+        """
+        Find every user eligible for automatic promotion.
+
+        Returns:
+            List of (trust_level_pk, user_id, old_level, new_level) tuples
+        """
+        candidates = []
+        for level in sorted(TrustLevel.PROMOTION_REQUIREMENTS, reverse=True):
+            filters = cls.promotion_filter(level)
+            rows = TrustLevel.objects.filter(**filters).values_list('pk', 'user_id')
+            candidates.extend((pk, user_id, level, level + 1) for pk, user_id in rows)
+        return candidates
+
+    @classmethod
+    def apply_promotions(cls, candidates, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Apply promotions found by find_promotions() with one UPDATE per chunk.
+
+        The UPDATE re-checks the source level and thresholds, so rows that
+        changed since they were selected are skipped rather than double-promoted.
+
+        Returns:
+            Dict mapping user_id -> new_level for rows actually promoted
+        """
+        promoted = {}
+        now = timezone.now()
+
+        by_level = {}
+        for pk, user_id, old_level, new_level in candidates:
+            by_level.setdefault(old_level, []).append((pk, user_id))
+
+        # Highest source level first so nobody moves more than one level
+        for old_level in sorted(by_level, reverse=True):
+            filters = cls.promotion_filter(old_level)
+            new_level = old_level + 1
+
+            for chunk in cls._chunked(by_level[old_level], chunk_size):
+                pks = [pk for pk, _ in chunk]
+                with transaction.atomic():
+                    updated_pks = set(
+                        TrustLevel.objects.select_for_update()
+                        .filter(pk__in=pks, **filters)
+                        .values_list('pk', flat=True)
+                    )
+                    if not updated_pks:
+                        continue
+                    TrustLevel.objects.filter(pk__in=updated_pks).update(
+                        level=new_level,
+                        promoted_at=now,
+                        last_calculated=now,
+                        updated_at=now,
+                    )
+                for pk, user_id in chunk:
+                    if pk in updated_pks:
+                        promoted[user_id] = new_level
+
+        return promoted
+
+    @classmethod
+    def recalculate_all(cls, dry_run=False, emit_events=True, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Create missing trust levels and promote every eligible user.
+
+        Args:
+            dry_run: Report what would change without writing anything
+            emit_events: Forward promotions to the gamification and
+                notification layers as a single batch
+            chunk_size: Rows per bulk INSERT/UPDATE
+
+        Returns:
+            Dict of statistics: total_users, created, promotions (Counter of
+            new levels), distribution (level -> count before promotion)
+        """
+        distribution = dict(
+            TrustLevel.objects.values_list('level').annotate(count=Count('pk')).order_by('level')
+        )
+        created = cls.create_missing_trust_levels(dry_run=dry_run, chunk_size=chunk_size)
+        candidates = cls.find_promotions()
+
+        if dry_run:
+            promotions = Counter(new_level for _, _, _, new_level in candidates)
+        else:
+            promoted = cls.apply_promotions(candidates, chunk_size=chunk_size)
+            promotions = Counter(promoted.values())
+
+            if emit_events and promoted:
+                from .gamification_service import GamificationService
+                GamificationService.handle_bulk_trust_level_promotions(promoted)
+
+            logger.info(
+                f"Bulk trust level recalculation: created {created}, "
+                f"promoted {sum(promotions.values())}"
+            )
+
+        return {
+            'total_users': User.objects.count(),
+            'created': created,
+            'promotions': promotions,
+            'distribution': distribution,
+        }
+
+    @staticmethod
+    def _chunked(iterable, size):
+        """Yield lists of at most `size` items from `iterable`."""
+        chunk = []
+        for item in iterable:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -0,0 +1,78 @@
+"""
+Compact bitmap of post IDs.
+
+Used to remember which posts a user has already been credited for reading,
+so batched read receipts can be de-duplicated without a row per (user, post).
+Bits are grouped into fixed-size chunks keyed by the high bits of the post ID,
+which keeps the serialized form small even when post IDs are sparse.
+"""
+
+import struct
+import zlib
+
+CHUNK_BITS = 4096
+CHUNK_BYTES = CHUNK_BITS // 8
+
+_HEADER = struct.Struct('<I')
+
+
+class PostIdBitmap:
+    """
+    Set of non-negative integer IDs stored as chunked bitmaps.
+
+    Example:
+        bitmap = PostIdBitmap.from_bytes(row.bitmap)
+        newly_read = bitmap.add_many([10, 11, 12])
+        row.bitmap = bitmap.to_bytes()
+    """
+
+    def __init__(self):
+        self._chunks = {}
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Load a bitmap serialized with to_bytes(). Empty input gives an empty bitmap."""
+        bitmap = cls()
+        if not data:
+            return bitmap
+
+        raw = zlib.decompress(bytes(data))
+        record_size = _HEADER.size + CHUNK_BYTES
+        for offset in range(0, len(raw), record_size):
+            (key,) = _HEADER.unpack_from(raw, offset)
+            start = offset + _HEADER.size
+            bitmap._chunks[key] = int.from_bytes(raw[start:start + CHUNK_BYTES], 'little')
+        return bitmap
+
+    def to_bytes(self):
+        """Serialize to compressed bytes suitable for a BinaryField."""
+        parts = []
+        for key in sorted(self._chunks):
+            bits = self._chunks[key]
+            if bits:
+                parts.append(_HEADER.pack(key))
+                parts.append(bits.to_bytes(CHUNK_BYTES, 'little'))
+        return zlib.compress(b''.join(parts))
+
+    def __contains__(self, value):
+        key, bit = divmod(value, CHUNK_BITS)
+        return bool(self._chunks.get(key, 0) >> bit & 1)
+
+    def __len__(self):
+        return sum(bin(bits).count('1') for bits in self._chunks.values())
+
+    def add(self, value):
+        """Add an ID. Returns True if it was not already present."""
+        if value < 0:
+            raise ValueError('Bitmap values must be non-negative')
+        key, bit = divmod(value, CHUNK_BITS)
+        bits = self._chunks.get(key, 0)
+        mask = 1 << bit
+        if bits & mask:
+            return False
+        self._chunks[key] = bits | mask
+        return True
+
+    def add_many(self, values):
+        """Add several IDs. Returns the list of IDs that were newly added."""
+        return [value for value in values if self.add(value)]
@@ -5,10 +5,8 @@ SECURITY NOTE: This module implements XSS prevention for CVE-2024-XSS-002.
 User-supplied embed code is sanitized to prevent arbitrary JavaScript execution.
 """
 
-import bleach
 from bleach.css_sanitizer import CSSSanitizer
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from apps.api.services.html_sanitizer import SanitizationPolicy
 import logging
 
 logger = logging.getLogger(__name__)
@@ -70,14 +68,30 @@ for domain in ALLOWED_IFRAME_DOMAINS:
             f"Domain should not start with a dot. Use 'youtube.com', not '.youtube.com'"
         )
 
+EMBED_POLICY = SanitizationPolicy(
+    name='embed',
+    tags=ALLOWED_TAGS,
+    attributes=ALLOWED_ATTRIBUTES,
+    protocols=ALLOWED_PROTOCOLS,
+    strip=True,  # Remove disallowed tags (but not their content)
+    css_sanitizer=css_sanitizer,
+    # Removed with their content, so script text isn't shown
+    drop_content_tags=['script', 'style', 'noscript'],
+    iframe_domains=ALLOWED_IFRAME_DOMAINS,
+)
+
 
 def sanitize_embed_code(html):
     """
     Sanitize user-supplied embed code to prevent XSS attacks.
 
-    This function implements a two-pass sanitization:
-    1. bleach.clean() removes dangerous HTML tags and attributes
-    2. BeautifulSoup validates iframe domains against whitelist
+    EMBED_POLICY is applied in a single html5lib pass (see HtmlSanitizer):
+    1. <script>, <style> and <noscript> are removed with their content
+    2. bleach's sanitizer removes other disallowed tags and attributes
+    3. iframes are restricted to ALLOWED_IFRAME_DOMAINS
+
+    Results are cached by content hash, so unchanged embed code is only
+    sanitized once.
 
     Security considerations:
     - Removes <script> tags and event handlers (onclick, onerror, etc.)
@@ -109,94 +123,14 @@ def sanitize_embed_code(html):
         f"contains_iframe={'<iframe' in html.lower()}"
     )
 
-    # 🔒 SECURITY: Multi-pass sanitization for defense in depth
-    # Pass 1: Pre-processing - Remove dangerous tags entirely (including content)
-    # Pass 2: bleach.clean() - Battle-tested against XSS, handles malformed HTML
-    # Pass 3: Domain validation - Restrict iframes to trusted sources only
-
-    # First pass: Remove dangerous tags entirely (including their content)
-    # NOTE: This is done BEFORE bleach for UX (to avoid showing script text).
-    # Security concern addressed: bleach in Pass 2 will catch any malformed/nested
-    # tags that BeautifulSoup misses (e.g., <scr<script>ipt>)
-    soup_pre = BeautifulSoup(html, 'html.parser')
-    dangerous_tags = ['script', 'style', 'noscript']
-    for tag_name in dangerous_tags:
-        for tag in soup_pre.find_all(tag_name):
-            tag.decompose()  # Remove tag and all its content
-    html_without_dangerous = str(soup_pre)
-
-    # Second pass: bleach sanitization
-    # bleach is designed to handle malformed/nested HTML attacks (e.g., <scr<script>ipt>)
-    clean_html = bleach.clean(
-        html_without_dangerous,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        protocols=ALLOWED_PROTOCOLS,
-        strip=True,  # Remove remaining disallowed tags (but not their content)
-        css_sanitizer=css_sanitizer,
-    )
-
-    # Second pass: validate iframe domains
-    # Even though bleach allows iframes, we must restrict to trusted domains
-    soup = BeautifulSoup(clean_html, 'html.parser')
-
-    iframes_removed = 0
-    for iframe in soup.find_all('iframe'):
-        src = iframe.get('src', '')
-        if not src:
-            # No src attribute - remove iframe
-            iframe.decompose()
-            iframes_removed += 1
-            continue
-
-        try:
-            parsed_url = urlparse(src)
-            domain = parsed_url.netloc.lower()
-
-            # Check if domain is in whitelist
-            # Allow subdomain matches (e.g., player.vimeo.com matches vimeo.com)
-            is_allowed = False
-            for allowed_domain in ALLOWED_IFRAME_DOMAINS:
-                if domain == allowed_domain or domain.endswith('.' + allowed_domain):
-                    is_allowed = True
-                    break
-
-            if not is_allowed:
-                logger.warning(
-                    f"EMBED_BLOCKED: Untrusted iframe domain blocked: {domain}"
-                )
-                iframe.decompose()  # Remove untrusted iframe
-                iframes_removed += 1
-        except (ValueError, TypeError) as e:
-            # URL parsing failed - remove unsafe iframe
-            logger.warning(
-                f"EMBED_SANITIZATION: Invalid URL in iframe src, removing iframe. "
-                f"Error: {e}, URL: {src[:100]}"
-            )
-            iframe.decompose()
-            iframes_removed += 1
-        except Exception as e:
-            # Unexpected error - only remove if URL contains known dangerous patterns
-            logger.error(
-                f"EMBED_SANITIZATION_ERROR: Unexpected error parsing iframe. "
-                f"Error: {e}, URL: {src[:100]}"
-            )
-            # Check for obviously dangerous patterns
-            dangerous_patterns = ['javascript:', 'data:', 'file:', 'vbscript:']
-            if any(pattern in src.lower() for pattern in dangerous_patterns):
-                logger.error(f"EMBED_BLOCKED: Dangerous protocol detected in URL")
-                iframe.decompose()
-                iframes_removed += 1
-            # If URL seems safe, preserve it but log the error for investigation
-
-    result = str(soup)
+    from apps.api.services.container import container
+    result = container.get_html_sanitizer().sanitize(html, EMBED_POLICY)
 
     # 🔒 SECURITY AUDIT LOG: Log sanitization results
     logger.info(
         f"EMBED_SANITIZATION_COMPLETE: "
         f"input_length={len(html)} "
         f"output_length={len(result)} "
-        f"iframes_removed={iframes_removed} "
         f"sanitized={html != result}"
     )
 
@@ -159,13 +159,14 @@ class LessonAdmin(admin.ModelAdmin):
     
     def enable_structured_content(self, request, queryset):
         """Enable structured content for selected lessons."""
-        updated = queryset.update(enable_structured_content=True, content_format='structured')
+        # update() skips save(), so drop the stored render; it's redone on the next read
+        updated = queryset.update(enable_structured_content=True, content_format='structured', rendered_blocks={})
         self.message_user(request, f'{updated} lessons enabled for structured content.')
     enable_structured_content.short_description = "Enable structured content"
     
     def disable_structured_content(self, request, queryset):
         """Disable structured content for selected lessons."""
-        updated = queryset.update(enable_structured_content=False, content_format='plain')
+        updated = queryset.update(enable_structured_content=False, content_format='plain', rendered_blocks={})
         self.message_user(request, f'{updated} lessons disabled for structured content.')
     disable_structured_content.short_description = "Disable structured content"
 
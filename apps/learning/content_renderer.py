@@ -5,7 +5,11 @@ Handles structured content blocks with syntax highlighting and interactive eleme
 
 import re
 import json
-from typing import List, Dict, Any, Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from django.utils.safestring import mark_safe
 from django.template.loader import render_to_string
 
@@ -19,7 +23,8 @@ except ImportError:
 
 try:
     from pygments import highlight
-    from pygments.lexers import get_lexer_by_name, guess_lexer
+    from pygments.lexers import get_lexer_by_name
+    from pygments.lexers.special import TextLexer
     from pygments.formatters import HtmlFormatter
     from pygments.util import ClassNotFound
     PYGMENTS_AVAILABLE = True
@@ -27,6 +32,9 @@ except ImportError:
     PYGMENTS_AVAILABLE = False
 
 
+LEGACY_CONTENT_BLOCK = '_legacy_content'
+
+
 class ContentBlockRenderer:
     """
     Service for rendering structured content blocks with enhanced formatting.
@@ -46,70 +54,174 @@ class ContentBlockRenderer:
         'image': 'render_image_block',
         'video': 'render_video_block',
         'list': 'render_list_block',
-        'table': 'render_table_block'
+        'table': 'render_table_block',
+        # Whole-lesson content of lessons without structured blocks
+        LEGACY_CONTENT_BLOCK: 'render_legacy_content_block',
     }
     
+    # Markdown configurations; each thread gets its own instance of each
+    MARKDOWN_CONFIGS = {
+        'blocks': {
+            'extensions': ['fenced_code', 'codehilite', 'tables', 'toc'],
+            'extension_configs': {
+                'codehilite': {
+                    'css_class': 'highlight',
+                    'use_pygments': True
+                }
+            },
+        },
+        # Legacy markdown lessons (Lesson.content_format == 'markdown')
+        'lesson': {
+            'extensions': ['fenced_code', 'codehilite', 'tables'],
+        },
+        # Forum posts (apps.api.services.post_rendering)
+        'forum_post': {
+            'extensions': ['fenced_code', 'codehilite', 'tables', 'nl2br'],
+            'extension_configs': {
+                'codehilite': {
+                    'css_class': 'highlight',
+                    'use_pygments': True
+                }
+            },
+        },
+    }
+
+    # Bump when rendered output changes, so stored renders are redone
+    RENDER_VERSION = 1
+    HIGHLIGHT_CACHE_SIZE = 512
+
     def __init__(self):
         self.markdown_available = MARKDOWN_AVAILABLE
         self.pygments_available = PYGMENTS_AVAILABLE
-        
-        if self.markdown_available:
-            self.markdown = markdown.Markdown(
-                extensions=[
-                    'fenced_code',
-                    'codehilite',
-                    'tables',
-                    'toc'
-                ],
-                extension_configs={
-                    'codehilite': {
-                        'css_class': 'highlight',
-                        'use_pygments': True
-                    }
-                }
-            )
-    
+        self._markdown_pool = threading.local()
+        self._highlight_cache: OrderedDict = OrderedDict()
+        self._highlight_lock = threading.Lock()
+
+    def render_markdown(self, text: str, config: str = 'blocks') -> str:
+        """
+        Convert markdown with this thread's Markdown instance for a config.
+
+        Markdown instances keep per-document state (e.g. toc anchors), so
+        they are reset after every conversion and never shared by threads.
+        """
+        instances = getattr(self._markdown_pool, 'instances', None)
+        if instances is None:
+            instances = self._markdown_pool.instances = {}
+        md = instances.get(config)
+        if md is None:
+            md = instances[config] = markdown.Markdown(**self.MARKDOWN_CONFIGS[config])
+        try:
+            return md.convert(text)
+        finally:
+            md.reset()
+
     def render_content_blocks(self, content_blocks: List[Dict[str, Any]]) -> str:
         """
         Render a list of content blocks to HTML.
         """
         if not isinstance(content_blocks, list):
             return ""
-        
-        rendered_blocks = []
-        
-        for block in content_blocks:
-            if not isinstance(block, dict) or 'type' not in block:
-                continue
-                
-            block_type = block.get('type')
-            renderer_method = self.BLOCK_TYPES.get(block_type)
-            
-            if renderer_method and hasattr(self, renderer_method):
-                try:
-                    rendered_html = getattr(self, renderer_method)(block)
-                    if rendered_html:
-                        rendered_blocks.append(rendered_html)
-                except Exception as e:
-                    # Fallback for rendering errors
-                    rendered_blocks.append(
-                        f'<div class="alert alert-danger">Error rendering block: {str(e)}</div>'
-                    )
+
+        rendered_blocks = [self.render_block(block) for block in content_blocks]
+        return mark_safe('\n'.join(html for html in rendered_blocks if html))
+
+    def render_block(self, block: Any) -> str:
+        """
+        Render one content block to HTML ('' for blocks that render nothing).
+        """
+        if not isinstance(block, dict) or 'type' not in block:
+            return ''
+
+        block_type = block.get('type')
+        renderer_method = self.BLOCK_TYPES.get(block_type)
+
+        if renderer_method and hasattr(self, renderer_method):
+            try:
+                return getattr(self, renderer_method)(block) or ''
+            except Exception as e:
+                # Fallback for rendering errors
+                return f'<div class="alert alert-danger">Error rendering block: {str(e)}</div>'
+
+        # Fallback for unknown block types
+        content = block.get('content', '')
+        if content:
+            return f'<div class="content-block unknown-type">{content}</div>'
+        return ''
+
+    def block_hash(self, block: Any) -> str:
+        """
+        Hash of a block's content and the renderer version.
+        """
+        data = json.dumps([self.RENDER_VERSION, block], sort_keys=True, default=str)
+        return hashlib.blake2b(data.encode(), digest_size=12).hexdigest()
+
+    def render_blocks_incremental(
+        self,
+        content_blocks: List[Any],
+        previous: Optional[List[Tuple[str, str]]] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Render blocks to [(block hash, html), ...], reusing previous renders.
+
+        Blocks whose hash appears in `previous` keep their earlier HTML, so
+        only added or changed blocks are rendered. Each earlier render is
+        reused once, so duplicated blocks keep distinct element ids.
+        """
+        reusable: Dict[str, List[str]] = {}
+        for block_hash, html in previous or []:
+            reusable.setdefault(block_hash, []).append(html)
+
+        rendered = []
+        for block in content_blocks or []:
+            block_hash = self.block_hash(block)
+            if reusable.get(block_hash):
+                html = reusable[block_hash].pop(0)
             else:
-                # Fallback for unknown block types
-                content = block.get('content', '')
-                if content:
-                    rendered_blocks.append(f'<div class="content-block unknown-type">{content}</div>')
-        
-        return mark_safe('\n'.join(rendered_blocks))
-    
+                html = self.render_block(block)
+            rendered.append((block_hash, html))
+        return rendered
+
+    def render_lesson(self, lesson, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Render a lesson's content for storing on the lesson.
+
+        Args:
+            lesson: Lesson instance
+            previous: The lesson's earlier render, whose unchanged blocks are reused
+
+        Returns:
+            {'version': RENDER_VERSION, 'blocks': [[block hash, html], ...]}
+        """
+        if lesson.enable_structured_content and lesson.structured_content:
+            blocks = lesson.structured_content
+        else:
+            blocks = [{
+                'type': LEGACY_CONTENT_BLOCK,
+                'format': lesson.content_format,
+                'content': lesson.content or '',
+            }]
+
+        rendered = self.render_blocks_incremental(blocks, (previous or {}).get('blocks'))
+        return {
+            'version': self.RENDER_VERSION,
+            'blocks': [[block_hash, html] for block_hash, html in rendered],
+        }
+
+    def render_legacy_content_block(self, block: Dict[str, Any]) -> str:
+        """Render the plain text or markdown content of a lesson."""
+        content = block.get('content', '')
+        if block.get('format') == 'markdown' and self.markdown_available:
+            return self.render_markdown(content, config='lesson')
+        # Plain text with line breaks
+        return content.replace('\n', '<br>')
+
     def render_text_block(self, block: Dict[str, Any]) -> str:
         """Render a text content block."""
         content = block.get('content', '')
         format_type = block.get('format', 'plain')
         
         if format_type == 'markdown' and self.markdown_available:
-            content = self.markdown.convert(content)
+            content = self.render_markdown(content)
         else:
             # Convert line breaks for plain text
             content = content.replace('\n', '<br>')
@@ -418,27 +530,34 @@ class ContentBlockRenderer:
         '''
     
     def _highlight_code(self, code: str, language: str, show_line_numbers: bool = True) -> str:
-        """Apply syntax highlighting to code."""
+        """
+        Apply syntax highlighting to code.
+
+        Results are memoized by (code hash, language, line-number flag), and
+        lexers and formatters are built once. Unknown languages are
+        highlighted as plain text rather than guessed.
+        """
         if not self.pygments_available:
             # Fallback without syntax highlighting
-            return f'<pre class="code-block"><code>{code}</code></pre>'
-        
-        try:
-            lexer = get_lexer_by_name(language, stripall=True)
-        except ClassNotFound:
-            try:
-                lexer = guess_lexer(code)
-            except:
-                # Fallback to plain text
-                return f'<pre class="code-block"><code>{code}</code></pre>'
-        
-        formatter = HtmlFormatter(
-            cssclass='highlight',
-            linenos=show_line_numbers,
-            style='monokai'  # Dark theme compatible
+            return f'<pre class="code-block"><code>{self._escape_html(code)}</code></pre>'
+
+        key = (
+            hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest(),
+            (language or '').lower(),
+            bool(show_line_numbers),
         )
-        
-        highlighted = highlight(code, lexer, formatter)
+        with self._highlight_lock:
+            highlighted = self._highlight_cache.get(key)
+            if highlighted is not None:
+                self._highlight_cache.move_to_end(key)
+                return highlighted
+
+        highlighted = highlight(code, _get_lexer(key[1]), _get_formatter(key[2]))
+
+        with self._highlight_lock:
+            self._highlight_cache[key] = highlighted
+            while len(self._highlight_cache) > self.HIGHLIGHT_CACHE_SIZE:
+                self._highlight_cache.popitem(last=False)
         return highlighted
 
     def _escape_html(self, text: str) -> str:
@@ -450,5 +569,24 @@ class ContentBlockRenderer:
                    .replace("'", '&#39;'))
 
 
+@lru_cache(maxsize=64)
+def _get_lexer(language: str):
+    """Shared lexer for a language; plain text for unknown languages."""
+    try:
+        return get_lexer_by_name(language, stripall=True)
+    except ClassNotFound:
+        return TextLexer(stripall=True)
+
+
+@lru_cache(maxsize=2)
+def _get_formatter(show_line_numbers: bool):
+    """Shared HTML formatter with or without line numbers."""
+    return HtmlFormatter(
+        cssclass='highlight',
+        linenos=show_line_numbers,
+        style='monokai'  # Dark theme compatible
+    )
+
+
 # Global instance for easy import
 content_renderer = ContentBlockRenderer()
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0005_alter_course_banner_image_alter_course_thumbnail_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='rendered_blocks',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Rendered HTML per content block, refreshed on save'),
+        ),
+    ]
@@ -8,7 +8,9 @@ from django.core.validators import MinValueValidator, MaxValueValidator, FileExt
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.safestring import mark_safe
 import json
+from apps.learning.content_renderer import content_renderer
 from apps.users.validators import (
     SecureCourseImageUpload,
     validate_course_image_file_size,
@@ -304,6 +306,12 @@ class Lesson(models.Model):
         help_text="Structured content blocks for enhanced lesson delivery"
     )
     video_url = models.URLField(blank=True, help_text="Optional video URL")
+    rendered_blocks = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Rendered HTML per content block, refreshed on save"
+    )
     
     # Enhanced content features
     enable_structured_content = models.BooleanField(
@@ -392,6 +400,23 @@ class Lesson(models.Model):
     def __str__(self):
         return f"{self.course.title} - {self.title}"
     
+    # Fields the rendered content is built from
+    RENDER_SOURCE_FIELDS = {'content', 'structured_content', 'enable_structured_content', 'content_format'}
+
+    def save(self, *args, **kwargs):
+        """
+        Re-render changed content blocks before saving.
+
+        Blocks are keyed by content hash, so only added or edited blocks are
+        rendered again; saves limited to other fields skip rendering.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.RENDER_SOURCE_FIELDS & set(update_fields):
+            self.rendered_blocks = content_renderer.render_lesson(self, previous=self.rendered_blocks)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'rendered_blocks'}
+        super().save(*args, **kwargs)
+    
     def get_absolute_url(self):
         return reverse('lesson_detail', kwargs={
             'course_slug': self.course.slug,
@@ -457,6 +482,19 @@ class Lesson(models.Model):
         self.structured_content.append(block)
         return block
     
+    def get_rendered_html(self):
+        """
+        Get the lesson's rendered HTML, as precomputed on save.
+
+        Renders made by an older renderer version are refreshed and stored.
+        """
+        rendered = self.rendered_blocks
+        if not rendered or rendered.get('version') != content_renderer.RENDER_VERSION:
+            rendered = self.rendered_blocks = content_renderer.render_lesson(self, previous=rendered)
+            if self.pk:
+                Lesson.objects.filter(pk=self.pk).update(rendered_blocks=rendered)
+        return mark_safe('\n'.join(html for _, html in rendered['blocks'] if html))
+    
     def get_rendered_content(self):
         """Get content in the appropriate format for rendering."""
         if self.enable_structured_content:
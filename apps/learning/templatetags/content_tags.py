@@ -32,20 +32,8 @@ def render_lesson_content(lesson):
     if not lesson:
         return ""
     
-    if lesson.enable_structured_content and lesson.structured_content:
-        return content_renderer.render_content_blocks(lesson.structured_content)
-    elif lesson.content_format == 'markdown':
-        # Handle markdown rendering if available
-        try:
-            import markdown
-            md = markdown.Markdown(extensions=['fenced_code', 'codehilite', 'tables'])
-            return mark_safe(md.convert(lesson.content))
-        except ImportError:
-            # Fallback to plain text with line breaks
-            return mark_safe(lesson.content.replace('\n', '<br>'))
-    else:
-        # Plain text with line breaks
-        return mark_safe(lesson.content.replace('\n', '<br>'))
+    # Rendered when the lesson is saved; see Lesson.save()
+    return lesson.get_rendered_html()
 
 
 @register.inclusion_tag('learning/content_blocks/code_example.html', takes_context=True)
@@ -0,0 +1,153 @@
+"""
+Tests for cached content rendering and precomputed lesson HTML.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+from django.contrib.admin import AdminSite
+from django.test import TestCase, SimpleTestCase
+
+from apps.learning import content_renderer as renderer_module
+from apps.learning.admin import LessonAdmin
+from apps.learning.content_renderer import ContentBlockRenderer
+from apps.learning.models import Category, Course, Lesson
+from apps.learning.templatetags.content_tags import render_lesson_content
+from apps.users.models import User
+
+
+class ContentBlockRendererTests(SimpleTestCase):
+    """Test markdown instances and highlighting cache."""
+
+    def setUp(self):
+        self.renderer = ContentBlockRenderer()
+
+    def test_markdown_state_reset_between_conversions(self):
+        block = {'type': 'text', 'format': 'markdown', 'content': '# Lists\n\nUse `sorted()`.'}
+
+        first = self.renderer.render_block(block)
+        second = self.renderer.render_block(block)
+
+        # Without a reset, toc would number the second anchor "lists_1"
+        self.assertEqual(first, second)
+        self.assertIn('id="lists"', second)
+
+    def test_markdown_instances_per_thread(self):
+        instances = []
+
+        def convert():
+            self.renderer.render_markdown('*x*')
+            instances.append(self.renderer._markdown_pool.instances['blocks'])
+
+        threads = [threading.Thread(target=convert) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(instances), 2)
+        self.assertIsNot(instances[0], instances[1])
+
+    def test_highlight_memoized(self):
+        with patch.object(renderer_module, 'highlight', wraps=renderer_module.highlight) as highlight:
+            first = self.renderer._highlight_code('print("hi")', 'python')
+            self.assertEqual(self.renderer._highlight_code('print("hi")', 'Python'), first)
+            self.renderer._highlight_code('print("hi")', 'python', show_line_numbers=False)
+
+        self.assertEqual(highlight.call_count, 2)
+
+    def test_unknown_language_highlighted_as_text(self):
+        html = self.renderer._highlight_code('<b>x</b>', 'not-a-language', show_line_numbers=False)
+
+        self.assertIn('&lt;b&gt;x&lt;/b&gt;', html)
+
+
+class LessonRenderTests(TestCase):
+    """Test that lessons store rendered blocks and re-render only changes."""
+
+    def setUp(self):
+        instructor = User.objects.create_user(
+            username='renderer', email='renderer@example.com', password='testpass123'
+        )
+        category = Category.objects.create(name='Render Category', slug='render-category')
+        self.course = Course.objects.create(
+            title='Render Course', slug='render-course', description='Test', short_description='Test',
+            category=category, instructor=instructor, estimated_duration=10,
+        )
+
+    def _lesson(self, **kwargs):
+        return Lesson.objects.create(
+            course=self.course, title='Render Lesson', slug='render-lesson', description='Test',
+            estimated_duration=10, **kwargs
+        )
+
+    def test_structured_blocks_rendered_on_save(self):
+        lesson = self._lesson(
+            content='',
+            enable_structured_content=True,
+            structured_content=[
+                {'type': 'text', 'format': 'markdown', 'content': '**Bold**'},
+                {'type': 'tip', 'content': 'Use a list comprehension'},
+            ],
+        )
+
+        lesson = Lesson.objects.get(pk=lesson.pk)
+        self.assertEqual(len(lesson.rendered_blocks['blocks']), 2)
+
+        with patch.object(ContentBlockRenderer, 'render_block') as render_block:
+            html = render_lesson_content(lesson)
+            render_block.assert_not_called()
+
+        self.assertIn('<strong>Bold</strong>', html)
+        self.assertIn('Use a list comprehension', html)
+
+    def test_only_changed_blocks_rerendered(self):
+        lesson = self._lesson(
+            content='',
+            enable_structured_content=True,
+            structured_content=[
+                {'type': 'text', 'content': 'Intro'},
+                {'type': 'note', 'content': 'Old note'},
+                {'type': 'text', 'content': 'Outro'},
+            ],
+        )
+        first_hashes = [block_hash for block_hash, _ in lesson.rendered_blocks['blocks']]
+
+        lesson.structured_content[1]['content'] = 'New note'
+        with patch.object(ContentBlockRenderer, 'render_block', autospec=True,
+                          side_effect=ContentBlockRenderer.render_block) as render_block:
+            lesson.save()
+            self.assertEqual(render_block.call_count, 1)
+            render_block.reset_mock()
+
+            # Saves that don't touch the content don't render at all
+            lesson.title = 'Renamed'
+            lesson.save(update_fields=['title'])
+            render_block.assert_not_called()
+
+        hashes = [block_hash for block_hash, _ in lesson.rendered_blocks['blocks']]
+        self.assertEqual([hashes[0], hashes[2]], [first_hashes[0], first_hashes[2]])
+        self.assertIn('New note', lesson.get_rendered_html())
+
+    def test_legacy_markdown_lesson_and_stale_render(self):
+        lesson = self._lesson(content='Some *markdown*', content_format='markdown')
+        Lesson.objects.filter(pk=lesson.pk).update(rendered_blocks={})
+
+        lesson = Lesson.objects.get(pk=lesson.pk)
+
+        self.assertEqual(lesson.get_rendered_html(), '<p>Some <em>markdown</em></p>')
+        self.assertEqual(Lesson.objects.get(pk=lesson.pk).rendered_blocks['version'], ContentBlockRenderer.RENDER_VERSION)
+
+    def test_admin_format_actions_drop_stored_render(self):
+        lesson = self._lesson(
+            content='Plain *text*',
+            content_format='markdown',
+            structured_content=[{'type': 'tip', 'content': 'Structured tip'}],
+        )
+        self.assertIn('<em>text</em>', lesson.get_rendered_html())
+        lessons = Lesson.objects.filter(pk=lesson.pk)
+
+        LessonAdmin(Lesson, AdminSite()).enable_structured_content(Mock(), lessons)
+        self.assertIn('Structured tip', Lesson.objects.get(pk=lesson.pk).get_rendered_html())
+
+        LessonAdmin(Lesson, AdminSite()).disable_structured_content(Mock(), lessons)
+        self.assertNotIn('Structured tip', Lesson.objects.get(pk=lesson.pk).get_rendered_html())
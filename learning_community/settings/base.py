@@ -475,6 +475,62 @@ RATE_LIMIT_SETTINGS = {
     'AI_REQUESTS': config('RATE_LIMIT_AI', default='30/h', cast=str),  # 30 AI requests per hour
 }
 
+# Forum event outbox (apps.forum_integration.event_bus)
+# DISPATCH: 'thread' runs subscribers in an in-process thread pool after commit,
+# 'worker' leaves events for `manage.py process_forum_events`,
+# 'eager' runs them in the committing thread.
+FORUM_EVENTS = {
+    'DISPATCH': config('FORUM_EVENTS_DISPATCH', default='thread', cast=str),
+    'MAX_WORKERS': config('FORUM_EVENTS_MAX_WORKERS', default=4, cast=int),
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 5,
+    'LEASE_SECONDS': 300,
+}
+
+# WebSocket broadcast outbox (apps.forum_integration.broadcast_outbox)
+# Broadcasts are sent after the recording transaction commits: DISPATCH
+# 'thread' batches them per group in a background event loop, 'eager' sends
+# them from the committing thread. Failed sends are retried MAX_ATTEMPTS times.
+FORUM_BROADCASTS = {
+    'DISPATCH': config('FORUM_BROADCASTS_DISPATCH', default='thread', cast=str),
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BASE_SECONDS': 0.5,
+    'LAG_WARNING_SECONDS': 5,
+}
+
+# WebSocket fan-out limits (apps.forum_integration.realtime_fanout)
+# Typing state is sent as one frame per room at most every TYPING_INTERVAL_MS;
+# connections may send RATE_LIMIT messages per second (bursts of RATE_BURST);
+# user activity is written to the cache every ACTIVITY_FLUSH_INTERVAL seconds.
+FORUM_REALTIME = {
+    'TYPING_INTERVAL_MS': 500,
+    'TYPING_TTL': 6,
+    'RATE_LIMIT': 10,
+    'RATE_BURST': 20,
+    'ACTIVITY_FLUSH_INTERVAL': 5,
+    'ACTIVITY_TIMEOUT': 300,
+}
+
+# Buffered topic views (apps.api.services.topic_views)
+# Views are de-duplicated per viewer for DEDUP_WINDOW seconds and written to
+# the database every FLUSH_INTERVAL seconds or once MAX_PENDING are buffered.
+FORUM_TOPIC_VIEWS = {
+    'FLUSH_INTERVAL': 30,
+    'MAX_PENDING': 500,
+    'DEDUP_WINDOW': 1800,
+}
+
+# Paginator totals (apps.api.pagination.count_rows)
+# Lists up to EXACT_THRESHOLD rows are counted exactly; larger unfiltered
+# lists use the PostgreSQL planner estimate, larger filtered lists a count
+# cached for CACHE_TTL seconds per query.
+FORUM_PAGINATION_COUNTS = {
+    'EXACT_THRESHOLD': 1000,
+    'CACHE_TTL': 60,
+}
+
 # Email Configuration (will be overridden in environment-specific settings)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -180,5 +180,9 @@ DOCKER_EXECUTOR_MEMORY_LIMIT = config('DOCKER_EXECUTOR_MEMORY_LIMIT', default='2
 DOCKER_EXECUTOR_CPU_LIMIT = config('DOCKER_EXECUTOR_CPU_LIMIT', default='0.5')
 DOCKER_EXECUTOR_TIME_LIMIT = config('DOCKER_EXECUTOR_TIME_LIMIT', default=30, cast=int)
 
+# Forum events are consumed by the process_forum_events worker in production
+# (the forum-events service of docker-compose.prod.yml)
+FORUM_EVENTS['DISPATCH'] = config('FORUM_EVENTS_DISPATCH', default='worker', cast=str)
+
 # Create logs directory if it doesn't exist
 os.makedirs(BASE_DIR / 'logs', exist_ok=True)
\ No newline at end of file
@@ -370,7 +370,7 @@ class TopicWebSocket {
             post_updated: (data) => this.handlePostUpdated(data),
             post_deleted: (data) => this.handlePostDeleted(data),
             like_updated: (data) => this.handleLikeUpdated(data),
-            typing: (data) => this.handleTyping(data),
+            typing_state: (data) => this.handleTypingState(data),
             user_joined: (data) => this.handleUserJoined(data),
             user_left: (data) => this.handleUserLeft(data),
             initial_data: (data) => this.handleInitialData(data)
@@ -419,12 +419,8 @@ class TopicWebSocket {
         this.updateLikeCount(data.post_id, data.likes_count, data.user_liked);
     }
 
-    handleTyping(data) {
-        if (data.is_typing) {
-            this.typingUsers.add(data.username);
-        } else {
-            this.typingUsers.delete(data.username);
-        }
+    handleTypingState(data) {
+        this.typingUsers = new Set(data.users.map(user => user.username));
         this.updateTypingIndicator();
     }
 